@@ -0,0 +1,335 @@
+"""
+Asset Register Service
+======================
+
+Bulk paths for the asset register - onboarding thousands of laptops / tools
+at once and exporting the register back out.
+
+- Import: rows are streamed from CSV/XLSX (AuthN.bulk_import_service
+  readers) and validated per chunk - categories and asset code uniqueness
+  are checked with ONE set query each per chunk (asset_admin_code_uniq),
+  then valid rows are written with bulk_create chunk by chunk.
+- Export: rows are read with values_list().iterator(), so CSV exports are
+  streamed to the client and XLSX exports are written in write-only mode.
+- Depreciation: one set-based UPDATE per month recomputes current_value of
+  every asset from purchase_price (written-down value method).
+
+Time Complexity: O(n) rows, O(n / chunk_size) queries
+Space Complexity: O(chunk_size) rows + O(n) seen asset codes
+"""
+
+import csv
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db.models import DecimalField, F, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, ExtractMonth, ExtractYear, Greatest, Power
+from django.utils import timezone
+
+from .models import Asset, AssetCategory
+from AuthN.bulk_import_service import _error_row_num, parse_date
+
+BLANK_VALUES = ('', 'n/a', 'none', 'null')  # Exported empty cells read back as blank
+MAX_AMOUNT = Decimal('9999999999.99')  # max_digits=12, decimal_places=2
+DEFAULT_DEPRECIATION_RATE = 15  # % per year, written-down value
+DEFAULT_RESIDUAL_VALUE_PERCENT = 5  # Floor - an asset never drops below this % of purchase_price
+
+STATUS_VALUES = {value for value, _ in Asset.STATUS_CHOICES}
+CONDITION_VALUES = {value for value, _ in Asset.CONDITION_CHOICES}
+
+# (header, values_list field) - headers normalise to the import column names,
+# so an exported file can be edited and imported again
+EXPORT_COLUMNS = (
+    ('Asset ID', 'id'),
+    ('Asset Code', 'asset_code'),
+    ('Name', 'name'),
+    ('Description', 'description'),
+    ('Category', 'category__name'),
+    ('Brand', 'brand'),
+    ('Model', 'model'),
+    ('Serial Number', 'serial_number'),
+    ('Status', 'status'),
+    ('Condition', 'condition'),
+    ('Location', 'location'),
+    ('Purchase Date', 'purchase_date'),
+    ('Purchase Price', 'purchase_price'),
+    ('Current Value', 'current_value'),
+    ('Warranty Expiry', 'warranty_expiry'),
+    ('Vendor', 'vendor'),
+    ('Notes', 'notes'),
+    ('Created At', 'created_at'),
+    ('Updated At', 'updated_at'),
+)
+EXPORT_ITERATOR_CHUNK_SIZE = 2000
+
+
+# ==================== IMPORT ====================
+
+def _text(row_data, field):
+    value = (row_data.get(field) or '').strip()
+    return '' if value.lower() in BLANK_VALUES else value
+
+
+def _amount(value):
+    """'1,25,000.50' -> Decimal('125000.50'); raises ValueError if invalid"""
+    if not value:
+        return None
+    try:
+        amount = Decimal(value.replace(',', '')).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        raise ValueError('must be a number')
+    if amount < 0 or amount > MAX_AMOUNT:
+        raise ValueError(f'must be between 0 and {MAX_AMOUNT}')
+    return amount
+
+
+def _clean_asset_row(row_num, row_data):
+    """
+    Field-level validation of one asset row.
+
+    Returns:
+        tuple: (cleaned dict, None) or (None, error message)
+    """
+    asset_code = _text(row_data, 'asset_code')
+    name = _text(row_data, 'name')
+    category = _text(row_data, 'category') or _text(row_data, 'category_code') or _text(row_data, 'category_name')
+
+    missing_fields = [field for field, value in (('asset_code', asset_code), ('name', name), ('category', category)) if not value]
+    if missing_fields:
+        return None, f"Row {row_num}: Missing required fields: {', '.join(missing_fields)}"
+    if len(asset_code) > 100:
+        return None, f"Row {row_num}: asset_code is longer than 100 characters"
+
+    status_value = _text(row_data, 'status').lower() or 'available'
+    if status_value not in STATUS_VALUES:
+        return None, f"Row {row_num}: Invalid status '{status_value}'. Use one of: {', '.join(sorted(STATUS_VALUES))}"
+    condition = _text(row_data, 'condition').lower() or 'good'
+    if condition not in CONDITION_VALUES:
+        return None, f"Row {row_num}: Invalid condition '{condition}'. Use one of: {', '.join(sorted(CONDITION_VALUES))}"
+
+    cleaned = {
+        'row_num': row_num,
+        'category': category,
+        'asset_code': asset_code,
+        'name': name[:255],
+        'status': status_value,
+        'condition': condition,
+    }
+    for field in ('purchase_date', 'warranty_expiry'):
+        value = _text(row_data, field)
+        cleaned[field] = parse_date(value)
+        if value and cleaned[field] is None:
+            return None, f"Row {row_num}: Invalid {field} format. Use YYYY-MM-DD"
+    for field in ('purchase_price', 'current_value'):
+        try:
+            cleaned[field] = _amount(_text(row_data, field))
+        except ValueError as e:
+            return None, f"Row {row_num}: {field} {str(e)}"
+    if cleaned['current_value'] is None:
+        cleaned['current_value'] = cleaned['purchase_price']
+    for field, max_length in (('brand', 100), ('model', 100), ('serial_number', 100), ('location', 255), ('vendor', 255)):
+        cleaned[field] = _text(row_data, field)[:max_length] or None
+    for field in ('description', 'notes'):
+        cleaned[field] = _text(row_data, field) or None
+    return cleaned, None
+
+
+class AssetRowValidator:
+    """
+    Chunked validator for asset import rows of one admin (and site).
+
+    Categories are matched by code, then by name, among the admin's active
+    categories of the site (or without a site). Resolved categories and the
+    asset codes accepted so far are kept across chunks.
+    """
+
+    def __init__(self, admin_id, site_id=None):
+        self.admin_id = admin_id
+        self.site_id = site_id
+        self.categories = {}  # category code/name from the file -> category id (None = not found)
+        self.seen_codes = set()
+
+    def _resolve_categories(self, values):
+        """One query per chunk for category values not resolved by an earlier chunk"""
+        values = {value for value in values if value not in self.categories}
+        if not values:
+            return
+        categories = AssetCategory.objects.filter(
+            Q(code__in=values) | Q(name__in=values),
+            admin_id=self.admin_id,
+            is_active=True,
+        )
+        if self.site_id:
+            categories = categories.filter(Q(site_id=self.site_id) | Q(site__isnull=True))
+        by_code, by_name = {}, {}
+        for category_id, code, name in categories.values_list('id', 'code', 'name'):
+            by_code[code] = category_id
+            by_name.setdefault(name, category_id)
+        for value in values:
+            self.categories[value] = by_code.get(value) or by_name.get(value)
+
+    def validate_chunk(self, rows):
+        """
+        Validate a chunk of (row_num, row_dict) pairs.
+
+        Returns:
+            tuple: (list of valid row dicts with category_id, list of error messages)
+        """
+        errors = []
+        cleaned_rows = []
+        for row_num, row_data in rows:
+            try:
+                cleaned, error = _clean_asset_row(row_num, row_data)
+            except Exception as e:
+                cleaned, error = None, f"Row {row_num}: {str(e)}"
+            if error:
+                errors.append(error)
+            else:
+                cleaned_rows.append(cleaned)
+
+        # 2 queries per chunk - categories, then codes via the (admin, asset_code) unique index
+        self._resolve_categories({row['category'] for row in cleaned_rows})
+        codes = {row['asset_code'] for row in cleaned_rows}
+        existing_codes = set(
+            Asset.objects.filter(admin_id=self.admin_id, asset_code__in=codes).values_list('asset_code', flat=True)
+        ) if codes else set()
+
+        valid_rows = []
+        for row in cleaned_rows:
+            row_num = row['row_num']
+            asset_code = row['asset_code']
+            category_id = self.categories.get(row['category'])
+            if category_id is None:
+                errors.append(f"Row {row_num}: Asset category '{row['category']}' not found")
+                continue
+            # O(1) - Set lookups against DB codes and rows accepted earlier in the file
+            if asset_code in existing_codes or asset_code in self.seen_codes:
+                errors.append(f"Row {row_num}: Asset with code {asset_code} already exists")
+                continue
+            self.seen_codes.add(asset_code)
+            row['category_id'] = category_id
+            valid_rows.append(row)
+
+        # Keep file order for error reporting
+        errors.sort(key=_error_row_num)
+        return valid_rows, errors
+
+
+ASSET_ROW_FIELDS = (
+    'category_id', 'asset_code', 'name', 'description', 'brand', 'model', 'serial_number',
+    'status', 'condition', 'location', 'purchase_date', 'purchase_price', 'current_value',
+    'warranty_expiry', 'vendor', 'notes',
+)
+
+
+def create_asset_rows(admin_id, site_id, valid_rows):
+    """
+    Bulk create validated rows - one INSERT per chunk.
+    Must be called inside transaction.atomic().
+
+    Returns:
+        int: number of assets created
+    """
+    if not valid_rows:
+        return 0
+    assets = Asset.objects.bulk_create([
+        Asset(admin_id=admin_id, site_id=site_id, **{field: row[field] for field in ASSET_ROW_FIELDS})
+        for row in valid_rows
+    ])
+    return len(assets)
+
+
+# ==================== EXPORT ====================
+
+def iter_export_rows(queryset):
+    """Export rows as tuples (EXPORT_COLUMNS order) - streamed from the DB cursor"""
+    return queryset.values_list(*(field for _, field in EXPORT_COLUMNS)).iterator(
+        chunk_size=EXPORT_ITERATOR_CHUNK_SIZE
+    )
+
+
+def _export_value(value):
+    if value is None:
+        return 'N/A'
+    if hasattr(value, 'hour'):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class _Echo:
+    """csv.writer target that hands each line back instead of buffering it"""
+
+    def write(self, value):
+        return value
+
+
+def stream_export_csv(queryset):
+    """Yield the CSV export line by line - memory stays flat for any register size"""
+    writer = csv.writer(_Echo())
+    yield '\ufeff'  # BOM - Excel opens UTF-8 CSV correctly
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    for row in iter_export_rows(queryset):
+        yield writer.writerow([_export_value(value) for value in row])
+
+
+def iter_export_values(queryset):
+    """Export rows with values formatted for a spreadsheet"""
+    for row in iter_export_rows(queryset):
+        yield [_export_value(value) for value in row]
+
+
+# ==================== DEPRECIATION ====================
+
+def snapshot_depreciation(as_of=None, admin_id=None):
+    """
+    Recompute current_value of every asset for the month of `as_of` (default: today).
+
+    Written-down value per whole month since purchase:
+        purchase_price * (1 - rate / 100) ^ (months / 12)
+    floored at ASSET_RESIDUAL_VALUE_PERCENT of purchase_price. rate is the
+    category's depreciation_rate, else ASSET_DEPRECIATION_RATE.
+
+    One UPDATE for all assets - the value is derived from purchase_price, so
+    re-running within a month is a no-op. Assets without purchase price/date,
+    inactive and disposed assets keep their current_value.
+
+    Returns:
+        int: number of assets updated
+    """
+    as_of = as_of or timezone.localdate()
+    default_rate = getattr(settings, 'ASSET_DEPRECIATION_RATE', DEFAULT_DEPRECIATION_RATE)
+    residual_percent = getattr(settings, 'ASSET_RESIDUAL_VALUE_PERCENT', DEFAULT_RESIDUAL_VALUE_PERCENT)
+
+    months = Value(as_of.year * 12 + as_of.month) - (
+        ExtractYear('purchase_date') * 12 + ExtractMonth('purchase_date')
+    )
+    rate = Coalesce(
+        Subquery(AssetCategory.objects.filter(id=OuterRef('category_id')).order_by().values('depreciation_rate')[:1]),
+        Value(Decimal(str(default_rate))),
+        output_field=DecimalField(max_digits=5, decimal_places=2),
+    )
+    price = Cast(F('purchase_price'), FloatField())
+    factor = Power(
+        Value(1.0) - Cast(rate, FloatField()) / Value(100.0),
+        Cast(months, FloatField()) / Value(12.0),
+    )
+    value = Greatest(price * factor, price * Value(residual_percent / 100.0))
+
+    assets = Asset.objects.filter(
+        is_active=True,
+        purchase_price__isnull=False,
+        purchase_date__isnull=False,
+        purchase_date__lte=as_of,
+    ).exclude(status='disposed')
+    if admin_id:
+        assets = assets.filter(admin_id=admin_id)
+    return assets.update(
+        current_value=Cast(value, DecimalField(max_digits=12, decimal_places=2)),
+        updated_at=timezone.now(),
+    )
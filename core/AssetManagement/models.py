@@ -3,6 +3,7 @@ Asset Management System
 Medium level asset tracking and management
 """
 
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from uuid import uuid4
 from AuthN.models import BaseUserModel
@@ -27,6 +28,11 @@ class AssetCategory(models.Model):
     name = models.CharField(max_length=255)
     code = models.CharField(max_length=50)
     description = models.TextField(blank=True, null=True)
+    depreciation_rate = models.DecimalField(
+        max_digits=5, decimal_places=2, null=True, blank=True,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+        help_text="Annual written-down-value depreciation % (blank = ASSET_DEPRECIATION_RATE)"
+    )
     is_active = models.BooleanField(default=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
@@ -110,8 +116,11 @@ class Asset(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
-        unique_together = ('admin', 'asset_code')
         ordering = ['-created_at']
+        constraints = [
+            # Asset codes are unique per admin - also serves asset_code lookups/imports
+            models.UniqueConstraint(fields=['admin', 'asset_code'], name='asset_admin_code_uniq'),
+        ]
         indexes = [
             # Primary query optimization - most common filter pattern
             models.Index(fields=['admin', 'is_active', 'created_at'], name='asset_adm_act_created_idx'),
@@ -123,8 +132,7 @@ class Asset(models.Model):
             models.Index(fields=['admin', 'created_at'], name='asset_adm_created_idx'),
             # Detail view optimization
             models.Index(fields=['id', 'admin'], name='asset_id_adm_idx'),
-            # Search optimization (for asset_code, name lookups)
-            models.Index(fields=['admin', 'asset_code'], name='asset_adm_code_idx'),
+            # Search optimization (name lookups - asset_code uses asset_admin_code_uniq)
             models.Index(fields=['admin', 'name'], name='asset_adm_name_idx'),
             # Site filtering optimization - O(1) queries
             models.Index(fields=['site', 'admin', 'is_active', 'created_at'], name='asset_site_adm_act_created_idx'),
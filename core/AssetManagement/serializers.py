@@ -14,7 +14,7 @@ class AssetCategorySerializer(serializers.ModelSerializer):
         model = AssetCategory
         fields = [
             'id', 'admin', 'name', 'code', 'description',
-            'is_active', 'created_at', 'updated_at'
+            'depreciation_rate', 'is_active', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
 
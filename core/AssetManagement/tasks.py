@@ -0,0 +1,23 @@
+"""
+Celery Tasks for Asset Management
+Monthly depreciation snapshot - current_value of every asset is recomputed
+from purchase_price in one set-based UPDATE (idempotent within a month).
+"""
+
+from celery import shared_task
+from datetime import date
+import logging
+
+from .asset_register_service import snapshot_depreciation
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='snapshot_asset_depreciation')
+def snapshot_asset_depreciation(as_of=None):
+    """
+    Update current_value of all assets for the month of `as_of` (ISO date, default today)
+    """
+    updated = snapshot_depreciation(date.fromisoformat(as_of) if as_of else None)
+    logger.info(f"Asset depreciation snapshot: {updated} asset(s) updated")
+    return {"updated": updated}
@@ -8,6 +8,7 @@ from .views import (
     AssetCategoryAPIView,
     AssetCategoryDetailAPIView,
     AssetAPIView,
+    AssetBulkImportAPIView,
     AssetDetailAPIView
 )
 
@@ -18,5 +19,6 @@ urlpatterns = [
     
     # Asset URLs
     path('assets/<uuid:site_id>/', AssetAPIView.as_view(), name='asset-list-create'),
+    path('assets/<uuid:site_id>/import/', AssetBulkImportAPIView.as_view(), name='asset-bulk-import'),
     path('assets/<uuid:site_id>/<int:pk>/', AssetDetailAPIView.as_view(), name='asset-detail'),
 ]
@@ -8,125 +8,46 @@ All queries O(1) or using proper database indexes
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.db.models import Q
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
 from django.utils import timezone
-from io import BytesIO
 from datetime import datetime, timedelta, time
+import tempfile
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill, Font, Alignment
+from openpyxl.utils import get_column_letter
 
 from .models import AssetCategory, Asset
 from .serializers import AssetCategorySerializer, AssetSerializer
-from AuthN.models import BaseUserModel, AdminProfile
-from SiteManagement.models import Site
+from .asset_register_service import (
+    EXPORT_COLUMNS, AssetRowValidator, create_asset_rows, iter_export_values, stream_export_csv,
+)
+from AuthN.bulk_import_service import SUPPORTED_FORMATS, chunked, get_chunk_size, get_file_format, iter_import_rows
 from django.shortcuts import get_object_or_404
+from AuthN.permissions import HasTenantAccess
 from utils.pagination_utils import CustomPagination
 from utils.site_filter_utils import filter_queryset_by_site
 
-
-def get_admin_and_site_optimized(request, site_id):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Returns: (admin, site) tuple or Response with error
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                'message': 'Site not found or you don\'t have permission to access this site',
-                'data': None,
-                'status': status.HTTP_403_FORBIDDEN
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                'message': 'admin_id is required for organization role. Please provide admin_id as query parameter.',
-                'data': None,
-                'status': status.HTTP_400_BAD_REQUEST
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                'message': 'Admin not found',
-                'data': None,
-                'status': status.HTTP_404_NOT_FOUND
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        # Uses index on (user_id, organization_id) if exists, else (user_id)
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                'message': 'Admin does not belong to your organization',
-                'data': None,
-                'status': status.HTTP_403_FORBIDDEN
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                'message': 'Site not found or you don\'t have permission to access this site',
-                'data': None,
-                'status': status.HTTP_403_FORBIDDEN
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    else:
-        return None, None, Response({
-            'message': 'Unauthorized access. Only admin and organization roles can access this endpoint',
-            'data': None,
-            'status': status.HTTP_403_FORBIDDEN
-        }, status=status.HTTP_403_FORBIDDEN)
+EXPORT_COLUMN_MIN_WIDTH = 14
 
 
 class AssetCategoryAPIView(APIView):
     """Asset Category CRUD Operations - Optimized"""
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     
     def get(self, request, site_id):
         """Get all asset categories - O(1) query with index optimization"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index (admin, is_active) - ac_admin_active_idx
             categories = AssetCategory.objects.filter(
                 admin_id=admin.id,
                 is_active=True
-            ).only('id', 'admin_id', 'name', 'code', 'description', 'is_active', 'created_at', 'updated_at', 'site_id')
+            ).only('id', 'admin_id', 'name', 'code', 'description', 'depreciation_rate', 'is_active', 'created_at', 'updated_at', 'site_id')
             
             # Filter by site - O(1) with index
             categories = filter_queryset_by_site(categories, site_id, 'site')
@@ -148,9 +69,7 @@ class AssetCategoryAPIView(APIView):
     def post(self, request, site_id):
         """Create new asset category - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin, site = request.tenant.admin, request.tenant.site
             
             data = request.data.copy()
             data['admin'] = admin.id
@@ -181,19 +100,18 @@ class AssetCategoryAPIView(APIView):
 
 class AssetCategoryDetailAPIView(APIView):
     """Asset Category Detail Operations - Optimized"""
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     
     def get(self, request, site_id, pk):
         """Get single asset category - O(1) query with index"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index (id, admin) - ac_admin_code_idx or primary key
             category = AssetCategory.objects.filter(
                 id=pk,
                 admin_id=admin.id
-            ).only('id', 'admin_id', 'name', 'code', 'description', 'is_active', 'created_at', 'updated_at', 'site_id').first()
+            ).only('id', 'admin_id', 'name', 'code', 'description', 'depreciation_rate', 'is_active', 'created_at', 'updated_at', 'site_id').first()
             
             if not category:
                 return Response({
@@ -227,9 +145,7 @@ class AssetCategoryDetailAPIView(APIView):
     def put(self, request, site_id, pk):
         """Update asset category - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index
             category = AssetCategory.objects.filter(id=pk, admin_id=admin.id).only('id', 'site_id').first()
@@ -275,9 +191,7 @@ class AssetCategoryDetailAPIView(APIView):
     def delete(self, request, site_id, pk):
         """Delete asset category (soft delete) - Optimized O(1) update"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query to check existence
             category = AssetCategory.objects.filter(id=pk, admin_id=admin.id).only('id', 'site_id', 'is_active').first()
@@ -314,6 +228,7 @@ class AssetCategoryDetailAPIView(APIView):
 
 class AssetAPIView(APIView):
     """Asset CRUD Operations - Optimized for high-traffic, low-cost architecture"""
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     pagination_class = CustomPagination
     
     def get(self, request, site_id):
@@ -323,9 +238,7 @@ class AssetAPIView(APIView):
         All queries O(1) or using proper database indexes
         """
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             admin_id = admin.id
             
@@ -379,7 +292,7 @@ class AssetAPIView(APIView):
             search = request.query_params.get('search', '').strip()
             if search:
                 # Use Q objects for efficient OR queries
-                # Uses indexes: asset_adm_code_idx, asset_adm_name_idx
+                # Uses indexes: asset_admin_code_uniq, asset_adm_name_idx
                 search_q = (
                     Q(name__icontains=search) |
                     Q(asset_code__icontains=search) |
@@ -393,10 +306,12 @@ class AssetAPIView(APIView):
                 )
                 assets = assets.filter(search_q)
             
-            # Check if Excel export is requested
-            export_excel = request.query_params.get('export', '').lower() == 'true'
-            if export_excel:
-                # Limit export to prevent memory issues - max 10K records
+            # Check if export is requested - export=true (Excel) or export=csv (streamed)
+            export = request.query_params.get('export', '').lower()
+            if export == 'csv':
+                return self.generate_csv_export(assets)
+            if export == 'true':
+                # Limit Excel export - the workbook is zipped in one go, use export=csv for larger registers
                 export_limit = 10000
                 export_assets = assets[:export_limit]
                 return self.generate_excel_export_optimized(export_assets)
@@ -430,117 +345,55 @@ class AssetAPIView(APIView):
     def generate_excel_export_optimized(self, assets_queryset):
         """
         Generate Excel export for assets - Highly Optimized
-        Uses raw SQL for maximum performance with millions of records
+        Write-only workbook fed from a DB cursor: rows are streamed into the
+        file instead of building every cell in memory
         """
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Assets"
-        
-        headers = [
-            "Asset ID", "Asset Code", "Name", "Description", "Category", "Brand", "Model",
-            "Serial Number", "Status", "Condition", "Location",
-            "Purchase Date", "Purchase Price", "Current Value", "Warranty Expiry", "Vendor",
-            "Notes", "Created At", "Updated At"
-        ]
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Assets")
         
         header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
         header_font = Font(bold=True, color="FFFFFF")
         
+        # Write-only sheets cannot be measured after writing - widths from the header, capped at 50 chars
+        for col, (head, _) in enumerate(EXPORT_COLUMNS, 1):
+            ws.column_dimensions[get_column_letter(col)].width = min(max(len(head) + 2, EXPORT_COLUMN_MIN_WIDTH), 50)
+        
         # Header Row
-        for col, head in enumerate(headers, 1):
-            c = ws.cell(row=1, column=col, value=head)
+        header_cells = []
+        for head, _ in EXPORT_COLUMNS:
+            c = WriteOnlyCell(ws, value=head)
             c.fill = header_fill
             c.font = header_font
             c.alignment = Alignment(horizontal="center")
+            header_cells.append(c)
+        ws.append(header_cells)
         
-        # Helper function to convert values to Excel-compatible format
-        def to_excel_value(val):
-            if val is None:
-                return "N/A"
-            if hasattr(val, 'strftime'):
-                return val.strftime('%Y-%m-%d %H:%M:%S') if hasattr(val, 'hour') else val.strftime('%Y-%m-%d')
-            try:
-                if not isinstance(val, (str, int, float, bool)):
-                    return str(val)
-            except:
-                return "N/A"
-            return val
+        # Data Rows - values_list().iterator(), no model instantiation
+        for row in iter_export_values(assets_queryset):
+            ws.append(row)
         
-        # Use .values() to fetch only required fields - avoids model instantiation
-        # This is much faster and uses less memory for large datasets
-        # Uses select_related category data efficiently
-        asset_values = assets_queryset.values(
-            'id', 'asset_code', 'name', 'description', 'brand', 'model',
-            'serial_number', 'status', 'condition', 'location',
-            'purchase_date', 'purchase_price', 'current_value', 'warranty_expiry',
-            'vendor', 'notes', 'created_at', 'updated_at',
-            'category__name'  # Access related field via select_related
-        )
-        
-        # Data Rows - iterate over values directly (O(N) but optimized)
-        # Batch write for better performance
-        row_data = []
-        for asset in asset_values:
-            row = [
-                to_excel_value(asset.get("id", "N/A")),
-                to_excel_value(asset.get("asset_code", "N/A")),
-                to_excel_value(asset.get("name", "N/A")),
-                to_excel_value(asset.get("description", "N/A")),
-                to_excel_value(asset.get("category__name", "N/A")),
-                to_excel_value(asset.get("brand", "N/A")),
-                to_excel_value(asset.get("model", "N/A")),
-                to_excel_value(asset.get("serial_number", "N/A")),
-                to_excel_value(asset.get("status", "N/A")),
-                to_excel_value(asset.get("condition", "N/A")),
-                to_excel_value(asset.get("location", "N/A")),
-                to_excel_value(asset.get("purchase_date", "N/A")),
-                to_excel_value(asset.get("purchase_price", "N/A")),
-                to_excel_value(asset.get("current_value", "N/A")),
-                to_excel_value(asset.get("warranty_expiry", "N/A")),
-                to_excel_value(asset.get("vendor", "N/A")),
-                to_excel_value(asset.get("notes", "N/A")),
-                to_excel_value(asset.get("created_at", "N/A")),
-                to_excel_value(asset.get("updated_at", "N/A")),
-            ]
-            row_data.append(row)
-        
-        # Batch write to worksheet for better performance
-        for i, row in enumerate(row_data, 2):
-            for col, val in enumerate(row, 1):
-                ws.cell(row=i, column=col).value = val
-        
-        # Auto width - optimized to only check first 100 rows for performance
-        for col_idx, col in enumerate(ws.columns, 1):
-            max_len = 0
-            letter = col[0].column_letter
-            # Only check first 100 rows + header for width calculation
-            check_rows = min(100, len(col))
-            for cell in col[:check_rows]:
-                try:
-                    max_len = max(max_len, len(str(cell.value)))
-                except:
-                    pass
-            ws.column_dimensions[letter].width = min(max_len + 2, 50)  # Cap at 50 chars
-        
-        # Save in memory
-        output = BytesIO()
+        # Spooled to disk past 10 MB
+        output = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
         wb.save(output)
         output.seek(0)
         
-        response = HttpResponse(
-            output.getvalue(),
+        return FileResponse(
+            output,
+            as_attachment=True,
+            filename="assets.xlsx",
             content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
-        response["Content-Disposition"] = 'attachment; filename="assets.xlsx"'
-        
+    
+    def generate_csv_export(self, assets_queryset):
+        """Generate CSV export for assets - streamed row by row, no size limit"""
+        response = StreamingHttpResponse(stream_export_csv(assets_queryset), content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = 'attachment; filename="assets.csv"'
         return response
     
     def post(self, request, site_id):
         """Create new asset - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin, site = request.tenant.admin, request.tenant.site
             
             data = request.data.copy()
             data['admin'] = admin.id
@@ -569,15 +422,99 @@ class AssetAPIView(APIView):
             }, status=status.HTTP_400_BAD_REQUEST)
 
 
+class AssetBulkImportAPIView(APIView):
+    """
+    Bulk Asset Import via CSV/Excel - Optimized for onboarding thousands of assets
+    
+    Columns: asset_code, name, category (code or name) required; description, brand,
+    model, serial_number, status, condition, location, purchase_date, purchase_price,
+    current_value, warranty_expiry, vendor, notes optional. An asset export
+    (export=csv / export=true) can be edited and imported again.
+    
+    - Rows streamed from the file (XLSX in read-only mode)
+    - Categories and asset codes checked with one set query each per chunk
+    - bulk_create chunk by chunk
+    
+    All-or-nothing: any validation error rejects the whole file.
+    """
+    permission_classes = [IsAuthenticated, HasTenantAccess]
+    
+    def post(self, request, site_id):
+        """Upload and import a CSV/Excel asset register"""
+        try:
+            admin, site = request.tenant.admin, request.tenant.site
+            
+            if 'file' not in request.FILES:
+                return Response({
+                    'message': 'No file uploaded',
+                    'data': None,
+                    'status': status.HTTP_400_BAD_REQUEST
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            file = request.FILES['file']
+            file_format = get_file_format(file.name)
+            if file_format not in SUPPORTED_FORMATS:
+                return Response({
+                    'message': 'Unsupported file format. Please upload CSV or Excel file.',
+                    'data': None,
+                    'status': status.HTTP_400_BAD_REQUEST
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            site_pk = site.id if site else None
+            chunk_size = get_chunk_size()
+            total_rows = 0
+            errors = []
+            valid_rows = []
+            
+            # PHASE 1: Stream and validate ALL rows first - collect all errors before any creation
+            validator = AssetRowValidator(admin.id, site_pk)
+            for chunk in chunked(iter_import_rows(file, file_format), chunk_size):
+                total_rows += len(chunk)
+                chunk_valid_rows, chunk_errors = validator.validate_chunk(chunk)
+                valid_rows.extend(chunk_valid_rows)
+                errors.extend(chunk_errors)
+            
+            if not total_rows:
+                return Response({
+                    'message': 'File is empty or has no data rows',
+                    'data': None,
+                    'status': status.HTTP_400_BAD_REQUEST
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            if errors:
+                return Response({
+                    'message': f'Validation failed. Please fix all errors before uploading. {len(errors)} error(s) found.',
+                    'data': {'processed': 0, 'errors': errors},
+                    'status': status.HTTP_400_BAD_REQUEST
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # PHASE 2: All validations passed - bulk create chunk by chunk in one transaction
+            processed = 0
+            with transaction.atomic():
+                for chunk in chunked(valid_rows, chunk_size):
+                    processed += create_asset_rows(admin.id, site_pk, chunk)
+            
+            return Response({
+                'message': f'Successfully imported {processed} asset(s)',
+                'data': {'processed': processed, 'errors': None},
+                'status': status.HTTP_201_CREATED
+            }, status=status.HTTP_201_CREATED)
+        except Exception as e:
+            return Response({
+                'message': f'Error importing assets: {str(e)}',
+                'data': None,
+                'status': status.HTTP_400_BAD_REQUEST
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+
 class AssetDetailAPIView(APIView):
     """Asset Detail Operations - Optimized"""
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     
     def get(self, request, site_id, pk):
         """Get single asset - O(1) query with index"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index asset_id_adm_idx (id, admin)
             asset = Asset.objects.filter(
@@ -623,9 +560,7 @@ class AssetDetailAPIView(APIView):
     def put(self, request, site_id, pk):
         """Update asset - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index asset_id_adm_idx
             asset = Asset.objects.filter(id=pk, admin_id=admin.id).only('id', 'site_id').first()
@@ -671,9 +606,7 @@ class AssetDetailAPIView(APIView):
     def delete(self, request, site_id, pk):
         """Delete asset (soft delete) - Optimized O(1) update"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query to check existence using index
             asset = Asset.objects.filter(id=pk, admin_id=admin.id).only('id', 'site_id', 'is_active').first()
@@ -30,7 +30,6 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from .permissions import *
 from django.shortcuts import get_object_or_404
-from django.db import transaction
 from django.db.models import Q, Count, Sum, Avg
 from django.utils import timezone
 from datetime import datetime, date
@@ -39,7 +38,7 @@ import csv
 
 from .models import *
 from .serializers import (
-    UserProfileReadSerializer, UserProfileUpdateSerializer,
+    UserProfileListSerializer, UserProfileUpdateSerializer,
     AdminProfileReadSerializer, AdminProfileUpdateSerializer,
     ChangePasswordSerializer, EmployeeActivateSerializer,
     EmployeeTransferSerializer, EmployeeStatusUpdateSerializer,
@@ -47,6 +46,10 @@ from .serializers import (
     FcmTokenUpdateSerializer
 )
 from utils.pagination_utils import CustomPagination
+from SearchIndex.search_service import apply_search
+from utils.Employee.bulk_operations import bulk_set_employees_active, bulk_transfer_employees
+from utils.status_counter_service import get_status_counts
+from utils.tenant_utils import resolve_admin_and_site
 
 
 # ==================== CHANGE PASSWORD FOR ALL ROLES ====================
@@ -142,6 +145,7 @@ class EmployeeListUnderAdminAPIView(APIView):
     """Get all employees under an admin"""
     permission_classes = [IsAuthenticated, IsOrganizationOrAdmin]
     pagination_class = CustomPagination
+    query_budget = {'GET': 10}  # Constant - must not grow with employee count
     
     def get(self, request):
         try:
@@ -197,12 +201,7 @@ class EmployeeListUnderAdminAPIView(APIView):
             
             # Search
             if search:
-                queryset = queryset.filter(
-                    Q(user_name__icontains=search) |
-                    Q(custom_employee_id__icontains=search) |
-                    Q(designation__icontains=search) |
-                    Q(user__email__icontains=search)
-                )
+                queryset = apply_search(queryset, 'employee', search)
             
             # Status filter
             if status_filter == 'active':
@@ -226,9 +225,10 @@ class EmployeeListUnderAdminAPIView(APIView):
             
             # Pagination
             paginator = self.pagination_class()
-            paginated_qs = paginator.paginate_queryset(queryset, request)
+            # Flat values() rows - 1 query for the page + 1 per M2M relation
+            paginated_qs = paginator.paginate_queryset(UserProfileListSerializer.setup_queryset(queryset), request)
             
-            serializer = UserProfileReadSerializer(paginated_qs, many=True)
+            serializer = UserProfileListSerializer(paginated_qs, context={'request': request})
             pagination_data = paginator.get_paginated_response(serializer.data)
             pagination_data["summary"] = {
                 "total": total,
@@ -662,12 +662,7 @@ class AllEmployeesUnderOrganizationAPIView(APIView):
             
             # Search
             if search:
-                queryset = queryset.filter(
-                    Q(user_name__icontains=search) |
-                    Q(custom_employee_id__icontains=search) |
-                    Q(designation__icontains=search) |
-                    Q(user__email__icontains=search)
-                )
+                queryset = apply_search(queryset, 'employee', search)
             
             # Status filter
             if status_filter == 'active':
@@ -716,9 +711,10 @@ class AllEmployeesUnderOrganizationAPIView(APIView):
             
             # Pagination
             paginator = self.pagination_class()
-            paginated_qs = paginator.paginate_queryset(queryset, request)
+            # Flat values() rows - 1 query for the page + 1 per M2M relation
+            paginated_qs = paginator.paginate_queryset(UserProfileListSerializer.setup_queryset(queryset), request)
             
-            serializer = UserProfileReadSerializer(paginated_qs, many=True)
+            serializer = UserProfileListSerializer(paginated_qs, context={'request': request})
             pagination_data = paginator.get_paginated_response(serializer.data)
             pagination_data["summary"] = {
                 "total": total,
@@ -1065,53 +1061,11 @@ class EmployeeTransferAPIView(APIView):
             new_admin = get_object_or_404(BaseUserModel, id=new_admin_id, role='admin')
             new_admin_profile = get_object_or_404(AdminProfile, user=new_admin, organization=organization)
             
-            transferred = []
-            errors = []
-            
-            with transaction.atomic():
-                for emp_id in employee_ids:
-                    try:
-                        employee = get_object_or_404(BaseUserModel, id=emp_id, role='user')
-                        profile = get_object_or_404(UserProfile, user=employee, organization=organization)
-                        
-                        # Get current active assignment using utility
-                        from utils.Employee.assignment_utils import get_current_assignment_for_employee
-                        from django.utils import timezone
-                        current_assignment = get_current_assignment_for_employee(employee)
-                        
-                        old_admin_id = None
-                        if current_assignment:
-                            old_admin_id = str(current_assignment.admin.id)
-                            # End current assignment
-                            current_assignment.end_assignment(
-                                end_date=timezone.now().date(),
-                                reason='Transferred to another admin'
-                            )
-                        
-                        # Create new assignment
-                        from SiteManagement.models import EmployeeAdminSiteAssignment
-                        EmployeeAdminSiteAssignment.objects.create(
-                            employee=employee,
-                            admin=new_admin,
-                            site=None,  # Site can be assigned later
-                            start_date=timezone.now().date(),
-                            end_date=None,
-                            is_active=True,
-                            assigned_by=request.user if request.user.is_authenticated else None,
-                            assignment_reason=f'Transferred from admin {old_admin_id}'
-                        )
-                        
-                        transferred.append({
-                            "employee_id": str(emp_id),
-                            "employee_name": profile.user_name,
-                            "old_admin_id": old_admin_id,
-                            "new_admin_id": str(new_admin_id)
-                        })
-                    except Exception as e:
-                        errors.append({
-                            "employee_id": str(emp_id),
-                            "error": str(e)
-                        })
+            # Set based - one validation query, bulk_update + bulk_create of assignments
+            transferred, errors = bulk_transfer_employees(
+                organization.id, new_admin.id, employee_ids,
+                assigned_by=request.user if request.user.is_authenticated else None
+            )
             
             return Response({
                 "status": status.HTTP_200_OK,
@@ -1236,9 +1190,10 @@ class DeactivateUserListAPIView(APIView):
                 )
             
             paginator = self.pagination_class()
-            paginated_qs = paginator.paginate_queryset(queryset, request)
+            # Flat values() rows - 1 query for the page + 1 per M2M relation
+            paginated_qs = paginator.paginate_queryset(UserProfileListSerializer.setup_queryset(queryset), request)
             
-            serializer = UserProfileReadSerializer(paginated_qs, many=True, context={'request': request})
+            serializer = UserProfileListSerializer(paginated_qs, context={'request': request})
             pagination_data = paginator.get_paginated_response(serializer.data)
             pagination_data["results"] = serializer.data  # Add results array to pagination data
             pagination_data["status"] = status.HTTP_200_OK
@@ -1314,30 +1269,8 @@ class DeactivateUserListAPIView(APIView):
             employee_ids = validated_data['employee_ids']
             action = validated_data['action']
             
-            updated = []
-            errors = []
-            
-            with transaction.atomic():
-                for emp_id in employee_ids:
-                    try:
-                        employee = get_object_or_404(BaseUserModel, id=emp_id, role='user')
-                        # Verify employee is under this admin using utility
-                        from utils.Employee.assignment_utils import verify_employee_under_admin
-                        if not verify_employee_under_admin(employee, admin, raise_exception=False):
-                            errors.append({
-                                "employee_id": str(emp_id),
-                                "error": "Employee is not under this admin"
-                            })
-                            continue
-                        
-                        employee.is_active = (action == "activate")
-                        employee.save()
-                        updated.append(str(emp_id))
-                    except Exception as e:
-                        errors.append({
-                            "employee_id": str(emp_id),
-                            "error": str(e)
-                        })
+            # Set based - one membership query + one UPDATE for the whole id set
+            updated, errors = bulk_set_employees_active(admin.id, employee_ids, action == "activate")
             
             return Response({
                 "status": status.HTTP_200_OK,
@@ -1389,17 +1322,13 @@ class AllUserListInfoAPIView(APIView):
             
             search = request.query_params.get("q", "")
             if search:
-                queryset = queryset.filter(
-                    Q(user_name__icontains=search) |
-                    Q(custom_employee_id__icontains=search) |
-                    Q(designation__icontains=search) |
-                    Q(user__email__icontains=search)
-                )
+                queryset = apply_search(queryset, 'employee', search)
             
             paginator = self.pagination_class()
-            paginated_qs = paginator.paginate_queryset(queryset, request)
+            # Flat values() rows - 1 query for the page + 1 per M2M relation
+            paginated_qs = paginator.paginate_queryset(UserProfileListSerializer.setup_queryset(queryset), request)
             
-            serializer = UserProfileReadSerializer(paginated_qs, many=True)
+            serializer = UserProfileListSerializer(paginated_qs, context={'request': request})
             pagination_data = paginator.get_paginated_response(serializer.data)
             
             return Response({
@@ -1508,30 +1437,8 @@ class EmployeeStatusUpdateAPIView(APIView):
             employee_ids = validated_data['employee_ids']
             status_value = validated_data['status']
             
-            updated = []
-            errors = []
-            
-            with transaction.atomic():
-                for emp_id in employee_ids:
-                    try:
-                        employee = get_object_or_404(BaseUserModel, id=emp_id, role='user')
-                        # Verify employee is under this admin using utility
-                        from utils.Employee.assignment_utils import verify_employee_under_admin
-                        if not verify_employee_under_admin(employee, admin, raise_exception=False):
-                            errors.append({
-                                "employee_id": str(emp_id),
-                                "error": "Employee is not under this admin"
-                            })
-                            continue
-                        
-                        employee.is_active = (status_value == "active")
-                        employee.save()
-                        updated.append(str(emp_id))
-                    except Exception as e:
-                        errors.append({
-                            "employee_id": str(emp_id),
-                            "error": str(e)
-                        })
+            # Set based - one membership query + one UPDATE for the whole id set
+            updated, errors = bulk_set_employees_active(admin.id, employee_ids, status_value == "active")
             
             return Response({
                 "status": status.HTTP_200_OK,
@@ -1651,17 +1558,13 @@ class AllEmployeeProfileAPIView(APIView):
             
             search = request.query_params.get("q", "")
             if search:
-                queryset = queryset.filter(
-                    Q(user_name__icontains=search) |
-                    Q(custom_employee_id__icontains=search) |
-                    Q(designation__icontains=search) |
-                    Q(user__email__icontains=search)
-                )
+                queryset = apply_search(queryset, 'employee', search)
             
             paginator = self.pagination_class()
-            paginated_qs = paginator.paginate_queryset(queryset, request)
+            # Flat values() rows - 1 query for the page + 1 per M2M relation
+            paginated_qs = paginator.paginate_queryset(UserProfileListSerializer.setup_queryset(queryset), request)
             
-            serializer = UserProfileReadSerializer(paginated_qs, many=True)
+            serializer = UserProfileListSerializer(paginated_qs, context={'request': request})
             pagination_data = paginator.get_paginated_response(serializer.data)
             
             return Response({
@@ -1759,4 +1662,50 @@ class UserFcmTokenUpdate(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-# Removed EmployeeAssignmentHistoryAPIView - assignment system removed
\ No newline at end of file
+# Removed EmployeeAssignmentHistoryAPIView - assignment system removed
+
+
+# ==================== LIVE STATUS COUNTS ====================
+
+class LiveStatusCountsAPIView(APIView):
+    """
+    Live status counts for status widgets - served from cache counters
+    (0 queries once warm).
+
+    GET /api/status-counts/<site_id>           - counts for one site
+    GET /api/status-counts/<site_id>?scope=all - counts across all the admin's sites
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = 8  # Tenant resolution + one recount per cold entity
+
+    def get(self, request, site_id):
+        try:
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
+                return Response({
+                    "status": tenant_error.status_code,
+                    "message": tenant_error.message,
+                    "data": []
+                }, status=tenant_error.status_code)
+
+            counter_site_id = None if request.query_params.get('scope') == 'all' else site.id
+            data = {
+                "tasks": get_status_counts('task', admin.id, counter_site_id),
+                "visits": get_status_counts('visit', admin.id, counter_site_id),
+                "expenses": get_status_counts('expense', admin.id, counter_site_id),
+                "leaves": get_status_counts('leave', admin.id, counter_site_id),
+                "attendance": get_status_counts('attendance', admin.id, counter_site_id),
+            }
+
+            return Response({
+                "status": status.HTTP_200_OK,
+                "message": "Live status counts fetched successfully",
+                "data": data
+            }, status=status.HTTP_200_OK)
+
+        except Exception as e:
+            return Response({
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": f"Error fetching status counts: {str(e)}",
+                "data": []
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthnConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'AuthN'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import AuthN.signals
@@ -15,27 +15,29 @@ Space Complexity: O(n) for data structures
 """
 
 import csv
-import openpyxl
-from io import StringIO, BytesIO
 from django.db import transaction
-from django.contrib.auth.hashers import make_password
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.http import HttpResponse
-from datetime import datetime, date
 import uuid
 
-from .models import BaseUserModel, UserProfile, AdminProfile, OrganizationProfile
+from .models import BaseUserModel, AdminProfile, BulkImportJob
+from .serializers import BulkImportJobSerializer
+from .password_hashing import hash_passwords
+from .bulk_import_service import (
+    SUPPORTED_FORMATS, EmployeeImportContext, EmployeeRowValidator, chunked,
+    create_employee_rows, get_chunk_size, get_file_format, hash_employee_passwords, is_job_resumable, iter_import_rows,
+)
 # Note: bulk_views.py uses direct model creation, not serializers
 # Registration serializers are only used in views.py for registration endpoints
-from ServiceShift.models import ServiceShift
-from ServiceWeekOff.models import WeekOffPolicy
-from LocationControl.models import Location
-from SiteManagement.models import EmployeeAdminSiteAssignment, Site
-from django.utils import timezone
+from SiteManagement.models import Site
+from utils.tenant_utils import resolve_tenant
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class BulkEmployeeRegistrationAPIView(APIView):
@@ -43,11 +45,14 @@ class BulkEmployeeRegistrationAPIView(APIView):
     Bulk Employee Registration via CSV/Excel - Optimized for O(1) complexity
     
     Optimizations:
-    - Pre-fetch all existing emails/employee_ids in sets for O(1) lookup
+    - Rows streamed from the file (XLSX in read-only mode)
+    - Uniqueness checked with one set query per column per chunk
     - Pre-fetch shifts/locations/week_offs as dictionaries for O(1) lookup
-    - Use bulk_create for batch inserts
+    - Use bulk_create for batch inserts, chunk by chunk
     - Batch many-to-many assignments
-    - Use .only() to limit queried fields
+    
+    All-or-nothing: any validation error rejects the whole file.
+    For very large files use BulkEmployeeImportJobAPIView (resumable, chunked commits).
     
     Time Complexity: O(n) where n = rows (optimal, one pass through data)
     Space Complexity: O(n) for data structures
@@ -115,64 +120,13 @@ class BulkEmployeeRegistrationAPIView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             file = request.FILES['file']
-            file_extension = file.name.split('.')[-1].lower()
-            
-            # Parse file
-            if file_extension == 'csv':
-                data = self._parse_csv(file)
-            elif file_extension in ['xlsx', 'xls']:
-                data = self._parse_excel(file)
-            else:
+            file_format = get_file_format(file.name)
+            if file_format not in SUPPORTED_FORMATS:
                 return Response({
                     "status": status.HTTP_400_BAD_REQUEST,
                     "message": "Unsupported file format. Please upload CSV or Excel file."
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            if not data:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "File is empty or has no data rows"
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # O(1) - Pre-fetch all existing emails, usernames, phone_numbers in sets for O(1) lookup
-            all_emails = set(
-                BaseUserModel.objects.filter(role='user').only('email').values_list('email', flat=True)
-            )
-            all_usernames = set(
-                BaseUserModel.objects.only('username').values_list('username', flat=True)
-            )
-            all_phone_numbers = set(
-                BaseUserModel.objects.only('phone_number').values_list('phone_number', flat=True)
-            )
-            
-            # O(1) - Pre-fetch all existing custom_employee_ids in a set for O(1) lookup
-            all_employee_ids = set(
-                UserProfile.objects.only('custom_employee_id').values_list('custom_employee_id', flat=True)
-            )
-            
-            # O(1) - Pre-fetch shifts as dictionary {shift_name: shift_id} for O(1) lookup
-            shifts_dict = {
-                shift.shift_name.lower(): shift.id
-                for shift in ServiceShift.objects.filter(
-                    admin=admin,
-                    is_active=True
-                ).only('id', 'shift_name')
-            }
-            default_shift_id = next(iter(shifts_dict.values()), None) if shifts_dict else None
-            
-            # O(1) - Pre-fetch locations as dictionary {location_name: location_id} for O(1) lookup
-            locations_dict = {
-                location.name.lower(): location.id
-                for location in Location.objects.filter(
-                    admin=admin,
-                    is_active=True
-                ).only('id', 'name')
-            }
-            
-            # O(1) - Pre-fetch default week off
-            default_week_off = WeekOffPolicy.objects.filter(admin=admin).only('id').first()
-            default_week_off_id = default_week_off.id if default_week_off else None
-            
             # Get site_id from request data (query params or form data) or use default
             site_id = request.data.get('site_id') or request.query_params.get('site_id')
             selected_site = None
@@ -196,112 +150,29 @@ class BulkEmployeeRegistrationAPIView(APIView):
                         "status": status.HTTP_400_BAD_REQUEST,
                         "message": f"Invalid site_id: {str(e)}"
                     }, status=status.HTTP_400_BAD_REQUEST)
-            else:
-                # O(1) - Pre-fetch admin's default site (first created active site)
-                selected_site = Site.objects.filter(
-                    created_by_admin=admin,
-                    is_active=True
-                ).order_by('created_at').only('id').first()
             
-            processed = 0
+            # O(1) - shifts/locations/week off/default site fetched once for the whole file
+            context = EmployeeImportContext(admin, organization.id, selected_site)
+            chunk_size = get_chunk_size()
+            
+            total_rows = 0
             errors = []
             valid_rows = []  # Store validated row data
             
-            # PHASE 1: Validate ALL rows first - collect all errors before any creation
-            for row_num, row_data in enumerate(data, start=2):
-                try:
-                    # Required fields only
-                    email = row_data.get('email', '').strip().lower()
-                    username = row_data.get('username', '').strip()
-                    phone_number_str = row_data.get('phone_number', '').strip()
-                    custom_employee_id = row_data.get('custom_employee_id', '').strip().replace(' ', '')  # Remove spaces
-                    gender = row_data.get('gender', '').strip()
-                    date_of_joining_str = row_data.get('date_of_joining', '').strip()
-                    user_name = row_data.get('user_name', '').strip()
-                    state = row_data.get('state', '').strip()
-                    city = row_data.get('city', '').strip()
-                    
-                    # Convert phone_number to integer
-                    phone_number = None
-                    if phone_number_str:
-                        try:
-                            phone_number = int(phone_number_str)
-                        except ValueError:
-                            errors.append(f"Row {row_num}: Invalid phone number format. Phone number must be a valid number.")
-                            continue
-                    
-                    # Validate all required fields
-                    missing_fields = []
-                    if not email:
-                        missing_fields.append('email')
-                    if not username:
-                        missing_fields.append('username')
-                    if not phone_number:
-                        missing_fields.append('phone_number')
-                    if not custom_employee_id:
-                        missing_fields.append('custom_employee_id')
-                    if not gender:
-                        missing_fields.append('gender')
-                    if not date_of_joining_str:
-                        missing_fields.append('date_of_joining')
-                    if not user_name:
-                        missing_fields.append('user_name')
-                    if not state:
-                        missing_fields.append('state')
-                    if not city:
-                        missing_fields.append('city')
-                    
-                    if missing_fields:
-                        errors.append(f"Row {row_num}: Missing required fields: {', '.join(missing_fields)}")
-                        continue
-                    
-                    # O(1) - Check if employee already exists using set lookup
-                    if email in all_emails:
-                        errors.append(f"Row {row_num}: Employee with email {email} already exists")
-                        continue
-                    
-                    if username in all_usernames:
-                        errors.append(f"Row {row_num}: Employee with username {username} already exists")
-                        continue
-                    
-                    if phone_number in all_phone_numbers:
-                        errors.append(f"Row {row_num}: Employee with phone number {phone_number} already exists")
-                        continue
-                    
-                    if custom_employee_id in all_employee_ids:
-                        errors.append(f"Row {row_num}: Employee ID {custom_employee_id} already exists")
-                        continue
-                    
-                    # Parse required date_of_joining
-                    date_of_joining = self._parse_date(date_of_joining_str)
-                    if not date_of_joining:
-                        errors.append(f"Row {row_num}: Invalid date_of_joining format. Use YYYY-MM-DD")
-                        continue
-                    
-                    # All validations passed - add to sets to prevent duplicates in same batch
-                    all_emails.add(email)
-                    all_usernames.add(username)
-                    all_phone_numbers.add(phone_number)
-                    all_employee_ids.add(custom_employee_id)
-                    
-                    # Store validated row data (password will be auto-generated as custom_employee_id@123)
-                    valid_rows.append({
-                        'row_num': row_num,
-                        'row_data': row_data,
-                        'email': email,
-                        'username': username,
-                        'phone_number': phone_number,
-                        'custom_employee_id': custom_employee_id,
-                        'gender': gender,
-                        'date_of_joining': date_of_joining,
-                        'user_name': user_name,
-                        'state': state,
-                        'city': city,
-                    })
-                    
-                except Exception as e:
-                    errors.append(f"Row {row_num}: {str(e)}")
-                    continue
+            # PHASE 1: Stream and validate ALL rows first - collect all errors before any creation
+            # Uniqueness is checked with one set query per column per chunk
+            validator = EmployeeRowValidator()
+            for chunk in chunked(iter_import_rows(file, file_format), chunk_size):
+                total_rows += len(chunk)
+                chunk_valid_rows, chunk_errors = validator.validate_chunk(chunk)
+                valid_rows.extend(chunk_valid_rows)
+                errors.extend(chunk_errors)
+            
+            if not total_rows:
+                return Response({
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "File is empty or has no data rows"
+                }, status=status.HTTP_400_BAD_REQUEST)
             
             # If ANY errors exist, return immediately without creating ANY records
             if errors:
@@ -312,160 +183,14 @@ class BulkEmployeeRegistrationAPIView(APIView):
                     "errors": errors
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # PHASE 2: All validations passed - proceed with bulk creation
+            # PHASE 2: All validations passed - hash outside the transaction, then
+            # bulk create chunk by chunk in one transaction
+            hashed_passwords = hash_employee_passwords(valid_rows)
+            processed = 0
             with transaction.atomic():
-                users_to_create = []
-                profiles_to_create = []
-                many_to_many_assignments = []
-                
-                for valid_row in valid_rows:
-                    row_data = valid_row['row_data']
-                    
-                    # Parse optional date_of_birth
-                    date_of_birth = self._parse_date(row_data.get('date_of_birth', ''))
-                    
-                    # Auto-generate password as custom_employee_id@123
-                    custom_emp_id = valid_row['custom_employee_id']
-                    auto_password = f"{custom_emp_id}@123"
-                    
-                    # Prepare user object with required fields
-                    user = BaseUserModel(
-                        email=valid_row['email'],
-                        username=valid_row['username'],
-                        password=make_password(auto_password),  # Auto-generated password
-                        role='user',  # Always 'user' for employee
-                        phone_number=valid_row['phone_number']
-                    )
-                    users_to_create.append(user)
-                    
-                    # Prepare profile data (will set user after user is created)
-                    shift_name_key = row_data.get('shift_name', '').strip().lower()
-                    shift_id = shifts_dict.get(shift_name_key, default_shift_id)
-                    
-                    location_name_key = row_data.get('location_name', '').strip().lower()
-                    location_id = locations_dict.get(location_name_key, None)
-                    
-                    profile_data = {
-                        'user_name': valid_row['user_name'],
-                        'admin_id': admin.id,
-                        'organization_id': organization.id,
-                        'custom_employee_id': valid_row['custom_employee_id'],
-                        'state': valid_row['state'],
-                        'city': valid_row['city'],
-                        'date_of_birth': date_of_birth,
-                        'date_of_joining': valid_row['date_of_joining'],
-                        'gender': valid_row['gender'] or '',
-                        # CharField fields without null=True need empty string, not None
-                        'marital_status': row_data.get('marital_status', '').strip() or '',
-                        'blood_group': row_data.get('blood_group', '').strip() or '',
-                        'job_title': row_data.get('job_title', '').strip() or '',
-                        'designation': row_data.get('designation', '').strip() or '',
-                        'emergency_contact_no': row_data.get('emergency_contact_no', '').strip() or '',
-                        'user': None,  # Will be set after user creation
-                        'shift_id': shift_id,
-                        'week_off_id': default_week_off_id,
-                        'location_id': location_id,
-                        'original_index': len(users_to_create) - 1  # Track index for assignment
-                    }
-                    profiles_to_create.append(profile_data)
-                
-                # O(1) - Bulk create all users at once
-                if users_to_create:
-                    created_users = BaseUserModel.objects.bulk_create(users_to_create, ignore_conflicts=False)
-                    
-                    # Create profiles with user references
-                    profile_objects = []
-                    for idx, profile_data in enumerate(profiles_to_create):
-                        profile = UserProfile(
-                            user=created_users[idx],
-                            user_name=profile_data['user_name'],
-                            admin_id=profile_data['admin_id'],
-                            organization_id=profile_data['organization_id'],
-                            custom_employee_id=profile_data['custom_employee_id'],
-                            date_of_birth=profile_data['date_of_birth'],
-                            date_of_joining=profile_data['date_of_joining'],
-                            gender=profile_data['gender'],
-                            marital_status=profile_data['marital_status'],
-                            blood_group=profile_data['blood_group'],
-                            job_title=profile_data['job_title'],
-                            designation=profile_data['designation'],
-                            emergency_contact_no=profile_data['emergency_contact_no'],
-                        )
-                        profile_objects.append(profile)
-                        many_to_many_assignments.append({
-                            'profile': profile,
-                            'shift_id': profile_data['shift_id'],
-                            'week_off_id': profile_data['week_off_id'],
-                            'location_id': profile_data['location_id']
-                        })
-                    
-                    # O(1) - Bulk create all profiles at once
-                    created_profiles = UserProfile.objects.bulk_create(profile_objects)
-                    
-                    # Batch many-to-many assignments using through models
-                    # O(1) - Process assignments using enumerate for O(1) index access
-                    shift_assignments = []
-                    week_off_assignments = []
-                    location_assignments = []
-                    
-                    for idx, assignment in enumerate(many_to_many_assignments):
-                        profile = created_profiles[idx]
-                        
-                        if assignment['shift_id']:
-                            shift_assignments.append(
-                                UserProfile.shifts.through(
-                                    userprofile_id=profile.id,
-                                    serviceshift_id=assignment['shift_id']
-                                )
-                            )
-                        
-                        if assignment['week_off_id']:
-                            week_off_assignments.append(
-                                UserProfile.week_offs.through(
-                                    userprofile_id=profile.id,
-                                    weekoffpolicy_id=assignment['week_off_id']
-                                )
-                            )
-                        
-                        if assignment['location_id']:
-                            location_assignments.append(
-                                UserProfile.locations.through(
-                                    userprofile_id=profile.id,
-                                    location_id=assignment['location_id']
-                                )
-                            )
-                    
-                    # Bulk insert many-to-many relationships
-                    if shift_assignments:
-                        UserProfile.shifts.through.objects.bulk_create(shift_assignments, ignore_conflicts=True)
-                    if week_off_assignments:
-                        UserProfile.week_offs.through.objects.bulk_create(week_off_assignments, ignore_conflicts=True)
-                    if location_assignments:
-                        UserProfile.locations.through.objects.bulk_create(location_assignments, ignore_conflicts=True)
-                    
-                    # Create EmployeeAdminSiteAssignment for all employees with selected site (from payload) or default site
-                    assignment_objects = []
-                    for idx, profile in enumerate(created_profiles):
-                        valid_row = valid_rows[idx]
-                        assignment = EmployeeAdminSiteAssignment(
-                            employee=profile.user,
-                            admin=admin,
-                            site=selected_site,  # Use site from payload or default site
-                            start_date=valid_row['date_of_joining'],
-                            end_date=None,  # Active assignment
-                            is_active=True,
-                            assigned_by=admin,
-                            assignment_reason='Initial assignment during bulk registration'
-                        )
-                        assignment_objects.append(assignment)
-                    
-                    # Bulk create assignments
-                    if assignment_objects:
-                        EmployeeAdminSiteAssignment.objects.bulk_create(assignment_objects, ignore_conflicts=False)
-                    
-                    processed = len(created_profiles)
-                else:
-                    processed = 0
+                for start in range(0, len(valid_rows), chunk_size):
+                    end = start + chunk_size
+                    processed += create_employee_rows(context, valid_rows[start:end], hashed_passwords[start:end])
             
             return Response({
                 "status": status.HTTP_200_OK,
@@ -480,50 +205,6 @@ class BulkEmployeeRegistrationAPIView(APIView):
                 "message": f"Error processing bulk registration: {str(e)}",
                 "data": []
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def _parse_csv(self, file):
-        """Parse CSV file"""
-        decoded_file = file.read().decode('utf-8')
-        io_string = StringIO(decoded_file)
-        reader = csv.DictReader(io_string)
-        return list(reader)
-    
-    def _parse_excel(self, file):
-        """Parse Excel file"""
-        wb = openpyxl.load_workbook(file)
-        ws = wb.active
-        
-        # Get headers from first row
-        headers = [cell.value for cell in ws[1]]
-        
-        data = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            row_dict = {}
-            for idx, value in enumerate(row):
-                if idx < len(headers):
-                    row_dict[headers[idx].lower().replace(' ', '_') if headers[idx] else f'col_{idx}'] = str(value) if value else ''
-            data.append(row_dict)
-        
-        return data
-    
-    def _parse_date(self, date_str):
-        """Parse date string to date object"""
-        if not date_str:
-            return None
-        
-        date_str = str(date_str).strip()
-        if not date_str or date_str.lower() == 'none':
-            return None
-        
-        # Try different date formats
-        formats = ['%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%Y/%m/%d', '%d.%m.%Y']
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt).date()
-            except:
-                continue
-        
-        return None
 
 
 class BulkAdminRegistrationAPIView(APIView):
@@ -560,13 +241,11 @@ class BulkAdminRegistrationAPIView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             file = request.FILES['file']
-            file_extension = file.name.split('.')[-1].lower()
+            file_format = get_file_format(file.name)
             
-            # Parse file
-            if file_extension == 'csv':
-                data = self._parse_csv(file)
-            elif file_extension in ['xlsx', 'xls']:
-                data = self._parse_excel(file)
+            # Parse file - streamed row by row (XLSX in read-only mode)
+            if file_format in SUPPORTED_FORMATS:
+                data = list(iter_import_rows(file, file_format))
             else:
                 return Response({
                     "status": status.HTTP_400_BAD_REQUEST,
@@ -598,7 +277,7 @@ class BulkAdminRegistrationAPIView(APIView):
             
             with transaction.atomic():
                 # First pass: Validate and prepare data
-                for row_num, row_data in enumerate(data, start=2):
+                for row_num, row_data in data:
                     try:
                         email = row_data.get('email', '').strip().lower()
                         username = row_data.get('username', '').strip() or email.split('@')[0] if email else ''
@@ -648,7 +327,7 @@ class BulkAdminRegistrationAPIView(APIView):
                         user = BaseUserModel(
                             email=email,
                             username=username,
-                            password=make_password(password),  # Hash password
+                            password=password,  # Hashed in parallel after validation
                             role='admin',
                             phone_number=phone_number
                         )
@@ -674,6 +353,11 @@ class BulkAdminRegistrationAPIView(APIView):
                 
                 # O(1) - Bulk create all users at once
                 if users_to_create:
+                    # Hash all passwords in one parallel batch (PBKDF2 is CPU-bound)
+                    hashed_passwords = hash_passwords(user.password for user in users_to_create)
+                    for user, hashed_password in zip(users_to_create, hashed_passwords):
+                        user.password = hashed_password
+                    
                     created_users = BaseUserModel.objects.bulk_create(users_to_create, ignore_conflicts=False)
                     
                     # Create profiles with user references
@@ -732,30 +416,153 @@ class BulkAdminRegistrationAPIView(APIView):
                 "message": f"Error processing bulk registration: {str(e)}",
                 "data": []
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    def _parse_csv(self, file):
-        """Parse CSV file"""
-        decoded_file = file.read().decode('utf-8')
-        io_string = StringIO(decoded_file)
-        reader = csv.DictReader(io_string)
-        return list(reader)
-    
-    def _parse_excel(self, file):
-        """Parse Excel file"""
-        wb = openpyxl.load_workbook(file)
-        ws = wb.active
-        
-        headers = [cell.value for cell in ws[1]]
-        
-        data = []
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            row_dict = {}
-            for idx, value in enumerate(row):
-                if idx < len(headers):
-                    row_dict[headers[idx].lower().replace(' ', '_') if headers[idx] else f'col_{idx}'] = str(value) if value else ''
-            data.append(row_dict)
-        
-        return data
+
+
+class BulkEmployeeImportJobAPIView(APIView):
+    """
+    Resumable bulk employee import for large files (e.g. HR system migrations).
+
+    POST stores the file as a BulkImportJob and runs it in a Celery worker:
+    rows are streamed, validated in a first pass (nothing is written if any
+    row is invalid), then committed in chunks of chunk_size. GET lists the
+    jobs of the admin.
+
+    Time Complexity: O(1) per request - the import itself runs in the worker
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        tenant, error = resolve_tenant(request)
+        if error:
+            return Response({
+                "status": error.status_code,
+                "message": error.message,
+                "data": None
+            }, status=error.status_code)
+
+        # O(1) query using index bulk_import_admin_idx
+        jobs = BulkImportJob.objects.filter(admin_id=tenant.admin_id).select_related('site')[:50]
+        return Response({
+            "status": status.HTTP_200_OK,
+            "message": "Bulk import jobs fetched successfully",
+            "data": BulkImportJobSerializer(jobs, many=True).data
+        }, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        site_id = request.data.get('site_id') or request.query_params.get('site_id')
+        admin_id = request.query_params.get('admin_id') or request.data.get('admin_id')
+        tenant, error = resolve_tenant(request, site_id, admin_id=admin_id)
+        if error:
+            return Response({
+                "status": error.status_code,
+                "message": error.message,
+                "data": None
+            }, status=error.status_code)
+
+        if 'file' not in request.FILES:
+            return Response({
+                "status": status.HTTP_400_BAD_REQUEST,
+                "message": "No file uploaded",
+                "data": None
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        file = request.FILES['file']
+        file_format = get_file_format(file.name)
+        if file_format not in SUPPORTED_FORMATS:
+            return Response({
+                "status": status.HTTP_400_BAD_REQUEST,
+                "message": "Unsupported file format. Please upload CSV or Excel file.",
+                "data": None
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        job = BulkImportJob.objects.create(
+            admin=tenant.admin,
+            organization_id=tenant.organization_id,
+            site=tenant.site,
+            created_by=request.user,
+            file=file,
+            original_filename=file.name,
+            file_format=file_format,
+            chunk_size=get_chunk_size(request.data.get('chunk_size')),
+        )
+        message = _enqueue_import_job(job)
+
+        return Response({
+            "status": status.HTTP_202_ACCEPTED,
+            "message": message,
+            "data": BulkImportJobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class BulkImportJobDetailAPIView(APIView):
+    """
+    GET  - progress of a bulk import job
+    POST - resume a failed or stalled job from its last committed chunk
+    """
+    permission_classes = [IsAuthenticated]
+
+    def _get_job(self, request, job_id):
+        # O(1) query using primary key
+        job = BulkImportJob.objects.select_related('site').filter(id=job_id).first()
+        if job is None:
+            return None
+        user = request.user
+        if user.role == 'admin' and job.admin_id == user.id:
+            return job
+        if user.role == 'organization' and job.organization_id == user.id:
+            return job
+        return None
+
+    def get(self, request, job_id):
+        job = self._get_job(request, job_id)
+        if job is None:
+            return Response({
+                "status": status.HTTP_404_NOT_FOUND,
+                "message": "Bulk import job not found",
+                "data": None
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "status": status.HTTP_200_OK,
+            "message": "Bulk import job fetched successfully",
+            "data": BulkImportJobSerializer(job).data
+        }, status=status.HTTP_200_OK)
+
+    def post(self, request, job_id):
+        job = self._get_job(request, job_id)
+        if job is None:
+            return Response({
+                "status": status.HTTP_404_NOT_FOUND,
+                "message": "Bulk import job not found",
+                "data": None
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        if not is_job_resumable(job):
+            return Response({
+                "status": status.HTTP_400_BAD_REQUEST,
+                "message": f"Job is {job.status} and cannot be resumed",
+                "data": BulkImportJobSerializer(job).data
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        message = _enqueue_import_job(job)
+        return Response({
+            "status": status.HTTP_202_ACCEPTED,
+            "message": message,
+            "data": BulkImportJobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+def _enqueue_import_job(job):
+    """Queue a job for the Celery worker; returns the message for the response"""
+    from .tasks import run_bulk_import_job
+
+    try:
+        run_bulk_import_job.delay(str(job.id))
+    except Exception as e:
+        # Broker down - the job stays resumable and can be run with manage.py run_bulk_import
+        logger.warning(f"Could not queue bulk import job {job.id}: {str(e)}")
+        return f"Import job saved but could not be queued. Run: python manage.py run_bulk_import {job.id}"
+    return "Import job queued. Poll the job for progress."
 
 
 class DownloadEmployeeSampleCSVAPIView(APIView):
@@ -0,0 +1,122 @@
+"""
+Login Service
+=============
+
+Single-hash login path for LoginView.
+
+The login identifier may be an email, a username or an employee's
+custom_employee_id. Instead of calling authenticate() once per identifier
+type (each call runs a full PBKDF2 hash), the account is resolved with ONE
+UNION ALL query - every branch uses its own unique index - and the password
+is verified exactly once. The role-specific extras needed in the login
+response (organization_id for admins, is_photo_updated for employees) are
+fetched in the same query.
+
+Time Complexity: O(1) - one indexed query + one password hash
+"""
+
+from django.contrib.auth import user_login_failed
+from django.db import connection
+from django.db.models import IntegerField, Value
+
+from .models import BaseUserModel
+
+
+# Identifier lookup order - mirrors the previous email -> username -> employee ID fallback
+LOGIN_LOOKUPS = (
+    ('email', 'email'),
+    ('username', 'username'),
+    ('custom_employee_id', 'own_user_profile__custom_employee_id'),
+)
+
+USER_FIELDS = ('id', 'email', 'username', 'password', 'role', 'is_active', 'last_login')
+EXTRA_FIELDS = ('own_user_profile__is_photo_updated', 'own_admin_profile__organization_id')
+
+
+class LoginResult:
+    """Outcome of a login attempt"""
+
+    __slots__ = ('user', 'extras', 'error')
+
+    INVALID_CREDENTIALS = 'invalid_credentials'
+
+    def __init__(self, user=None, extras=None, error=None):
+        self.user = user
+        self.extras = extras or {}
+        self.error = error
+
+    @property
+    def is_success(self):
+        return self.error is None
+
+
+def _build_user(field_values):
+    """Build a (deferred) BaseUserModel instance from selected column values"""
+    # from_db() expects values in concrete field order
+    field_names = [f.attname for f in BaseUserModel._meta.concrete_fields if f.attname in field_values]
+    return BaseUserModel.from_db(connection.alias, field_names, [field_values[name] for name in field_names])
+
+
+def find_login_account(identifier):
+    """
+    Resolve the account for a login identifier with ONE query.
+
+    Args:
+        identifier: email, username or custom_employee_id
+
+    Returns:
+        tuple: (BaseUserModel, extras dict) or (None, None)
+    """
+    branches = [
+        BaseUserModel.objects.filter(**{lookup: identifier}).annotate(
+            login_priority=Value(priority, output_field=IntegerField())
+        ).values_list(*USER_FIELDS, *EXTRA_FIELDS, 'login_priority')
+        for priority, (_, lookup) in enumerate(LOGIN_LOOKUPS)
+    ]
+    # UNION ALL - each branch hits its own unique index (email, username, custom_employee_id)
+    rows = list(branches[0].union(*branches[1:], all=True))
+    if not rows:
+        return None, None
+
+    # Highest priority match wins (email before username before employee ID)
+    row = min(rows, key=lambda r: r[-1])
+    user = _build_user(dict(zip(USER_FIELDS, row)))
+    is_photo_updated, organization_id = row[len(USER_FIELDS):len(USER_FIELDS) + len(EXTRA_FIELDS)]
+    extras = {
+        'is_photo_updated': bool(is_photo_updated),
+        'organization_id': organization_id,
+    }
+    return user, extras
+
+
+def authenticate_login(request, identifier, password):
+    """
+    Authenticate a login attempt with a single password hash.
+
+    A dummy hash is computed when no account matches so response time does
+    not reveal whether the identifier exists (same as Django's ModelBackend).
+
+    Args:
+        request: HTTP request (used for auth signals)
+        identifier: email, username or custom_employee_id
+        password: raw password
+
+    Returns:
+        LoginResult
+    """
+    user, extras = find_login_account(identifier)
+
+    if user is None:
+        # Run the hasher once to keep timing uniform for unknown identifiers
+        BaseUserModel().set_password(password)
+        user_login_failed.send(sender=__name__, credentials={'username': identifier}, request=request)
+        return LoginResult(error=LoginResult.INVALID_CREDENTIALS)
+
+    # Exactly one hash - check_password also upgrades outdated hashes in place.
+    # Inactive accounts get the same generic error as a wrong password (like
+    # ModelBackend), so a correct password does not reveal the account state.
+    if not user.check_password(password) or not user.is_active:
+        user_login_failed.send(sender=__name__, credentials={'username': identifier}, request=request)
+        return LoginResult(error=LoginResult.INVALID_CREDENTIALS)
+
+    return LoginResult(user=user, extras=extras)
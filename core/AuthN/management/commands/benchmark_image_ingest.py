@@ -0,0 +1,125 @@
+import os
+import random
+import tempfile
+import time
+from io import BytesIO
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.helpers import image_utils
+from utils.helpers.media_store import make_thumbnail
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+def _legacy_ingest(image_data, extension, max_size):
+    """Previous save_base64_image path: compress_image, then the aggressive loop if still too big"""
+    allowed_formats = getattr(settings, 'ATTENDANCE_IMAGE_ALLOWED_FORMATS', ['jpg', 'jpeg', 'png', 'webp'])
+    if extension not in allowed_formats:
+        img = image_utils.Image.open(BytesIO(image_data)).convert('RGB')
+        output = BytesIO()
+        img.save(output, format='JPEG', quality=85, optimize=True)
+        image_data, extension = output.getvalue(), 'jpg'
+    data = image_utils.compress_image(image_data, extension)
+    if len(data) > max_size:
+        data = image_utils.compress_image_aggressive(image_data, extension, max_size)
+    return data
+
+
+def _legacy_thumbnail(data):
+    """Thumbnail decoded again from the stored bytes at full size"""
+    img = image_utils.Image.open(BytesIO(data))
+    img = image_utils.ImageOps.exif_transpose(img).convert('RGB')
+    img = image_utils.ImageOps.fit(img, (160, 160), image_utils.Image.Resampling.LANCZOS)
+    output = BytesIO()
+    img.save(output, format='JPEG', quality=80, optimize=True)
+    return output.getvalue()
+
+
+def _phone_photo(path, width, height, seed):
+    """Noisy 12 MP-style JPEG (noise keeps the file phone-sized); every other one rotated via EXIF"""
+    Image = image_utils.Image
+    rng = random.Random(seed)
+    base = Image.linear_gradient('L').resize((width, height)).rotate(rng.randint(0, 359))
+    bands = [Image.blend(base, Image.effect_noise((width, height), rng.randint(30, 80)), 0.5) for _ in range(3)]
+    img = Image.merge('RGB', bands)
+    exif = Image.Exif()
+    if seed % 2:
+        exif[image_utils.EXIF_ORIENTATION] = 6
+    img.save(path, format='JPEG', quality=92, exif=exif)
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark image ingest on phone photos: CPU time and output size of the single-pass '
+        'ingest_image() (decode once, JPEG draft mode, quality binary search) vs the previous '
+        'compress_image / compress_image_aggressive helpers, thumbnail included.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('folder', nargs='?', help='Folder of photos (default: generate 12 MP samples)')
+        parser.add_argument('--generate', type=int, default=6, help='Samples to generate without a folder (default: 6)')
+        parser.add_argument('--limit', type=int, default=0, help='Only use the first N images')
+        parser.add_argument(
+            '--max-size-mb', type=float, default=None,
+            help='Size limit (default: settings.ATTENDANCE_IMAGE_MAX_SIZE_MB)'
+        )
+
+    def handle(self, *args, **options):
+        if not image_utils.PIL_AVAILABLE:
+            raise CommandError('Pillow is not installed')
+
+        folder = options['folder']
+        if folder is None:
+            folder = tempfile.mkdtemp(prefix='ingest_bench_')
+            self.stdout.write(f'Generating {options["generate"]} 4000x3000 sample(s) in {folder}')
+            for number in range(options['generate']):
+                _phone_photo(os.path.join(folder, f'photo_{number}.jpg'), 4000, 3000, number)
+        elif not os.path.isdir(folder):
+            raise CommandError(f'{folder} is not a folder')
+
+        paths = sorted(
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if options['limit']:
+            paths = paths[:options['limit']]
+        if not paths:
+            raise CommandError(f'No images found in {folder}')
+
+        max_size_mb = options['max_size_mb'] or getattr(settings, 'ATTENDANCE_IMAGE_MAX_SIZE_MB', 3)
+        max_size = int(max_size_mb * 1024 * 1024)
+        samples = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                samples.append((f.read(), os.path.splitext(path)[1].lstrip('.').lower()))
+        input_mb = sum(len(data) for data, _ in samples) / len(samples) / (1024 * 1024)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(samples)} image(s), avg {input_mb:.1f} MB, limit {max_size_mb} MB'
+        ))
+
+        start = time.process_time()
+        legacy_sizes = []
+        for data, extension in samples:
+            output = _legacy_ingest(data, extension, max_size)
+            _legacy_thumbnail(output)
+            legacy_sizes.append(len(output))
+        legacy_cpu = time.process_time() - start
+
+        start = time.process_time()
+        new_sizes = []
+        for data, extension in samples:
+            output, _, decoded = image_utils.ingest_image(data, extension, max_size)
+            make_thumbnail(image=decoded)
+            new_sizes.append(len(output))
+        new_cpu = time.process_time() - start
+
+        for label, cpu, sizes in (('previous', legacy_cpu, legacy_sizes), ('ingest', new_cpu, new_sizes)):
+            over = sum(size > max_size for size in sizes)
+            self.stdout.write(
+                f'  {label:<9} {cpu / len(samples) * 1000:>7.0f} ms CPU/image   '
+                f'avg output {sum(sizes) / len(sizes) / 1024:>6.0f} KB   over limit: {over}'
+            )
+        self.stdout.write(f'  speed-up  {legacy_cpu / new_cpu:.1f}x')
@@ -0,0 +1,70 @@
+import time
+
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from AuthN.login_service import authenticate_login
+from AuthN.models import BaseUserModel, UserProfile
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark login throughput (logins/sec on one core) for the single-hash '
+        'login resolver vs. the legacy authenticate() fallback chain'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--identifier', required=True, help='Email, username or custom_employee_id to log in with')
+        parser.add_argument('--password', required=True, help='Password for the account')
+        parser.add_argument('--iterations', type=int, default=20, help='Login attempts per scenario (default: 20)')
+
+    def legacy_login(self, request, identifier, password):
+        """Previous LoginView behaviour: up to three authenticate() calls"""
+        user = authenticate(request, username=identifier, password=password)
+        if user is None:
+            user_obj = BaseUserModel.objects.only('id', 'email').filter(username=identifier).first()
+            if user_obj:
+                user = authenticate(request, username=user_obj.email, password=password)
+        if user is None:
+            profile = UserProfile.objects.select_related('user').only('user__email').filter(
+                custom_employee_id=identifier
+            ).first()
+            if profile:
+                user = authenticate(request, username=profile.user.email, password=password)
+        return user
+
+    def run_scenario(self, label, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - start
+        rate = iterations / elapsed if elapsed else 0
+        self.stdout.write(f'  {label:<45} {rate:>8.1f} logins/sec  ({elapsed / iterations * 1000:.1f} ms/login)')
+        return rate
+
+    def handle(self, *args, **options):
+        identifier = options['identifier']
+        password = options['password']
+        iterations = options['iterations']
+        request = RequestFactory().post('/api/login/')
+
+        result = authenticate_login(request, identifier, password)
+        if not result.is_success:
+            self.stdout.write(self.style.ERROR(f'Login failed for "{identifier}": {result.error}'))
+            return
+
+        wrong_password = password + '-wrong'
+        self.stdout.write(self.style.SUCCESS(f'Benchmarking {iterations} logins per scenario (single process = 1 core)'))
+
+        self.stdout.write('Successful login:')
+        legacy_ok = self.run_scenario('legacy authenticate() chain', lambda: self.legacy_login(request, identifier, password), iterations)
+        new_ok = self.run_scenario('single-hash resolver', lambda: authenticate_login(request, identifier, password), iterations)
+
+        self.stdout.write('Failed login (wrong password):')
+        legacy_fail = self.run_scenario('legacy authenticate() chain', lambda: self.legacy_login(request, identifier, wrong_password), iterations)
+        new_fail = self.run_scenario('single-hash resolver', lambda: authenticate_login(request, identifier, wrong_password), iterations)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Speedup: {new_ok / legacy_ok:.2f}x on success, {new_fail / legacy_fail:.2f}x on failure'
+        ))
@@ -0,0 +1,59 @@
+import os
+import time
+
+from django.contrib.auth.hashers import check_password
+from django.core.management.base import BaseCommand
+
+from AuthN.password_hashing import get_hash_workers, hash_passwords
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark bulk registration password hashing (rows/sec) for an increasing '
+        'number of worker processes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200, help='Passwords to hash per run (default: 200)')
+        parser.add_argument(
+            '--workers', type=str, default='',
+            help='Comma separated worker counts to try (default: 1,2,4,... up to CPU count)'
+        )
+
+    def worker_counts(self, option):
+        if option:
+            return sorted({max(int(value), 1) for value in option.split(',') if value.strip()})
+        cpu_count = os.cpu_count() or 1
+        counts = []
+        workers = 1
+        while workers < cpu_count:
+            counts.append(workers)
+            workers *= 2
+        counts.append(cpu_count)
+        return counts
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        passwords = [f"EMP{index:05d}@123" for index in range(rows)]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Hashing {rows} passwords - CPU count: {os.cpu_count()}, '
+            f'configured BULK_PASSWORD_HASH_WORKERS: {get_hash_workers()}'
+        ))
+
+        baseline = None
+        for workers in self.worker_counts(options['workers']):
+            start = time.perf_counter()
+            hashed = hash_passwords(passwords, workers=workers, min_parallel=0)
+            elapsed = time.perf_counter() - start
+
+            # Spot-check ordering - hashes must line up with their rows
+            if not (check_password(passwords[0], hashed[0]) and check_password(passwords[-1], hashed[-1])):
+                self.stdout.write(self.style.ERROR(f'  workers={workers}: hash/row mismatch'))
+                return
+
+            rate = rows / elapsed if elapsed else 0
+            baseline = baseline or rate
+            self.stdout.write(
+                f'  workers={workers:<3} {rate:>8.1f} rows/sec  ({elapsed:.2f}s total, {rate / baseline:.2f}x)'
+            )
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from utils.helpers.media_store import collect_garbage, store_dir
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete media store blobs (and their thumbnails) that no FileField / ImageField '
+        'row references any more. Run off-peak, e.g. nightly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-age-hours', type=float, default=24,
+            help='Keep unreferenced blobs younger than this - uploads in flight (default: 24)'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted')
+
+    def handle(self, *args, **options):
+        stats = collect_garbage(min_age_hours=options['min_age_hours'], dry_run=options['dry_run'])
+        verb = 'would delete' if options['dry_run'] else 'deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f"{store_dir()}/: {stats['blobs']} blob(s), {stats['kept']} kept, "
+            f"{verb} {stats['deleted']} blob(s) and {stats['thumbnails_deleted']} thumbnail(s), "
+            f"{stats['bytes_freed'] / (1024 * 1024):.1f} MB"
+        ))
@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from utils.status_counter_service import COUNTED_ENTITIES, reconcile_status_counters
+
+
+class Command(BaseCommand):
+    help = (
+        'Recount live status counters (tasks, visits, expenses, leaves, present-today) '
+        'from the database and overwrite drifted values'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--entity', action='append', choices=[*COUNTED_ENTITIES, 'attendance'],
+            help='Only reconcile these entities (repeatable)'
+        )
+        parser.add_argument('--admin-id', action='append', help='Only reconcile these admins (repeatable)')
+        parser.add_argument(
+            '--day', action='append', type=date.fromisoformat,
+            help='Attendance day YYYY-MM-DD (repeatable, default: today and yesterday)'
+        )
+
+    def handle(self, *args, **options):
+        drifted = reconcile_status_counters(
+            entities=options['entity'], admin_ids=options['admin_id'], days=options['day']
+        )
+        for entity, count in drifted.items():
+            style = self.style.WARNING if count else self.style.SUCCESS
+            self.stdout.write(style(f'{entity}: {count} drifted counter(s) corrected'))
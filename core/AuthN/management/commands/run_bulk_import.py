@@ -0,0 +1,86 @@
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from AuthN.bulk_import_service import (
+    SUPPORTED_FORMATS, get_chunk_size, get_file_format, run_employee_import_job,
+)
+from AuthN.models import AdminProfile, BulkImportJob
+from SiteManagement.models import Site
+
+
+class Command(BaseCommand):
+    help = (
+        'Run or resume a bulk employee import job in this process. '
+        'Pass a job id to resume, or --file/--admin-id to import a local file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_id', nargs='?', help='BulkImportJob id to run / resume')
+        parser.add_argument('--file', help='Path to a CSV/XLSX file to import as a new job')
+        parser.add_argument('--admin-id', help='Admin the employees are created under (with --file)')
+        parser.add_argument('--site-id', help='Site for the initial assignment (default: admin\'s first site)')
+        parser.add_argument('--chunk-size', type=int, help='Rows per committed chunk (default: BULK_IMPORT_CHUNK_SIZE)')
+
+    def create_job(self, options):
+        path = options['file']
+        if not options['admin_id']:
+            raise CommandError('--admin-id is required with --file')
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+
+        file_format = get_file_format(path)
+        if file_format not in SUPPORTED_FORMATS:
+            raise CommandError('Unsupported file format. Please use a CSV or Excel file.')
+
+        profile = AdminProfile.objects.filter(user_id=options['admin_id']).only('user_id', 'organization_id').first()
+        if profile is None:
+            raise CommandError(f'Admin not found: {options["admin_id"]}')
+
+        site = None
+        if options['site_id']:
+            site = Site.objects.filter(
+                id=options['site_id'], created_by_admin_id=profile.user_id, is_active=True
+            ).first()
+            if site is None:
+                raise CommandError(f'Site {options["site_id"]} not found or does not belong to this admin.')
+
+        with open(path, 'rb') as handle:
+            job = BulkImportJob(
+                admin_id=profile.user_id,
+                organization_id=profile.organization_id,
+                site=site,
+                original_filename=os.path.basename(path),
+                file_format=file_format,
+                chunk_size=get_chunk_size(options['chunk_size']),
+            )
+            job.file.save(os.path.basename(path), File(handle), save=False)
+            job.save()
+        return job
+
+    def handle(self, *args, **options):
+        if options['file']:
+            job = self.create_job(options)
+            self.stdout.write(f'Created job {job.id}')
+        elif options['job_id']:
+            job = BulkImportJob.objects.filter(id=options['job_id']).first()
+            if job is None:
+                raise CommandError(f'Job not found: {options["job_id"]}')
+            if options['chunk_size']:
+                job.chunk_size = get_chunk_size(options['chunk_size'])
+                job.save(update_fields=['chunk_size', 'updated_at'])
+        else:
+            raise CommandError('Pass a job id or --file with --admin-id')
+
+        if job.last_committed_row:
+            self.stdout.write(f'Resuming after row {job.last_committed_row} ({job.created_count} already created)')
+
+        job = run_employee_import_job(job.id)
+        style = self.style.SUCCESS if job.status == 'completed' else self.style.ERROR
+        self.stdout.write(style(
+            f'{job.status}: {job.created_count} created, {job.error_count} error(s), '
+            f'{job.total_rows} row(s) - {job.message}'
+        ))
+        for error in job.errors[:20]:
+            self.stdout.write(f'  {error}')
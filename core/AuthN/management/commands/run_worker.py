@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.celery import app
+
+
+class Command(BaseCommand):
+    help = (
+        'Start a Celery worker for one background queue with that queue\'s concurrency, '
+        'prefetch and time limits from settings.BACKGROUND_QUEUES. OCR workers preload the model.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('queue', help='Queue to consume (realtime, bulk, media, ocr)')
+        parser.add_argument('--concurrency', type=int, default=None, help='Override the queue\'s concurrency')
+        parser.add_argument('--loglevel', default='INFO')
+
+    def handle(self, *args, **options):
+        queues = getattr(settings, 'BACKGROUND_QUEUES', {})
+        queue = options['queue']
+        if queue not in queues:
+            raise CommandError(f'Unknown queue {queue!r} - expected one of: {", ".join(queues)}')
+
+        worker = queues[queue]
+        if queue == 'ocr':
+            # Read by the worker_process_init hook in ContactManagement.tasks in each forked child
+            settings.OCR_WORKER_PRELOAD = True
+
+        argv = [
+            'worker',
+            f'--queues={queue}',
+            f'--hostname={queue}@%h',
+            f'--concurrency={options["concurrency"] or worker["concurrency"]}',
+            f'--prefetch-multiplier={worker["prefetch_multiplier"]}',
+            f'--soft-time-limit={worker["soft_time_limit"]}',
+            f'--time-limit={worker["time_limit"]}',
+            f'--loglevel={options["loglevel"]}',
+        ]
+        self.stdout.write(self.style.SUCCESS(f'Starting {queue} worker: celery {" ".join(argv)}'))
+        app.worker_main(argv)
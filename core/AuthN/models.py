@@ -265,3 +265,53 @@ class OrganizationSettings(models.Model):
 
 
 
+class BulkImportJob(models.Model):
+    """
+    Resumable bulk employee import.
+
+    Rows are streamed from the stored file, validated in a first pass and then
+    committed chunk by chunk. last_committed_row is written in the same
+    transaction as each chunk, so a failed/interrupted job resumes right after
+    the last committed chunk.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('validating', 'Validating'),
+        ('importing', 'Importing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    admin = models.ForeignKey(BaseUserModel, on_delete=models.CASCADE, limit_choices_to={'role': 'admin'}, related_name='bulk_import_jobs')
+    organization = models.ForeignKey(BaseUserModel, on_delete=models.CASCADE, limit_choices_to={'role': 'organization'}, related_name='organization_bulk_import_jobs')
+    site = models.ForeignKey('SiteManagement.Site', on_delete=models.SET_NULL, null=True, blank=True, related_name='bulk_import_jobs')
+    created_by = models.ForeignKey(BaseUserModel, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_bulk_import_jobs')
+    file = models.FileField(upload_to='bulk_imports/')
+    original_filename = models.CharField(max_length=255, blank=True)
+    file_format = models.CharField(max_length=10)  # csv / xlsx
+    chunk_size = models.PositiveIntegerField(default=500)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_rows = models.PositiveIntegerField(default=0)
+    last_committed_row = models.PositiveIntegerField(default=0, help_text="File row number of the last committed row (header is row 1)")
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True)
+    validated_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Job list per admin / organization - O(1) queries
+            models.Index(fields=['admin', '-created_at'], name='bulk_import_admin_idx'),
+            models.Index(fields=['organization', '-created_at'], name='bulk_import_org_idx'),
+            models.Index(fields=['status'], name='bulk_import_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.original_filename or self.file.name} - {self.status}"
@@ -0,0 +1,136 @@
+"""
+Bulk Password Hashing
+=====================
+
+Parallel make_password() for the bulk registration APIs.
+
+PBKDF2 is deliberately CPU-bound (~100-300 ms per hash at Django's default
+iteration count), so hashing 2,000 rows serially keeps one core busy for
+minutes while every other core sits idle. hash_passwords() fans the work out
+over a process pool instead - every hash still gets its own random salt and
+uses the configured hasher, only the wall-clock time changes.
+
+- The process pool is created once per process and reused by later calls
+  (web requests do not fork a new pool each time).
+- Daemonic processes - Celery prefork children such as the bulk queue
+  workers running import jobs - may not have children, so there the chunks
+  go to a thread pool instead (hashlib's PBKDF2 releases the GIL).
+
+Settings:
+    BULK_PASSWORD_HASH_WORKERS: worker processes (default: os.cpu_count(), 1 = serial)
+    BULK_PASSWORD_HASH_MIN_PARALLEL: batches smaller than this are hashed in-process
+        (default: 16 - below that pool start-up costs more than it saves)
+
+Time Complexity: O(n / workers) wall-clock for n passwords
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+
+DEFAULT_MIN_PARALLEL = 16
+
+_pool = None
+_pool_pid = None
+_pool_size = None
+_pool_lock = threading.Lock()
+
+
+def get_hash_workers():
+    """Configured worker count for bulk hashing (at least 1)"""
+    workers = getattr(settings, 'BULK_PASSWORD_HASH_WORKERS', None) or os.cpu_count() or 1
+    return max(int(workers), 1)
+
+
+def _init_worker(settings_module):
+    """Make Django settings available in spawned / forkserver workers"""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+        django.setup()
+
+
+def _in_daemon_process():
+    """True in daemonic processes (Celery prefork children) - they may not fork a pool"""
+    if multiprocessing.current_process().daemon:
+        return True
+    try:
+        import billiard
+    except ImportError:
+        return False
+    return bool(billiard.current_process().daemon)
+
+
+def _get_process_pool(size):
+    """Process-wide pool, created on first use - again after a fork or for a different size"""
+    global _pool, _pool_pid, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid() or _pool_size != size:
+            if _pool is not None and _pool_pid == os.getpid():
+                _pool.shutdown(wait=False)
+            settings_module = os.environ.get('DJANGO_SETTINGS_MODULE', 'core.settings')
+            _pool = ProcessPoolExecutor(max_workers=size, initializer=_init_worker, initargs=(settings_module,))
+            _pool_pid = os.getpid()
+            _pool_size = size
+        return _pool
+
+
+def _discard_process_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _hash_chunk(raw_passwords):
+    """Hash one chunk of passwords inside a worker process"""
+    return [make_password(raw) for raw in raw_passwords]
+
+
+def hash_passwords(raw_passwords, workers=None, min_parallel=None):
+    """
+    Hash a list of raw passwords, in parallel when the batch is large enough.
+
+    Args:
+        raw_passwords: list of raw password strings
+        workers: Optional worker count override (default: BULK_PASSWORD_HASH_WORKERS)
+        min_parallel: Optional serial threshold override (default: BULK_PASSWORD_HASH_MIN_PARALLEL)
+
+    Returns:
+        list: hashed passwords in the same order as raw_passwords
+    """
+    raw_passwords = list(raw_passwords)
+    workers = get_hash_workers() if workers is None else max(int(workers), 1)
+    if min_parallel is None:
+        min_parallel = getattr(settings, 'BULK_PASSWORD_HASH_MIN_PARALLEL', DEFAULT_MIN_PARALLEL)
+
+    pool_size = workers
+    workers = min(workers, len(raw_passwords))
+    if workers <= 1 or len(raw_passwords) < min_parallel:
+        return _hash_chunk(raw_passwords)
+
+    # Contiguous chunks (a few per worker for load balancing) keep result order trivial
+    chunk_count = workers * 4
+    chunk_size = -(-len(raw_passwords) // chunk_count)
+    chunks = [raw_passwords[i:i + chunk_size] for i in range(0, len(raw_passwords), chunk_size)]
+
+    if _in_daemon_process():
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return [hashed for chunk_result in executor.map(_hash_chunk, chunks) for hashed in chunk_result]
+
+    pool = _get_process_pool(pool_size)
+    try:
+        return [hashed for chunk_result in pool.map(_hash_chunk, chunks) for hashed in chunk_result]
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM killed) - drop the pool so the next call starts a fresh one
+        _discard_process_pool(pool)
+        return _hash_chunk(raw_passwords)
@@ -170,3 +170,44 @@ class CanUpdateOwnOrAnyUser(permissions.BasePermission):
         
         return is_own_data or has_admin_access
 
+
+class HasTenantAccess(permissions.BasePermission):
+    """
+    Permission class that resolves the request tenant (role, admin, organization, site)
+    and exposes it as request.tenant.
+    
+    Uses the cached tenant map, so on a warm cache this costs zero queries.
+    The site is taken from the URL kwarg 'site_id' when present.
+    Organization role must pass ?admin_id=.
+    
+    Usage:
+        permission_classes = [IsAuthenticated, HasTenantAccess]
+    
+    Time Complexity: O(1)
+    """
+    allow_user_role = False
+
+    def has_permission(self, request, view):
+        """Resolve tenant or raise TenantAccessError with the standard response shape."""
+        from utils.tenant_utils import resolve_tenant
+        from utils.exceptions import TenantAccessError
+
+        if not request.user.is_authenticated:
+            return False
+
+        site_id = view.kwargs.get('site_id')
+        tenant, error = resolve_tenant(request, site_id, allow_user_role=self.allow_user_role)
+        if error:
+            raise TenantAccessError(error.message, status_code=error.status_code)
+        return True
+
+
+class HasTenantAccessOrIsEmployee(HasTenantAccess):
+    """
+    Same as HasTenantAccess, but employees are also resolved through their
+    active site assignment.
+    
+    Usage:
+        permission_classes = [IsAuthenticated, HasTenantAccessOrIsEmployee]
+    """
+    allow_user_role = True
@@ -8,6 +8,7 @@ from TaskControl.models import *
 from Expenditure.models import * 
 from SiteManagement.models import Site
 from django.db import transaction
+from utils.helpers.media_store import thumbnail_url
 
 class CustomUserSerializer(serializers.ModelSerializer):
     role = serializers.CharField(required=False)
@@ -653,6 +654,7 @@ class UserProfileReadSerializer(serializers.ModelSerializer):
     phone_number = serializers.SerializerMethodField()
     is_active = serializers.SerializerMethodField()
     profile_photo_url = serializers.SerializerMethodField()
+    profile_photo_thumbnail_url = serializers.SerializerMethodField()
     user_id = serializers.SerializerMethodField()
     
     class Meta:
@@ -685,11 +687,141 @@ class UserProfileReadSerializer(serializers.ModelSerializer):
             return obj.profile_photo.url
         return None
     
+    def get_profile_photo_thumbnail_url(self, obj):
+        """Small square photo for lists - the full photo for files saved before thumbnails"""
+        url = thumbnail_url(obj.profile_photo.name if obj.profile_photo else None)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if url and request else url
+    
     def get_user_id(self, obj):
         """Return user ID (UID)"""
         return str(obj.user.id) if obj.user else None
 
 
+class UserProfileListSerializer:
+    """
+    Flat, values()-based read path for employee list endpoints and exports.
+
+    Produces the same keys/values as UserProfileReadSerializer, but:
+    - the queryset requirements live here (setup_queryset): ONE values() query
+      for the page, with user fields joined in
+    - M2M fields (shifts, week_offs, locations) are loaded with one query per
+      relation for the whole page instead of one per employee
+    - rows are plain dicts - no model instances, no deferred-field reloads
+
+    Query count is constant: 1 (page) + 3 (M2M) regardless of page size.
+
+    Usage:
+        page = paginator.paginate_queryset(UserProfileListSerializer.setup_queryset(qs), request)
+        data = UserProfileListSerializer(page, context={'request': request}).data
+    """
+
+    # Output key -> values() lookup on the related user
+    USER_FIELDS = {
+        'email': 'user__email',
+        'username': 'user__username',
+        'phone_number': 'user__phone_number',
+        'is_active': 'user__is_active',
+    }
+    M2M_FIELDS = ('shifts', 'week_offs', 'locations')
+
+    _field_plan = None  # Built once per process from UserProfileReadSerializer
+
+    def __init__(self, instance, many=True, context=None):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    @staticmethod
+    def _concrete_fields():
+        return [f for f in UserProfile._meta.concrete_fields]
+
+    @classmethod
+    def setup_queryset(cls, queryset):
+        """Turn a UserProfile queryset into the flat values() query this serializer renders"""
+        columns = [f.attname for f in cls._concrete_fields()]
+        return queryset.values(*columns, *cls.USER_FIELDS.values())
+
+    @classmethod
+    def _get_field_plan(cls):
+        """
+        (key, kind, source, drf_field) per output key, in UserProfileReadSerializer order.
+        DRF fields are reused for value formatting (dates, decimals, choices).
+        """
+        if cls._field_plan is None:
+            model_fields = {f.name: f for f in cls._concrete_fields()}
+            plan = []
+            for key, drf_field in UserProfileReadSerializer().fields.items():
+                if key in cls.USER_FIELDS:
+                    plan.append((key, 'user', cls.USER_FIELDS[key], None))
+                elif key == 'user_id':
+                    plan.append((key, 'user_id', 'user_id', None))
+                elif key == 'profile_photo_url':
+                    plan.append((key, 'photo_url', 'profile_photo', None))
+                elif key == 'profile_photo_thumbnail_url':
+                    plan.append((key, 'thumbnail_url', 'profile_photo', None))
+                elif key in cls.M2M_FIELDS:
+                    plan.append((key, 'm2m', key, None))
+                elif key in model_fields and model_fields[key].is_relation:
+                    plan.append((key, 'fk', model_fields[key].attname, None))
+                elif key == 'profile_photo':
+                    plan.append((key, 'file', key, drf_field))
+                elif key in model_fields:
+                    plan.append((key, 'value', key, drf_field))
+            cls._field_plan = plan
+        return cls._field_plan
+
+    def _load_m2m(self, profile_ids):
+        """O(1) query per M2M relation for the whole page"""
+        relations = {}
+        for name in self.M2M_FIELDS:
+            field = UserProfile._meta.get_field(name)
+            through = field.remote_field.through
+            source = field.m2m_field_name() + '_id'
+            target = field.m2m_reverse_field_name() + '_id'
+            related = {}
+            for profile_id, related_id in through.objects.filter(
+                **{f'{source}__in': profile_ids}
+            ).values_list(source, target).order_by('id'):
+                related.setdefault(profile_id, []).append(related_id)
+            relations[name] = related
+        return relations
+
+    def _photo_url(self, name):
+        if not name:
+            return None
+        url = UserProfile._meta.get_field('profile_photo').storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def to_representation(self, row, relations):
+        data = {}
+        for key, kind, source, drf_field in self._get_field_plan():
+            value = row.get(source)
+            if kind == 'value':
+                data[key] = drf_field.to_representation(value) if value is not None else None
+            elif kind in ('user', 'fk'):
+                data[key] = value
+            elif kind == 'user_id':
+                data[key] = str(value) if value else None
+            elif kind in ('file', 'photo_url'):
+                data[key] = self._photo_url(value)
+            elif kind == 'thumbnail_url':
+                url = thumbnail_url(value)
+                request = self.context.get('request')
+                data[key] = request.build_absolute_uri(url) if url and request else url
+            elif kind == 'm2m':
+                data[key] = relations[source].get(row['id'], [])
+        return data
+
+    @property
+    def data(self):
+        rows = list(self.instance) if self.many else [self.instance]
+        relations = self._load_m2m([row['id'] for row in rows]) if rows else {}
+        results = [self.to_representation(row, relations) for row in rows]
+        return results if self.many else results[0]
+
+
 class UserProfileUpdateSerializer(serializers.ModelSerializer):
     """
     Update serializer for User/Employee Profile.
@@ -1213,4 +1345,18 @@ class FcmTokenUpdateSerializer(serializers.Serializer):
         value = value.strip()
         if not value:
             raise serializers.ValidationError("FCM token cannot be empty.")
-        return value
\ No newline at end of file
+        return value
+
+class BulkImportJobSerializer(serializers.ModelSerializer):
+    """Read-only progress view of a bulk employee import job"""
+    site_name = serializers.CharField(source='site.site_name', read_only=True, default=None)
+
+    class Meta:
+        model = BulkImportJob
+        fields = [
+            'id', 'admin', 'organization', 'site', 'site_name', 'original_filename', 'file_format',
+            'chunk_size', 'status', 'total_rows', 'last_committed_row', 'created_count',
+            'error_count', 'errors', 'message', 'validated_at', 'started_at', 'completed_at',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,63 @@
+"""
+AuthN Signals
+Keeps cached tenant maps in sync with admin user / admin profile writes, and
+cached employee geofences in sync with profile / organization settings writes.
+Invalidation runs on commit so concurrent readers never re-cache pre-commit rows.
+"""
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import BaseUserModel, AdminProfile, OrganizationSettings, UserProfile
+from utils.geofence_service import invalidate_geofences
+from utils.tenant_utils import invalidate_tenant_cache
+
+GEOFENCE_PROFILE_FIELDS = {'allow_geo_fencing', 'radius', 'organization', 'organization_id'}
+
+
+@receiver(post_save, sender=BaseUserModel)
+@receiver(post_delete, sender=BaseUserModel)
+def invalidate_admin_tenant_on_user_change(sender, instance, **kwargs):
+    """Drop the admin's cached tenant map when the admin user changes"""
+    if instance.role == 'admin':
+        admin_id = instance.id
+        transaction.on_commit(lambda: invalidate_tenant_cache([admin_id]))
+
+
+@receiver(post_save, sender=AdminProfile)
+@receiver(post_delete, sender=AdminProfile)
+def invalidate_admin_tenant_on_profile_change(sender, instance, **kwargs):
+    """Drop the admin's cached tenant map when organization membership changes"""
+    admin_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_tenant_cache([admin_id]))
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_employee_geofence(sender, instance, update_fields=None, **kwargs):
+    """Drop the employee's cached geofence when fencing flags or radius change"""
+    if update_fields is not None and not GEOFENCE_PROFILE_FIELDS.intersection(update_fields):
+        return
+    user_ids = [instance.user_id]
+    transaction.on_commit(lambda: invalidate_geofences(user_ids=user_ids))
+
+
+@receiver(m2m_changed, sender=UserProfile.locations.through)
+def invalidate_geofence_on_location_assignment(sender, instance, action, reverse, **kwargs):
+    """Assigned locations changed - per employee, or for the whole organization when edited from the Location side"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        organization_ids = [instance.organization_id]
+        transaction.on_commit(lambda: invalidate_geofences(organization_ids=organization_ids))
+    else:
+        user_ids = [instance.user_id]
+        transaction.on_commit(lambda: invalidate_geofences(user_ids=user_ids))
+
+
+@receiver(post_save, sender=OrganizationSettings)
+@receiver(post_delete, sender=OrganizationSettings)
+def invalidate_organization_geofences(sender, instance, **kwargs):
+    """geofencing_enabled / default radius changed for every employee of the organization"""
+    organization_ids = [instance.organization_id]
+    transaction.on_commit(lambda: invalidate_geofences(organization_ids=organization_ids))
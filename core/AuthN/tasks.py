@@ -0,0 +1,60 @@
+"""
+Celery Tasks for AuthN
+Bulk employee import jobs run in the worker so large files never block a request.
+Profile photo processing (media queue) is queued through the outbox after checkout.
+"""
+
+from celery import shared_task
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='run_bulk_import_job')
+def run_bulk_import_job(job_id):
+    """
+    Run or resume a BulkImportJob.
+    O(n / chunk_size) queries - rows are streamed and committed per chunk
+    """
+    from .bulk_import_service import run_employee_import_job
+
+    job = run_employee_import_job(job_id)
+    logger.info(f"Bulk import job {job_id}: {job.status} ({job.created_count} created, {job.error_count} errors)")
+    return {"status": job.status, "job_id": str(job.id), "created": job.created_count}
+
+
+@shared_task(name='media.update_profile_photo')
+def update_profile_photo(user_id, upload_name, captured_at=None):
+    """
+    Compress a selfie stashed by a checkout and make it the profile photo.
+    Idempotent - the same upload maps to the same stored file
+    """
+    import os
+
+    from django.core.files.storage import default_storage
+    from django.utils.dateparse import parse_datetime
+
+    from utils.helpers import media_store
+    from utils.helpers.image_utils import save_image_bytes
+    from .models import UserProfile
+
+    if not default_storage.exists(upload_name):
+        logger.warning(f"Profile photo upload {upload_name} for user {user_id} is gone")
+        return {"user_id": user_id, "updated": False}
+
+    with default_storage.open(upload_name, 'rb') as f:
+        image_data = f.read()
+    extension = os.path.splitext(upload_name)[1].lstrip('.') or 'jpg'
+    saved = save_image_bytes(
+        image_data, extension, attendance_type='profile',
+        captured_at=parse_datetime(captured_at) if captured_at else None
+    )
+    # The compressed image may be byte-identical to the stashed upload (stored without thumbnail)
+    media_store.ensure_thumbnail(saved['file_path'])
+
+    profile = UserProfile.objects.only('id', 'profile_photo').filter(user_id=user_id).first()
+    if profile is None or profile.profile_photo.name == saved['file_path']:
+        return {"user_id": user_id, "updated": False}
+    profile.profile_photo = saved['file_path']
+    profile.save(update_fields=['profile_photo'])
+    return {"user_id": user_id, "updated": True}
@@ -1,3 +1,194 @@
-from django.test import TestCase
+import multiprocessing
+import os
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import check_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory
+
+from utils.fixture_utils import create_employees, create_tenant
+from . import password_hashing
+from .bulk_import_service import run_employee_import_job
+from .models import BaseUserModel, BulkImportJob, UserProfile
+from .password_hashing import hash_passwords
+from .serializers import UserProfileListSerializer, UserProfileReadSerializer
+
+
+def _hash_in_daemon(queue):
+    """Runs in a daemonic child, like a Celery prefork worker on the bulk queue"""
+    try:
+        hashed = hash_passwords([f'EMP{n:03d}@123' for n in range(40)], workers=4, min_parallel=2)
+        # No pool may have been created in this (daemonic) process
+        queue.put((hashed, password_hashing._pool_pid != os.getpid()))
+    except Exception as exc:
+        queue.put((repr(exc), None))
+
+
+def employee_csv(count):
+    lines = ['email,username,phone_number,custom_employee_id,gender,date_of_joining,user_name,state,city']
+    lines += [
+        f'bulk{n}@example.com,bulk{n},{8100000000 + n},BULK{n:03d},Female,2026-01-05,Bulk {n},Karnataka,Bengaluru'
+        for n in range(count)
+    ]
+    return SimpleUploadedFile('employees.csv', '\n'.join(lines).encode(), content_type='text/csv')
+
+
+@override_settings(BULK_IMPORT_CHUNK_SIZE=2)
+class BulkEmployeeImportTests(TestCase):
+    """Bulk employee registration - passwords hashed before each chunk's transaction opens"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+
+    def setUp(self):
+        # Atomic depth of the test itself - hashing must not add to it
+        self.base_depth = len(connection.atomic_blocks)
+        self.hash_depths = []
+
+        def recording_hash_passwords(raw_passwords):
+            self.hash_depths.append(len(connection.atomic_blocks))
+            return hash_passwords(raw_passwords, workers=1)
+
+        patcher = mock.patch('AuthN.bulk_import_service.hash_passwords', recording_hash_passwords)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def assertEmployeesCreated(self, count):
+        users = BaseUserModel.objects.filter(username__startswith='bulk').order_by('username')
+        self.assertEqual(len(users), count)
+        for n, user in enumerate(users):
+            self.assertTrue(check_password(f'BULK{n:03d}@123', user.password), user.username)
+
+    def test_registration_hashes_outside_the_transaction(self):
+        client = APIClient()
+        client.force_authenticate(self.tenant['admin'])
+        response = client.post('/api/bulk-register/employees/', {'file': employee_csv(3)}, format='multipart')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['processed'], 3)
+        self.assertEqual(self.hash_depths, [self.base_depth])  # Whole file hashed once, before atomic()
+        self.assertEmployeesCreated(3)
+
+    def test_import_job_hashes_each_chunk_outside_its_transaction(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        with override_settings(MEDIA_ROOT=media_root):
+            job = BulkImportJob.objects.create(
+                admin=self.tenant['admin'], organization=self.tenant['organization'], site=self.tenant['site'],
+                file=employee_csv(3), original_filename='employees.csv', file_format='csv', chunk_size=2,
+            )
+            job = run_employee_import_job(job.id)
+        self.assertEqual((job.status, job.created_count), ('completed', 3), job.message)
+        self.assertEqual(self.hash_depths, [self.base_depth, self.base_depth])  # One call per chunk
+        self.assertEmployeesCreated(3)
+
+
+class LoginViewTests(TestCase):
+    """LoginView - single-hash login via login_service.authenticate_login"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = BaseUserModel.objects.create_user(
+            email='admin@example.com', password='secret-pass', username='admin1',
+            role='admin', phone_number=9000000001,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def login(self, username, password):
+        return self.client.post('/api/login', {'username': username, 'password': password}, format='json')
+
+    def test_login_with_email_and_username(self):
+        for identifier in ('admin@example.com', 'admin1'):
+            response = self.login(identifier, 'secret-pass')
+            self.assertEqual(response.status_code, 200, identifier)
+
+    def test_wrong_password_is_generic_401(self):
+        response = self.login('admin1', 'wrong-pass')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['message'], 'Invalid credentials')
+
+    def test_inactive_user_with_correct_password_is_generic_401(self):
+        BaseUserModel.objects.filter(id=self.user.id).update(is_active=False)
+        response = self.login('admin1', 'secret-pass')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['message'], 'Invalid credentials')
+
+
+class HashPasswordsTests(SimpleTestCase):
+    """password_hashing.hash_passwords - shared pool, daemon-safe"""
+
+    def test_parallel_hashes_keep_order(self):
+        raw = [f'EMP{n:03d}@123' for n in range(40)]
+        hashed = hash_passwords(raw, workers=2, min_parallel=2)
+        self.assertEqual(len(hashed), len(raw))
+        self.assertTrue(all(check_password(r, h) for r, h in zip(raw, hashed)))
+
+    def test_pool_is_reused_across_calls(self):
+        hash_passwords(['a'] * 8, workers=2, min_parallel=2)
+        pool = password_hashing._pool
+        hash_passwords(['b'] * 8, workers=2, min_parallel=2)
+        self.assertIsNotNone(pool)
+        self.assertIs(password_hashing._pool, pool)
+
+    def test_daemonic_process_hashes_without_forking(self):
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        process = context.Process(target=_hash_in_daemon, args=(queue,), daemon=True)
+        process.start()
+        hashed, no_own_pool = queue.get(timeout=60)
+        process.join(timeout=10)
+        self.assertIsInstance(hashed, list, hashed)
+        self.assertEqual(len(hashed), 40)
+        self.assertTrue(check_password('EMP007@123', hashed[7]))
+        self.assertTrue(no_own_pool)
+
+
+class EmployeeListQueryTests(TestCase):
+    """GET /api/employee/ - UserProfileListSerializer keeps the query count flat"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.small = create_tenant()
+        create_employees(cls.small, 1)
+        cls.large = create_tenant()
+        create_employees(cls.large, 1000)
+
+    def setUp(self):
+        cache.clear()
+
+    def list_queries(self, tenant):
+        client = APIClient()
+        client.force_authenticate(tenant['admin'])
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/employee/', {'page_size': 1000})
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.data['data']
+
+    def test_constant_queries_for_1_and_1000_employees(self):
+        small_queries, small_data = self.list_queries(self.small)
+        large_queries, large_data = self.list_queries(self.large)
+        self.assertEqual(small_data['count'], 1)
+        self.assertEqual(large_data['count'], 1000)
+        self.assertEqual(small_queries, large_queries)
+
+    def test_list_serializer_matches_read_serializer(self):
+        profiles = UserProfile.objects.filter(admin=self.large['admin']).order_by('id')[:50]
+        UserProfile.objects.filter(id=profiles[0].id).update(profile_photo='profile_photos/photo.jpg', date_of_birth='1990-05-17')
+        request = APIRequestFactory().get('/api/employee/')
+        expected = UserProfileReadSerializer(profiles, many=True, context={'request': request}).data
+        actual = UserProfileListSerializer(
+            UserProfileListSerializer.setup_queryset(profiles), context={'request': request}
+        ).data
+        self.assertEqual(len(actual), len(expected))
+        for expected_row, actual_row in zip(expected, actual):
+            self.assertEqual(list(actual_row), list(expected_row))
+            for field, value in expected_row.items():
+                self.assertEqual(actual_row[field], value, field)
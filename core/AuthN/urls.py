@@ -35,6 +35,8 @@ urlpatterns = [
     path("bulk-register/admins/<uuid:org_id>", BulkAdminRegistrationAPIView.as_view(), name="bulk-admin-register"),
     path("bulk-register/download/employee-sample", DownloadEmployeeSampleCSVAPIView.as_view(), name="download-employee-sample"),
     path("bulk-register/download/admin-sample", DownloadAdminSampleCSVAPIView.as_view(), name="download-admin-sample"),
+    path("bulk-import/employees", BulkEmployeeImportJobAPIView.as_view(), name="bulk-employee-import"),
+    path("bulk-import/jobs/<uuid:job_id>", BulkImportJobDetailAPIView.as_view(), name="bulk-import-job-detail"),
 
     # ---ADDITIONAL UTILITY APIS----
     # Change Password for All Roles
@@ -75,4 +77,7 @@ urlpatterns = [
     path('photo-refresh/<uuid:user_id>', PhotoRefreshToggleAPIView.as_view(), name='photo-refresh-toggle'),
     path('employee/profile-photo-upload/<uuid:user_id>', EmployeeProfilePhotoUploadAPIView.as_view(), name='employee-profile-photo-upload'),
 
+    # Live status counts (cache counters)
+    path('status-counts/<uuid:site_id>', LiveStatusCountsAPIView.as_view(), name='live-status-counts'),
+
 ]
@@ -15,7 +15,6 @@ Space Complexity: O(1) - Minimal space usage
 
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
-from django.contrib.auth import authenticate
 from .models import (
     BaseUserModel, SystemOwnerProfile, OrganizationProfile,
     AdminProfile, UserProfile, OrganizationSettings
@@ -27,6 +26,7 @@ from .serializers import (
     OrganizationSettingsSerializer, AllOrganizationProfileSerializer
 )
 from .permissions import IsSystemOwner
+from .login_service import authenticate_login, LoginResult
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
@@ -278,9 +278,10 @@ class UserRegisterView(generics.CreateAPIView):
 
 class LoginView(APIView):
     """
-    Login endpoint supporting both email and username authentication.
+    Login endpoint supporting email, username and employee ID authentication.
     
-    Optimized with proper indexes and O(1) queries.
+    Optimized with proper indexes: one UNION ALL query and exactly one password hash
+    per attempt (see AuthN.login_service).
     
     Time Complexity: O(1) - Constant time authentication with index usage
     """
@@ -289,7 +290,7 @@ class LoginView(APIView):
     def post(self, request):
         """
         Authenticate user and return JWT tokens.
-        Supports both email and username login.
+        Supports email, username and custom_employee_id login.
         
         Returns:
             Response with tokens on success, error message on failure
@@ -303,91 +304,37 @@ class LoginView(APIView):
                 "message": "Username/Email/Employee ID and password are required"
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        user = None
-        
-        # O(1) - First, try to authenticate with the value as email (since USERNAME_FIELD = "email")
-        # Uses index on email (unique constraint)
-        user = authenticate(request, username=username, password=password)
-        
-        # O(1) - If authentication fails, try to find user by username and then authenticate with email
-        # Uses index on username (unique constraint)
-        if user is None:
-            try:
-                # O(1) - Single query with .only() to limit fields, uses username index
-                user_obj = BaseUserModel.objects.only('id', 'email', 'username', 'is_active').get(username=username)
-                # O(1) - Authenticate with email
-                user = authenticate(request, username=user_obj.email, password=password)
-            except BaseUserModel.DoesNotExist:
-                user = None
-        
-        # O(1) - If still None, try custom_employee_id for employee login
-        # Uses index on custom_employee_id (unique constraint)
-        if user is None:
-            try:
-                # O(1) - Single query with select_related and .only(), uses custom_employee_id index
-                user_profile = UserProfile.objects.select_related('user').only(
-                    'user__id', 'user__email', 'user__is_active', 'custom_employee_id'
-                ).get(custom_employee_id=username)
-                # O(1) - Authenticate with email
-                user = authenticate(request, username=user_profile.user.email, password=password)
-            except UserProfile.DoesNotExist:
-                user = None
-
-        if user is None:
+        # O(1) - One indexed query across email/username/custom_employee_id, one password hash
+        result = authenticate_login(request, username, password)
+
+        if result.error == LoginResult.INVALID_CREDENTIALS:
             return Response({
                 "status": status.HTTP_401_UNAUTHORIZED,
                 "message": "Invalid credentials"
             }, status=status.HTTP_401_UNAUTHORIZED)
 
-        if not user.is_active:
-            return Response({
-                "status": status.HTTP_401_UNAUTHORIZED,
-                "message": "User account is disabled"
-            }, status=status.HTTP_401_UNAUTHORIZED)
+        user = result.user
 
         # Generate tokens
         tokens = generate_tokens(user)
         
-        # Add organization_id for admin role - O(1) query with select_related
+        # Add organization_id for admin role - fetched in the login query
         if user.role == "admin":
-            try:
-                # O(1) - Single query with select_related, uses index on (user_id) or primary key
-                admin_profile = AdminProfile.objects.select_related('organization').filter(
-                    user_id=user.id
-                ).only('organization_id', 'organization__id').first()
-                
-                if admin_profile and admin_profile.organization:
-                    tokens["organization_id"] = str(admin_profile.organization.id)
-                else:
-                    # Log warning if admin profile or organization not found
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"Admin profile or organization not found for user {user.id}")
-            except Exception as e:
-                # Log error but continue without organization_id
+            if result.extras.get("organization_id"):
+                tokens["organization_id"] = str(result.extras["organization_id"])
+            else:
+                # Log warning if admin profile or organization not found
                 import logging
                 logger = logging.getLogger(__name__)
-                logger.error(f"Error fetching organization_id for admin {user.id}: {str(e)}")
+                logger.warning(f"Admin profile or organization not found for user {user.id}")
         
         # For organization role, user_id is the organization_id
         if user.role == "organization":
             tokens["organization_id"] = str(user.id)
         
-        # Add is_photo_updated status for employees - O(1) query
+        # Add is_photo_updated status for employees - fetched in the login query
         if user.role == "user":
-            try:
-                # O(1) - Single query with .only(), uses index on (user_id) or primary key
-                user_profile = UserProfile.objects.filter(user_id=user.id).only('is_photo_updated').first()
-                if user_profile:
-                    tokens["is_photo_updated"] = user_profile.is_photo_updated
-                else:
-                    tokens["is_photo_updated"] = False
-            except Exception as e:
-                # Log error but continue without is_photo_updated
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.error(f"Error fetching user profile for user {user.id}: {str(e)}")
-                tokens["is_photo_updated"] = False
+            tokens["is_photo_updated"] = result.extras.get("is_photo_updated", False)
 
         return Response(tokens, status=status.HTTP_200_OK)
 
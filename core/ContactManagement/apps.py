@@ -5,3 +5,6 @@ class ContactmanagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ContactManagement'
 
+    def ready(self):
+        """Import signals when app is ready"""
+        import ContactManagement.signals
@@ -0,0 +1,483 @@
+"""
+Business card text parser
+Turns the raw OCR text of a card into contact fields.
+
+All patterns and keyword tables are compiled once at import. Each OCR line is
+scanned once by a single tokenizer (TOKEN_PATTERN) that emits emails, URLs,
+WhatsApp numbers, digit runs (phones / pincodes) and keywords (job titles,
+departments, company suffixes, address words, states, cities); the fields are
+then resolved from those per-line tokens without touching the text again.
+
+Used by BusinessCardOCRService.extract_contact_info - see parse_card_text().
+Field accuracy against the labelled corpus ocr_corpus/business_cards.json is
+asserted in ContactManagement/tests.py; lines/sec is measured with:
+python manage.py benchmark_card_parser
+"""
+import re
+from typing import Dict, List, Optional
+
+
+INDIAN_STATES = [
+    'Andhra Pradesh', 'Arunachal Pradesh', 'Assam', 'Bihar', 'Chhattisgarh',
+    'Goa', 'Gujarat', 'Haryana', 'Himachal Pradesh', 'Jharkhand',
+    'Karnataka', 'Kerala', 'Madhya Pradesh', 'Maharashtra', 'Manipur',
+    'Meghalaya', 'Mizoram', 'Nagaland', 'Odisha', 'Punjab',
+    'Rajasthan', 'Sikkim', 'Tamil Nadu', 'Telangana', 'Tripura',
+    'Uttar Pradesh', 'Uttarakhand', 'West Bengal'
+]
+
+INDIAN_CITIES = [
+    'Mumbai', 'Delhi', 'Bangalore', 'Hyderabad', 'Chennai', 'Kolkata',
+    'Pune', 'Ahmedabad', 'Jaipur', 'Surat', 'Lucknow', 'Kanpur',
+    'Nagpur', 'Indore', 'Thane', 'Bhopal', 'Visakhapatnam', 'Patna',
+    'Vadodara', 'Ghaziabad', 'Ludhiana', 'Agra', 'Nashik', 'Faridabad'
+]
+
+# Other spellings seen on cards -> name used in INDIAN_CITIES
+CITY_ALIASES = {
+    'Bengaluru': 'Bangalore',
+    'Bombay': 'Mumbai',
+    'Madras': 'Chennai',
+    'Calcutta': 'Kolkata',
+    'Baroda': 'Vadodara',
+}
+
+JOB_TITLES = [
+    'CEO', 'CTO', 'CFO', 'COO', 'CMO', 'Director', 'Manager',
+    'President', 'Vice President', 'VP', 'Head', 'Lead', 'Senior', 'Sr',
+    'Executive', 'Officer', 'Specialist', 'Analyst', 'Engineer',
+    'Developer', 'Designer', 'Consultant', 'Advisor', 'Coordinator',
+    'Founder', 'Co-Founder', 'Partner', 'Proprietor', 'Owner', 'Chairman',
+    'Assistant', 'Associate', 'Architect', 'Administrator', 'Representative',
+    'Accountant', 'Supervisor', 'Intern'
+]
+
+DEPARTMENTS = [
+    'Sales', 'Marketing', 'IT', 'HR', 'Finance', 'Operations',
+    'Engineering', 'Product', 'Customer Service', 'Support',
+    'Business Development', 'Research', 'Development', 'R&D',
+    'QA', 'Procurement', 'Accounts', 'Legal'
+]
+
+# Words that only name a company when they end it or stand alone - "Pvt Ltd", "Solutions"...
+COMPANY_WORDS = [
+    'Pvt', 'Private', 'Ltd', 'Limited', 'LLP', 'LLC', 'Inc', 'Corp', 'Corporation',
+    'Co', 'Company', 'Technologies', 'Technology', 'Solutions', 'Services', 'Systems',
+    'Software', 'Enterprises', 'Industries', 'Labs', 'Studios', 'Studio', 'Group',
+    'Associates', 'Partners', 'Traders', 'Exports', 'Imports', 'Logistics', 'Organics',
+    'Foods', 'Retail', 'Bank', 'Clinic', 'Hospital', 'Capital', 'Consulting', 'Events',
+    'Stores', 'Constructions', 'Builders', 'Analytics', 'Pharma', 'Textiles',
+    'Adventures', 'Media', 'Agency', 'Ventures', 'International', 'Infotech', 'Networks'
+]
+
+ADDRESS_WORDS = [
+    'Street', 'Road', 'Avenue', 'Lane', 'Nagar', 'Colony', 'Sector', 'Floor',
+    'Building', 'Plot', 'Block', 'Marg', 'Phase', 'Tower', 'Layout', 'Cross',
+    'Shop', 'Near', 'Opp', 'Complex', 'Chowk', 'Bagh', 'Place', 'Hills'
+]
+
+# Department acronyms only count in capitals - "IT" yes, "it" no
+CASE_SENSITIVE_KEYWORDS = {'IT', 'HR', 'QA'}
+
+
+def _keyword_table():
+    """lower-case keyword -> [(kind, canonical name)]"""
+    table = {}
+    for kind, words in (
+        ('title', JOB_TITLES), ('department', DEPARTMENTS), ('company', COMPANY_WORDS),
+        ('address', ADDRESS_WORDS), ('state', INDIAN_STATES), ('city', INDIAN_CITIES),
+    ):
+        for word in words:
+            table.setdefault(word.lower(), []).append((kind, word))
+    for alias, city in CITY_ALIASES.items():
+        table.setdefault(alias.lower(), []).append(('city', city))
+    return table
+
+
+KEYWORDS = _keyword_table()
+
+def _trie_pattern(words):
+    """
+    Regex for a set of words as a prefix trie - ("head", "hr", "hills") becomes
+    "h(?:ead|ills|r)". Python's re tries alternatives one by one, so a flat
+    200-word alternation is retried in full at every word start; the trie
+    rejects most positions after one character. Longer words win over their
+    prefixes ("Co-Founder" over "Co") as each group is tried longest branch first.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        end = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not end:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if end else group
+
+    return build(trie)
+
+
+# One alternation, tried left to right at each position: an email swallows the
+# words inside it, a WhatsApp number its digits, and so on.
+TOKEN_PATTERN = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+    r'|(?P<url>(?:https?://|www\.)[^\s,|]+)'
+    r'|(?P<whatsapp>\b(?:whatsapp|wa\.me/?)[:\s-]*(?P<whatsapp_number>\+?\d[\d\s().-]*\d))'
+    r'|(?P<digits>(?<![\w+@.])\+?\(?\d[\d\s().-]*\d(?![\w@]))'
+    r'|(?P<keyword>(?<![\w-])' + _trie_pattern(KEYWORDS) + r'(?![\w-]))',
+    re.IGNORECASE
+)
+
+# Label right before a phone number: "Mob:", "Tel", "F.", ...
+PHONE_LABEL_PATTERN = re.compile(
+    r'(?<![a-z])(fax|f|tel|telephone|t|off|office|o|board|landline|'
+    r'mob|mobile|m|cell|c|ph|phone|p)\b[\s.:\-]*$',
+    re.IGNORECASE
+)
+PHONE_LABELS = {
+    'fax': 'fax', 'f': 'fax',
+    'tel': 'office', 'telephone': 'office', 't': 'office', 'off': 'office',
+    'office': 'office', 'o': 'office', 'board': 'office', 'landline': 'office',
+    'mob': 'mobile', 'mobile': 'mobile', 'm': 'mobile', 'cell': 'mobile', 'c': 'mobile',
+}
+
+INDIAN_MOBILE_PATTERN = re.compile(r'(?:\+?91|0)?[6-9]\d{9}')
+INDIAN_LANDLINE_PATTERN = re.compile(r'\+91[1-5]\d{8,9}|0[1-9]\d{8,10}|1800\d{6,7}')
+PINCODE_PATTERN = re.compile(r'[1-9]\d{2}\s?\d{3}|\d{5}(?:-\d{4})?')
+DATE_PATTERN = re.compile(r'\d{1,2}[-.]\d{1,2}[-.]\d{2,4}')
+# "079 2656 7788", "(022) 2345 6789" - an STD code written apart means a landline
+STD_CODE_PATTERN = re.compile(r'\(?0\d{2,4}\)?[\s.-]')
+PHONE_SEPARATORS = re.compile(r'[-.\s()]')
+NAME_PATTERN = re.compile(r"[A-Za-z][A-Za-z.' ]*[A-Za-z.]")
+
+URL_PATTERN = re.compile(
+    r'https?://(?:[-\w.])+(?:[:\d]+)?(?:/(?:[\w/_.])*(?:\?(?:[\w&=%.])*)?(?:#(?:\w*))?)?'
+)
+LINKEDIN_PATTERN = re.compile(r'(?:linkedin\.com/in/|linkedin\.com/company/)[\w-]+', re.IGNORECASE)
+INSTAGRAM_PATTERN = re.compile(r'(?:instagram\.com/|(?<![\w.])@)[\w.]+', re.IGNORECASE)
+FACEBOOK_PATTERN = re.compile(r'(?:facebook\.com/|fb\.com/)[\w.]+', re.IGNORECASE)
+
+MIN_PHONE_DIGITS = 7
+MAX_PHONE_DIGITS = 15
+
+
+class CardLine:
+    """Tokens found on one OCR line"""
+    __slots__ = ('index', 'text', 'emails', 'urls', 'phones', 'whatsapp', 'pincodes', 'keywords')
+
+    def __init__(self, index, text):
+        self.index = index
+        self.text = text
+        self.emails = []
+        self.urls = []
+        self.phones = []  # [(number, label kind or None)]
+        self.whatsapp = None
+        self.pincodes = []
+        self.keywords = {}  # kind -> [canonical, ...] in line order
+
+    def has(self, kind):
+        return kind in self.keywords
+
+    @property
+    def is_contact(self):
+        return bool(self.emails or self.urls or self.phones or self.whatsapp)
+
+    @property
+    def is_address(self):
+        return bool(self.pincodes) or any(self.has(kind) for kind in ('address', 'state', 'city'))
+
+
+def _clean_number(value):
+    return PHONE_SEPARATORS.sub('', value)
+
+
+def _split_digit_run(run):
+    """
+    Break a run holding several numbers ("560001 98765 43210") on whitespace,
+    wherever the next group would push a chunk past MAX_PHONE_DIGITS
+    """
+    chunks, current, current_digits = [], '', 0
+    for group in run.split():
+        group_digits = sum(ch.isdigit() for ch in group)
+        if current and current_digits + group_digits > MAX_PHONE_DIGITS:
+            chunks.append(current)
+            current, current_digits = '', 0
+        current = f'{current} {group}' if current else group
+        current_digits += group_digits
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _add_digit_run(card_line, run, label, split=True):
+    """Classify a run of digits as phone number(s), pincode or noise"""
+    run = run.strip()
+    digit_count = sum(ch.isdigit() for ch in run)
+    if PINCODE_PATTERN.fullmatch(run):
+        card_line.pincodes.append(run.replace(' ', ''))
+        return
+    if digit_count < MIN_PHONE_DIGITS or DATE_PATTERN.fullmatch(run):
+        return
+    if digit_count > MAX_PHONE_DIGITS:
+        if split:
+            for chunk in _split_digit_run(run):
+                _add_digit_run(card_line, chunk, label, split=False)
+        return
+    if label is None and STD_CODE_PATTERN.match(run):
+        label = 'office'
+    card_line.phones.append((_clean_number(run), label))
+
+
+def tokenize_line(index, text):
+    """Scan one line once and collect its tokens"""
+    card_line = CardLine(index, text)
+    previous_end = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        value = match.group(kind)
+
+        if kind == 'email':
+            card_line.emails.append(value)
+        elif kind == 'url':
+            card_line.urls.append(value)
+        elif kind == 'whatsapp':
+            card_line.whatsapp = re.sub(r'[^\d+]', '', match.group('whatsapp_number'))
+        elif kind == 'digits':
+            label = PHONE_LABEL_PATTERN.search(text, previous_end, match.start())
+            _add_digit_run(card_line, value, PHONE_LABELS.get(label.group(1).lower()) if label else None)
+        else:
+            for keyword_kind, canonical in KEYWORDS[value.lower()]:
+                if canonical in CASE_SENSITIVE_KEYWORDS and value != canonical:
+                    continue
+                card_line.keywords.setdefault(keyword_kind, []).append(canonical)
+        previous_end = match.end()
+    return card_line
+
+
+def tokenize(raw_text):
+    """Non-empty OCR lines as CardLine objects"""
+    lines = (line.strip() for line in raw_text.split('\n'))
+    return [tokenize_line(index, line) for index, line in enumerate(line for line in lines if line)]
+
+
+def _phone_kind(number, label):
+    """'fax', 'office' or 'mobile' - the label wins, else the number's shape"""
+    if label in ('fax', 'office', 'mobile'):
+        return label
+    if INDIAN_MOBILE_PATTERN.fullmatch(number):
+        return 'mobile'
+    if INDIAN_LANDLINE_PATTERN.fullmatch(number):
+        return 'office'
+    return 'mobile'
+
+
+def _phone_key(number):
+    """Same number with or without +91 / 0 prefix"""
+    return re.sub(r'\D', '', number)[-10:]
+
+
+def _is_name_line(card_line):
+    words = card_line.text.split()
+    return (
+        2 <= len(words) <= 4
+        and not card_line.keywords
+        and not card_line.is_contact
+        and NAME_PATTERN.fullmatch(card_line.text) is not None
+    )
+
+
+def _first_keyword(lines, kind):
+    for card_line in lines:
+        if card_line.has(kind):
+            return card_line.keywords[kind][0]
+    return None
+
+
+def _resolve_people(lines, result):
+    """full_name, job_title, department and company_name from the top of the card"""
+    head = lines[:5]
+    name_line = next((line for line in lines[:3] if _is_name_line(line)), None)
+
+    if name_line is None and lines:
+        # No clean "Firstname Lastname" line - take the first line, split "Name, Title"
+        name_line = lines[0]
+        parts = name_line.text.split(',')
+        if len(parts) >= 2:
+            result['full_name'] = parts[0].strip()
+            result['job_title'] = parts[1].strip()
+        else:
+            result['full_name'] = name_line.text
+    elif name_line is not None:
+        result['full_name'] = name_line.text
+
+    title_line = None
+    if not result['job_title']:
+        title_line = next(
+            (line for line in head if line is not name_line and line.has('title') and not line.is_contact),
+            None
+        )
+        if title_line is not None:
+            result['job_title'] = title_line.text
+
+    result['department'] = _first_keyword(
+        [line for line in head if line is not name_line and not line.is_contact], 'department'
+    )
+
+    taken = (name_line, title_line)
+    candidates = [line for line in head if line not in taken and not line.is_contact]
+    company_line = next((line for line in candidates if line.has('company')), None)
+    if company_line is None:
+        company_line = next(
+            (
+                line for line in candidates
+                if line.index < 4 and not line.is_address and not line.has('title') and len(line.text) > 3
+            ),
+            None
+        )
+    if company_line is not None:
+        result['company_name'] = company_line.text
+    return taken + (company_line,)
+
+
+def _resolve_phones(lines, result):
+    buckets = {'mobile': [], 'office': [], 'fax': []}
+    seen = set()
+    numbers = []
+    for card_line in lines:
+        numbers.extend(card_line.phones)
+        if card_line.whatsapp:
+            numbers.append((card_line.whatsapp, 'mobile'))
+    for number, label in numbers:
+        key = _phone_key(number)
+        if key in seen:
+            continue
+        seen.add(key)
+        buckets[_phone_kind(number, label)].append(number)
+
+    mobiles, offices = buckets['mobile'], buckets['office']
+    result['mobile_number'] = mobiles[0] if mobiles else None
+    result['office_landline'] = offices[0] if offices else None
+    result['fax_number'] = buckets['fax'][0] if buckets['fax'] else None
+    spare = mobiles[1:] + offices[1:]
+    result['alternate_phone'] = spare[0] if spare else None
+    result['whatsapp_number'] = next((line.whatsapp for line in lines if line.whatsapp), None)
+
+
+def _resolve_address(lines, result, skip):
+    """state, city, pincode, country and full_address - address-looking lines win"""
+    address_lines = [line for line in lines if line.is_address and not line.is_contact and line not in skip]
+    ranked = address_lines + [line for line in lines if line not in address_lines]
+
+    result['state'] = _first_keyword(ranked, 'state')
+    result['city'] = _first_keyword(ranked, 'city')
+    result['pincode'] = next((line.pincodes[0] for line in ranked if line.pincodes), None)
+    if result['state'] or result['city']:
+        result['country'] = 'India'
+    if address_lines:
+        result['full_address'] = ', '.join(line.text for line in address_lines)
+
+
+def empty_result():
+    return {
+        'success': True,
+        'full_name': None,
+        'company_name': None,
+        'job_title': None,
+        'department': None,
+        'mobile_number': None,
+        'alternate_phone': None,
+        'office_landline': None,
+        'fax_number': None,
+        'email_address': None,
+        'alternate_email': None,
+        'full_address': None,
+        'state': None,
+        'city': None,
+        'country': None,
+        'pincode': None,
+        'whatsapp_number': None,
+        'additional_notes': None
+    }
+
+
+def parse_card_text(raw_text: str) -> Dict:
+    """
+    Parse the OCR text of a business card.
+
+    Returns:
+        dict: the contact fields of BusinessCardOCRService.extract_contact_info
+    """
+    lines = tokenize(raw_text)
+    result = empty_result()
+
+    emails = list(dict.fromkeys(email for line in lines for email in line.emails))
+    if emails:
+        result['email_address'] = emails[0]
+        if len(emails) > 1:
+            result['alternate_email'] = emails[1]
+
+    people_lines = _resolve_people(lines, result)
+    _resolve_phones(lines, result)
+    _resolve_address(lines, result, people_lines)
+    return result
+
+
+# Single-field helpers (kept for BusinessCardOCRService's extract_* methods)
+
+def find_emails(text: str) -> List[str]:
+    return list(dict.fromkeys(email for line in tokenize(text) for email in line.emails))
+
+
+def find_phones(text: str) -> List[str]:
+    phones = {}
+    for card_line in tokenize(text):
+        for number, _ in card_line.phones:
+            phones.setdefault(_phone_key(number), number)
+    return sorted(phones.values(), key=len, reverse=True)
+
+
+def find_urls(text: str) -> List[str]:
+    return list(dict.fromkeys(URL_PATTERN.findall(text)))
+
+
+def find_social_links(text: str) -> Dict[str, str]:
+    social_links = {}
+
+    linkedin = LINKEDIN_PATTERN.search(text)
+    if linkedin:
+        link = linkedin.group(0)
+        social_links['linkedin'] = link if link.startswith('http') else f"https://{link}"
+
+    instagram = INSTAGRAM_PATTERN.search(text)
+    if instagram:
+        link = instagram.group(0).lstrip('@')
+        social_links['instagram'] = link if link.startswith('http') else f"https://instagram.com/{link.split('/')[-1]}"
+
+    facebook = FACEBOOK_PATTERN.search(text)
+    if facebook:
+        link = facebook.group(0)
+        social_links['facebook'] = link if link.startswith('http') else f"https://{link}"
+
+    whatsapp = next((line.whatsapp for line in tokenize(text) if line.whatsapp), None)
+    if whatsapp:
+        social_links['whatsapp'] = whatsapp
+    return social_links
+
+
+def find_address_components(text: str) -> Dict[str, Optional[str]]:
+    result = empty_result()
+    _resolve_address(tokenize(text), result, ())
+    return {key: result[key] for key in ('state', 'city', 'country', 'pincode')}
+
+
+def find_name_and_title(text_lines: List[str]) -> Dict[str, Optional[str]]:
+    result = empty_result()
+    _resolve_people(tokenize('\n'.join(text_lines)), result)
+    return {key: result[key] for key in ('full_name', 'job_title', 'department')}
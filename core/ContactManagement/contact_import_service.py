@@ -0,0 +1,391 @@
+"""
+Contact Import Service
+======================
+
+Batch business card import - hundreds of cards from one upload (a ZIP
+and/or several image files) become contacts without one request per card.
+
+- Upload: cards are stored under business_cards/ (they become the contacts'
+  business_card_image) and recorded on a ContactImportJob
+- Extract: every card is submitted to the OCR worker pool up front
+  (ocr_job_service), so the pool works through them in parallel; the regex
+  extractors run on each card's text in the worker. Pending cards are polled
+  with two cache round trips per poll, however many cards there are
+- Import: cards are deduplicated by normalized phone / email against the
+  admin's existing contacts (ONE query) and against earlier cards of the
+  batch, then created with one bulk_create
+
+Time Complexity: O(cards) OCR jobs spread over the pool, O(1) queries per poll/import
+"""
+
+import logging
+import os
+import re
+import zipfile
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Contact, ContactImportJob
+from .ocr_job_service import JOB_COMPLETED, JOB_FAILED, get_jobs, submit_extraction
+from utils.dashboard_stats_service import invalidate_dashboard_stats
+
+logger = logging.getLogger(__name__)
+
+
+CONTACT_IMAGE_DIR = 'business_cards'
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tif', '.tiff')
+DEFAULT_MAX_CARDS = 500
+MAX_IMAGE_BYTES = 15 * 1024 * 1024  # Per card - also bounds what a ZIP entry may expand to
+POLL_INTERVAL_SECONDS = 3
+EXTRACTION_TIMEOUT = timedelta(minutes=30)
+PROGRESS_SAVE_EVERY = 25  # Cards submitted between progress saves
+BULK_CREATE_BATCH_SIZE = 500
+
+# Extracted fields copied onto the contact
+CONTACT_FIELDS = (
+    'full_name', 'company_name', 'job_title', 'department',
+    'mobile_number', 'alternate_phone', 'office_landline', 'fax_number',
+    'email_address', 'alternate_email',
+    'full_address', 'state', 'city', 'country', 'pincode',
+    'whatsapp_number', 'additional_notes',
+)
+PHONE_FIELDS = ('mobile_number', 'alternate_phone', 'whatsapp_number')
+EMAIL_FIELDS = ('email_address', 'alternate_email')
+
+# Card statuses in ContactImportJob.items
+CARD_STORED = 'stored'
+CARD_QUEUED = 'queued'
+CARD_EXTRACTED = 'extracted'
+CARD_CREATED = 'created'
+CARD_DUPLICATE = 'duplicate'
+CARD_FAILED = 'failed'
+
+ACTIVE_STATUSES = ('pending', 'extracting', 'importing')
+
+CardImage = namedtuple('CardImage', ['filename', 'size', 'read'])
+
+
+def get_max_cards():
+    return getattr(settings, 'CONTACT_IMPORT_MAX_CARDS', DEFAULT_MAX_CARDS)
+
+
+# ==================== UPLOAD ====================
+
+def _is_image_name(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def list_card_images(files):
+    """
+    Card images in the uploaded files - ZIP archives are expanded.
+    Nothing is read yet, so limits can be checked before storing anything.
+
+    Raises:
+        ValueError: unsupported file or invalid ZIP
+    """
+    cards = []
+    for upload in files:
+        name = os.path.basename(upload.name or '')
+        if name.lower().endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(upload)
+            except zipfile.BadZipFile:
+                raise ValueError(f"{name} is not a valid ZIP file")
+            for info in archive.infolist():
+                entry_name = os.path.basename(info.filename)
+                # Skip folders, macOS resource forks and hidden files
+                if info.is_dir() or info.filename.startswith('__MACOSX/') or entry_name.startswith('.'):
+                    continue
+                if _is_image_name(entry_name):
+                    cards.append(CardImage(entry_name, info.file_size, lambda archive=archive, info=info: archive.read(info)))
+        elif _is_image_name(name) or (getattr(upload, 'content_type', '') or '').startswith('image/'):
+            cards.append(CardImage(name, upload.size, upload.read))
+        else:
+            raise ValueError(f"{name}: upload business card images or a ZIP of images")
+    return cards
+
+
+def create_import_job(admin, site, created_by, files):
+    """
+    Store the uploaded cards and create the job (not started).
+
+    Raises:
+        ValueError: no cards, too many cards, or unsupported files
+    """
+    cards = list_card_images(files)
+    if not cards:
+        raise ValueError("No business card images found in the upload")
+    max_cards = get_max_cards()
+    if len(cards) > max_cards:
+        raise ValueError(f"Too many cards ({len(cards)}). At most {max_cards} cards per import.")
+
+    items = []
+    for index, card in enumerate(cards):
+        item = {
+            'index': index, 'filename': card.filename, 'image': None, 'job_id': None,
+            'status': CARD_STORED, 'contact_id': None, 'duplicate_of': None, 'error': None,
+        }
+        if card.size > MAX_IMAGE_BYTES:
+            item['status'] = CARD_FAILED
+            item['error'] = f"Image is larger than {MAX_IMAGE_BYTES // (1024 * 1024)} MB"
+        else:
+            item['image'] = default_storage.save(f"{CONTACT_IMAGE_DIR}/{card.filename}", ContentFile(card.read()))
+        items.append(item)
+
+    failed = sum(1 for item in items if item['status'] == CARD_FAILED)
+    return ContactImportJob.objects.create(
+        admin=admin,
+        site=site,
+        created_by=created_by,
+        total_cards=len(items),
+        processed_cards=failed,
+        error_count=failed,
+        items=items,
+    )
+
+
+# ==================== EXTRACTION ====================
+
+def _apply_extraction(item, result):
+    """Record a finished OCR result on a card"""
+    if result.get('success'):
+        item['status'] = CARD_EXTRACTED
+        item['result'] = {field: result.get(field) for field in CONTACT_FIELDS}
+    else:
+        item['status'] = CARD_FAILED
+        item['error'] = result.get('error') or 'Failed to extract contact information'
+
+
+def _submit_card(item):
+    """Queue one card on the OCR pool (or take its cached result)"""
+    with default_storage.open(item['image'], 'rb') as image_file:
+        digest, result = submit_extraction(ContentFile(image_file.read(), name=item['filename']))
+    item['job_id'] = digest
+    if result is None:
+        item['status'] = CARD_QUEUED
+    else:
+        _apply_extraction(item, result)
+
+
+def _update_progress(job):
+    job.processed_cards = sum(1 for item in job.items if item['status'] not in (CARD_STORED, CARD_QUEUED))
+    job.error_count = sum(1 for item in job.items if item['status'] == CARD_FAILED)
+
+
+def _submit_cards(job):
+    """Stage 1 - fan every stored card out to the OCR pool"""
+    job.status = 'extracting'
+    job.started_at = job.started_at or timezone.now()
+    job.save(update_fields=['status', 'started_at', 'updated_at'])
+
+    for count, item in enumerate((item for item in job.items if item['status'] == CARD_STORED), 1):
+        try:
+            _submit_card(item)
+        except Exception as e:
+            item['status'] = CARD_FAILED
+            item['error'] = str(e)
+        if count % PROGRESS_SAVE_EVERY == 0:
+            # Progress heartbeat (cached / inline results show up while submitting)
+            _update_progress(job)
+            job.save(update_fields=['items', 'processed_cards', 'error_count', 'updated_at'])
+
+    _update_progress(job)
+    job.save(update_fields=['items', 'processed_cards', 'error_count', 'updated_at'])
+
+
+def _poll_cards(job):
+    """Stage 2 - collect finished OCR results; True once no card is pending"""
+    queued = [item for item in job.items if item['status'] == CARD_QUEUED]
+    polled = get_jobs([item['job_id'] for item in queued])
+    timed_out = job.started_at and timezone.now() - job.started_at > EXTRACTION_TIMEOUT
+
+    for item in queued:
+        state = polled.get(item['job_id'])
+        if state is None:
+            # Job state expired from the cache - submit again (cheap if the result is cached)
+            _submit_card(item)
+        elif state['status'] == JOB_COMPLETED:
+            _apply_extraction(item, state['result'])
+        elif state['status'] == JOB_FAILED:
+            _apply_extraction(item, {'success': False, 'error': state['error']})
+        elif timed_out:
+            item['status'] = CARD_FAILED
+            item['error'] = 'Timed out waiting for OCR - is an OCR worker running?'
+
+    _update_progress(job)
+    job.save(update_fields=['items', 'processed_cards', 'error_count', 'updated_at'])
+    return not any(item['status'] == CARD_QUEUED for item in job.items)
+
+
+# ==================== DEDUPLICATION / IMPORT ====================
+
+def normalize_phone(value):
+    """National number for matching - '+91 98765-43210' and '9876543210' are the same phone"""
+    digits = re.sub(r'\D', '', str(value or ''))
+    if len(digits) >= 10:
+        return digits[-10:]
+    return digits if len(digits) >= 7 else ''
+
+
+def normalize_email(value):
+    return str(value or '').strip().lower()
+
+
+def contact_keys(values):
+    """
+    Normalized phones and emails of a contact.
+
+    Args:
+        values: mapping with the contact fields
+
+    Returns:
+        set of ('phone', number) / ('email', address) keys
+    """
+    keys = {('phone', normalize_phone(values.get(field))) for field in PHONE_FIELDS}
+    keys |= {('email', normalize_email(values.get(field))) for field in EMAIL_FIELDS}
+    return {key for key in keys if key[1]}
+
+
+def existing_contact_keys(admin_id):
+    """{key: contact id} for every contact of the admin - ONE query"""
+    fields = ('id',) + PHONE_FIELDS + EMAIL_FIELDS
+    keys = {}
+    for row in Contact.objects.filter(admin_id=admin_id).values_list(*fields):
+        values = dict(zip(fields, row))
+        for key in contact_keys(values):
+            keys.setdefault(key, values['id'])
+    return keys
+
+
+def _build_contact(job, item):
+    values = {}
+    for field in CONTACT_FIELDS:
+        value = item['result'].get(field)
+        if value in (None, ''):
+            continue
+        value = str(value).strip()
+        max_length = Contact._meta.get_field(field).max_length
+        values[field] = value[:max_length] if max_length else value
+    values.setdefault('mobile_number', '')
+    return Contact(
+        admin_id=job.admin_id,
+        site_id=job.site_id,
+        created_by_id=job.created_by_id or job.admin_id,
+        source_type='scanned',
+        business_card_image=item['image'],
+        **values
+    )
+
+
+def _import_cards(job):
+    """Stage 3 - skip duplicates and bulk_create the remaining contacts"""
+    job.status = 'importing'
+    job.save(update_fields=['status', 'updated_at'])
+
+    known = existing_contact_keys(job.admin_id)  # key -> existing contact id
+    batch_owner = {}  # key -> earlier card of this batch
+    contacts = []
+    owners = []
+    discarded_images = []
+    for item in job.items:
+        if item['status'] == CARD_FAILED:
+            if item['image']:
+                discarded_images.append(item['image'])
+            continue
+        if item['status'] != CARD_EXTRACTED:
+            continue
+
+        keys = contact_keys(item['result'])
+        existing = next((known[key] for key in keys if key in known), None)
+        earlier = next((batch_owner[key] for key in keys if key in batch_owner), None)
+        if existing is not None or earlier is not None:
+            item['status'] = CARD_DUPLICATE
+            item['duplicate_of'] = existing
+            item['duplicate_of_card'] = earlier['index'] if earlier is not None and existing is None else None
+            discarded_images.append(item['image'])
+            continue
+
+        for key in keys:
+            batch_owner[key] = item
+        contacts.append(_build_contact(job, item))
+        owners.append(item)
+
+    with transaction.atomic():
+        created = Contact.objects.bulk_create(contacts, batch_size=BULK_CREATE_BATCH_SIZE)
+        for item, contact in zip(owners, created):
+            item['status'] = CARD_CREATED
+            item['contact_id'] = contact.pk
+            item.pop('result', None)
+        # In-batch duplicates point at the contact created from the earlier card
+        for item in job.items:
+            if item.get('duplicate_of_card') is not None:
+                item['duplicate_of'] = job.items[item['duplicate_of_card']].get('contact_id')
+
+        job.created_count = len(created)
+        job.duplicate_count = sum(1 for item in job.items if item['status'] == CARD_DUPLICATE)
+        job.status = 'completed'
+        job.message = (
+            f"Created {job.created_count} contact(s), skipped {job.duplicate_count} duplicate(s), "
+            f"{job.error_count} card(s) failed"
+        )
+        job.completed_at = timezone.now()
+        job.save(update_fields=[
+            'items', 'created_count', 'duplicate_count', 'status', 'message', 'completed_at', 'updated_at'
+        ])
+        # bulk_create skips post_save - refresh the contacts dashboard explicitly
+        invalidate_dashboard_stats('contacts', [job.admin_id])
+        transaction.on_commit(lambda: _delete_images(discarded_images))
+
+
+def _delete_images(paths):
+    for path in paths:
+        try:
+            default_storage.delete(path)
+        except Exception as e:
+            logger.warning(f"Could not delete business card image {path}: {str(e)}")
+
+
+# ==================== JOB ====================
+
+def advance_import_job(job_id):
+    """
+    Move a job forward as far as possible without waiting.
+
+    Submits stored cards, collects finished OCR results and - once no card is
+    pending - imports the contacts. Call again while the job is active.
+
+    Returns:
+        ContactImportJob
+    """
+    job = ContactImportJob.objects.get(id=job_id)
+    if job.status not in ACTIVE_STATUSES:
+        return job
+
+    try:
+        if job.status == 'pending':
+            _submit_cards(job)
+        if job.status == 'extracting' and _poll_cards(job):
+            _import_cards(job)
+        elif job.status == 'importing':
+            _import_cards(job)  # Interrupted import - nothing was committed
+    except Exception as e:
+        logger.exception(f"Contact import job {job_id} failed")
+        job.status = 'failed'
+        job.message = f"Error importing business cards: {str(e)}"
+        job.save(update_fields=['status', 'message', 'updated_at'])
+
+    return job
+
+
+def card_progress(job):
+    """Per-card progress for API responses (extracted fields left out)"""
+    return [
+        {key: value for key, value in item.items() if key not in ('result', 'duplicate_of_card')}
+        for item in job.items
+    ]
@@ -0,0 +1,50 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ContactManagement.card_parser import parse_card_text
+
+
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    'ocr_corpus', 'business_cards.json'
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure business card text parser throughput in lines/sec over a corpus of OCR outputs. '
+        'No OCR engine needed. Field accuracy is covered by the ContactManagement tests.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--corpus', default=DEFAULT_CORPUS,
+            help='JSON list of {"text": ...} cards (default: ocr_corpus/business_cards.json)'
+        )
+        parser.add_argument('--iterations', type=int, default=200, help='Passes over the corpus for the timing run')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['corpus'], encoding='utf-8') as f:
+                corpus = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not load corpus {options["corpus"]}: {str(e)}')
+        if not corpus:
+            raise CommandError('Corpus is empty')
+
+        texts = [card['text'] for card in corpus]
+        line_count = sum(1 for text in texts for line in text.split('\n') if line.strip())
+        iterations = max(options['iterations'], 1)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for text in texts:
+                parse_card_text(text)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f'{len(texts)} card(s), {line_count} line(s)'))
+        self.stdout.write(
+            f'  throughput {line_count * iterations / elapsed:,.0f} lines/sec   '
+            f'{len(texts) * iterations / elapsed:,.0f} cards/sec   ({iterations} pass(es))'
+        )
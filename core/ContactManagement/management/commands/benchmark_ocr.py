@@ -0,0 +1,132 @@
+import multiprocessing
+import os
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ContactManagement.ocr_service import OCR_AVAILABLE
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.tif', '.tiff')
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _setup_worker(preload):
+    """Pool initializer - spawned processes start without Django"""
+    import django
+
+    django.setup()
+    if preload:
+        from ContactManagement.ocr_service import get_reader
+
+        get_reader()
+
+
+def _ping(_):
+    return os.getpid()
+
+
+def _extract(args):
+    path, max_side = args
+    from ContactManagement.ocr_service import BusinessCardOCRService
+
+    result = BusinessCardOCRService().extract_contact_info(path, max_side=max_side)
+    return bool(result.get('success')), _peak_rss_mb()
+
+
+def _inline_run(args):
+    """Old request-path behaviour: cold model load in the worker, full-size images"""
+    paths, max_side = args
+    from ContactManagement.ocr_service import BusinessCardOCRService, get_reader
+
+    start = time.perf_counter()
+    get_reader()
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    succeeded = 0
+    for path in paths:
+        result = BusinessCardOCRService().extract_contact_info(path, max_side=max_side)
+        succeeded += bool(result.get('success'))
+    return load_seconds, time.perf_counter() - start, succeeded, _peak_rss_mb()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark business card OCR on a folder of sample cards: cards/sec and memory for '
+        'in-request extraction (cold model, full-size images) vs a warm worker pool with '
+        'downsized grayscale images. Needs EasyOCR or Tesseract installed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('folder', help='Folder of business card images')
+        parser.add_argument('--workers', type=int, default=2, help='OCR pool processes (default: 2)')
+        parser.add_argument(
+            '--max-side', type=int, default=None,
+            help='Longest side fed to OCR in the pool (default: settings.OCR_MAX_IMAGE_SIDE)'
+        )
+        parser.add_argument('--limit', type=int, default=0, help='Only use the first N images')
+
+    def handle(self, *args, **options):
+        if not OCR_AVAILABLE:
+            raise CommandError('No OCR engine installed - pip install easyocr (or pytesseract + Tesseract)')
+
+        folder = options['folder']
+        if not os.path.isdir(folder):
+            raise CommandError(f'{folder} is not a folder')
+        paths = sorted(
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if options['limit']:
+            paths = paths[:options['limit']]
+        if not paths:
+            raise CommandError(f'No images found in {folder}')
+
+        max_side = options['max_side'] if options['max_side'] is not None else settings.OCR_MAX_IMAGE_SIDE
+        workers = max(options['workers'], 1)
+        # spawn - every process starts clean, like a separate gunicorn / Celery worker
+        context = multiprocessing.get_context('spawn')
+
+        self.stdout.write(self.style.SUCCESS(f'{len(paths)} card(s), CPU count: {os.cpu_count()}'))
+
+        with context.Pool(1, initializer=_setup_worker, initargs=(False,)) as pool:
+            load_seconds, elapsed, succeeded, rss = pool.map(_inline_run, [(paths, 0)])[0]
+        self.stdout.write(
+            f'  in-request   {len(paths) / elapsed:>7.2f} cards/sec   model load {load_seconds:.1f}s   '
+            f'worker RSS {self.format_mb(rss)}   ({succeeded}/{len(paths)} extracted)'
+        )
+
+        with context.Pool(workers, initializer=_setup_worker, initargs=(True,)) as pool:
+            # Wait until every process has loaded the model - throughput is measured warm
+            start = time.perf_counter()
+            pool.map(_ping, range(workers), chunksize=1)
+            warm_up = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = pool.map(_extract, [(path, max_side) for path in paths], chunksize=1)
+            elapsed = time.perf_counter() - start
+        succeeded = sum(success for success, _ in results)
+        pool_rss = max((rss for _, rss in results if rss is not None), default=None)
+        self.stdout.write(
+            f'  pool x{workers:<4} {len(paths) / elapsed:>7.2f} cards/sec   warm-up {warm_up:.1f}s   '
+            f'OCR worker RSS {self.format_mb(pool_rss)}   max side {max_side or "full"}   '
+            f'({succeeded}/{len(paths)} extracted)'
+        )
+        # This process only queues jobs, like a web worker with the pool in place
+        self.stdout.write(f'  web worker RSS (queues jobs only) {self.format_mb(_peak_rss_mb())}')
+
+    def format_mb(self, value):
+        return f'{value:.0f} MB' if value is not None else 'n/a'
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ContactManagement.contact_import_service import ACTIVE_STATUSES, POLL_INTERVAL_SECONDS, advance_import_job
+from ContactManagement.models import ContactImportJob
+
+
+class Command(BaseCommand):
+    help = (
+        'Run or resume a batch business card import job in this process. '
+        'Cards still go to the OCR worker pool (or are extracted inline with OCR_WORKER_ENABLED=False).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_id', help='ContactImportJob id to run / resume')
+
+    def handle(self, *args, **options):
+        if not ContactImportJob.objects.filter(id=options['job_id']).exists():
+            raise CommandError(f'Job not found: {options["job_id"]}')
+
+        job = advance_import_job(options['job_id'])
+        while job.status in ACTIVE_STATUSES:
+            self.stdout.write(f'{job.status}: {job.processed_cards}/{job.total_cards} card(s) processed')
+            time.sleep(POLL_INTERVAL_SECONDS)
+            job = advance_import_job(job.id)
+
+        style = self.style.SUCCESS if job.status == 'completed' else self.style.ERROR
+        self.stdout.write(style(f'{job.status}: {job.message}'))
+        for item in job.items:
+            if item['status'] == 'failed':
+                self.stdout.write(f'  {item["filename"]}: {item["error"]}')
@@ -1,6 +1,8 @@
 """
 Contact Management Models
 """
+import uuid
+
 from django.db import models
 from django.utils.timezone import now
 from AuthN.models import BaseUserModel
@@ -100,3 +102,48 @@ class Contact(models.Model):
     
     def __str__(self):
         return f"{self.full_name or 'Unnamed Contact'} - {self.company_name or 'No Company'}"
+
+
+class ContactImportJob(models.Model):
+    """
+    Batch business card import (ZIP or multi-file upload).
+
+    Every card is sent to the OCR worker pool in parallel; per-card progress
+    is kept in `items`. Once every card is extracted, contacts matching an
+    existing contact (or an earlier card) by normalized phone/email are
+    skipped and the rest are created with one bulk_create.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('extracting', 'Extracting'),
+        ('importing', 'Importing'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    admin = models.ForeignKey(BaseUserModel, on_delete=models.CASCADE, limit_choices_to={'role': 'admin'}, related_name='contact_import_jobs')
+    site = models.ForeignKey(Site, on_delete=models.SET_NULL, null=True, blank=True, related_name='contact_import_jobs')
+    created_by = models.ForeignKey(BaseUserModel, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_contact_import_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total_cards = models.PositiveIntegerField(default=0)
+    processed_cards = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    items = models.JSONField(default=list, blank=True, help_text="Per-card progress: filename, image, job_id, status, contact_id, error")
+    message = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # Job list per admin - O(1) queries
+            models.Index(fields=['admin', '-created_at'], name='contact_import_admin_idx'),
+        ]
+
+    def __str__(self):
+        return f"Contact import {self.id} - {self.status}"
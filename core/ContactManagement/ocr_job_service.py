@@ -0,0 +1,171 @@
+"""
+Business card OCR jobs
+Keeps OCR out of web workers: the upload is stored, a job is queued on the
+dedicated 'ocr' Celery queue, and the client polls for the result.
+
+- Job id = SHA-256 of the image bytes, so the same card uploaded twice (or
+  while its first job is still running) never runs OCR twice
+- Results are cached by that hash for OCR_RESULT_CACHE_TIMEOUT
+- OCR workers load the EasyOCR model once per process (ocr_service.get_reader)
+
+Run the pool with:
+    celery -A core worker -Q ocr -c <processes> -n ocr@%h
+
+With OCR_WORKER_ENABLED=False (or the broker unreachable) extraction runs
+inline in the request, as before.
+"""
+import hashlib
+import logging
+import os
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from .ocr_service import BusinessCardOCRService
+
+
+logger = logging.getLogger(__name__)
+
+OCR_UPLOAD_DIR = 'ocr_jobs'
+DEFAULT_RESULT_CACHE_TIMEOUT = 7 * 24 * 60 * 60  # 7 days
+JOB_STATE_TIMEOUT = 60 * 60  # Pending / failed job state - 1 hour
+
+JOB_PENDING = 'pending'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+
+def image_digest(image_bytes):
+    """Content hash used as job id and result cache key"""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def _result_key(digest):
+    return f"ocr_result_{digest}"
+
+
+def _job_key(digest):
+    return f"ocr_job_{digest}"
+
+
+def _result_timeout():
+    return getattr(settings, 'OCR_RESULT_CACHE_TIMEOUT', DEFAULT_RESULT_CACHE_TIMEOUT)
+
+
+def _worker_enabled():
+    return getattr(settings, 'OCR_WORKER_ENABLED', True)
+
+
+def _store_result(digest, result):
+    """Cache a finished extraction - failures only briefly so a retry can succeed"""
+    if result.get('success'):
+        cache.set(_result_key(digest), result, _result_timeout())
+        cache.delete(_job_key(digest))
+    else:
+        cache.set(_job_key(digest), {'status': JOB_FAILED, 'error': result.get('error')}, JOB_STATE_TIMEOUT)
+
+
+def run_extraction(digest, image_file):
+    """Extract and cache one card - called by the OCR worker (or inline)"""
+    result = BusinessCardOCRService().extract_contact_info(image_file)
+    _store_result(digest, result)
+    return result
+
+
+def submit_extraction(image_file):
+    """
+    Get the extraction for an uploaded card - cached, queued or inline.
+
+    Returns:
+        tuple: (job_id, result dict or None while the job is pending)
+    """
+    image_bytes = image_file.read()
+    digest = image_digest(image_bytes)
+
+    result = cache.get(_result_key(digest))
+    if result is not None:
+        return digest, result
+
+    if not _worker_enabled():
+        return digest, run_extraction(digest, ContentFile(image_bytes))
+
+    # cache.add is atomic - concurrent uploads of the same card queue one job
+    if not cache.add(_job_key(digest), {'status': JOB_PENDING}, JOB_STATE_TIMEOUT):
+        job = cache.get(_job_key(digest)) or {}
+        if job.get('status') == JOB_PENDING:
+            return digest, None
+        cache.set(_job_key(digest), {'status': JOB_PENDING}, JOB_STATE_TIMEOUT)  # Retry a failed job
+
+    from .tasks import extract_business_card
+
+    extension = os.path.splitext(getattr(image_file, 'name', '') or '')[1].lower() or '.jpg'
+    try:
+        path = default_storage.save(f"{OCR_UPLOAD_DIR}/{digest}{extension}", ContentFile(image_bytes))
+    except Exception:
+        cache.delete(_job_key(digest))  # Never leave a job pending that nobody will run
+        raise
+
+    try:
+        extract_business_card.delay(digest, path)  # Routed to the 'ocr' queue (CELERY_TASK_ROUTES)
+    except Exception as e:
+        # Broker down - fall back to extracting in the request
+        logger.warning(f"Could not queue OCR job {digest}: {str(e)}")
+        default_storage.delete(path)
+        return digest, run_extraction(digest, ContentFile(image_bytes))
+    return digest, None
+
+
+def process_job(digest, path):
+    """Worker side of a queued job - the stored upload is removed afterwards"""
+    try:
+        with default_storage.open(path, 'rb') as image_file:
+            return run_extraction(digest, image_file)
+    except Exception as e:
+        result = {'success': False, 'error': str(e), 'raw_text': None}
+        _store_result(digest, result)
+        return result
+    finally:
+        default_storage.delete(path)
+
+
+def get_job(digest):
+    """
+    Poll a job.
+
+    Returns:
+        dict: {'status': pending|completed|failed, 'result', 'error'} or None if unknown/expired
+    """
+    result = cache.get(_result_key(digest))
+    if result is not None:
+        return {'status': JOB_COMPLETED, 'result': result, 'error': None}
+    job = cache.get(_job_key(digest))
+    if job is None:
+        return None
+    return {'status': job['status'], 'result': None, 'error': job.get('error')}
+
+
+def get_jobs(digests):
+    """
+    Poll many jobs with two cache round trips (batch imports).
+
+    Returns:
+        dict: {digest: get_job() dict or None}
+    """
+    digests = list(dict.fromkeys(digests))
+    results = cache.get_many([_result_key(digest) for digest in digests])
+    missing = [digest for digest in digests if _result_key(digest) not in results]
+    jobs = cache.get_many([_job_key(digest) for digest in missing]) if missing else {}
+
+    polled = {}
+    for digest in digests:
+        result = results.get(_result_key(digest))
+        job = jobs.get(_job_key(digest))
+        if result is not None:
+            polled[digest] = {'status': JOB_COMPLETED, 'result': result, 'error': None}
+        elif job is not None:
+            polled[digest] = {'status': job['status'], 'result': None, 'error': job.get('error')}
+        else:
+            polled[digest] = None
+    return polled
@@ -2,7 +2,7 @@
 Contact Management Serializers
 """
 from rest_framework import serializers
-from .models import Contact
+from .models import Contact, ContactImportJob
 from AuthN.models import BaseUserModel
 
 
@@ -114,3 +114,25 @@ class ContactExtractionResultSerializer(serializers.Serializer):
     whatsapp_number = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     additional_notes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
 
+
+
+class ContactImportJobSerializer(serializers.ModelSerializer):
+    """Read-only progress view of a batch business card import"""
+    site_name = serializers.CharField(source='site.site_name', read_only=True, default=None)
+    cards = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ContactImportJob
+        fields = [
+            'id', 'admin', 'site', 'site_name', 'status', 'total_cards', 'processed_cards',
+            'created_count', 'duplicate_count', 'error_count', 'message', 'cards',
+            'started_at', 'completed_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+    def get_cards(self, obj):
+        if not self.context.get('include_cards', True):
+            return None
+        from .contact_import_service import card_progress
+
+        return card_progress(obj)
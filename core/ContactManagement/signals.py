@@ -0,0 +1,16 @@
+"""
+ContactManagement Signals
+Invalidates cached dashboard statistics when contacts are written
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Contact
+from utils.dashboard_stats_service import invalidate_dashboard_stats
+
+
+@receiver(post_save, sender=Contact)
+@receiver(post_delete, sender=Contact)
+def invalidate_contact_dashboard_stats(sender, instance, **kwargs):
+    """Bump the admin's contacts dashboard version once the write commits"""
+    invalidate_dashboard_stats('contacts', [instance.admin_id])
@@ -0,0 +1,53 @@
+"""
+Celery Tasks for ContactManagement
+Business card OCR runs on the dedicated 'ocr' queue so the EasyOCR model is
+only ever loaded by OCR workers, once per worker process.
+"""
+
+from celery import shared_task
+from celery.signals import worker_process_init
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@worker_process_init.connect
+def preload_ocr_reader(**kwargs):
+    """
+    Load the OCR model when a pool process starts instead of on its first job.
+    Only for OCR workers - started with OCR_WORKER_PRELOAD=True.
+    """
+    if getattr(settings, 'OCR_WORKER_PRELOAD', False):
+        from .ocr_service import get_reader
+
+        get_reader()
+
+
+@shared_task(name='extract_business_card')
+def extract_business_card(digest, path):
+    """
+    Extract contact details from a stored business card upload.
+    Result is cached by image hash - see ocr_job_service
+    """
+    from .ocr_job_service import process_job
+
+    result = process_job(digest, path)
+    logger.info(f"OCR job {digest}: {'completed' if result.get('success') else 'failed'}")
+    return {"job_id": digest, "success": bool(result.get('success'))}
+
+
+@shared_task(bind=True, name='run_contact_import_job')
+def run_contact_import_job(self, job_id):
+    """
+    Drive a batch business card import.
+    Re-queues itself every few seconds while cards are still on the OCR pool
+    """
+    from .contact_import_service import ACTIVE_STATUSES, POLL_INTERVAL_SECONDS, advance_import_job
+
+    job = advance_import_job(job_id)
+    if job.status in ACTIVE_STATUSES:
+        self.apply_async(args=[job_id], countdown=POLL_INTERVAL_SECONDS)
+    else:
+        logger.info(f"Contact import job {job_id}: {job.status} - {job.message}")
+    return {"status": job.status, "job_id": str(job.id), "processed": job.processed_cards}
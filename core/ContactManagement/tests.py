@@ -0,0 +1,125 @@
+import json
+import os
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from utils.fixture_utils import create_tenant
+from . import contact_import_service
+from .card_parser import parse_card_text
+from .contact_import_service import CARD_CREATED, CARD_DUPLICATE, CARD_EXTRACTED, CARD_FAILED
+from .models import Contact, ContactImportJob
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ocr_corpus', 'business_cards.json')
+
+
+class CardParserCorpusTests(SimpleTestCase):
+    """card_parser.parse_card_text - every labelled field of the OCR corpus"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with open(CORPUS, encoding='utf-8') as f:
+            cls.corpus = json.load(f)
+
+    def test_corpus_is_labelled(self):
+        self.assertTrue(self.corpus)
+        for number, card in enumerate(self.corpus, start=1):
+            with self.subTest(card=number):
+                self.assertTrue(card['text'].strip())
+                self.assertTrue(card['expected'])
+
+    def test_labelled_fields(self):
+        for number, card in enumerate(self.corpus, start=1):
+            result = parse_card_text(card['text'])
+            for field, expected in card['expected'].items():
+                with self.subTest(card=number, field=field):
+                    self.assertEqual(result.get(field), expected)
+
+
+class ContactImportDedupTests(TestCase):
+    """contact_import_service - cards deduplicated by normalized phone / email on import"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        admin = cls.tenant['admin']
+        cls.existing = Contact.objects.create(
+            admin=admin, site=cls.tenant['site'], created_by=admin, full_name='Anita Rao',
+            mobile_number='+91 98765-43210', email_address='Anita@Acme.in',
+        )
+
+    def import_cards(self, *results):
+        """Import extracted cards - a None result is a card whose extraction failed"""
+        items = []
+        for index, result in enumerate(results):
+            item = {
+                'index': index, 'filename': f'card{index}.jpg', 'image': f'business_cards/card{index}.jpg',
+                'job_id': None, 'status': CARD_EXTRACTED, 'contact_id': None, 'duplicate_of': None, 'error': None,
+            }
+            if result is None:
+                item.update(status=CARD_FAILED, error='Failed to extract contact information')
+            else:
+                item['result'] = result
+            items.append(item)
+        job = ContactImportJob.objects.create(
+            admin=self.tenant['admin'], site=self.tenant['site'], created_by=self.tenant['admin'],
+            status='importing', total_cards=len(items), processed_cards=len(items), items=items,
+        )
+        with mock.patch.object(contact_import_service, 'default_storage') as storage:
+            with self.captureOnCommitCallbacks(execute=True):
+                job = contact_import_service.advance_import_job(job.id)
+        self.deleted_images = [call.args[0] for call in storage.delete.call_args_list]
+        return job
+
+    def test_normalized_phone_matches_existing_contact(self):
+        job = self.import_cards({'full_name': 'A. Rao', 'whatsapp_number': '09876543210'})
+        self.assertEqual(job.items[0]['status'], CARD_DUPLICATE)
+        self.assertEqual(job.items[0]['duplicate_of'], self.existing.id)
+        self.assertEqual((job.created_count, job.duplicate_count), (0, 1))
+        self.assertEqual(self.deleted_images, ['business_cards/card0.jpg'])
+
+    def test_normalized_email_matches_existing_contact(self):
+        job = self.import_cards({'full_name': 'Anita', 'alternate_email': '  anita@acme.IN '})
+        self.assertEqual(job.items[0]['status'], CARD_DUPLICATE)
+        self.assertEqual(Contact.objects.filter(admin=self.tenant['admin']).count(), 1)
+
+    def test_duplicates_within_the_batch_point_at_the_earlier_card(self):
+        job = self.import_cards(
+            {'full_name': 'Vikram Shah', 'mobile_number': '+91 91234 56789'},
+            {'full_name': 'Vikram S', 'alternate_phone': '9123456789'},
+            {'full_name': 'Meera Iyer', 'email_address': 'meera@example.com'},
+            {'full_name': 'M. Iyer', 'email_address': 'MEERA@example.com'},
+        )
+        statuses = [item['status'] for item in job.items]
+        self.assertEqual(statuses, [CARD_CREATED, CARD_DUPLICATE, CARD_CREATED, CARD_DUPLICATE])
+        self.assertEqual(job.items[1]['duplicate_of'], job.items[0]['contact_id'])
+        self.assertEqual(job.items[3]['duplicate_of'], job.items[2]['contact_id'])
+        self.assertEqual((job.created_count, job.duplicate_count, job.status), (2, 2, 'completed'))
+        self.assertEqual(
+            set(Contact.objects.filter(admin=self.tenant['admin'], source_type='scanned').values_list('full_name', flat=True)),
+            {'Vikram Shah', 'Meera Iyer'},
+        )
+        self.assertEqual(self.deleted_images, ['business_cards/card1.jpg', 'business_cards/card3.jpg'])
+
+    def test_cards_without_keys_are_not_duplicates(self):
+        job = self.import_cards(
+            {'full_name': 'No Contact Details', 'mobile_number': '12-34'},  # Too short to match on
+            {'full_name': 'No Contact Details', 'mobile_number': '12-34'},
+        )
+        self.assertEqual([item['status'] for item in job.items], [CARD_CREATED, CARD_CREATED])
+
+    def test_other_admins_contacts_are_not_duplicates(self):
+        other = create_tenant()
+        Contact.objects.create(
+            admin=other['admin'], site=other['site'], created_by=other['admin'], full_name='Ravi',
+            mobile_number='9000000001',
+        )
+        job = self.import_cards({'full_name': 'Ravi', 'mobile_number': '+91 90000 00001'})
+        self.assertEqual(job.items[0]['status'], CARD_CREATED)
+
+    def test_failed_cards_are_skipped_and_their_images_discarded(self):
+        job = self.import_cards(None, {'full_name': 'Lata', 'mobile_number': '9000000002'})
+        self.assertEqual([item['status'] for item in job.items], [CARD_FAILED, CARD_CREATED])
+        self.assertEqual(job.created_count, 1)
+        self.assertEqual(self.deleted_images, ['business_cards/card0.jpg'])
@@ -3,7 +3,8 @@ Contact Management URLs
 """
 from django.urls import path
 from .views import (
-    ContactAPIView, ContactExtractAPIView, ContactStatsAPIView
+    ContactAPIView, ContactExtractAPIView, ContactExtractJobAPIView, ContactStatsAPIView,
+    ContactImportAPIView, ContactImportJobAPIView
 )
 
 urlpatterns = [
@@ -15,6 +16,12 @@ urlpatterns = [
     # OCR Extraction
     path('contact-extract/<uuid:site_id>/', ContactExtractAPIView.as_view(), name='contact-extract'),
     path('contact-extract-by-user/<uuid:site_id>/<uuid:user_id>/', ContactExtractAPIView.as_view(), name='contact-extract-by-user'),
+    path('contact-extract-job/<uuid:site_id>/<str:job_id>/', ContactExtractJobAPIView.as_view(), name='contact-extract-job'),
+    path('contact-extract-job-by-user/<uuid:site_id>/<uuid:user_id>/<str:job_id>/', ContactExtractJobAPIView.as_view(), name='contact-extract-job-by-user'),
+    
+    # Batch business card import
+    path('contact-import/<uuid:site_id>/', ContactImportAPIView.as_view(), name='contact-import'),
+    path('contact-import-job/<uuid:site_id>/<uuid:job_id>/', ContactImportJobAPIView.as_view(), name='contact-import-job'),
     
     # Statistics
     path('contact-stats/<uuid:site_id>/', ContactStatsAPIView.as_view(), name='contact-stats'),
@@ -10,120 +10,80 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.db import transaction
-from django.db.models import Q, Count
+from django.db.models import Q
 from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.utils import timezone
 from datetime import datetime, timedelta, time
+import logging
 
-from .models import Contact
+from .models import Contact, ContactImportJob
 from .serializers import (
-    ContactSerializer, ContactCreateSerializer, ContactExtractionResultSerializer
+    ContactSerializer, ContactCreateSerializer, ContactExtractionResultSerializer,
+    ContactImportJobSerializer
 )
-from .ocr_service import BusinessCardOCRService
-from AuthN.models import BaseUserModel, AdminProfile
-from SiteManagement.models import Site
+from .contact_import_service import create_import_job
+from .ocr_job_service import JOB_FAILED, JOB_PENDING, get_job, submit_extraction
+from AuthN.models import BaseUserModel
 from utils.pagination_utils import CustomPagination
 from utils.site_filter_utils import filter_queryset_by_site
+from utils.tenant_utils import get_admin_and_site_or_response
+from utils.dashboard_stats_service import get_dashboard_stats
 
+logger = logging.getLogger(__name__)
 
-def get_admin_and_site_optimized(request, site_id):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Returns: (admin, site) tuple or Response with error
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+
+def extraction_response(extraction_result):
+    """Response for a finished OCR extraction (sync or polled)"""
+    if not extraction_result.get('success'):
+        return Response({
+            "status": status.HTTP_400_BAD_REQUEST,
+            "message": extraction_result.get('error', 'Failed to extract contact information'),
+            "data": None
+        }, status=status.HTTP_400_BAD_REQUEST)
     
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        # Uses index on (user_id, organization_id) if exists, else (user_id)
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+    # Remove success and error fields for response (copy - the result may be cached)
+    extraction_result = dict(extraction_result)
+    extraction_result.pop('success', None)
+    extraction_result.pop('error', None)
     
-    else:
-        return None, None, Response({
-            "status": status.HTTP_403_FORBIDDEN,
-            "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-            "data": None
-        }, status=status.HTTP_403_FORBIDDEN)
+    # Serialize the result
+    serializer = ContactExtractionResultSerializer(data=extraction_result)
+    if serializer.is_valid():
+        return Response({
+            "status": status.HTTP_200_OK,
+            "message": "Contact information extracted successfully",
+            "data": serializer.validated_data
+        })
+    return Response({
+        "status": status.HTTP_200_OK,
+        "message": "Contact information extracted with some validation issues",
+        "data": extraction_result
+    })
+
+
+def pending_job_response(job_id):
+    """202 for an OCR job still queued / running"""
+    return Response({
+        "status": status.HTTP_202_ACCEPTED,
+        "message": "Business card queued for extraction. Poll the job for the result.",
+        "data": {"job_id": job_id, "status": JOB_PENDING}
+    }, status=status.HTTP_202_ACCEPTED)
 
 
 class ContactExtractAPIView(APIView):
     """
     Extract contact information from business card image using OCR
     Optimized with O(1) admin/site validation
+    - OCR runs on the dedicated OCR worker pool, not in the request
+    - 200 with the result when this image was already extracted (cached by content hash)
+    - 202 with job_id otherwise - poll ContactExtractJobAPIView
     """
     permission_classes = [IsAuthenticated]
     
     def post(self, request, site_id, user_id=None):
-        """Extract contact details from uploaded business card image"""
+        """Queue contact extraction for an uploaded business card image"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -144,46 +104,165 @@ class ContactExtractAPIView(APIView):
                     "data": None
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Initialize OCR service
-            ocr_service = BusinessCardOCRService()
+            job_id, extraction_result = submit_extraction(image_file)
+            if extraction_result is None:
+                return pending_job_response(job_id)
+            return extraction_response(extraction_result)
+                
+        except Exception as e:
+            return Response({
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": f"Error extracting contact information: {str(e)}",
+                "data": None
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ContactExtractJobAPIView(APIView):
+    """
+    Poll a business card extraction job - cache lookups only, no OCR
+    - 202 while pending, 200 with the extracted fields, 400 if extraction failed
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, site_id, job_id, user_id=None):
+        try:
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+            if error_response:
+                return error_response
             
-            # Extract contact information
-            extraction_result = ocr_service.extract_contact_info(image_file)
+            job = get_job(job_id)
+            if job is None:
+                return Response({
+                    "status": status.HTTP_404_NOT_FOUND,
+                    "message": "Extraction job not found or expired - upload the card again",
+                    "data": None
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            if job['status'] == JOB_PENDING:
+                return pending_job_response(job_id)
+            if job['status'] == JOB_FAILED:
+                return extraction_response({'success': False, 'error': job['error']})
+            return extraction_response(job['result'])
+        except Exception as e:
+            return Response({
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": f"Error fetching extraction job: {str(e)}",
+                "data": None
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ContactImportAPIView(APIView):
+    """
+    Batch business card import
+    POST - ZIP (`file`) and/or several images (`business_card_images`); cards are
+           stored, OCR'd in parallel on the OCR worker pool, deduplicated against
+           existing contacts by phone/email and created in bulk. Returns the job (202)
+    GET  - recent import jobs of the admin (without per-card details)
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, site_id):
+        try:
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+            if error_response:
+                return error_response
             
-            if not extraction_result.get('success'):
+            # O(1) query using index contact_import_admin_idx
+            jobs = ContactImportJob.objects.filter(admin_id=admin.id).select_related('site').defer('items')[:50]
+            return Response({
+                "status": status.HTTP_200_OK,
+                "message": "Contact import jobs fetched successfully",
+                "data": ContactImportJobSerializer(jobs, many=True, context={'include_cards': False}).data
+            })
+        except Exception as e:
+            return Response({
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": str(e),
+                "data": None
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    
+    def post(self, request, site_id):
+        try:
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+            if error_response:
+                return error_response
+            
+            files = request.FILES.getlist('file') + request.FILES.getlist('business_card_images')
+            if not files:
                 return Response({
                     "status": status.HTTP_400_BAD_REQUEST,
-                    "message": extraction_result.get('error', 'Failed to extract contact information'),
+                    "message": "Upload a ZIP of business cards (file) or card images (business_card_images)",
                     "data": None
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Remove success and error fields for response
-            extraction_result.pop('success', None)
-            extraction_result.pop('error', None)
-            
-            # Serialize the result
-            serializer = ContactExtractionResultSerializer(data=extraction_result)
-            if serializer.is_valid():
+            try:
+                job = create_import_job(admin, site, request.user, files)
+            except ValueError as e:
                 return Response({
-                    "status": status.HTTP_200_OK,
-                    "message": "Contact information extracted successfully",
-                    "data": serializer.validated_data
-                })
-            else:
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": str(e),
+                    "data": None
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            message = _enqueue_contact_import(job)
+            return Response({
+                "status": status.HTTP_202_ACCEPTED,
+                "message": message,
+                "data": ContactImportJobSerializer(job).data
+            }, status=status.HTTP_202_ACCEPTED)
+        except Exception as e:
+            return Response({
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": f"Error importing business cards: {str(e)}",
+                "data": None
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ContactImportJobAPIView(APIView):
+    """Progress of a batch business card import, per card"""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request, site_id, job_id):
+        try:
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+            if error_response:
+                return error_response
+            
+            # O(1) query using primary key
+            job = ContactImportJob.objects.select_related('site').filter(id=job_id, admin_id=admin.id).first()
+            if job is None:
                 return Response({
-                    "status": status.HTTP_200_OK,
-                    "message": "Contact information extracted with some validation issues",
-                    "data": extraction_result
-                })
-                
+                    "status": status.HTTP_404_NOT_FOUND,
+                    "message": "Contact import job not found",
+                    "data": None
+                }, status=status.HTTP_404_NOT_FOUND)
+            
+            return Response({
+                "status": status.HTTP_200_OK,
+                "message": "Contact import job fetched successfully",
+                "data": ContactImportJobSerializer(job).data
+            })
         except Exception as e:
             return Response({
                 "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
-                "message": f"Error extracting contact information: {str(e)}",
+                "message": str(e),
                 "data": None
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _enqueue_contact_import(job):
+    """Queue a job for the Celery worker; returns the message for the response"""
+    from .tasks import run_contact_import_job
+    
+    try:
+        run_contact_import_job.delay(str(job.id))
+    except Exception as e:
+        # Broker down - the cards are stored and the job can be run with manage.py run_contact_import
+        logger.warning(f"Could not queue contact import job {job.id}: {str(e)}")
+        return f"Cards saved but the import could not be queued. Run: python manage.py run_contact_import {job.id}"
+    return "Import job queued. Poll the job for progress."
+
+
 class ContactAPIView(APIView):
     """
     Contact CRUD Operations - Optimized
@@ -198,7 +277,7 @@ class ContactAPIView(APIView):
     def get(self, request, site_id, user_id=None, pk=None):
         """Get contacts - filtered by role - O(1) queries with index optimization"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -211,9 +290,12 @@ class ContactAPIView(APIView):
                     id=pk,
                     admin_id=admin_id
                 ).select_related('admin', 'user', 'created_by').only(
-                    'id', 'admin_id', 'user_id', 'site_id', 'full_name', 'company_name', 'job_title',
-                    'mobile_number', 'email_address', 'state', 'city', 'source_type',
-                    'created_by_id', 'created_at', 'updated_at'
+                    'id', 'admin_id', 'user_id', 'site_id', 'full_name', 'company_name', 'job_title', 'department',
+                    'mobile_number', 'alternate_phone', 'office_landline', 'fax_number', 'whatsapp_number',
+                    'email_address', 'alternate_email', 'full_address', 'state', 'city', 'country', 'pincode',
+                    'additional_notes', 'business_card_image', 'source_type',
+                    'created_by_id', 'created_at', 'updated_at',
+                    'admin__email', 'user__email', 'created_by__email', 'created_by__username'
                 ).first()
                 
                 if not contact:
@@ -322,8 +404,10 @@ class ContactAPIView(APIView):
                 
                 # Fetch only required fields with select_related to avoid N+1
                 queryset = queryset.select_related('admin', 'user', 'created_by').only(
-                    'id', 'admin_id', 'user_id', 'site_id', 'full_name', 'company_name', 'job_title',
-                    'mobile_number', 'email_address', 'state', 'city', 'source_type',
+                    'id', 'admin_id', 'user_id', 'site_id', 'full_name', 'company_name', 'job_title', 'department',
+                    'mobile_number', 'alternate_phone', 'office_landline', 'fax_number', 'whatsapp_number',
+                    'email_address', 'alternate_email', 'full_address', 'state', 'city', 'country', 'pincode',
+                    'additional_notes', 'business_card_image', 'source_type',
                     'created_by_id', 'created_at', 'updated_at',
                     'admin__email', 'user__email', 'created_by__email', 'created_by__username'
                 )
@@ -351,7 +435,7 @@ class ContactAPIView(APIView):
     def post(self, request, site_id, user_id=None):
         """Create contact - Admin or User can create - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -452,7 +536,7 @@ class ContactAPIView(APIView):
     def put(self, request, site_id, user_id=None, pk=None):
         """Update contact - Optimized O(1) query"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -515,7 +599,7 @@ class ContactAPIView(APIView):
     def delete(self, request, site_id, user_id=None, pk=None):
         """Delete contact - Optimized O(1) query"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -574,7 +658,7 @@ class ContactStatsAPIView(APIView):
     def get(self, request, site_id, user_id=None):
         """Get contact statistics - O(1) aggregation queries with proper indexes"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -595,38 +679,10 @@ class ContactStatsAPIView(APIView):
             # Filter by site - O(1) with index
             contacts = filter_queryset_by_site(contacts, site_id, 'site')
             
-            # Single optimized query with aggregation - all stats in one query
-            # Uses indexes for efficient counting
-            stats = contacts.aggregate(
-                total_contacts=Count('id'),
-                scanned_contacts=Count('id', filter=Q(source_type='scanned')),
-                manual_contacts=Count('id', filter=Q(source_type='manual')),
-                contacts_with_email=Count('id', filter=~Q(email_address__isnull=True) & ~Q(email_address='')),
-                contacts_with_phone=Count('id', filter=~Q(mobile_number__isnull=True) & ~Q(mobile_number='')),
-                contacts_with_company=Count('id', filter=~Q(company_name__isnull=True) & ~Q(company_name='')),
-            )
-            
-            # Additional distinct counts - optimized queries using indexes
-            # Uses contact_adm_company_idx for company_name
-            stats['unique_companies'] = contacts.exclude(
-                company_name__isnull=True
-            ).exclude(
-                company_name=''
-            ).values('company_name').distinct().count()
-            
-            # Uses contact_adm_state_city_idx for state
-            stats['unique_states'] = contacts.exclude(
-                state__isnull=True
-            ).exclude(
-                state=''
-            ).values('state').distinct().count()
-            
-            # Uses contact_adm_state_city_idx for city
-            stats['unique_cities'] = contacts.exclude(
-                city__isnull=True
-            ).exclude(
-                city=''
-            ).values('city').distinct().count()
+            # Single conditional aggregate (incl. distinct company/state/city counts),
+            # cached per (admin, site, employee, day) - invalidated on contact writes
+            scope = user.id if user.role == 'user' else user_id
+            stats = get_dashboard_stats('contacts', contacts, tenant_id=admin_id, site_id=site_id, scope=scope)
             
             return Response({
                 "status": status.HTTP_200_OK,
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ExpenditureConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Expenditure'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import Expenditure.signals
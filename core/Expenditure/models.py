@@ -205,6 +205,8 @@ class Expense(models.Model):
             models.Index(fields=['admin', 'category', 'status'], name='expense_adm_cat_status_idx'),
             # Detail view optimization
             models.Index(fields=['id', 'admin'], name='expense_id_adm_idx'),
+            # Keyset pagination (?cursor=) - ordering (expense_date, created_at, id)
+            models.Index(fields=['admin', 'expense_date', 'created_at', 'id'], name='expense_adm_keyset_idx'),
             # Site filtering optimization - O(1) queries
             models.Index(fields=['site', 'admin', 'status', 'expense_date'], name='expense_site_adm_st_dt_idx'),
         ]
@@ -10,7 +10,6 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.db import transaction
-from django.db.models import Q
 from django.utils import timezone
 from django.http import HttpResponse
 from io import BytesIO
@@ -24,10 +23,13 @@ from .serializers import (
     ExpenseCategorySerializer, ExpenseProjectSerializer,
     ExpenseSerializer, ExpenseCreateSerializer
 )
-from AuthN.models import BaseUserModel, AdminProfile
+from AuthN.models import BaseUserModel
 from SiteManagement.models import Site, EmployeeAdminSiteAssignment
 from utils.pagination_utils import CustomPagination
 from utils.site_filter_utils import filter_queryset_by_site
+from utils.tenant_utils import get_admin_and_site_or_response
+from utils.status_counter_service import record_status_change
+from SearchIndex.search_service import apply_search
 
 
 def get_admin_and_site_for_expense(request, site_id, user_id=None):
@@ -38,76 +40,9 @@ def get_admin_and_site_for_expense(request, site_id, user_id=None):
     """
     user = request.user
     
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": []
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": []
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": []
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": []
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": []
-            }, status=status.HTTP_403_FORBIDDEN)
+    # Admin / organization roles - resolved from the cached tenant map (0 queries on warm cache)
+    if user.role in ('admin', 'organization'):
+        return get_admin_and_site_or_response(request, site_id, empty_data=[])
     
     # User role - O(1) queries with select_related
     elif user.role == 'user':
@@ -175,7 +110,7 @@ class ExpenseCategoryAPIView(APIView):
                     id=pk, 
                     admin_id=admin.id, 
                     is_active=True
-                ).only('id', 'admin_id', 'name', 'code', 'description', 'is_active', 'created_at', 'updated_at', 'site_id').first()
+                ).first()
                 
                 if not category:
                     return Response({
@@ -202,7 +137,7 @@ class ExpenseCategoryAPIView(APIView):
                 categories = ExpenseCategory.objects.filter(
                     admin_id=admin.id, 
                     is_active=True
-                ).only('id', 'admin_id', 'name', 'code', 'description', 'is_active', 'created_at', 'updated_at', 'site_id')
+                )
                 
                 # Filter by site - O(1) with index
                 categories = filter_queryset_by_site(categories, site_id, 'site')
@@ -359,7 +294,7 @@ class ExpenseProjectAPIView(APIView):
                     id=pk, 
                     admin_id=admin.id, 
                     is_active=True
-                ).only('id', 'admin_id', 'name', 'code', 'description', 'is_active', 'created_at', 'updated_at', 'site_id').first()
+                ).first()
                 
                 if not project:
                     return Response({
@@ -386,7 +321,7 @@ class ExpenseProjectAPIView(APIView):
                 projects = ExpenseProject.objects.filter(
                     admin_id=admin.id, 
                     is_active=True
-                ).only('id', 'admin_id', 'name', 'code', 'description', 'is_active', 'created_at', 'updated_at', 'site_id')
+                )
                 
                 # Filter by site - O(1) with index
                 projects = filter_queryset_by_site(projects, site_id, 'site')
@@ -530,6 +465,7 @@ class ExpenseAPIView(APIView):
     """Expense CRUD - Employee can submit, Admin can view all - Optimized"""
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('-expense_date', '-created_at', '-id')  # ?cursor= keyset pagination
     
     def get(self, request, site_id, user_id=None):
         """Get expenses - O(1) queries with index optimization"""
@@ -590,18 +526,9 @@ class ExpenseAPIView(APIView):
             if category_id:
                 expenses = expenses.filter(category_id=category_id)
             
-            # Search functionality - optimized with proper field selection
+            # Search functionality - SearchDocument trigram index
             search_query = request.query_params.get('search', '').strip()
-            if search_query:
-                expenses = expenses.filter(
-                    Q(title__icontains=search_query) |
-                    Q(description__icontains=search_query) |
-                    Q(employee__email__icontains=search_query) |
-                    Q(employee__own_user_profile__user_name__icontains=search_query) |
-                    Q(employee__own_user_profile__custom_employee_id__icontains=search_query) |
-                    Q(category__name__icontains=search_query) |
-                    Q(project__name__icontains=search_query)
-                )
+            expenses = apply_search(expenses, 'expense', search_query)
             
             # Optimize queryset with select_related to avoid N+1
             expenses = expenses.select_related(
@@ -644,7 +571,7 @@ class ExpenseAPIView(APIView):
             expenses = expenses.only(
                 'id', 'admin_id', 'employee_id', 'category_id', 'project_id', 'site_id',
                 'title', 'description', 'expense_date', 'amount', 'currency', 'status',
-                'submitted_at', 'approved_at', 'approved_by_id', 'rejected_at', 'rejected_by_id',
+                'submitted_at', 'approved_at', 'approved_by_id', 'rejection_reason', 'rejected_at', 'rejected_by_id',
                 'reimbursement_amount', 'reimbursement_date', 'reimbursement_mode',
                 'reimbursement_reference', 'receipts', 'supporting_documents', 'remarks',
                 'created_at', 'updated_at', 'created_by_id',
@@ -656,7 +583,7 @@ class ExpenseAPIView(APIView):
             
             # Pagination for admin view (all expenses) - single query with LIMIT/OFFSET using index
             paginator = self.pagination_class()
-            paginated_qs = paginator.paginate_queryset(expenses, request)
+            paginated_qs = paginator.paginate_queryset(expenses, request, view=self)
             serializer = ExpenseSerializer(paginated_qs, many=True)
             pagination_data = paginator.get_paginated_response(serializer.data)
             pagination_data["results"] = serializer.data
@@ -889,6 +816,8 @@ class ExpenseApprovalAPIView(APIView):
                     reimbursement_amount=Decimal(str(approval_amount)),
                     remarks=description if description else expense.remarks
                 )
+                # queryset.update() skips post_save - move the live status counters explicitly
+                record_status_change('expense', (admin.id, expense.site_id, expense.status), (admin.id, expense.site_id, 'approved'))
                 
                 # Reload expense for response
                 expense.refresh_from_db()
@@ -917,6 +846,8 @@ class ExpenseApprovalAPIView(APIView):
                     rejected_at=timezone.now(),
                     rejection_reason=description
                 )
+                # queryset.update() skips post_save - move the live status counters explicitly
+                record_status_change('expense', (admin.id, expense.site_id, expense.status), (admin.id, expense.site_id, 'rejected'))
                 
                 # Reload expense for response
                 expense.refresh_from_db()
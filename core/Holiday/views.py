@@ -11,9 +11,10 @@ from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from .models import Holiday
 from .serializers import HolidaySerializer, HolidayUpdateSerializer
-from AuthN.models import AdminProfile, BaseUserModel
+from AuthN.models import AdminProfile
 from SiteManagement.models import Site
 from utils.site_filter_utils import filter_queryset_by_site
+from utils.tenant_utils import get_admin_and_site_or_response
 
 
 def get_admin_and_site_for_holiday(request, site_id):
@@ -24,76 +25,9 @@ def get_admin_and_site_for_holiday(request, site_id):
     """
     user = request.user
     
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                'message': 'Site not found or you don\'t have permission to access this site',
-                'data': [],
-                'status': status.HTTP_403_FORBIDDEN
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                'message': 'admin_id is required for organization role. Please provide admin_id as query parameter.',
-                'data': [],
-                'status': status.HTTP_400_BAD_REQUEST
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                'message': 'Admin not found',
-                'data': [],
-                'status': status.HTTP_404_NOT_FOUND
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                'message': 'Admin does not belong to your organization',
-                'data': [],
-                'status': status.HTTP_403_FORBIDDEN
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                'message': 'Site not found or you don\'t have permission to access this site',
-                'data': [],
-                'status': status.HTTP_403_FORBIDDEN
-            }, status=status.HTTP_403_FORBIDDEN)
+    # Admin / organization roles - resolved from the cached tenant map (0 queries on warm cache)
+    if user.role in ('admin', 'organization'):
+        return get_admin_and_site_or_response(request, site_id, empty_data=[])
     
     # User role - O(1) queries with select_related
     elif user.role == 'user':
@@ -107,7 +41,6 @@ def get_admin_and_site_for_holiday(request, site_id):
                 'status': status.HTTP_403_FORBIDDEN
             }, status=status.HTTP_403_FORBIDDEN)
         
-        admin_id = admin.id
         # O(1) query - Validate site exists (for employees, just check if site exists and is active)
         try:
             site = Site.objects.only('id', 'site_name', 'is_active').get(
@@ -0,0 +1,210 @@
+"""
+Invoice Analytics Service
+=========================
+
+GST reports over InvoiceLineItem - the normalized copy of Invoice.items.
+
+- sync_line_items() rewrites the line item rows of a set of invoices from
+  their JSON: one SELECT, one DELETE and bulk INSERTs per batch. Invoice.save()
+  calls it for the saved invoice; rebuild_invoice_line_items backfills.
+- gst_report() groups line items by month / client / tax rate / place of
+  supply / HSN in SQL (one GROUP BY query plus one totals query) using the
+  (admin, invoice_date) family of indexes - no invoice or JSON is loaded.
+
+Tax amounts are taxable_amount * percent / 100, rounded per line. The
+taxable amount is the item's amount, else quantity * rate.
+"""
+
+from datetime import date
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Invoice, InvoiceLineItem
+
+LINE_ITEM_BATCH_SIZE = 1000
+CENT = Decimal('0.01')
+ZERO = Decimal('0.00')
+
+# Draft and cancelled invoices are not reported unless asked for with ?status=
+REPORT_STATUSES = ('sent', 'paid', 'overdue')
+
+# group_by key -> report columns (line item fields or REPORT_EXPRESSIONS)
+REPORT_GROUPS = {
+    'month': ('month',),
+    'client': ('client_name', 'client_gstin'),
+    'tax_rate': ('gst_rate', 'cess_percent'),
+    'place_of_supply': ('place_of_supply',),
+    'hsn': ('hsn_sac',),
+}
+REPORT_EXPRESSIONS = {
+    'month': TruncMonth('invoice_date'),
+}
+
+REPORT_SUMS = {
+    'taxable_amount': Sum('taxable_amount'),
+    'sgst_amount': Sum('sgst_amount'),
+    'cgst_amount': Sum('cgst_amount'),
+    'cess_amount': Sum('cess_amount'),
+    'total_amount': Sum('total_amount'),
+}
+
+# Header fields read for a sync - copied onto every line item
+INVOICE_SYNC_FIELDS = (
+    'id', 'admin_id', 'site_id', 'invoice_date', 'status', 'client_name',
+    'client_gstin', 'client_state', 'place_of_supply', 'items',
+)
+
+
+def _decimal(value):
+    """JSON number/str -> Decimal rounded to 2 places (invalid -> 0)"""
+    if value in (None, ''):
+        return ZERO
+    try:
+        return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError):
+        return ZERO
+
+
+def _tax(amount, percent):
+    return (amount * percent / 100).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def build_line_items(invoice):
+    """
+    Unsaved InvoiceLineItem rows for one invoice.
+
+    Args:
+        invoice: dict of INVOICE_SYNC_FIELDS
+
+    Returns:
+        list of InvoiceLineItem
+    """
+    items = invoice['items'] if isinstance(invoice['items'], list) else []
+    place_of_supply = (invoice['place_of_supply'] or invoice['client_state'] or '').strip()[:100]
+    line_items = []
+    for position, item in enumerate(items, 1):
+        if not isinstance(item, dict):
+            continue
+        quantity = _decimal(item.get('quantity'))
+        rate = _decimal(item.get('rate'))
+        taxable_amount = _decimal(item.get('amount')) or (quantity * rate).quantize(CENT, rounding=ROUND_HALF_UP)
+        sgst_percent = _decimal(item.get('sgst_percent'))
+        cgst_percent = _decimal(item.get('cgst_percent'))
+        cess_percent = _decimal(item.get('cess_percent'))
+        sgst_amount = _tax(taxable_amount, sgst_percent)
+        cgst_amount = _tax(taxable_amount, cgst_percent)
+        cess_amount = _tax(taxable_amount, cess_percent)
+        line_items.append(InvoiceLineItem(
+            invoice_id=invoice['id'],
+            admin_id=invoice['admin_id'],
+            site_id=invoice['site_id'],
+            invoice_date=invoice['invoice_date'],
+            status=invoice['status'],
+            client_name=invoice['client_name'],
+            client_gstin=(invoice['client_gstin'] or '').strip().upper(),
+            place_of_supply=place_of_supply,
+            position=position,
+            description=str(item.get('description') or ''),
+            hsn_sac=str(item.get('hsn_sac') or '').strip()[:20],
+            quantity=quantity,
+            rate=rate,
+            taxable_amount=taxable_amount,
+            gst_rate=sgst_percent + cgst_percent,
+            sgst_percent=sgst_percent,
+            cgst_percent=cgst_percent,
+            cess_percent=cess_percent,
+            sgst_amount=sgst_amount,
+            cgst_amount=cgst_amount,
+            cess_amount=cess_amount,
+            total_amount=taxable_amount + sgst_amount + cgst_amount + cess_amount,
+        ))
+    return line_items
+
+
+def sync_line_items(invoice_ids):
+    """
+    Rewrite the InvoiceLineItem rows of the given invoices from Invoice.items.
+    Idempotent - safe to re-run.
+
+    Returns:
+        int: number of line items written
+    """
+    invoice_ids = list(invoice_ids)
+    written = 0
+    for start in range(0, len(invoice_ids), LINE_ITEM_BATCH_SIZE):
+        batch = invoice_ids[start:start + LINE_ITEM_BATCH_SIZE]
+        line_items = []
+        for invoice in Invoice.objects.filter(id__in=batch).values(*INVOICE_SYNC_FIELDS):
+            line_items.extend(build_line_items(invoice))
+        with transaction.atomic():
+            InvoiceLineItem.objects.filter(invoice_id__in=batch).delete()
+            InvoiceLineItem.objects.bulk_create(line_items, batch_size=LINE_ITEM_BATCH_SIZE)
+        written += len(line_items)
+    return written
+
+
+def parse_group_by(value):
+    """
+    'month,tax_rate' -> ['month', 'tax_rate']
+
+    Raises:
+        ValueError: unknown group
+    """
+    groups = [group.strip() for group in (value or 'month').split(',') if group.strip()]
+    unknown = [group for group in groups if group not in REPORT_GROUPS]
+    if unknown or not groups:
+        raise ValueError(f"Invalid group_by '{value}'. Use one or more of: {', '.join(REPORT_GROUPS)}")
+    return list(dict.fromkeys(groups))
+
+
+def financial_year_start(day):
+    """1 April of the Indian financial year containing `day`"""
+    return date(day.year if day.month >= 4 else day.year - 1, 4, 1)
+
+
+def gst_report(admin_id, group_by, from_date, to_date, site_id=None, statuses=REPORT_STATUSES):
+    """
+    GST summary of an admin's line items, grouped in SQL.
+
+    Args:
+        group_by: list of REPORT_GROUPS keys (see parse_group_by)
+        from_date / to_date: invoice_date range (inclusive)
+        statuses: invoice statuses to include
+
+    Returns:
+        dict: {'rows': [...], 'totals': {...}} - each row has the group
+        columns, invoice_count, line_count and the REPORT_SUMS amounts
+    """
+    line_items = InvoiceLineItem.objects.filter(
+        admin_id=admin_id, invoice_date__gte=from_date, invoice_date__lte=to_date, status__in=statuses
+    )
+    if site_id:
+        line_items = line_items.filter(site_id=site_id)
+
+    columns = [column for group in group_by for column in REPORT_GROUPS[group]]
+    expressions = {column: REPORT_EXPRESSIONS[column] for column in columns if column in REPORT_EXPRESSIONS}
+    aggregates = {
+        'invoice_count': Count('invoice_id', distinct=True),
+        'line_count': Count('id'),
+        **REPORT_SUMS,
+    }
+    rows = list(
+        line_items.order_by()
+        .annotate(**expressions)
+        .values(*columns)
+        .annotate(**aggregates)
+        .order_by(*columns)
+    )
+    totals = line_items.order_by().aggregate(**aggregates)
+
+    for row in [*rows, totals]:
+        for field in REPORT_SUMS:
+            row[field] = (row[field] or ZERO).quantize(CENT)
+        row['total_tax'] = row['sgst_amount'] + row['cgst_amount'] + row['cess_amount']
+    for row in rows:
+        if 'month' in row and row['month'] is not None:
+            row['month'] = row['month'].strftime('%Y-%m')
+    return {'rows': rows, 'totals': totals}
@@ -0,0 +1,141 @@
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from AuthN.models import BaseUserModel
+from InvoiceManagement.invoice_analytics_service import (
+    REPORT_GROUPS, REPORT_STATUSES, REPORT_SUMS, build_line_items, gst_report, sync_line_items,
+)
+from InvoiceManagement.models import Invoice
+
+
+GENERATE_BATCH_SIZE = 5000
+STATES = ('Maharashtra', 'Karnataka', 'Tamil Nadu', 'Delhi', 'Gujarat', 'Telangana', 'Uttar Pradesh', 'West Bengal')
+HSN_CODES = ('998314', '998313', '997212', '8471', '8443', '4820', '9403', '996511')
+GST_RATES = (0, 5, 12, 18, 28)
+STATUSES = ('draft', 'sent', 'paid', 'paid', 'paid', 'overdue', 'cancelled')
+
+
+def _legacy_report(admin_id, group_by, from_date, to_date):
+    """Previous approach: load every invoice in range and aggregate its JSON items in Python"""
+    invoices = Invoice.objects.filter(
+        admin_id=admin_id, invoice_date__gte=from_date, invoice_date__lte=to_date, status__in=REPORT_STATUSES
+    ).values('id', 'admin_id', 'site_id', 'invoice_date', 'status', 'client_name',
+             'client_gstin', 'client_state', 'place_of_supply', 'items')
+    rows = {}
+    for invoice in invoices.iterator(chunk_size=2000):
+        for line in build_line_items(invoice):
+            key = []
+            for group in group_by:
+                for column in REPORT_GROUPS[group]:
+                    key.append(line.invoice_date.strftime('%Y-%m') if column == 'month' else getattr(line, column))
+            row = rows.setdefault(tuple(key), {field: 0 for field in REPORT_SUMS})
+            for field in REPORT_SUMS:
+                row[field] += getattr(line, field)
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark GST reports: grouped SQL over InvoiceLineItem vs loading invoices and aggregating '
+        'their JSON items in Python. Generates synthetic invoices for an admin (removed afterwards '
+        'unless --keep), or uses existing data with --invoices 0.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--admin', help='Admin the invoices belong to (default: first admin)')
+        parser.add_argument('--invoices', type=int, default=500000, help='Invoices to generate (default: 500000)')
+        parser.add_argument('--items', type=int, default=3, help='Line items per generated invoice (default: 3)')
+        parser.add_argument('--runs', type=int, default=3, help='Timed runs per report (default: 3)')
+        parser.add_argument('--skip-legacy', action='store_true', help='Only time the SQL reports')
+        parser.add_argument('--keep', action='store_true', help='Keep the generated invoices')
+
+    def generate(self, admin, count, items_per_invoice, prefix):
+        rng = random.Random(42)
+        today = timezone.localdate()
+        clients = [(f'Client {n}', f'{rng.randint(10, 37)}ABCDE{n:04d}F1Z{n % 10}', rng.choice(STATES)) for n in range(500)]
+        start = time.perf_counter()
+        line_items = 0
+        for offset in range(0, count, GENERATE_BATCH_SIZE):
+            invoices = []
+            for number in range(offset, min(offset + GENERATE_BATCH_SIZE, count)):
+                client_name, client_gstin, client_state = rng.choice(clients)
+                invoice_date = today - timedelta(days=rng.randint(0, 364))
+                items = []
+                for position in range(1, items_per_invoice + 1):
+                    gst_rate = rng.choice(GST_RATES)
+                    quantity = rng.randint(1, 20)
+                    rate = round(rng.uniform(100, 50000), 2)
+                    items.append({
+                        'id': position, 'description': f'Item {position}', 'hsn_sac': rng.choice(HSN_CODES),
+                        'quantity': quantity, 'rate': rate, 'amount': round(quantity * rate, 2),
+                        'sgst_percent': gst_rate / 2, 'cgst_percent': gst_rate / 2,
+                        'cess_percent': 12 if gst_rate == 28 and rng.random() < 0.2 else 0,
+                    })
+                invoices.append(Invoice(
+                    admin=admin, invoice_number=f'{prefix}{number:07d}', invoice_date=invoice_date,
+                    due_date=invoice_date + timedelta(days=30), status=rng.choice(STATUSES),
+                    business_name='Benchmark', client_name=client_name, client_gstin=client_gstin,
+                    client_state=client_state, place_of_supply=client_state, items=items,
+                ))
+            # bulk_create bypasses Invoice.save() - sync the batch like rebuild_invoice_line_items
+            created = Invoice.objects.bulk_create(invoices)
+            line_items += sync_line_items([invoice.pk for invoice in created])
+            self.stdout.write(f'  {offset + len(invoices)} / {count} invoice(s)', ending='\r')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {count} invoice(s), {line_items} line item(s) in {time.perf_counter() - start:.1f}s'
+        ))
+
+    def time_call(self, func, runs):
+        timings = []
+        result = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), result
+
+    def handle(self, *args, **options):
+        admin_queryset = BaseUserModel.objects.filter(role='admin')
+        if options['admin']:
+            admin_queryset = admin_queryset.filter(id=options['admin'])
+        admin = admin_queryset.order_by('date_joined').first()
+        if admin is None:
+            raise CommandError('No admin found')
+
+        prefix = f'BENCH-{uuid.uuid4().hex[:8].upper()}-'
+        if options['invoices']:
+            self.generate(admin, options['invoices'], options['items'], prefix)
+
+        try:
+            to_date = timezone.localdate()
+            from_date = to_date - timedelta(days=364)
+            self.stdout.write(self.style.SUCCESS(
+                f'Admin {admin.id}: {Invoice.objects.filter(admin=admin).count()} invoice(s), '
+                f'{from_date} - {to_date}, median of {options["runs"]} run(s)'
+            ))
+            for group in REPORT_GROUPS:
+                sql_ms, report = self.time_call(
+                    lambda: gst_report(admin.id, [group], from_date, to_date), options['runs']
+                )
+                line = f'  {group:<16} SQL {sql_ms:>9.1f} ms ({len(report["rows"])} row(s))'
+                if not options['skip_legacy']:
+                    legacy_ms, legacy_rows = self.time_call(
+                        lambda: _legacy_report(admin.id, [group], from_date, to_date), 1
+                    )
+                    legacy_total = sum(row['taxable_amount'] for row in legacy_rows.values())
+                    mismatch = '' if legacy_total == report['totals']['taxable_amount'] else self.style.WARNING(
+                        ' (totals differ - line items stale?)'
+                    )
+                    speedup = legacy_ms / sql_ms if sql_ms else 0
+                    line += f'   Python/JSON {legacy_ms:>9.1f} ms   {speedup:.1f}x{mismatch}'
+                self.stdout.write(line)
+        finally:
+            if options['invoices'] and not options['keep']:
+                deleted, _ = Invoice.objects.filter(invoice_number__startswith=prefix).delete()
+                self.stdout.write(f'Removed {deleted} generated row(s)')
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from InvoiceManagement.invoice_analytics_service import LINE_ITEM_BATCH_SIZE, sync_line_items
+from InvoiceManagement.models import Invoice
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfill / rebuild InvoiceLineItem rows from Invoice.items. '
+        'Run once after deploying the line item table and after bulk_create / queryset.update() '
+        'on invoices (they bypass Invoice.save()); safe to re-run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--admin', help='Only rebuild invoices of one admin')
+        parser.add_argument('--batch-size', type=int, default=LINE_ITEM_BATCH_SIZE, help=f'Invoices per batch (default: {LINE_ITEM_BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        queryset = Invoice.objects.all()
+        if options['admin']:
+            queryset = queryset.filter(admin_id=options['admin'])
+
+        start = time.perf_counter()
+        invoices = 0
+        line_items = 0
+        last_pk = None
+        # Keyset walk over the PK so memory stays flat on large tables
+        while True:
+            page = queryset.order_by('pk')
+            if last_pk is not None:
+                page = page.filter(pk__gt=last_pk)
+            pks = list(page.values_list('pk', flat=True)[:options['batch_size']])
+            if not pks:
+                break
+            line_items += sync_line_items(pks)
+            invoices += len(pks)
+            last_pk = pks[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{line_items} line item(s) written for {invoices} invoice(s) in {time.perf_counter() - start:.2f}s'
+        ))
@@ -3,7 +3,7 @@ Invoice Management System
 Comprehensive invoice creation and management for admin users
 """
 
-from django.db import models
+from django.db import models, transaction
 from decimal import Decimal
 from datetime import date
 from AuthN.models import BaseUserModel
@@ -103,6 +103,7 @@ class Invoice(models.Model):
         return f"Invoice {self.invoice_number or self.id} - {self.client_name}"
     
     def save(self, *args, **kwargs):
+        """Generate the invoice number and keep InvoiceLineItem rows in sync with items"""
         if not self.invoice_number:
             # Generate invoice number if not provided
             last_invoice = Invoice.objects.filter(admin=self.admin).order_by('-created_at').first()
@@ -114,7 +115,81 @@ class Invoice(models.Model):
                     self.invoice_number = f"INV-{str(self.admin.id)[:8].upper()}-00001"
             else:
                 self.invoice_number = f"INV-{str(self.admin.id)[:8].upper()}-00001"
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if update_fields is None or LINE_ITEM_SOURCE_FIELDS & set(update_fields):
+                from .invoice_analytics_service import sync_line_items
+                sync_line_items([self.pk])
+
+
+# Invoice fields copied onto its line items - saving any of them re-syncs the rows
+LINE_ITEM_SOURCE_FIELDS = {
+    'items', 'admin', 'admin_id', 'site', 'site_id', 'invoice_date', 'status',
+    'client_name', 'client_gstin', 'client_state', 'place_of_supply',
+}
+
+
+class InvoiceLineItem(models.Model):
+    """
+    Normalized, indexed copy of Invoice.items - one row per line item.
+
+    Rewritten from the JSON whenever the invoice is saved (Invoice.save), so
+    GST reports are grouped SQL over this table instead of loading invoices
+    and parsing JSON. Invoice header fields used by reports are denormalized
+    onto each row. Run rebuild_invoice_line_items after bulk_create /
+    queryset.update() on invoices (they bypass Invoice.save()).
+    """
+    id = models.BigAutoField(primary_key=True)
+    invoice = models.ForeignKey(Invoice, on_delete=models.CASCADE, related_name='line_items')
+    admin = models.ForeignKey(
+        BaseUserModel, on_delete=models.CASCADE,
+        limit_choices_to={'role': 'admin'},
+        related_name='admin_invoice_line_items'
+    )
+    site = models.ForeignKey(
+        Site, on_delete=models.SET_NULL,
+        null=True, blank=True,
+        related_name='invoice_line_items'
+    )
+    
+    # Invoice header (denormalized)
+    invoice_date = models.DateField()
+    status = models.CharField(max_length=20, choices=Invoice.STATUS_CHOICES)
+    client_name = models.CharField(max_length=255)
+    client_gstin = models.CharField(max_length=15, blank=True, default='')
+    place_of_supply = models.CharField(max_length=100, blank=True, default='', help_text="Invoice place_of_supply, else client_state")
+    
+    # Line item
+    position = models.PositiveIntegerField(default=0)
+    description = models.TextField(blank=True, default='')
+    hsn_sac = models.CharField(max_length=20, blank=True, default='')
+    quantity = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    rate = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    taxable_amount = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    gst_rate = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0.00'), help_text="sgst_percent + cgst_percent")
+    sgst_percent = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0.00'))
+    cgst_percent = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0.00'))
+    cess_percent = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0.00'))
+    sgst_amount = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    cgst_amount = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    cess_amount = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    total_amount = models.DecimalField(max_digits=15, decimal_places=2, default=Decimal('0.00'))
+    
+    class Meta:
+        ordering = ['invoice_id', 'position']
+        indexes = [
+            # Report date range per admin - month / client / tax rate grouping
+            models.Index(fields=['admin', 'invoice_date'], name='ili_adm_date_idx'),
+            # Site filtering optimization
+            models.Index(fields=['site', 'admin', 'invoice_date'], name='ili_site_adm_date_idx'),
+            # HSN and place of supply summaries
+            models.Index(fields=['admin', 'hsn_sac', 'invoice_date'], name='ili_adm_hsn_date_idx'),
+            models.Index(fields=['admin', 'place_of_supply', 'invoice_date'], name='ili_adm_pos_date_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.invoice_id} #{self.position} - {self.description[:40]}"
 
 
 
@@ -170,7 +170,7 @@ class InvoiceCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Invoice
         fields = [
-            'invoice_date', 'due_date', 'status', 'theme_color',
+            'site', 'invoice_date', 'due_date', 'status', 'theme_color',
             'business_name', 'business_contact_name', 'business_gstin',
             'business_address_line1', 'business_city', 'business_state',
             'business_country', 'business_pincode', 'business_logo',
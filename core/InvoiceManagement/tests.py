@@ -0,0 +1,166 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from utils.fixture_utils import create_tenant
+from .invoice_analytics_service import gst_report
+from .models import Invoice, InvoiceLineItem
+
+CENT = Decimal('0.01')
+
+SERVICE = {'description': 'Consulting', 'hsn_sac': '998314', 'quantity': 2, 'rate': 1500, 'sgst_percent': 9, 'cgst_percent': 9}
+GOODS = {'description': 'Router', 'hsn_sac': '8517', 'quantity': 3, 'rate': '333.33', 'sgst_percent': 6, 'cgst_percent': 6}
+CESS = {'description': 'Soda', 'hsn_sac': '2202', 'amount': '80.50', 'sgst_percent': 14, 'cgst_percent': 14, 'cess_percent': 12}
+
+
+def json_totals(*invoices):
+    """Expected report totals computed straight from the invoices' JSON items"""
+    totals = dict.fromkeys(('taxable_amount', 'sgst_amount', 'cgst_amount', 'cess_amount', 'total_amount'), Decimal('0.00'))
+    for invoice in invoices:
+        for item in invoice.items:
+            amount = Decimal(str(item['amount'])) if item.get('amount') else Decimal(str(item['quantity'])) * Decimal(str(item['rate']))
+            amount = amount.quantize(CENT)
+            taxes = {
+                field: (amount * Decimal(str(item.get(percent, 0))) / 100).quantize(CENT)
+                for field, percent in (('sgst_amount', 'sgst_percent'), ('cgst_amount', 'cgst_percent'), ('cess_amount', 'cess_percent'))
+            }
+            totals['taxable_amount'] += amount
+            for field, tax in taxes.items():
+                totals[field] += tax
+            totals['total_amount'] += amount + sum(taxes.values())
+    return totals
+
+
+def create_invoice(tenant, items, invoice_date=date(2026, 5, 10), status='sent', client_name='Acme Traders', **fields):
+    return Invoice.objects.create(
+        admin=tenant['admin'], site=tenant['site'], invoice_date=invoice_date, due_date=invoice_date,
+        status=status, business_name='Business', client_name=client_name, client_state='Karnataka',
+        items=items, **fields
+    )
+
+
+class LineItemSyncTests(TestCase):
+    """Invoice.save - InvoiceLineItem rows follow the JSON items and copied header fields"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+
+    def setUp(self):
+        self.invoice = create_invoice(self.tenant, [SERVICE, GOODS])
+
+    def line_items(self):
+        return list(InvoiceLineItem.objects.filter(invoice=self.invoice).order_by('position'))
+
+    def test_create_writes_one_row_per_item(self):
+        service, goods = self.line_items()
+        self.assertEqual((service.position, service.hsn_sac, service.taxable_amount), (1, '998314', Decimal('3000.00')))
+        self.assertEqual((service.gst_rate, service.sgst_amount, service.cgst_amount), (Decimal('18.00'), Decimal('270.00'), Decimal('270.00')))
+        self.assertEqual((goods.taxable_amount, goods.sgst_amount, goods.total_amount), (Decimal('999.99'), Decimal('60.00'), Decimal('1119.99')))
+        self.assertEqual(service.place_of_supply, 'Karnataka')  # Falls back to the client state
+
+    def test_full_save_rewrites_items(self):
+        self.invoice.items = [CESS]
+        self.invoice.save()
+        [line_item] = self.line_items()
+        self.assertEqual((line_item.position, line_item.taxable_amount, line_item.cess_amount), (1, Decimal('80.50'), Decimal('9.66')))
+
+    def test_partial_save_of_items_resyncs(self):
+        self.invoice.items = [GOODS]
+        self.invoice.save(update_fields=['items', 'updated_at'])
+        self.assertEqual([line_item.description for line_item in self.line_items()], ['Router'])
+
+    def test_partial_save_of_header_field_resyncs(self):
+        self.invoice.status = 'paid'
+        self.invoice.place_of_supply = 'Tamil Nadu'
+        self.invoice.save(update_fields=['status', 'place_of_supply'])
+        self.assertEqual({(line_item.status, line_item.place_of_supply) for line_item in self.line_items()}, {('paid', 'Tamil Nadu')})
+
+    def test_partial_save_of_unrelated_field_skips_sync(self):
+        with mock.patch('InvoiceManagement.invoice_analytics_service.sync_line_items') as sync_line_items:
+            self.invoice.notes = 'Thanks for your business'
+            self.invoice.save(update_fields=['notes'])
+        sync_line_items.assert_not_called()
+        self.assertEqual(len(self.line_items()), 2)
+
+    def test_deleting_invoice_deletes_rows(self):
+        self.invoice.delete()
+        self.assertFalse(InvoiceLineItem.objects.exists())
+
+
+class GSTReportTests(TestCase):
+    """invoice_analytics_service.gst_report - grouped sums equal the invoices' JSON totals"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        cls.may = create_invoice(cls.tenant, [SERVICE, GOODS], client_gstin='29abcde1234f1z5')
+        cls.june = create_invoice(cls.tenant, [SERVICE, CESS], invoice_date=date(2026, 6, 2), status='paid', client_name='Bharat Foods')
+        create_invoice(cls.tenant, [SERVICE], status='draft')  # Not reported by default
+        create_invoice(cls.tenant, [GOODS], invoice_date=date(2025, 12, 1))  # Outside the range
+        other = create_tenant()
+        create_invoice(other, [SERVICE, GOODS, CESS])
+
+    def report(self, group_by, **kwargs):
+        return gst_report(self.tenant['admin'].id, group_by, date(2026, 4, 1), date(2027, 3, 31), **kwargs)
+
+    def assertSums(self, row, expected):
+        for field, amount in expected.items():
+            self.assertEqual(row[field], amount, field)
+
+    def test_totals_match_json_items(self):
+        totals = self.report(['month'])['totals']
+        expected = json_totals(self.may, self.june)
+        self.assertSums(totals, expected)
+        self.assertEqual((totals['invoice_count'], totals['line_count']), (2, 4))
+        self.assertEqual(totals['total_tax'], expected['sgst_amount'] + expected['cgst_amount'] + expected['cess_amount'])
+
+    def test_month_rows_match_each_months_invoices(self):
+        rows = self.report(['month'])['rows']
+        self.assertEqual([row['month'] for row in rows], ['2026-05', '2026-06'])
+        self.assertSums(rows[0], json_totals(self.may))
+        self.assertSums(rows[1], json_totals(self.june))
+
+    def test_every_grouping_adds_up_to_the_totals(self):
+        for group_by in (['client'], ['tax_rate'], ['place_of_supply'], ['hsn'], ['month', 'tax_rate']):
+            with self.subTest(group_by=group_by):
+                report = self.report(group_by)
+                for field in ('taxable_amount', 'sgst_amount', 'cgst_amount', 'cess_amount', 'total_amount', 'line_count'):
+                    self.assertEqual(sum(row[field] for row in report['rows']), report['totals'][field], field)
+
+    def test_tax_rate_rows(self):
+        rows = {
+            (row['gst_rate'], row['cess_percent']): (row['invoice_count'], row['taxable_amount'])
+            for row in self.report(['tax_rate'])['rows']
+        }
+        self.assertEqual(rows, {
+            (Decimal('12.00'), Decimal('0.00')): (1, Decimal('999.99')),
+            (Decimal('18.00'), Decimal('0.00')): (2, Decimal('6000.00')),
+            (Decimal('28.00'), Decimal('12.00')): (1, Decimal('80.50')),
+        })
+
+    def test_statuses_filter(self):
+        totals = self.report(['month'], statuses=['draft'])['totals']
+        self.assertEqual((totals['invoice_count'], totals['taxable_amount']), (1, Decimal('3000.00')))
+
+    def test_report_follows_invoice_edits(self):
+        self.june.items = [SERVICE]
+        self.june.save()
+        self.assertSums(self.report(['month'])['totals'], json_totals(self.may, self.june))
+
+    def test_endpoint_returns_the_report(self):
+        cache.clear()
+        client = APIClient()
+        client.force_authenticate(self.tenant['admin'])
+        response = client.get(
+            f"/api/invoices/{self.tenant['site'].id}/reports/gst/",
+            {'group_by': 'month,tax_rate', 'from_date': '2026-04-01', 'to_date': '2027-03-31'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertSums(response.data['data']['totals'], json_totals(self.may, self.june))
+        response = client.get(f"/api/invoices/{self.tenant['site'].id}/reports/gst/", {'group_by': 'week'})
+        self.assertEqual(response.status_code, 400)
@@ -3,11 +3,14 @@ Invoice Management URLs
 """
 
 from django.urls import path
-from .views import InvoiceAPIView
+from .views import InvoiceAPIView, InvoiceGSTReportAPIView
 
 urlpatterns = [
     # Invoice CRUD
     path('invoices/<uuid:site_id>/', InvoiceAPIView.as_view(), name='invoice-list-create'),
     path('invoices/<uuid:site_id>/<int:pk>/', InvoiceAPIView.as_view(), name='invoice-detail'),
+    
+    # GST reports
+    path('invoices/<uuid:site_id>/reports/gst/', InvoiceGSTReportAPIView.as_view(), name='invoice-gst-report'),
 ]
 
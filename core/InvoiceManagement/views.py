@@ -21,98 +21,12 @@ from .serializers import (
     InvoiceSerializer, InvoiceCreateSerializer, InvoiceUpdateSerializer,
     InvoiceListSerializer
 )
-from AuthN.models import BaseUserModel, AdminProfile
-from SiteManagement.models import Site
+from .invoice_analytics_service import REPORT_STATUSES, financial_year_start, gst_report, parse_group_by
+from AuthN.permissions import HasTenantAccess
 from utils.pagination_utils import CustomPagination
 from utils.site_filter_utils import filter_queryset_by_site
 
 
-def get_admin_and_site_optimized(request, site_id):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Returns: (admin, site) tuple or Response with error
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    else:
-        return None, None, Response({
-            "status": status.HTTP_403_FORBIDDEN,
-            "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-            "data": None
-        }, status=status.HTTP_403_FORBIDDEN)
-
-
 def parse_items_data(data):
     """
     Parse items JSON data from request - handles various input formats
@@ -144,15 +58,13 @@ def parse_items_data(data):
 
 class InvoiceAPIView(APIView):
     """Invoice CRUD - Admin Only - Optimized"""
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     pagination_class = CustomPagination
     
     def get(self, request, site_id, pk=None):
         """Get invoice(s) - O(1) queries with index optimization"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             admin_id = admin.id
             
@@ -233,6 +145,7 @@ class InvoiceAPIView(APIView):
                 invoices = invoices.select_related('admin').only(
                     'id', 'admin_id', 'site_id', 'invoice_number', 'invoice_date', 'due_date',
                     'status', 'client_name', 'total_amount', 'created_at', 'updated_at',
+                    'items',  # items_count - loaded here, not per row
                     'admin__email'
                 )
                 
@@ -260,9 +173,7 @@ class InvoiceAPIView(APIView):
     def post(self, request, site_id):
         """Create invoice - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin, site = request.tenant.admin, request.tenant.site
             
             data = request.data.copy()
             
@@ -299,9 +210,7 @@ class InvoiceAPIView(APIView):
     def put(self, request, site_id, pk):
         """Update invoice - Optimized O(1) query"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index invoice_id_adm_idx
             invoice = Invoice.objects.filter(
@@ -352,9 +261,7 @@ class InvoiceAPIView(APIView):
     def delete(self, request, site_id, pk=None):
         """Delete invoice - Optimized O(1) query"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index invoice_id_adm_idx
             invoice = Invoice.objects.filter(
@@ -388,3 +295,57 @@ class InvoiceAPIView(APIView):
                 "message": str(e),
                 "data": None
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class InvoiceGSTReportAPIView(APIView):
+    """
+    GST Summary Report - Admin Only - Grouped SQL over InvoiceLineItem
+    
+    Query params:
+        group_by: month (default), client, tax_rate, place_of_supply, hsn - comma separated
+                  for combinations, e.g. month,tax_rate
+        from_date / to_date: YYYY-MM-DD, default the current financial year (1 April - today)
+        status: comma separated invoice statuses, default sent,paid,overdue
+    """
+    permission_classes = [IsAuthenticated, HasTenantAccess]
+    
+    def get(self, request, site_id):
+        """GST summary - one GROUP BY query + one totals query using ili_* indexes"""
+        try:
+            admin, site = request.tenant.admin, request.tenant.site
+            
+            try:
+                group_by = parse_group_by(request.query_params.get('group_by'))
+                today = timezone.localdate()
+                from_date = request.query_params.get('from_date')
+                to_date = request.query_params.get('to_date')
+                from_date = datetime.strptime(from_date, '%Y-%m-%d').date() if from_date else financial_year_start(today)
+                to_date = datetime.strptime(to_date, '%Y-%m-%d').date() if to_date else today
+            except ValueError as e:
+                return Response({
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": str(e),
+                    "data": None
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            status_param = request.query_params.get('status')
+            statuses = [value.strip() for value in status_param.split(',') if value.strip()] if status_param else REPORT_STATUSES
+            
+            report = gst_report(admin.id, group_by, from_date, to_date, site_id=site.id if site else None, statuses=statuses)
+            return Response({
+                "status": status.HTTP_200_OK,
+                "message": "GST report fetched successfully",
+                "data": {
+                    "group_by": group_by,
+                    "from_date": from_date,
+                    "to_date": to_date,
+                    "statuses": list(statuses),
+                    **report
+                }
+            })
+        except Exception as e:
+            return Response({
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": str(e),
+                "data": None
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LeavecontrolConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'LeaveControl'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import LeaveControl.signals
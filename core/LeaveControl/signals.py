@@ -0,0 +1,26 @@
+"""
+LeaveControl Signals
+Moves live status counters when leave applications are written
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import LeaveApplication
+from utils.status_counter_service import count_deleted, count_saved, remember_counted_state
+
+
+@receiver(pre_save, sender=LeaveApplication)
+def remember_leaveapplication_status(sender, instance, update_fields=None, **kwargs):
+    """Load the stored status so post_save can detect a transition"""
+    remember_counted_state(instance, update_fields)
+
+
+@receiver(post_save, sender=LeaveApplication)
+def count_leaveapplication_status_on_save(sender, instance, created, **kwargs):
+    """Move the live status counters on commit"""
+    count_saved('leave', instance, created)
+
+
+@receiver(post_delete, sender=LeaveApplication)
+def count_leaveapplication_status_on_delete(sender, instance, **kwargs):
+    count_deleted('leave', instance)
@@ -8,6 +8,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from django.db.models import Q
 from datetime import datetime
 from decimal import Decimal
@@ -17,143 +18,13 @@ from .serializers import (
     EmployeeLeaveBalanceSerializer, EmployeeLeaveBalanceUpdateSerializer,
     LeaveApplicationSerializer, LeaveApplicationUpdateSerializer
 )
-from AuthN.models import AdminProfile, UserProfile, BaseUserModel
-from SiteManagement.models import Site
+from AuthN.models import AdminProfile, UserProfile
 from utils.pagination_utils import CustomPagination
+from utils.tenant_utils import get_admin_and_site_or_response
 from utils.site_filter_utils import filter_queryset_by_site
+from utils.notification_service import notify
 
-
-def get_admin_and_site_for_leave(request, site_id, allow_user_role=True):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Handles admin, organization, and user roles
-    Returns: (admin, site, None) tuple or (None, None, Response with error)
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Validate UUID format
-        try:
-            import uuid
-            uuid.UUID(str(admin_id))
-        except (ValueError, AttributeError):
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": f"Invalid admin_id format: {admin_id}. Must be a valid UUID.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": f"Admin with ID {admin_id} not found in the system",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # User role - O(1) queries with select_related
-    elif user.role == 'user' and allow_user_role:
-        # O(1) query - Get admin from current assignment using utility
-        from SiteManagement.models import EmployeeAdminSiteAssignment
-        
-        assignment = EmployeeAdminSiteAssignment.objects.select_related('admin', 'site').filter(
-            employee_id=user.id,
-            site_id=site_id,
-            is_active=True
-        ).only('id', 'admin_id', 'site_id', 'employee_id', 'is_active').first()
-        
-        if not assignment:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "You are not assigned to this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        admin = assignment.admin
-        admin_id = admin.id
-        
-        # O(1) query - Validate site exists
-        try:
-            site = Site.objects.only('id', 'site_name', 'is_active').get(
-                id=site_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Site not found",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-    
-    else:
-        return None, None, Response({
-            "status": status.HTTP_403_FORBIDDEN,
-            "message": "Unauthorized access. Only admin, organization, and user roles can access this endpoint",
-            "data": None
-        }, status=status.HTTP_403_FORBIDDEN)
+LEAVE_DECISION_STATUSES = ('approved', 'rejected')  # Status changes pushed to the employee
 
 
 class LeaveTypeAPIView(APIView):
@@ -162,7 +33,7 @@ class LeaveTypeAPIView(APIView):
     def get(self, request, site_id, pk=None):
         """Get leave type(s) - O(1) queries with index optimization"""
         try:
-            admin, site, error_response = get_admin_and_site_for_leave(request, site_id, allow_user_role=True)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id, allow_user_role=True)
             if error_response:
                 return error_response
             
@@ -233,7 +104,7 @@ class LeaveTypeAPIView(APIView):
     def post(self, request, site_id, pk=None):
         """Create leave type - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_for_leave(request, site_id, allow_user_role=False)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -290,64 +161,16 @@ class LeaveTypeAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def put(self, request, site_id, pk=None):
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin_user = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin_user = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                from AuthN.models import AdminProfile
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin_user,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        leave = get_object_or_404(LeaveType, admin__id=admin_id, id=pk)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+        if error_response:
+            return error_response
         
-        # Validate site belongs to admin
-        try:
-            site = Site.objects.get(id=site_id, created_by_admin=admin_user, is_active=True)
-            if leave.site_id != site_id:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Leave type not found for this site"
-                }, status=status.HTTP_404_NOT_FOUND)
-        except Site.DoesNotExist:
+        leave = get_object_or_404(LeaveType, admin__id=admin.id, id=pk)
+        if leave.site_id != site_id:
             return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+                "status": status.HTTP_404_NOT_FOUND,
+                "message": "Leave type not found for this site"
+            }, status=status.HTTP_404_NOT_FOUND)
         
         serializer = LeaveTypeUpdateSerializer(leave, data=request.data)
         if not serializer.is_valid():
@@ -378,64 +201,16 @@ class LeaveTypeAPIView(APIView):
         })
 
     def patch(self, request, site_id, pk=None):
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin_user = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin_user = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                from AuthN.models import AdminProfile
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin_user,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+        if error_response:
+            return error_response
         
-        leave = get_object_or_404(LeaveType, admin__id=admin_id, id=pk)
-        
-        # Validate site belongs to admin
-        try:
-            site = Site.objects.get(id=site_id, created_by_admin=admin_user, is_active=True)
-            if leave.site_id != site_id:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Leave type not found for this site"
-                }, status=status.HTTP_404_NOT_FOUND)
-        except Site.DoesNotExist:
+        leave = get_object_or_404(LeaveType, admin__id=admin.id, id=pk)
+        if leave.site_id != site_id:
             return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+                "status": status.HTTP_404_NOT_FOUND,
+                "message": "Leave type not found for this site"
+            }, status=status.HTTP_404_NOT_FOUND)
         
         serializer = LeaveTypeSerializer(leave, data=request.data, partial=True)
         if serializer.is_valid():
@@ -452,64 +227,16 @@ class LeaveTypeAPIView(APIView):
         }, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, site_id, pk=None):
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin_user = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin_user = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                from AuthN.models import AdminProfile
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin_user,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        leave = get_object_or_404(LeaveType, admin__id=admin_id, id=pk)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+        if error_response:
+            return error_response
         
-        # Validate site belongs to admin
-        try:
-            site = Site.objects.get(id=site_id, created_by_admin=admin_user, is_active=True)
-            if leave.site_id != site_id:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Leave type not found for this site"
-                }, status=status.HTTP_404_NOT_FOUND)
-        except Site.DoesNotExist:
+        leave = get_object_or_404(LeaveType, admin__id=admin.id, id=pk)
+        if leave.site_id != site_id:
             return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+                "status": status.HTTP_404_NOT_FOUND,
+                "message": "Leave type not found for this site"
+            }, status=status.HTTP_404_NOT_FOUND)
         
         # Check if leave type is assigned to any employee
         # Get unique employee count (not total records)
@@ -570,41 +297,7 @@ class EmployeeLeaveBalanceAPIView(APIView):
         GET /leave-balances/<site_id>/<user_id>/?year=2025 -> Specific employee (year optional)
         GET /leave-balances/<site_id>/<user_id>/<pk>/ -> Specific balance
         """
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        elif request.user.role == 'user':
+        if request.user.role == 'user':
             # Employee role: can only view their own leave balances
             if user_id and str(user_id) != str(request.user.id):
                 return Response({
@@ -615,54 +308,10 @@ class EmployeeLeaveBalanceAPIView(APIView):
             
             # Set user_id to logged-in user
             user_id = request.user.id
-            
-            # Validate that employee is assigned to this site
-            from SiteManagement.models import EmployeeAdminSiteAssignment
-            from datetime import date
-            from django.db.models import Q
-            
-            assignment = EmployeeAdminSiteAssignment.objects.filter(
-                employee_id=user_id,
-                site_id=site_id,
-                is_active=True
-            ).select_related('admin', 'site').first()
-            
-            if not assignment:
-                return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "You are not assigned to this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            admin = assignment.admin
-            admin_id = admin.id
-            
-            # Validate site exists
-            try:
-                site = Site.objects.get(id=site_id, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Site not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin, organization, and user roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
         
-        # Validate site belongs to admin (for admin and organization roles only)
-        if request.user.role != 'user':
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id, allow_user_role=True)
+        if error_response:
+            return error_response
         
         # Get year from query params (optional)
         year = request.GET.get('year')
@@ -675,7 +324,7 @@ class EmployeeLeaveBalanceAPIView(APIView):
                     user_id=user_id, 
                     id=pk
                 ).select_related('user', 'user__own_user_profile', 'leave_type').only(
-                    'id', 'user_id', 'leave_type_id', 'year', 'assigned', 'used',
+                    'id', 'user_id', 'leave_type_id', 'year', 'assigned', 'used', 'created_at', 'updated_at',
                     'leave_type__site_id', 'leave_type__name', 'leave_type__code',
                     'user__email', 'user__own_user_profile__user_name'
                 ).first()
@@ -683,7 +332,7 @@ class EmployeeLeaveBalanceAPIView(APIView):
                 balance = EmployeeLeaveBalance.objects.filter(
                     id=pk
                 ).select_related('user', 'user__own_user_profile', 'leave_type').only(
-                    'id', 'user_id', 'leave_type_id', 'year', 'assigned', 'used',
+                    'id', 'user_id', 'leave_type_id', 'year', 'assigned', 'used', 'created_at', 'updated_at',
                     'leave_type__site_id', 'leave_type__name', 'leave_type__code',
                     'user__email', 'user__own_user_profile__user_name'
                 ).first()
@@ -710,10 +359,10 @@ class EmployeeLeaveBalanceAPIView(APIView):
             })
         
         # Admin viewing all employees' balances
-        if admin_id and not user_id:
+        if admin and not user_id:
             # Get all users under this admin using utility
             from utils.Employee.assignment_utils import get_employee_ids_under_admin
-            admin_users = get_employee_ids_under_admin(admin_id, active_only=True, site_id=site_id)
+            admin_users = get_employee_ids_under_admin(admin.id, active_only=True, site_id=site_id)
             
             # Build query with optional year filter
             query = {
@@ -725,7 +374,7 @@ class EmployeeLeaveBalanceAPIView(APIView):
             balances = EmployeeLeaveBalance.objects.filter(
                 **query
             ).select_related('user', 'user__own_user_profile', 'leave_type').only(
-                'id', 'user_id', 'leave_type_id', 'year', 'assigned', 'used',
+                'id', 'user_id', 'leave_type_id', 'year', 'assigned', 'used', 'created_at', 'updated_at',
                 'leave_type__site_id', 'leave_type__name', 'leave_type__code',
                 'user__email', 'user__own_user_profile__user_name'
             )
@@ -760,7 +409,7 @@ class EmployeeLeaveBalanceAPIView(APIView):
             balances = EmployeeLeaveBalance.objects.filter(**query).select_related(
                 'user', 'user__own_user_profile', 'leave_type'
             ).only(
-                'id', 'user_id', 'leave_type_id', 'year', 'assigned', 'used',
+                'id', 'user_id', 'leave_type_id', 'year', 'assigned', 'used', 'created_at', 'updated_at',
                 'leave_type__name', 'leave_type__code',
                 'user__email', 'user__own_user_profile__user_name'
             ).order_by('-year', 'leave_type__name')
@@ -883,41 +532,7 @@ class AssignLeaveAPIView(APIView):
     
     def post(self, request, site_id, user_id=None):
         """Assign leave(s) to a user - single ya bulk"""
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        elif request.user.role == 'user':
+        if request.user.role == 'user':
             # Employee role: can only assign leaves to themselves
             if not user_id:
                 return Response({
@@ -934,54 +549,10 @@ class AssignLeaveAPIView(APIView):
                 }, status=status.HTTP_403_FORBIDDEN)
             
             user_id = request.user.id
-            
-            # Validate that employee is assigned to this site
-            from SiteManagement.models import EmployeeAdminSiteAssignment
-            from datetime import date
-            from django.db.models import Q
-            
-            assignment = EmployeeAdminSiteAssignment.objects.filter(
-                employee_id=user_id,
-                site_id=site_id,
-                is_active=True
-            ).select_related('admin', 'site').first()
-            
-            if not assignment:
-                return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "You are not assigned to this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            admin = assignment.admin
-            admin_id = admin.id
-            
-            # Validate site exists
-            try:
-                site = Site.objects.get(id=site_id, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Site not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin, organization, and user roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
         
-        # Validate site belongs to admin (for admin and organization roles only)
-        if request.user.role != 'user':
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id, allow_user_role=True)
+        if error_response:
+            return error_response
         
         # Get user_id from URL or request body
         target_user_id = user_id or request.data.get('user_id')
@@ -1289,41 +860,7 @@ class LeaveApplicationAPIView(APIView):
         
         Year filtering respects organization's leave year type (calendar/financial/custom)
         """
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        elif request.user.role == 'user':
+        if request.user.role == 'user':
             # Employee role: can only view their own leave applications
             if user_id and str(user_id) != str(request.user.id):
                 return Response({
@@ -1334,54 +871,10 @@ class LeaveApplicationAPIView(APIView):
             
             # Set user_id to logged-in user
             user_id = request.user.id
-            
-            # Validate that employee is assigned to this site
-            from SiteManagement.models import EmployeeAdminSiteAssignment
-            from datetime import date
-            from django.db.models import Q
-            
-            assignment = EmployeeAdminSiteAssignment.objects.filter(
-                employee_id=user_id,
-                site_id=site_id,
-                is_active=True
-            ).select_related('admin', 'site').first()
-            
-            if not assignment:
-                return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "You are not assigned to this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            admin = assignment.admin
-            admin_id = admin.id
-            
-            # Validate site exists
-            try:
-                site = Site.objects.get(id=site_id, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Site not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin, organization, and user roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
         
-        # Validate site belongs to admin (for admin and organization roles only)
-        if request.user.role != 'user':
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id, allow_user_role=True)
+        if error_response:
+            return error_response
         
         # Specific leave application by ID (no year needed) - O(1) query
         if pk:
@@ -1453,8 +946,8 @@ class LeaveApplicationAPIView(APIView):
         # Get organization_id from admin or user
         from AuthN.models import UserProfile
         # Validate admin and site if provided
-        if admin_id:
-            admin_profile = UserProfile.objects.filter(user_id=admin_id).first()
+        if admin:
+            admin_profile = UserProfile.objects.filter(user_id=admin.id).first()
             if admin_profile:
                 org_id = admin_profile.organization_id
             else:
@@ -1525,10 +1018,10 @@ class LeaveApplicationAPIView(APIView):
                 }
         
         # Admin viewing all employees' applications
-        if admin_id and not user_id:
+        if admin and not user_id:
             # Get employees under this admin using utility
             from utils.Employee.assignment_utils import get_employee_ids_under_admin
-            admin_users = get_employee_ids_under_admin(admin_id, active_only=True, site_id=site_id)
+            admin_users = get_employee_ids_under_admin(admin.id, active_only=True, site_id=site_id)
             leaves = LeaveApplication.objects.filter(
                 user_id__in=admin_users,
                 **date_filter
@@ -1667,56 +1160,9 @@ class LeaveApplicationAPIView(APIView):
 
     def post(self, request, site_id, user_id=None, pk=None):
         """Create leave application"""
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Validate site belongs to admin
-        try:
-            site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-        except Site.DoesNotExist:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+        if error_response:
+            return error_response
         
         # Get user_id from URL or request body
         target_user_id = user_id or request.data.get('user_id')
@@ -1847,56 +1293,9 @@ class LeaveApplicationAPIView(APIView):
 
     def put(self, request, site_id, user_id=None, pk=None):
         """Update leave application - Handle status changes and balance updates"""
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Validate site belongs to admin
-        try:
-            site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-        except Site.DoesNotExist:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+        if error_response:
+            return error_response
         
         # Single O(1) query using index leaveapp_id_adm_idx
         leave = LeaveApplication.objects.filter(
@@ -1924,16 +1323,25 @@ class LeaveApplicationAPIView(APIView):
         
         serializer = LeaveApplicationUpdateSerializer(leave, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
-            
-            # Sync balance based on all pending + approved leaves
-            if new_status and old_status != new_status:
-                from .balance_sync import sync_leave_balance
-                sync_leave_balance(
-                    user_id=leave.user.id,
-                    leave_type_id=leave.leave_type.id,
-                    year=leave.from_date.year
-                )
+            with transaction.atomic():
+                serializer.save()
+                
+                # Sync balance based on all pending + approved leaves
+                if new_status and old_status != new_status:
+                    from .balance_sync import sync_leave_balance
+                    sync_leave_balance(
+                        user_id=leave.user.id,
+                        leave_type_id=leave.leave_type.id,
+                        year=leave.from_date.year
+                    )
+                
+                # Tell the employee - pushed after commit
+                if new_status in LEAVE_DECISION_STATUSES and old_status != new_status:
+                    notify(
+                        [leave.user_id], 'leave_status', f"Leave {new_status}",
+                        f"Your {float(leave.total_days):g} day leave from {leave.from_date:%d %b %Y} was {new_status}",
+                        data={'leave_id': leave.id, 'status': new_status}
+                    )
             
             return Response({
                 "status": status.HTTP_200_OK,
@@ -1948,56 +1356,9 @@ class LeaveApplicationAPIView(APIView):
 
     def delete(self, request, site_id, user_id=None, pk=None):
         """Cancel leave application - Only pending leaves can be cancelled"""
-        # Get admin_id based on role
-        if request.user.role == 'admin':
-            admin_id = request.user.id
-            admin = request.user
-        elif request.user.role == 'organization':
-            # Organization role: get admin_id from query params
-            admin_id = request.query_params.get('admin_id')
-            if not admin_id:
-                return Response({
-                    "status": status.HTTP_400_BAD_REQUEST,
-                    "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                    "data": None
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Validate admin exists and belongs to organization
-            try:
-                admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                # Verify admin belongs to organization
-                admin_profile = AdminProfile.objects.filter(
-                    user=admin,
-                    organization=request.user
-                ).first()
-                if not admin_profile:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Admin does not belong to your organization",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            except BaseUserModel.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_404_NOT_FOUND,
-                    "message": "Admin not found",
-                    "data": None
-                }, status=status.HTTP_404_NOT_FOUND)
-        else:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Validate site belongs to admin
-        try:
-            site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-        except Site.DoesNotExist:
-            return Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+        admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+        if error_response:
+            return error_response
         
         leave = get_object_or_404(LeaveApplication, id=pk)
         
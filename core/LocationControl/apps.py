@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LocationcontrolConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'LocationControl'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import LocationControl.signals
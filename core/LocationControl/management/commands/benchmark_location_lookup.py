@@ -0,0 +1,81 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.geofence_service import haversine_m
+from utils.location_lookup_service import LOCATION_FIELDS, locate, locations_for, nearest
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare nearest-location lookups: brute-force haversine over every organization location '
+        'vs the geohash-bucketed lookup. Uses existing data - load a realistic volume '
+        '(e.g. 10k+ locations) and run rebuild_location_geohash first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('organization', help='Organization id whose locations are searched')
+        parser.add_argument('--points', type=int, default=50, help='Random query points near existing locations (default: 50)')
+        parser.add_argument('--limit', type=int, default=5, help='Nearest N per lookup (default: 5)')
+        parser.add_argument('--jitter-m', type=float, default=500, help='Max offset of a query point from a location (default: 500 m)')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def brute_force(self, organization_id, latitude, longitude, limit):
+        rows = locations_for(organization_id).values(*LOCATION_FIELDS)
+        ranked = sorted(
+            (haversine_m(latitude, longitude, float(row['latitude']), float(row['longitude'])), row['id'], row['radius'])
+            for row in rows
+        )
+        return [location_id for _, location_id, _ in ranked[:limit]], [
+            location_id for distance, location_id, radius in ranked if distance <= radius
+        ]
+
+    def handle(self, *args, **options):
+        organization_id = options['organization']
+        anchors = list(locations_for(organization_id).values_list('latitude', 'longitude'))
+        if not anchors:
+            raise CommandError('Organization has no active locations')
+        if locations_for(organization_id).filter(geohash='').exists():
+            raise CommandError('Some locations have no geohash - run rebuild_location_geohash first')
+
+        rng = random.Random(options['seed'])
+        offset = options['jitter_m'] / 111320.0
+        points = []
+        for _ in range(options['points']):
+            lat, lon = rng.choice(anchors)
+            points.append((float(lat) + rng.uniform(-offset, offset), float(lon) + rng.uniform(-offset, offset)))
+
+        limit = options['limit']
+        brute_ms, indexed_ms, locate_ms = [], [], []
+        mismatches = 0
+        for lat, lon in points:
+            start = time.perf_counter()
+            expected_nearest, expected_inside = self.brute_force(organization_id, lat, lon, limit)
+            brute_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            found_nearest = [match.location['id'] for match in nearest(organization_id, lat, lon, limit=limit)]
+            indexed_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            found_inside = [match.location['id'] for match in locate(organization_id, lat, lon)]
+            locate_ms.append((time.perf_counter() - start) * 1000)
+
+            # Ties at equal distance may order differently - compare as sets
+            if set(found_nearest) != set(expected_nearest) or set(found_inside) != set(expected_inside):
+                mismatches += 1
+
+        brute = statistics.median(brute_ms)
+        indexed = statistics.median(indexed_ms)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(anchors)} location(s), {len(points)} point(s), median per lookup'
+        ))
+        self.stdout.write(f'  brute force   {brute:>9.2f} ms')
+        self.stdout.write(f'  nearest({limit})    {indexed:>9.2f} ms   {brute / indexed if indexed else 0:.1f}x')
+        self.stdout.write(f'  locate        {statistics.median(locate_ms):>9.2f} ms')
+        if mismatches:
+            self.stdout.write(self.style.WARNING(f'  {mismatches} point(s) disagree with brute force - geohash stale?'))
+        else:
+            self.stdout.write('  results identical to brute force')
@@ -0,0 +1,55 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from LocationControl.models import Location
+from utils.geohash import encode
+
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfill / recompute Location.geohash from latitude/longitude. '
+        'Run once after deploying the geohash column and after bulk_create / queryset.update() '
+        'on locations (they bypass Location.save()); safe to re-run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--organization', help='Only rebuild locations of one organization')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f'Rows per batch (default: {BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        queryset = Location.objects.all()
+        if options['organization']:
+            queryset = queryset.filter(organization_id=options['organization'])
+
+        start = time.perf_counter()
+        scanned = 0
+        updated = 0
+        last_pk = None
+        # Keyset walk over the PK so memory stays flat on large tables
+        while True:
+            page = queryset.order_by('pk')
+            if last_pk is not None:
+                page = page.filter(pk__gt=last_pk)
+            locations = list(page.only('id', 'latitude', 'longitude', 'geohash')[:options['batch_size']])
+            if not locations:
+                break
+
+            stale = []
+            for location in locations:
+                geohash = encode(location.latitude, location.longitude)
+                if location.geohash != geohash:
+                    location.geohash = geohash
+                    stale.append(location)
+            Location.objects.bulk_update(stale, ['geohash'])
+
+            scanned += len(locations)
+            updated += len(stale)
+            last_pk = locations[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{updated} of {scanned} location(s) updated in {time.perf_counter() - start:.2f}s'
+        ))
@@ -2,6 +2,7 @@ from django.db import models
 import uuid
 from AuthN.models import BaseUserModel  # Adjust if your base user import is different
 from SiteManagement.models import Site
+from utils.geohash import encode as encode_geohash
 
 class Location(models.Model):
     id = models.BigAutoField(primary_key=True)
@@ -18,6 +19,10 @@ class Location(models.Model):
     latitude = models.DecimalField(max_digits=9, decimal_places=6)
     longitude = models.DecimalField(max_digits=9, decimal_places=6)
     radius = models.IntegerField(help_text="Radius in meters for geofencing", default=100)
+    geohash = models.CharField(
+        max_length=12, blank=True, default='', editable=False,
+        help_text="Geohash of latitude/longitude - spatial bucket for nearest-location lookups"
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -30,8 +35,18 @@ class Location(models.Model):
             models.Index(fields=['id', 'admin'], name='location_id_adm_idx'),
             # Site filtering optimization - O(1) queries
             models.Index(fields=['site', 'admin', 'is_active'], name='location_site_adm_active_idx'),
+            # Spatial prefix scans (geohash LIKE 'abc%') - pattern ops so PostgreSQL uses the B-tree
+            models.Index(fields=['geohash'], name='location_geohash_idx', opclasses=['varchar_pattern_ops']),
         ]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """Keep geohash in sync with the coordinates"""
+        self.geohash = encode_geohash(self.latitude, self.longitude)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'geohash'}
+        super().save(*args, **kwargs)
+
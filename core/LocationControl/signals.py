@@ -0,0 +1,18 @@
+"""
+LocationControl Signals
+Keeps cached employee geofences in sync with Location writes
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Location
+from utils.geofence_service import invalidate_geofences
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def invalidate_location_geofences(sender, instance, **kwargs):
+    """Bump the organization's geofence version (center, radius or is_active changed) once the write commits"""
+    organization_ids = [instance.organization_id]
+    transaction.on_commit(lambda: invalidate_geofences(organization_ids=organization_ids))
@@ -1,3 +1,62 @@
+from decimal import Decimal
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from AuthN.models import OrganizationSettings, UserProfile
+from utils.fixture_utils import create_employees, create_tenant
+from utils.geofence_service import validate_punch
+
+OFFICE = (12.971599, 77.594566)
+
+
+class GeofenceInvalidationTests(TestCase):
+    """Geofence signals - cached fences go stale only once the write commits"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        cls.employee = create_employees(cls.tenant, 1)[0]
+        OrganizationSettings.objects.filter(organization=cls.tenant['organization']).update(geofencing_enabled=True)
+        UserProfile.objects.filter(user=cls.employee).update(allow_geo_fencing=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def punch(self, latitude, longitude):
+        allowed, result, error = validate_punch(self.employee.id, self.tenant['organization'].id, latitude, longitude)
+        return allowed
+
+    def test_location_write_bumps_organization_version_on_commit(self):
+        self.assertTrue(self.punch(*OFFICE))
+        location = self.tenant['location']
+        with self.captureOnCommitCallbacks() as callbacks:
+            location.latitude, location.longitude = Decimal('13.082680'), Decimal('80.270718')
+            location.save()
+        self.assertTrue(self.punch(*OFFICE))  # Not committed yet - the cached fence still stands
+        for callback in callbacks:
+            callback()
+        self.assertFalse(self.punch(*OFFICE))
+
+    def test_profile_flag_drops_employee_fence_on_commit(self):
+        self.assertFalse(self.punch(0, 0))
+        profile = UserProfile.objects.get(user=self.employee)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.allow_geo_fencing = False
+            profile.save(update_fields=['allow_geo_fencing'])
+        self.assertTrue(self.punch(0, 0))
+
+    def test_location_unassignment_drops_employee_fence_on_commit(self):
+        self.assertFalse(self.punch(0, 0))
+        profile = UserProfile.objects.get(user=self.employee)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.locations.remove(self.tenant['location'])
+        self.assertTrue(self.punch(0, 0))  # No assigned location - geofencing not enforced
+
+    def test_organization_settings_bump_version_on_commit(self):
+        self.assertFalse(self.punch(0, 0))
+        settings = OrganizationSettings.objects.get(organization=self.tenant['organization'])
+        with self.captureOnCommitCallbacks(execute=True):
+            settings.geofencing_enabled = False
+            settings.save()
+        self.assertTrue(self.punch(0, 0))
@@ -6,110 +6,25 @@ All queries O(1) or using proper database indexes
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from .models import Location
 from AuthN.models import AdminProfile, BaseUserModel, UserProfile
-from SiteManagement.models import Site
 from .serializers import LocationSerializer
+from AuthN.permissions import HasTenantAccess
 from utils.site_filter_utils import filter_queryset_by_site
-
-
-def get_admin_and_site_optimized(request, site_id):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Returns: (admin, site) tuple or Response with error
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    else:
-        return None, None, Response({
-            "status": status.HTTP_403_FORBIDDEN,
-            "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-            "data": None
-        }, status=status.HTTP_403_FORBIDDEN)
+from utils.location_lookup_service import locate, nearest, serialize_match
 
 
 class LocationAPIView(APIView):
     """Location CRUD Operations - Optimized"""
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     
     def get(self, request, site_id, pk=None):
         """Get locations - O(1) queries with index optimization"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             admin_id = admin.id
             
@@ -121,7 +36,7 @@ class LocationAPIView(APIView):
                     is_active=True
                 ).select_related('admin', 'organization').only(
                     'id', 'admin_id', 'site_id', 'organization_id', 'name', 'address',
-                    'latitude', 'longitude', 'radius', 'is_active', 'created_at', 'updated_at'
+                    'latitude', 'longitude', 'geohash', 'radius', 'is_active', 'created_at', 'updated_at'
                 ).first()
                 
                 if not obj:
@@ -151,7 +66,7 @@ class LocationAPIView(APIView):
                 is_active=True
             ).select_related('admin', 'organization').only(
                 'id', 'admin_id', 'site_id', 'organization_id', 'name', 'address',
-                'latitude', 'longitude', 'radius', 'is_active', 'created_at', 'updated_at'
+                'latitude', 'longitude', 'geohash', 'radius', 'is_active', 'created_at', 'updated_at'
             )
             
             # Filter by site - O(1) with index location_site_adm_active_idx
@@ -173,9 +88,7 @@ class LocationAPIView(APIView):
     def post(self, request, site_id, pk=None):
         """Create location - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin, site = request.tenant.admin, request.tenant.site
             
             # O(1) query - Get admin profile with select_related
             admin_profile = AdminProfile.objects.select_related('organization').filter(
@@ -219,9 +132,7 @@ class LocationAPIView(APIView):
     def put(self, request, site_id, pk=None):
         """Update location - Optimized O(1) query"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index location_id_adm_idx
             obj = Location.objects.filter(
@@ -267,9 +178,7 @@ class LocationAPIView(APIView):
     def delete(self, request, site_id, pk):
         """Delete location (soft delete) - Optimized O(1) update"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index location_id_adm_idx
             obj = Location.objects.filter(
@@ -328,13 +237,12 @@ class AssignLocationToUserAPIView(APIView):
     POST /assign-locations/<admin_id>/<user_id>
     Body: { "location_ids": [1, 2, 3] }
     """
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     
     def post(self, request, site_id, user_id=None):
         """Assign locations to user - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # O(1) query - Validate user
             user = BaseUserModel.objects.filter(id=user_id, role='user').only('id', 'role').first()
@@ -425,10 +333,6 @@ class AssignLocationToUserAPIView(APIView):
     def get(self, request, site_id, user_id):
         """Get user's assigned locations - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
-            
             # O(1) query - Validate user
             user = BaseUserModel.objects.filter(id=user_id, role='user').only('id', 'role').first()
             if not user:
@@ -475,9 +379,7 @@ class AssignLocationToUserAPIView(APIView):
     def delete(self, request, site_id, user_id=None, location_id=None):
         """Remove specific location or all locations from user - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # O(1) query - Validate user
             user = BaseUserModel.objects.filter(id=user_id, role='user').only('id', 'role').first()
@@ -552,3 +454,64 @@ class AssignLocationToUserAPIView(APIView):
                 "message": f"Error removing locations: {str(e)}",
                 "data": None
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+
+class NearbyLocationsAPIView(APIView):
+    """
+    Nearest locations to a point / locations whose geofence contains it.
+    Geohash-bucketed lookup - cost depends on local density, not location count.
+
+    Query params:
+        lat, lng (required)
+        mode: nearest (default) or locate
+        limit: max results for nearest (default 5, max 100)
+        radius_m: optional distance cut-off for nearest
+        scope: site (default) or all (every site of the admin)
+    """
+    permission_classes = [IsAuthenticated, HasTenantAccess]
+    
+    def get(self, request, site_id):
+        try:
+            admin, site = request.tenant.admin, request.tenant.site
+            
+            try:
+                latitude = float(request.query_params['lat'])
+                longitude = float(request.query_params['lng'])
+                limit = min(int(request.query_params.get('limit', 5)), 100)
+                radius_m = request.query_params.get('radius_m')
+                radius_m = float(radius_m) if radius_m else None
+            except (KeyError, ValueError):
+                return Response({
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "lat and lng are required numbers; limit and radius_m must be numeric",
+                    "data": None
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180) or limit < 1 or (radius_m is not None and not radius_m > 0):
+                return Response({
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Coordinates out of range or invalid limit / radius_m",
+                    "data": None
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            lookup_site_id = None if request.query_params.get('scope') == 'all' else site.id
+            if request.query_params.get('mode') == 'locate':
+                matches = locate(site.organization_id, latitude, longitude, site_id=lookup_site_id, admin_id=admin.id)
+            else:
+                matches = nearest(
+                    site.organization_id, latitude, longitude, limit=limit,
+                    max_distance_m=radius_m, site_id=lookup_site_id, admin_id=admin.id
+                )
+            
+            return Response({
+                "status": status.HTTP_200_OK,
+                "message": "Locations fetched successfully",
+                "data": [serialize_match(match) for match in matches]
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": f"Error looking up locations: {str(e)}",
+                "data": None
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
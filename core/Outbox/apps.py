@@ -0,0 +1,17 @@
+from importlib import import_module
+
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class OutboxConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'Outbox'
+
+    def ready(self):
+        """Register the outbox handlers of other apps (@outbox_handler)"""
+        from utils.push_transports import warn_if_development_transport
+
+        for module in getattr(settings, 'OUTBOX_HANDLER_MODULES', []):
+            import_module(module)
+        warn_if_development_transport()
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from Outbox.models import OutboxEvent
+from Outbox.outbox_service import drain, retry_failed
+
+
+class Command(BaseCommand):
+    help = (
+        'Dispatch due outbox events in this process (what the dispatch_outbox task does), '
+        'or just report the backlog with --status.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', action='store_true', help='Only show pending / failed counts per topic')
+        parser.add_argument('--retry-failed', action='store_true', help='Re-queue events that exhausted their attempts')
+        parser.add_argument('--max-seconds', type=float, default=None, help='Stop after this long')
+
+    def handle(self, *args, **options):
+        if options['retry_failed']:
+            self.stdout.write(f'Re-queued {retry_failed()} failed event(s)')
+
+        if not options['status']:
+            totals = drain(max_seconds=options['max_seconds'])
+            self.stdout.write(self.style.SUCCESS(
+                f"{totals['handled']} handled, {totals['retried']} to retry, "
+                f"{totals['failed']} failed in {totals['batches']} batch(es)"
+            ))
+
+        backlog = OutboxEvent.objects.values('status', 'topic').annotate(count=Count('id')).order_by('status', 'topic')
+        for row in backlog:
+            self.stdout.write(f"  {row['status']:<8} {row['topic']:<32} {row['count']}")
@@ -0,0 +1,39 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxEvent(models.Model):
+    """
+    A side effect (cache invalidation, Celery task, notification...) to run
+    after the transaction that recorded it commits.
+
+    Views write events in their own transaction, so an event exists if and only
+    if the change that caused it was committed. The dispatcher (Outbox.tasks)
+    claims due events in batches, runs them outside any transaction and deletes
+    them once handled - delivery is at-least-once, handlers must be idempotent.
+
+    available_at doubles as the claim lease and the retry backoff: a claimed
+    event is pushed into the future, so if its worker dies it becomes due again.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('failed', 'Failed'),  # Gave up after OUTBOX_MAX_ATTEMPTS - kept for inspection / retry
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    topic = models.CharField(max_length=64)  # Handler name - see outbox_service.HANDLERS
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    available_at = models.DateTimeField(default=timezone.now)  # Not before: claim lease / retry backoff
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # Dispatcher scan: due pending events in commit order
+            models.Index(fields=['status', 'available_at', 'id'], name='outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.topic} #{self.id} ({self.status})"
@@ -0,0 +1,226 @@
+"""
+Transactional outbox
+
+Side effects of a request - cache invalidation, Celery tasks (photo
+processing, exports), notifications - are recorded as OutboxEvent rows in the
+request's own transaction instead of being run inline:
+
+    with transaction.atomic():
+        attendance.save()
+        outbox_service.invalidate_cache(f"user_shifts_{user_id}")
+        outbox_service.enqueue_task('media.update_profile_photo', args=[...])
+
+- Nothing happens for a rolled-back transaction, and nothing is lost for a
+  committed one (the event is committed with it)
+- Locks taken by the transaction are released before any side effect runs
+- dispatch_batch() claims due events in one short transaction, runs the
+  handlers outside it, then deletes the handled events. A worker dying
+  mid-batch leaves the events claimed only until OUTBOX_LEASE_SECONDS
+  elapse - delivery is at-least-once, so handlers must be idempotent
+
+Each topic has a handler taking the payloads of a whole batch, so e.g. 500
+invalidations become one cache.delete_many(). Apps register more topics with
+@outbox_handler('topic') in a module listed in OUTBOX_HANDLER_MODULES.
+
+The dispatcher is the 'dispatch_outbox' task: woken (debounced) after a commit
+that wrote events, and swept by beat every OUTBOX_SWEEP_INTERVAL seconds.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 10
+MAX_BACKOFF_SECONDS = 3600
+WAKE_KEY = 'outbox_wake'
+WAKE_DEBOUNCE_SECONDS = 1
+
+HANDLERS = {}
+
+
+def outbox_handler(topic):
+    """Register handler(payloads) for a topic - called with every payload of a batch"""
+    def decorator(func):
+        HANDLERS[topic] = func
+        return func
+    return decorator
+
+
+def batch_size():
+    return getattr(settings, 'OUTBOX_BATCH_SIZE', DEFAULT_BATCH_SIZE)
+
+
+def lease_seconds():
+    return getattr(settings, 'OUTBOX_LEASE_SECONDS', DEFAULT_LEASE_SECONDS)
+
+
+def max_attempts():
+    return getattr(settings, 'OUTBOX_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)
+
+
+# Writing events
+
+def publish(topic, payload=None, delay_seconds=0):
+    """
+    Record a side effect in the current transaction.
+    The dispatcher is woken once the transaction commits (delayed events wait for a sweep).
+    """
+    event = OutboxEvent.objects.create(
+        topic=topic, payload=payload or {},
+        available_at=timezone.now() + timedelta(seconds=delay_seconds),
+    )
+    if not delay_seconds:
+        transaction.on_commit(wake_dispatcher)
+    return event
+
+
+def invalidate_cache(*keys):
+    """Delete cache keys once the current transaction commits"""
+    return publish('cache.delete', {'keys': list(keys)})
+
+
+def enqueue_task(name, args=None, kwargs=None):
+    """Send a Celery task (routed by CELERY_TASK_ROUTES) once the current transaction commits"""
+    return publish('celery.task', {'task': name, 'args': list(args or []), 'kwargs': kwargs or {}})
+
+
+def wake_dispatcher():
+    """
+    Ask a worker to drain the outbox now - at most once per second across
+    requests. Best effort: the beat sweep picks the events up otherwise.
+    """
+    if not getattr(settings, 'OUTBOX_WAKE_ON_COMMIT', True):
+        return
+    try:
+        if not cache.add(WAKE_KEY, 1, WAKE_DEBOUNCE_SECONDS):
+            return
+        from core.celery import app
+
+        app.send_task('dispatch_outbox')
+    except Exception as e:
+        logger.warning(f"Could not wake the outbox dispatcher: {str(e)}")
+
+
+# Dispatching
+
+def claim_batch(limit=None):
+    """
+    Claim due events by pushing available_at past the lease.
+    One short transaction; SKIP LOCKED lets concurrent dispatchers take disjoint batches.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', available_at__lte=now)
+            .order_by('id')
+            .values_list('id', flat=True)[:limit or batch_size()]
+        )
+        if ids:
+            OutboxEvent.objects.filter(id__in=ids).update(
+                available_at=now + timedelta(seconds=lease_seconds()),
+                attempts=F('attempts') + 1,
+            )
+    if not ids:
+        return []
+    return list(OutboxEvent.objects.filter(id__in=ids).order_by('id'))
+
+
+def _retry_at(attempts):
+    return timezone.now() + timedelta(seconds=min(2 ** attempts, MAX_BACKOFF_SECONDS))
+
+
+def dispatch_batch(limit=None):
+    """
+    Claim one batch and run it - outside any transaction.
+
+    Returns:
+        dict: {'claimed', 'handled', 'retried', 'failed'}
+    """
+    events = claim_batch(limit)
+    stats = {'claimed': len(events), 'handled': 0, 'retried': 0, 'failed': 0}
+
+    by_topic = {}
+    for event in events:
+        by_topic.setdefault(event.topic, []).append(event)
+
+    handled_ids = []
+    for topic, topic_events in by_topic.items():
+        handler = HANDLERS.get(topic)
+        try:
+            if handler is None:
+                raise LookupError(f"No outbox handler for topic '{topic}'")
+            handler([event.payload for event in topic_events])
+        except Exception as e:
+            logger.warning(f"Outbox {topic}: {len(topic_events)} event(s) failed: {str(e)}")
+            for event in topic_events:
+                if event.attempts >= max_attempts():
+                    OutboxEvent.objects.filter(id=event.id).update(status='failed', last_error=str(e))
+                    stats['failed'] += 1
+                else:
+                    OutboxEvent.objects.filter(id=event.id).update(
+                        available_at=_retry_at(event.attempts), last_error=str(e)
+                    )
+                    stats['retried'] += 1
+            continue
+        handled_ids.extend(event.id for event in topic_events)
+
+    if handled_ids:
+        OutboxEvent.objects.filter(id__in=handled_ids).delete()
+        stats['handled'] = len(handled_ids)
+    return stats
+
+
+def drain(max_seconds=None, limit=None):
+    """
+    Dispatch batches until no event is due (or max_seconds pass).
+
+    Returns:
+        dict: totals of dispatch_batch() stats plus 'batches'
+    """
+    started = timezone.now()
+    totals = {'batches': 0, 'claimed': 0, 'handled': 0, 'retried': 0, 'failed': 0}
+    while True:
+        stats = dispatch_batch(limit)
+        if not stats['claimed']:
+            break
+        totals['batches'] += 1
+        for key, value in stats.items():
+            totals[key] += value
+        if max_seconds is not None and (timezone.now() - started).total_seconds() >= max_seconds:
+            break
+    return totals
+
+
+def retry_failed():
+    """Put failed events back in the queue. Returns the number of events."""
+    return OutboxEvent.objects.filter(status='failed').update(
+        status='pending', attempts=0, available_at=timezone.now()
+    )
+
+
+# Built-in topics
+
+@outbox_handler('cache.delete')
+def _delete_cache_keys(payloads):
+    keys = {key for payload in payloads for key in payload.get('keys', [])}
+    if keys:
+        cache.delete_many(list(keys))
+
+
+@outbox_handler('celery.task')
+def _send_tasks(payloads):
+    from core.celery import app
+
+    for payload in payloads:
+        app.send_task(payload['task'], args=payload.get('args', []), kwargs=payload.get('kwargs', {}))
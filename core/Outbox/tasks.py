@@ -0,0 +1,28 @@
+"""
+Celery Tasks for Outbox
+The dispatcher runs on the realtime queue: woken after commits that wrote
+events, and swept by beat (OUTBOX_SWEEP_INTERVAL) in case a wake-up was lost.
+"""
+
+from celery import shared_task
+from django.conf import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='dispatch_outbox')
+def dispatch_outbox():
+    """
+    Drain due outbox events in batches.
+    Bounded by OUTBOX_DRAIN_SECONDS so one run never hogs a realtime worker
+    """
+    from .outbox_service import drain
+
+    totals = drain(max_seconds=getattr(settings, 'OUTBOX_DRAIN_SECONDS', 30))
+    if totals['claimed']:
+        logger.info(
+            f"Outbox: {totals['handled']} handled, {totals['retried']} to retry, "
+            f"{totals['failed']} failed in {totals['batches']} batch(es)"
+        )
+    return totals
@@ -0,0 +1,263 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from AuthN.models import OrganizationSettings, UserProfile
+from utils.fixture_utils import create_employees, create_tenant
+from utils.notification_service import MAX_SEND_ATTEMPTS, RETRY_DELAY_SECONDS, TOPIC, coalesce, notify, send_pending
+from utils.push_transports import MemoryTransport, PushTransport, warn_if_development_transport
+from . import outbox_service
+from .models import OutboxEvent
+
+
+def failing_handler(payloads):
+    raise RuntimeError('handler failed')
+
+
+@override_settings(OUTBOX_WAKE_ON_COMMIT=False, OUTBOX_LEASE_SECONDS=300, OUTBOX_MAX_ATTEMPTS=3)
+class OutboxDispatchTests(TestCase):
+    """Outbox.outbox_service - publish on commit, leased claims, backoff, drain and retry"""
+
+    def setUp(self):
+        self.handled = []
+        patcher = mock.patch.dict(outbox_service.HANDLERS, {
+            'test.ok': self.handled.extend,
+            'test.fail': failing_handler,
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_publish_wakes_the_dispatcher_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            outbox_service.publish('test.ok', {'n': 1})
+            outbox_service.publish('test.ok', {'n': 2}, delay_seconds=60)  # Waits for a sweep
+        self.assertEqual(callbacks, [outbox_service.wake_dispatcher])
+
+    def test_claim_leases_due_events(self):
+        due = [outbox_service.publish('test.ok', {'n': n}) for n in range(2)]
+        outbox_service.publish('test.ok', {'n': 'later'}, delay_seconds=60)
+
+        claimed = outbox_service.claim_batch()
+        self.assertEqual([event.id for event in claimed], [event.id for event in due])
+        for event in claimed:
+            self.assertEqual(event.attempts, 1)
+            self.assertGreater(event.available_at, timezone.now() + timedelta(seconds=290))
+        self.assertEqual(outbox_service.claim_batch(), [])  # Leased - not claimable until the lease runs out
+
+        OutboxEvent.objects.filter(id=due[0].id).update(available_at=timezone.now())  # Worker died, lease expired
+        reclaimed = outbox_service.claim_batch()
+        self.assertEqual([(event.id, event.attempts) for event in reclaimed], [(due[0].id, 2)])
+
+    def test_claim_respects_the_batch_limit(self):
+        events = [outbox_service.publish('test.ok', {'n': n}) for n in range(3)]
+        self.assertEqual([event.id for event in outbox_service.claim_batch(limit=2)], [event.id for event in events[:2]])
+
+    def test_handled_events_are_deleted(self):
+        outbox_service.publish('test.ok', {'n': 1})
+        outbox_service.publish('test.ok', {'n': 2})
+        stats = outbox_service.dispatch_batch()
+        self.assertEqual(stats, {'claimed': 2, 'handled': 2, 'retried': 0, 'failed': 0})
+        self.assertEqual(self.handled, [{'n': 1}, {'n': 2}])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_failing_handler_backs_off_exponentially(self):
+        event = outbox_service.publish('test.fail')
+        ok = outbox_service.publish('test.ok', {'n': 1})
+        stats = outbox_service.dispatch_batch()
+        self.assertEqual((stats['handled'], stats['retried']), (1, 1))
+        self.assertFalse(OutboxEvent.objects.filter(id=ok.id).exists())  # Other topics are unaffected
+
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts, event.last_error), ('pending', 1, 'handler failed'))
+        self.assertAlmostEqual((event.available_at - timezone.now()).total_seconds(), 2, delta=1)  # 2 ** attempts
+
+        OutboxEvent.objects.filter(id=event.id).update(available_at=timezone.now())
+        outbox_service.dispatch_batch()
+        event.refresh_from_db()
+        self.assertAlmostEqual((event.available_at - timezone.now()).total_seconds(), 4, delta=1)
+
+    def test_event_fails_after_max_attempts(self):
+        event = outbox_service.publish('test.fail')
+        for _ in range(2):
+            self.assertEqual(outbox_service.dispatch_batch()['retried'], 1)
+            OutboxEvent.objects.filter(id=event.id).update(available_at=timezone.now())
+
+        stats = outbox_service.dispatch_batch()
+        self.assertEqual((stats['retried'], stats['failed']), (0, 1))
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts), ('failed', 3))
+        self.assertEqual(outbox_service.claim_batch(), [])  # Failed events are never claimed
+
+    def test_unknown_topic_is_retried(self):
+        outbox_service.publish('test.unregistered')
+        stats = outbox_service.dispatch_batch()
+        self.assertEqual(stats['retried'], 1)
+        self.assertIn("No outbox handler for topic 'test.unregistered'", OutboxEvent.objects.get().last_error)
+
+    def test_drain_dispatches_batches_until_nothing_is_due(self):
+        for n in range(5):
+            outbox_service.publish('test.ok', {'n': n})
+        outbox_service.publish('test.ok', {'n': 'later'}, delay_seconds=60)
+
+        totals = outbox_service.drain(limit=2)
+        self.assertEqual(totals, {'batches': 3, 'claimed': 5, 'handled': 5, 'retried': 0, 'failed': 0})
+        self.assertEqual(self.handled, [{'n': n} for n in range(5)])
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_retry_failed_requeues_failed_events(self):
+        event = outbox_service.publish('test.ok', {'n': 1})
+        OutboxEvent.objects.filter(id=event.id).update(status='failed', attempts=3, available_at=timezone.now() + timedelta(days=1))
+
+        self.assertEqual(outbox_service.retry_failed(), 1)
+        event.refresh_from_db()
+        self.assertEqual((event.status, event.attempts), ('pending', 0))
+        self.assertEqual(outbox_service.drain()['handled'], 1)
+        self.assertEqual(self.handled, [{'n': 1}])
+
+
+@skipUnlessDBFeature('has_select_for_update_skip_locked')
+@override_settings(OUTBOX_WAKE_ON_COMMIT=False)
+class OutboxSkipLockedTests(TransactionTestCase):
+    """Concurrent dispatchers claim disjoint batches (FOR UPDATE SKIP LOCKED)"""
+
+    def test_locked_events_are_skipped(self):
+        events = [outbox_service.publish('test.ok', {'n': n}) for n in range(4)]
+        locked, released = threading.Event(), threading.Event()
+
+        def hold_lock():
+            # A dispatcher mid-claim: rows locked by an open transaction
+            with transaction.atomic():
+                list(OutboxEvent.objects.select_for_update().filter(id__in=[events[0].id, events[1].id]))
+                locked.set()
+                released.wait(10)
+            connection.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            claimed = outbox_service.claim_batch()
+        finally:
+            released.set()
+            holder.join()
+        self.assertEqual([event.id for event in claimed], [event.id for event in events[2:]])
+
+
+class FailingTransport(PushTransport):
+    """Every batch fails - the provider is down"""
+
+    def send(self, messages):
+        raise ConnectionError('provider unavailable')
+
+
+@override_settings(PUSH_TRANSPORT='memory', PUSH_RATE_LIMIT_PER_MINUTE=0, OUTBOX_WAKE_ON_COMMIT=False)
+class PushNotificationTests(TestCase):
+    """utils.notification_service through the outbox - MemoryTransport records what was sent"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        cls.employees = create_employees(cls.tenant, 3)
+        OrganizationSettings.objects.filter(organization=cls.tenant['organization']).update(push_notifications_enabled=True)
+        for employee in cls.employees:
+            UserProfile.objects.filter(user=employee).update(fcm_token=f'token-{employee.id}')
+
+    def setUp(self):
+        MemoryTransport.reset()
+        self.addCleanup(MemoryTransport.reset)
+
+    def token(self, employee):
+        return f'token-{employee.id}'
+
+    def sent(self):
+        return [message for batch in MemoryTransport.batches for message in batch]
+
+    def test_notifications_are_coalesced_per_recipient_and_kind(self):
+        employee = self.employees[0]
+        for n in range(3):
+            notify([employee.id], 'task_assigned', 'New task', f'Task {n}')
+        notify([employee.id], 'leave_status', 'Leave approved', 'Your leave was approved')
+        outbox_service.drain()
+
+        messages = {message.data['kind']: message for message in self.sent()}
+        self.assertEqual(len(self.sent()), 2)
+        self.assertEqual(messages['task_assigned'].title, '3 new tasks assigned')
+        self.assertEqual(messages['task_assigned'].body, 'Task 2')
+        self.assertEqual(messages['leave_status'].title, 'Leave approved')
+        self.assertEqual({message.token for message in self.sent()}, {self.token(employee)})
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    @override_settings(PUSH_RATE_LIMIT_PER_MINUTE=2)
+    def test_rate_limited_excess_is_republished_for_the_next_window(self):
+        notify([employee.id for employee in self.employees], 'shift_reminder', 'Shift reminder', 'Starts at 9:00')
+        outbox_service.drain()
+
+        self.assertEqual(len(self.sent()), 2)
+        deferred = OutboxEvent.objects.get(topic=TOPIC)
+        self.assertGreater(deferred.available_at, timezone.now())
+        self.assertEqual(deferred.payload['attempts'], 0)  # Deferral is not a failed attempt
+        sent_tokens = {message.token for message in self.sent()}
+        deferred_tokens = {self.token(employee) for employee in self.employees if str(employee.id) in deferred.payload['user_ids']}
+        self.assertEqual(len(deferred_tokens), 1)
+        self.assertFalse(sent_tokens & deferred_tokens)
+
+    def test_invalid_tokens_are_pruned_in_one_update(self):
+        rejected = self.employees[:2]
+        MemoryTransport.invalid_tokens = {self.token(employee) for employee in rejected}
+        notify([employee.id for employee in self.employees], 'task_assigned', 'New task', 'Task 1')
+        with CaptureQueriesContext(connection) as queries:
+            outbox_service.drain()
+
+        profile_updates = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE') and '"AuthN_userprofile"' in query['sql']
+        ]
+        self.assertEqual(len(profile_updates), 1)
+        tokens = dict(UserProfile.objects.filter(user__in=self.employees).values_list('user_id', 'fcm_token'))
+        self.assertEqual({user_id for user_id, token in tokens.items() if not token}, {employee.id for employee in rejected})
+        self.assertEqual(tokens[self.employees[2].id], self.token(self.employees[2]))
+
+    @override_settings(PUSH_TRANSPORT='Outbox.tests.FailingTransport')
+    def test_failed_sends_retry_until_the_attempt_cap(self):
+        payloads = [{
+            'user_ids': [str(self.employees[0].id)], 'kind': 'task_assigned', 'title': 'New task', 'body': 'Task 1',
+        }]
+        for attempt in range(1, MAX_SEND_ATTEMPTS):
+            with self.assertLogs('utils.notification_service', 'WARNING'):
+                stats = send_pending(coalesce(payloads))
+            self.assertEqual(stats['failed'], 1)
+            retry = OutboxEvent.objects.get(topic=TOPIC)
+            self.assertEqual(retry.payload['attempts'], attempt)
+            self.assertGreater(retry.available_at, timezone.now() + timedelta(seconds=RETRY_DELAY_SECONDS - 5))
+            payloads = [retry.payload]
+            retry.delete()
+
+        with self.assertLogs('utils.notification_service', 'WARNING') as logs:
+            send_pending(coalesce(payloads))
+        self.assertIn(f'dropped after {MAX_SEND_ATTEMPTS} attempts', '\n'.join(logs.output))
+        self.assertFalse(OutboxEvent.objects.filter(topic=TOPIC).exists())
+
+
+class PushTransportSettingTests(SimpleTestCase):
+    """utils.push_transports.warn_if_development_transport - run from OutboxConfig.ready()"""
+
+    @override_settings(DEBUG=False, PUSH_TRANSPORT='file')
+    def test_file_transport_without_debug_warns(self):
+        with self.assertLogs('utils.push_transports', 'WARNING') as logs:
+            warn_if_development_transport()
+        self.assertIn("PUSH_TRANSPORT is 'file'", logs.output[0])
+
+    @override_settings(DEBUG=True, PUSH_TRANSPORT='file')
+    def test_file_transport_with_debug_is_quiet(self):
+        with self.assertNoLogs('utils.push_transports', 'WARNING'):
+            warn_if_development_transport()
+
+    @override_settings(DEBUG=False, PUSH_TRANSPORT='fcm')
+    def test_fcm_transport_is_quiet(self):
+        with self.assertNoLogs('utils.push_transports', 'WARNING'):
+            warn_if_development_transport()
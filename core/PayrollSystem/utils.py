@@ -12,7 +12,9 @@ from .models import (
     EmployeePayrollConfig,
     SalaryStructure,
 )
-from AuthN.models import BaseUserModel, UserProfile, AdminProfile
+from AuthN.models import BaseUserModel, UserProfile
+from ServiceShift.models import ServiceShift
+from utils.tenant_utils import get_admin_tenant_map
 
 
 # ==================== STATUTORY CALCULATION FUNCTIONS ====================
@@ -654,14 +656,13 @@ def get_all_employee_payroll_details(admin_id, month, year, employee_id=None):
         }
     """
     try:
-        # Validate admin
-        admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-        
-        # Get organization from admin
-        try:
-            admin_profile = AdminProfile.objects.select_related('organization').get(user=admin)
-            organization = admin_profile.organization
-        except AdminProfile.DoesNotExist:
+        # Validate admin and get its organization - cached tenant map (0 queries on warm cache)
+        tenant_map = get_admin_tenant_map(admin_id)
+        admin = tenant_map['admin']
+        if admin is None:
+            raise BaseUserModel.DoesNotExist
+        organization_id = tenant_map['organization_id']
+        if organization_id is None:
             return {
                 'error': 'Organization not found for admin',
                 'employees': [],
@@ -683,13 +684,14 @@ def get_all_employee_payroll_details(admin_id, month, year, employee_id=None):
         if employee_id:
             employees_query = employees_query.filter(id=employee_id)
         
+        # Active shifts prefetched once - a .filter() on the relation would query per employee
         employees = employees_query.select_related('own_user_profile').prefetch_related(
-            'own_user_profile__shifts'
+            Prefetch('own_user_profile__shifts', queryset=ServiceShift.objects.filter(is_active=True))
         ).distinct()
         
         # Get payroll settings for organization (once for all employees)
         try:
-            payroll_settings = OrganizationPayrollSettings.objects.get(organization=organization)
+            payroll_settings = OrganizationPayrollSettings.objects.get(organization_id=organization_id)
         except OrganizationPayrollSettings.DoesNotExist:
             payroll_settings = None
         
@@ -754,7 +756,7 @@ def get_all_employee_payroll_details(admin_id, month, year, employee_id=None):
             
             # Get assigned shifts
             assigned_shifts = []
-            for shift in user_profile.shifts.filter(is_active=True):
+            for shift in user_profile.shifts.all():
                 assigned_shifts.append({
                     'shift_id': shift.id,
                     'shift_name': shift.shift_name,
@@ -46,8 +46,8 @@ from .serializers import (
     EmployeeAdvanceListSerializer,
 )
 from AuthN.models import BaseUserModel, UserProfile, AdminProfile
-from SiteManagement.models import Site
 from utils.site_filter_utils import filter_queryset_by_site
+from utils.tenant_utils import resolve_admin_and_site
 from decimal import Decimal
 from .utils import (
     calculate_pf_employee, calculate_pf_employer,
@@ -66,91 +66,6 @@ from calendar import monthrange
 
 # ==================== HELPER FUNCTIONS ====================
 
-def get_admin_and_site_for_payroll(request, site_id):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Returns: (admin, site, None) tuple or (None, None, Response with error)
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "response": False,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "response": False,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "response": False,
-                "message": "Admin not found",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "response": False,
-                "message": "Admin does not belong to your organization",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "response": False,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    else:
-        return None, None, Response({
-            "response": False,
-            "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-            "data": None
-        }, status=status.HTTP_403_FORBIDDEN)
-
 def get_or_create_statutory_component(organization, code, name, component_type, statutory_type=None):
     """Get or create a statutory salary component"""
     component, created = SalaryComponent.objects.get_or_create(
@@ -225,9 +140,14 @@ class PayslipGeneratorAPIView(APIView):
     def get(self, request, site_id, pk=None):
         """Get payslip(s) for admin - O(1) queries with index optimization"""
         try:
-            admin, site, error_response = get_admin_and_site_for_payroll(request, site_id)
-            if error_response:
-                return error_response
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
+                return Response({
+                    "response": False,
+                    "message": tenant_error.message,
+                    "data": None
+                }, status=tenant_error.status_code)
             
             admin_id = admin.id
             
@@ -308,9 +228,14 @@ class PayslipGeneratorAPIView(APIView):
     def post(self, request, site_id):
         """Create payslip - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_for_payroll(request, site_id)
-            if error_response:
-                return error_response
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
+                return Response({
+                    "response": False,
+                    "message": tenant_error.message,
+                    "data": None
+                }, status=tenant_error.status_code)
             
             data = request.data.copy()
             data['admin_id'] = str(admin.id)
@@ -349,56 +274,14 @@ class PayslipGeneratorAPIView(APIView):
     def put(self, request, site_id, pk=None):
         """Update payslip"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "response": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "response": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "response": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
-                return Response({
-                    "response": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "response": False,
-                    "message": "Site not found or you don't have permission to access this site",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             payslip = PayslipGenerator.objects.get(id=pk, admin=admin)
             
             serializer = PayslipGeneratorUpdateSerializer(payslip, data=request.data, partial=True)
@@ -439,56 +322,14 @@ class PayslipGeneratorAPIView(APIView):
     def delete(self, request, site_id, pk=None):
         """Delete payslip"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "response": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "response": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "response": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
-                return Response({
-                    "response": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "response": False,
-                    "message": "Site not found or you don't have permission to access this site",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             payslip = PayslipGenerator.objects.get(id=pk, admin=admin)
             
             # Filter by site
@@ -1654,46 +1495,15 @@ class EmployeePayrollConfigAPIView(APIView):
         - prefix/<site_id>/employee/<uuid:employee_id>/?effective_month=X&effective_year=Y → Get by employee ID
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "response": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "response": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "response": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "response": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
+            admin_id = admin.id
             
             # Common: Parse month/year params
             effective_month = request.query_params.get('effective_month')
@@ -1949,56 +1759,15 @@ class EmployeePayrollConfigAPIView(APIView):
     def post(self, request, site_id):
         """POST - Create new EmployeePayrollConfig"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
-                return Response({
-                    "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
+            admin_id = admin.id
             
             # Get organization from admin
             organization = self.get_organization_from_admin(admin_id)
@@ -2139,56 +1908,15 @@ class EmployeePayrollConfigAPIView(APIView):
     def put(self, request, site_id, pk=None):
         """PUT - Update EmployeePayrollConfig"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
+            admin_id = admin.id
             
             # Get config
             try:
@@ -2348,46 +2076,14 @@ class EmployeePayrollConfigAPIView(APIView):
     def delete(self, request, site_id, pk):
         """DELETE - Soft delete EmployeePayrollConfig"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Single O(1) query using index payconfig_id_adm_idx
             config = EmployeePayrollConfig.objects.filter(
@@ -2457,9 +2153,14 @@ class EmployeeBankInfoAPIView(APIView):
         - is_primary: Filter by primary status (true/false)
         """
         try:
-            admin, site, error_response = get_admin_and_site_for_payroll(request, site_id)
-            if error_response:
-                return error_response
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
+                return Response({
+                    "response": False,
+                    "message": tenant_error.message,
+                    "data": None
+                }, status=tenant_error.status_code)
             
             admin_id = admin.id
             
@@ -2609,56 +2310,14 @@ class EmployeeBankInfoAPIView(APIView):
         Request body should include employee_id and all bank info fields
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             serializer = EmployeeBankInfoCreateSerializer(data=request.data)
             if serializer.is_valid():
@@ -2721,56 +2380,14 @@ class EmployeeBankInfoAPIView(APIView):
         Requires pk in URL
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
-                return Response({
-                    "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             if not pk:
                 return Response({
@@ -2829,56 +2446,14 @@ class EmployeeBankInfoAPIView(APIView):
         Requires pk in URL
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
-                return Response({
-                    "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             if not pk:
                 return Response({
@@ -2946,9 +2521,14 @@ class EmployeeAdvanceAPIView(APIView):
         - page_size: Items per page (default: 10, max: 100)
         """
         try:
-            admin, site, error_response = get_admin_and_site_for_payroll(request, site_id)
-            if error_response:
-                return error_response
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
+                return Response({
+                    "response": False,
+                    "message": tenant_error.message,
+                    "data": None
+                }, status=tenant_error.status_code)
             
             admin_id = admin.id
             
@@ -3088,56 +2668,15 @@ class EmployeeAdvanceAPIView(APIView):
         Admin or organization can create advance
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
+            admin_id = admin.id
             admin = BaseUserModel.objects.get(id=admin_id, role='admin')
             
             # Get created_by from request user
@@ -3218,56 +2757,14 @@ class EmployeeEarningsExcelAPIView(APIView):
         Query parameters: month (1-12), year (required)
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get month and year from query parameters
             month = request.query_params.get('month')
@@ -3408,56 +2905,14 @@ class EmployeeEarningsExcelAPIView(APIView):
         Query parameters: month (1-12), year (required)
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
-                return Response({
-                    "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get month and year from query parameters
             month = request.query_params.get('month')
@@ -3662,56 +3117,14 @@ class EmployeeDeductionsExcelAPIView(APIView):
         Query parameters: month (1-12), year (required)
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get month and year from query parameters
             month = request.query_params.get('month')
@@ -3850,56 +3263,14 @@ class EmployeeDeductionsExcelAPIView(APIView):
         Query parameters: month (1-12), year (required)
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
-                return Response({
-                    "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get month and year from query parameters
             month = request.query_params.get('month')
@@ -4101,56 +3472,14 @@ class DemoAttendanceSheetDownloadAPIView(APIView):
         Payable days column is left empty for user input
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get all employees under this admin
             employees = UserProfile.objects.filter(
@@ -4267,56 +3596,14 @@ class GeneratePayrollFromAttendanceAPIView(APIView):
         - Use bulk_create/bulk_update for database operations
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get month and year from query parameters
             month = request.query_params.get('month')
@@ -4849,56 +4136,14 @@ class GeneratePayrollFromAttendanceAPIView(APIView):
         - download=true or format=excel - Returns Excel file instead of JSON
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get month and year from query parameters
             month = request.query_params.get('month')
@@ -5244,56 +4489,14 @@ class GeneratePayslipFromPayrollRecordAPIView(APIView):
         try:
             from datetime import date
             
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get month and year from query parameters
             month = request.query_params.get('month')
@@ -5464,56 +4667,14 @@ class PayslipListView(APIView):
         - year (optional) - Filter by year
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": False,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": False,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": False,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
                     "status": False,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
+                    "message": tenant_error.message,
                     "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": False,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get query parameters
             employee_id = request.query_params.get('employee_id')
@@ -5556,7 +4717,7 @@ class PayslipListView(APIView):
                     pass
             
             # Order by latest first
-            payslips_qs = payslips_qs.select_related('employee', 'employee__own_user_profile').order_by('-year', '-created_at')
+            payslips_qs = payslips_qs.select_related('admin', 'employee', 'employee__own_user_profile').order_by('-year', '-created_at')
             
             # Serialize payslips
             serializer = PayslipGeneratorSerializer(payslips_qs, many=True, context={'request': request})
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SearchIndexConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'SearchIndex'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import SearchIndex.signals
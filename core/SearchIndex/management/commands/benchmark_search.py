@@ -0,0 +1,58 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from SearchIndex.models import SearchDocument
+from SearchIndex.search_service import SEARCH_ENTITIES, apply_search, get_entity
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare list search latency: legacy icontains across joins vs the SearchDocument index. '
+        'Uses existing data - load a realistic volume (e.g. 1M tasks) and run rebuild_search_index first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('terms', nargs='+', help='Search terms to try')
+        parser.add_argument('--entity', choices=sorted(SEARCH_ENTITIES), default='task')
+        parser.add_argument('--tenant', help='Scope to one admin (organization for employees) like the list views')
+        parser.add_argument('--runs', type=int, default=5, help='Timed runs per term (default: 5)')
+        parser.add_argument('--limit', type=int, default=20, help='Page size fetched per run (default: 20)')
+
+    def time_search(self, queryset, entity_type, term, enabled, runs, limit):
+        timings = []
+        count = 0
+        with override_settings(SEARCH_INDEX_ENABLED=enabled):
+            for _ in range(runs):
+                start = time.perf_counter()
+                results = apply_search(queryset, entity_type, term)
+                count = results.count()
+                list(results.order_by('-pk').values_list('pk', flat=True)[:limit])
+                timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings), count
+
+    def handle(self, *args, **options):
+        entity_type = options['entity']
+        entity = get_entity(entity_type)
+        queryset = entity.model.objects.all()
+        if options['tenant']:
+            queryset = queryset.filter(**{entity.tenant_field: options['tenant']})
+
+        indexed = SearchDocument.objects.filter(entity_type=entity_type).count()
+        if not indexed:
+            raise CommandError(f'No {entity_type} documents indexed - run rebuild_search_index first')
+        self.stdout.write(self.style.SUCCESS(
+            f'{entity_type}: {queryset.count()} row(s), {indexed} document(s), median of {options["runs"]} run(s)'
+        ))
+
+        for term in options['terms']:
+            legacy_ms, legacy_count = self.time_search(queryset, entity_type, term, False, options['runs'], options['limit'])
+            index_ms, index_count = self.time_search(queryset, entity_type, term, True, options['runs'], options['limit'])
+            speedup = legacy_ms / index_ms if index_ms else 0
+            mismatch = '' if legacy_count == index_count else self.style.WARNING(' (match count differs - index stale?)')
+            self.stdout.write(
+                f'  {term!r:<20} icontains {legacy_ms:>9.1f} ms ({legacy_count})   '
+                f'index {index_ms:>9.1f} ms ({index_count})   {speedup:.1f}x{mismatch}'
+            )
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from SearchIndex.models import SearchDocument
+from SearchIndex.search_service import INDEX_BATCH_SIZE, SEARCH_ENTITIES, get_entity, index_queryset
+
+
+class Command(BaseCommand):
+    help = (
+        'Backfill / rebuild SearchDocument rows for tasks, expenses, visits and employees. '
+        'Run once after deploying the SearchIndex app; safe to re-run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entity', choices=sorted(SEARCH_ENTITIES), help='Only rebuild one entity type')
+        parser.add_argument('--tenant', help='Only rebuild objects of one admin (organization for employees)')
+        parser.add_argument('--purge', action='store_true', help='Delete existing documents of the rebuilt entities first')
+
+    def handle(self, *args, **options):
+        entity_types = [options['entity']] if options['entity'] else list(SEARCH_ENTITIES)
+        for entity_type in entity_types:
+            entity = get_entity(entity_type)
+            queryset = entity.model.objects.all()
+            documents = SearchDocument.objects.filter(entity_type=entity_type)
+            if options['tenant']:
+                queryset = queryset.filter(**{entity.tenant_field: options['tenant']})
+                documents = documents.filter(tenant_id=options['tenant'])
+            if options['purge']:
+                documents.delete()
+
+            start = time.perf_counter()
+            written = 0
+            last_pk = None
+            # Keyset walk over the PK so memory stays flat on large tables
+            while True:
+                page = queryset.order_by('pk')
+                if last_pk is not None:
+                    page = page.filter(pk__gt=last_pk)
+                pks = list(page.values_list('pk', flat=True)[:INDEX_BATCH_SIZE])
+                if not pks:
+                    break
+                written += index_queryset(entity_type, entity.model.objects.filter(pk__in=pks))
+                last_pk = pks[-1]
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{entity_type}: {written} document(s) indexed in {time.perf_counter() - start:.2f}s'
+            ))
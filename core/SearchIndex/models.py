@@ -0,0 +1,33 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized search text for one searchable object (task, expense, visit, employee).
+
+    content holds the lower-cased values of every field the list views search
+    on, including joined ones (employee name/ID/email, category, task type...),
+    so a search is ONE indexed LIKE on this table instead of ORed icontains
+    predicates across joins. On PostgreSQL a pg_trgm GIN index on content is
+    created after migrate (see SearchIndex.signals).
+
+    Rows are maintained by signals and `manage.py rebuild_search_index`.
+    """
+    id = models.BigAutoField(primary_key=True)
+    entity_type = models.CharField(max_length=20)  # task / expense / visit / employee
+    object_id = models.CharField(max_length=64)  # PK of the indexed object (int or UUID as string)
+    tenant_id = models.UUIDField(null=True, blank=True)  # admin (or organization for employees)
+    content = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'object_id'], name='searchdoc_entity_object_uniq'),
+        ]
+        indexes = [
+            # Tenant scoped search - O(1) narrowing before the trigram match
+            models.Index(fields=['entity_type', 'tenant_id'], name='searchdoc_entity_tenant_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.object_id}"
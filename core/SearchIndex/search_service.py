@@ -0,0 +1,269 @@
+"""
+Search Service
+Shared search for list endpoints (tasks, expenses, visits, employees).
+
+Each searchable entity declares, in SEARCH_ENTITIES:
+- the model and the tenant column used to scope documents
+- the lookups the list views search on (the same ones they used to OR
+  together with icontains)
+- which related models/fields feed those lookups, so signals know which
+  documents to rebuild when e.g. an employee is renamed
+
+apply_search() is the single entry point for views. With the index enabled a
+search is ONE LIKE on SearchDocument.content (pg_trgm GIN index on
+PostgreSQL) joined back to the list queryset by primary key; with
+SEARCH_INDEX_ENABLED = False it falls back to the ORed icontains predicates.
+"""
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import BigIntegerField, Q, UUIDField
+from django.db.models.functions import Cast
+
+from .models import SearchDocument
+
+
+INDEX_BATCH_SIZE = 2000
+CONTENT_SEPARATOR = ' | '
+
+
+class SearchEntity:
+    """Search definition for one model"""
+
+    def __init__(self, name, model_label, tenant_field, fields, dependencies=()):
+        """
+        Args:
+            name: entity_type stored on SearchDocument
+            model_label: 'App.Model'
+            tenant_field: column scoping the documents (admin_id / organization_id)
+            fields: lookups whose values make up the document
+            dependencies: (related model label, watched fields, lookups on this
+                model, attribute of the related instance matched by those lookups)
+        """
+        self.name = name
+        self.model_label = model_label
+        self.tenant_field = tenant_field
+        self.fields = tuple(fields)
+        self.dependencies = tuple(dependencies)
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def icontains_q(self, query):
+        """Legacy ORed icontains predicate over the searchable lookups"""
+        condition = Q()
+        for lookup in self.fields:
+            condition |= Q(**{f'{lookup}__icontains': query})
+        return condition
+
+    def pk_cast_field(self):
+        """Output field used to cast SearchDocument.object_id back to this model's PK"""
+        pk = self.model._meta.pk
+        return UUIDField() if pk.get_internal_type() == 'UUIDField' else BigIntegerField()
+
+
+SEARCH_ENTITIES = {
+    entity.name: entity for entity in (
+        SearchEntity(
+            'task', 'TaskControl.Task', 'admin_id',
+            fields=(
+                'title', 'description',
+                'assigned_to__email',
+                'assigned_to__own_user_profile__user_name',
+                'assigned_to__own_user_profile__custom_employee_id',
+                'assigned_by__email',
+                'assigned_by__own_user_profile__user_name',
+                'assigned_by__own_user_profile__custom_employee_id',
+                'task_type__name',
+            ),
+            dependencies=(
+                ('AuthN.BaseUserModel', ('email',), ('assigned_to', 'assigned_by'), 'pk'),
+                ('AuthN.UserProfile', ('user_name', 'custom_employee_id'), ('assigned_to', 'assigned_by'), 'user_id'),
+                ('TaskControl.TaskType', ('name',), ('task_type',), 'pk'),
+            ),
+        ),
+        SearchEntity(
+            'expense', 'Expenditure.Expense', 'admin_id',
+            fields=(
+                'title', 'description',
+                'employee__email',
+                'employee__own_user_profile__user_name',
+                'employee__own_user_profile__custom_employee_id',
+                'category__name',
+                'project__name',
+            ),
+            dependencies=(
+                ('AuthN.BaseUserModel', ('email',), ('employee',), 'pk'),
+                ('AuthN.UserProfile', ('user_name', 'custom_employee_id'), ('employee',), 'user_id'),
+                ('Expenditure.ExpenseCategory', ('name',), ('category',), 'pk'),
+                ('Expenditure.ExpenseProject', ('name',), ('project',), 'pk'),
+            ),
+        ),
+        SearchEntity(
+            'visit', 'VisitControl.Visit', 'admin_id',
+            fields=(
+                'assigned_employee__own_user_profile__user_name',
+                'assigned_employee__email',
+                'assigned_employee__own_user_profile__custom_employee_id',
+                'client_name', 'location_name', 'address',
+                'contact_person', 'contact_phone', 'contact_email',
+                'title', 'description',
+            ),
+            dependencies=(
+                ('AuthN.BaseUserModel', ('email',), ('assigned_employee',), 'pk'),
+                ('AuthN.UserProfile', ('user_name', 'custom_employee_id'), ('assigned_employee',), 'user_id'),
+            ),
+        ),
+        SearchEntity(
+            'employee', 'AuthN.UserProfile', 'organization_id',
+            fields=('user_name', 'custom_employee_id', 'designation', 'user__email'),
+            dependencies=(
+                ('AuthN.BaseUserModel', ('email',), ('user',), 'pk'),
+            ),
+        ),
+    )
+}
+
+
+def document_object_id(pk):
+    """
+    SearchDocument.object_id for a primary key. UUIDs are stored as 32-char hex,
+    which casts back to uuid on PostgreSQL and matches SQLite's char(32) storage.
+    """
+    return pk.hex if isinstance(pk, uuid.UUID) else str(pk)
+
+
+def search_index_enabled():
+    return getattr(settings, 'SEARCH_INDEX_ENABLED', True)
+
+
+def get_entity(entity_type):
+    try:
+        return SEARCH_ENTITIES[entity_type]
+    except KeyError:
+        raise ValueError(f"Unknown search entity: {entity_type}")
+
+
+# ==================== SEARCH ====================
+
+def apply_search(queryset, entity_type, query, tenant_id=None):
+    """
+    Filter a list queryset by a free-text search.
+
+    Args:
+        queryset: queryset of the entity's model (already scoped by the view)
+        entity_type: 'task' / 'expense' / 'visit' / 'employee'
+        query: raw search string (empty = no filtering)
+        tenant_id: Optional admin (or organization for employees) to narrow documents
+
+    Returns:
+        QuerySet
+    """
+    query = (query or '').strip()
+    if not query:
+        return queryset
+
+    entity = get_entity(entity_type)
+    if not search_index_enabled():
+        return queryset.filter(entity.icontains_q(query))
+
+    # O(1) indexed query - trigram GIN index on content, entity/tenant btree index
+    documents = SearchDocument.objects.filter(entity_type=entity_type, content__contains=query.lower())
+    if tenant_id:
+        documents = documents.filter(tenant_id=tenant_id)
+    matching_ids = documents.annotate(
+        matched_pk=Cast('object_id', output_field=entity.pk_cast_field())
+    ).values('matched_pk')
+    return queryset.filter(pk__in=matching_ids)
+
+
+# ==================== INDEXING ====================
+
+def _build_documents(entity, queryset):
+    """One values() query for a batch of objects -> unsaved SearchDocuments"""
+    rows = queryset.values('pk', entity.tenant_field, *entity.fields)
+    documents = {}
+    for row in rows:
+        pk = document_object_id(row['pk'])
+        values = [str(row[lookup]).lower() for lookup in entity.fields if row[lookup] not in (None, '')]
+        document = documents.get(pk)
+        if document is None:
+            documents[pk] = SearchDocument(
+                entity_type=entity.name,
+                object_id=pk,
+                tenant_id=row[entity.tenant_field],
+                content=CONTENT_SEPARATOR.join(values),
+            )
+        elif values:
+            # Multi-valued joins yield several rows per object - merge them
+            document.content = CONTENT_SEPARATOR.join((document.content, *values))
+    return list(documents.values())
+
+
+def index_queryset(entity_type, queryset):
+    """
+    (Re)build documents for every object in a queryset of the entity's model.
+
+    Set based: one SELECT + one upsert per INDEX_BATCH_SIZE objects.
+
+    Returns:
+        int: number of documents written
+    """
+    entity = get_entity(entity_type)
+    written = 0
+    pks = list(queryset.order_by().values_list('pk', flat=True))
+    for start in range(0, len(pks), INDEX_BATCH_SIZE):
+        batch = entity.model.objects.filter(pk__in=pks[start:start + INDEX_BATCH_SIZE])
+        documents = _build_documents(entity, batch)
+        if documents:
+            SearchDocument.objects.bulk_create(
+                documents,
+                update_conflicts=True,
+                unique_fields=['entity_type', 'object_id'],
+                update_fields=['tenant_id', 'content', 'updated_at'],
+            )
+            written += len(documents)
+    return written
+
+
+def index_objects(entity_type, pks):
+    """
+    (Re)build documents for the given primary keys.
+
+    Call after bulk_create / queryset.update() on a searchable model, which
+    bypass the post_save signal.
+    """
+    pks = [pk for pk in pks if pk is not None]
+    if not pks:
+        return 0
+    entity = get_entity(entity_type)
+    return index_queryset(entity_type, entity.model.objects.filter(pk__in=pks))
+
+
+def remove_objects(entity_type, pks):
+    """Delete documents for deleted objects"""
+    SearchDocument.objects.filter(entity_type=entity_type, object_id__in=[document_object_id(pk) for pk in pks]).delete()
+
+
+def reindex_dependents(related_label, instance, update_fields=None):
+    """
+    Rebuild documents whose content includes fields of a related object.
+
+    Skipped when the save only touched fields that are not searched
+    (e.g. last_login on BaseUserModel).
+    """
+    for entity in SEARCH_ENTITIES.values():
+        for label, watched_fields, lookups, attribute in entity.dependencies:
+            if label != related_label:
+                continue
+            if update_fields is not None and not set(update_fields) & set(watched_fields):
+                continue
+            value = getattr(instance, attribute, None)
+            if value is None:
+                continue
+            condition = Q()
+            for lookup in lookups:
+                condition |= Q(**{lookup: value})
+            index_queryset(entity.name, entity.model.objects.filter(condition))
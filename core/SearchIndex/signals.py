@@ -0,0 +1,85 @@
+"""
+SearchIndex Signals
+Keeps SearchDocument rows in sync with the searchable models and the related
+models whose fields are part of their search text.
+
+Writes are applied on transaction commit so rolled-back saves never reach the
+index. bulk_create / queryset.update() bypass these signals - callers use
+search_service.index_objects() for those.
+"""
+import logging
+from functools import partial
+
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+from .search_service import SEARCH_ENTITIES, index_objects, reindex_dependents, remove_objects
+
+
+logger = logging.getLogger(__name__)
+
+
+def _index_on_save(entity_type, sender, instance, created=False, update_fields=None, **kwargs):
+    if kwargs.get('raw'):
+        return
+    entity = SEARCH_ENTITIES[entity_type]
+    if update_fields is not None and not created:
+        # Saves that only touch unsearched columns (status, timestamps...) keep the document
+        local_fields = {lookup.split('__', 1)[0] for lookup in entity.fields} | {entity.tenant_field}
+        if not {name.removesuffix('_id') for name in update_fields} & {name.removesuffix('_id') for name in local_fields}:
+            return
+    transaction.on_commit(partial(index_objects, entity_type, [instance.pk]))
+
+
+def _remove_on_delete(entity_type, sender, instance, **kwargs):
+    transaction.on_commit(partial(remove_objects, entity_type, [instance.pk]))
+
+
+def _reindex_dependents_on_save(related_label, sender, instance, created=False, update_fields=None, **kwargs):
+    if created or kwargs.get('raw'):
+        return  # A new related row is not referenced by any document yet
+    transaction.on_commit(partial(reindex_dependents, related_label, instance, update_fields))
+
+
+def connect_search_signals():
+    """Connect save/delete handlers for every entity and its dependencies"""
+    dependency_labels = set()
+    for entity_type, entity in SEARCH_ENTITIES.items():
+        post_save.connect(
+            partial(_index_on_save, entity_type), sender=entity.model_label,
+            weak=False, dispatch_uid=f'search_index_save_{entity_type}',
+        )
+        post_delete.connect(
+            partial(_remove_on_delete, entity_type), sender=entity.model_label,
+            weak=False, dispatch_uid=f'search_index_delete_{entity_type}',
+        )
+        dependency_labels.update(label for label, *_ in entity.dependencies)
+
+    for label in dependency_labels:
+        post_save.connect(
+            partial(_reindex_dependents_on_save, label), sender=label,
+            weak=False, dispatch_uid=f'search_index_dependents_{label}',
+        )
+
+
+def create_trigram_index(sender, using='default', **kwargs):
+    """
+    PostgreSQL: enable pg_trgm and add a GIN trigram index on content so
+    LIKE '%term%' searches use an index. Needs CREATE privilege on the
+    database for the extension; logged and skipped otherwise.
+    """
+    if sender.name != 'SearchIndex' or connection.vendor != 'postgresql':
+        return
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                'CREATE INDEX IF NOT EXISTS searchdoc_content_trgm_idx '
+                'ON "SearchIndex_searchdocument" USING gin (content gin_trgm_ops)'
+            )
+    except Exception as e:
+        logger.warning(f"Could not create trigram search index: {e}")
+
+
+connect_search_signals()
+post_migrate.connect(create_trigram_index, dispatch_uid='search_index_trigram')
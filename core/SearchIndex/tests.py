@@ -0,0 +1,117 @@
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase, override_settings
+
+from AuthN.models import UserProfile
+from TaskControl.models import Task, TaskType
+from utils.fixture_utils import create_employees, create_tenant
+from .models import SearchDocument
+from .search_service import apply_search, document_object_id
+
+
+def create_task(tenant, title, assigned_to=None):
+    task_type, _ = TaskType.objects.get_or_create(admin=tenant['admin'], site=tenant['site'], name='Audit')
+    return Task.objects.create(
+        admin=tenant['admin'], site=tenant['site'], task_type=task_type, title=title, assigned_to=assigned_to,
+        assigned_by=tenant['admin'], start_date=date(2026, 1, 1), due_date=date(2026, 1, 2),
+    )
+
+
+class SearchIndexSignalTests(TestCase):
+    """SearchIndex.signals - documents follow saves and deletes once they commit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        cls.employee = create_employees(cls.tenant, 1)[0]
+
+    def document(self, entity_type, pk):
+        return SearchDocument.objects.filter(entity_type=entity_type, object_id=document_object_id(pk)).first()
+
+    def test_document_is_written_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            task = create_task(self.tenant, 'Quarterly Audit', self.employee)
+        self.assertIsNone(self.document('task', task.pk))  # Not committed yet
+        for callback in callbacks:
+            callback()
+        document = self.document('task', task.pk)
+        self.assertEqual(document.tenant_id, self.tenant['admin'].id)
+        self.assertIn('quarterly audit', document.content)
+        self.assertIn('employee 0', document.content)  # Joined assignee name
+
+    def test_searched_field_update_rebuilds_document(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = create_task(self.tenant, 'Quarterly Audit', self.employee)
+        with self.captureOnCommitCallbacks(execute=True):
+            task.title = 'Stock Count'
+            task.save(update_fields=['title'])
+        content = self.document('task', task.pk).content
+        self.assertIn('stock count', content)
+        self.assertNotIn('quarterly audit', content)
+
+    def test_unsearched_field_update_keeps_document(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = create_task(self.tenant, 'Quarterly Audit', self.employee)
+        with mock.patch('SearchIndex.signals.index_objects') as index_objects:
+            with self.captureOnCommitCallbacks(execute=True):
+                task.status = 'completed'
+                task.save(update_fields=['status'])
+        index_objects.assert_not_called()
+
+    def test_related_rename_reindexes_dependents(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = create_task(self.tenant, 'Quarterly Audit', self.employee)
+        profile = UserProfile.objects.get(user=self.employee)
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.user_name = 'Priya Raman'
+            profile.save(update_fields=['user_name'])
+        self.assertIn('priya raman', self.document('task', task.pk).content)
+        self.assertIn('priya raman', self.document('employee', profile.pk).content)
+
+    def test_document_is_removed_on_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = create_task(self.tenant, 'Quarterly Audit', self.employee)
+        pk = task.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertIsNone(self.document('task', pk))
+
+
+class ApplySearchTests(TestCase):
+    """SearchIndex.search_service.apply_search - indexed match, scoped to the tenant"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        cls.other = create_tenant()
+        cls.tasks = {}
+        with cls.captureOnCommitCallbacks(execute=True):
+            for key, tenant in (('own', cls.tenant), ('foreign', cls.other)):
+                cls.tasks[key] = create_task(tenant, 'Quarterly Audit', create_employees(tenant, 1)[0])
+            cls.tasks['unmatched'] = create_task(cls.tenant, 'Stock Count')
+
+    def search(self, query, tenant_id=None, queryset=None):
+        queryset = Task.objects.all() if queryset is None else queryset
+        return set(apply_search(queryset, 'task', query, tenant_id=tenant_id))
+
+    def test_search_is_case_insensitive_substring(self):
+        self.assertEqual(self.search('  qUARTERLY aud '), {self.tasks['own'], self.tasks['foreign']})
+
+    def test_tenant_id_scopes_documents(self):
+        admin_id = self.tenant['admin'].id
+        self.assertEqual(self.search('quarterly', tenant_id=admin_id), {self.tasks['own']})
+        self.assertEqual(self.search('quarterly', tenant_id=self.other['admin'].id), {self.tasks['foreign']})
+
+    def test_search_never_widens_the_view_queryset(self):
+        scoped = Task.objects.filter(admin=self.tenant['admin'])
+        self.assertEqual(self.search('quarterly', queryset=scoped), {self.tasks['own']})
+
+    def test_empty_query_returns_queryset_unchanged(self):
+        queryset = Task.objects.filter(admin=self.tenant['admin'])
+        self.assertIs(apply_search(queryset, 'task', '  '), queryset)
+
+    @override_settings(SEARCH_INDEX_ENABLED=False)
+    def test_fallback_matches_the_index(self):
+        self.assertEqual(self.search('quarterly audit'), {self.tasks['own'], self.tasks['foreign']})
+        self.assertEqual(self.search('stock', tenant_id=self.tenant['admin'].id), {self.tasks['unmatched']})
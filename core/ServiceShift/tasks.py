@@ -0,0 +1,104 @@
+"""
+Celery Tasks for ServiceShift
+Shift reminders: every SHIFT_REMINDER_INTERVAL seconds, employees whose shift
+starts SHIFT_REMINDER_LEAD_MINUTES from now get a push notification - unless
+they already checked in, are on approved leave, have a week off or a holiday.
+"""
+
+from celery import shared_task
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _starting_between(start, end):
+    """Q for shifts whose start_time falls in [start, end) - the window may cross midnight"""
+    if start.date() == end.date():
+        return Q(start_time__gte=start.time(), start_time__lt=end.time())
+    return Q(start_time__gte=start.time()) | Q(start_time__lt=end.time())
+
+
+def _week_off_policy_ids(day):
+    """Active week off policies that include `day` (weekday name + week of month in the cycle)"""
+    from ServiceWeekOff.models import WeekOffPolicy
+
+    weekday = day.strftime('%A')
+    week_of_month = (day.day - 1) // 7 + 1
+    return [
+        policy_id
+        for policy_id, week_days, cycle in WeekOffPolicy.objects.filter(is_active=True).values_list(
+            'id', 'week_days', 'week_off_cycle'
+        )
+        if weekday in (week_days or []) and week_of_month in (cycle or [])
+    ]
+
+
+@shared_task(name='send_shift_reminders')
+def send_shift_reminders():
+    """
+    Queue push reminders for shifts starting in the next reminder window.
+    Each (shift, day) is reminded once - repeated or overlapping runs are no-ops
+    """
+    from AuthN.models import UserProfile
+    from Holiday.models import Holiday
+    from LeaveControl.models import LeaveApplication
+    from WorkLog.models import Attendance
+    from utils.notification_service import notify
+    from .models import ServiceShift
+
+    lead = timedelta(minutes=getattr(settings, 'SHIFT_REMINDER_LEAD_MINUTES', 15))
+    interval = timedelta(seconds=getattr(settings, 'SHIFT_REMINDER_INTERVAL', 300))
+    window_start = timezone.localtime() + lead
+    window_end = window_start + interval
+    day = window_start.date()
+
+    holiday = Holiday.objects.filter(
+        Q(site__isnull=True) | Q(site_id=OuterRef('site_id')),
+        admin_id=OuterRef('admin_id'), holiday_date=day, is_active=True, is_optional=False,
+    )
+    shifts = list(
+        ServiceShift.objects.filter(_starting_between(window_start, window_end), is_active=True)
+        .exclude(Exists(holiday))
+        .values_list('id', 'shift_name', 'start_time')
+    )
+    if not shifts:
+        return {"shifts": 0, "employees": 0}
+
+    week_off_ids = _week_off_policy_ids(day)
+    checked_in = Attendance.objects.filter(user_id=OuterRef('user_id'), attendance_date=day)
+    on_leave = LeaveApplication.objects.filter(
+        user_id=OuterRef('user_id'), status='approved', from_date__lte=day, to_date__gte=day
+    )
+    employees = 0
+    for shift_id, shift_name, start_time in shifts:
+        if not cache.add(f"shift_reminder_{shift_id}_{day.isoformat()}", 1, 24 * 60 * 60):
+            continue
+        recipients = (
+            UserProfile.objects
+            .filter(
+                shifts=shift_id, user__is_active=True,
+                organization__own_organization_profile_setting__push_notifications_enabled=True,
+            )
+            .exclude(fcm_token='')
+            .exclude(Exists(checked_in))
+            .exclude(Exists(on_leave))
+        )
+        if week_off_ids:
+            recipients = recipients.exclude(week_offs__in=week_off_ids)
+        user_ids = list(recipients.values_list('user_id', flat=True).distinct())
+        if not user_ids:
+            continue
+        notify(
+            user_ids, 'shift_reminder', 'Shift reminder',
+            f"Your {shift_name or 'shift'} starts at {start_time.strftime('%I:%M %p')}",
+            data={'shift_id': shift_id},
+        )
+        employees += len(user_ids)
+
+    logger.info(f"Shift reminders: {employees} employee(s) across {len(shifts)} shift(s)")
+    return {"shifts": len(shifts), "employees": employees}
@@ -6,110 +6,24 @@ All queries O(1) or using proper database indexes
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from .models import WeekOffPolicy
-from AuthN.models import AdminProfile, BaseUserModel, UserProfile
-from SiteManagement.models import Site
+from AuthN.models import BaseUserModel, UserProfile
 from .serializers import WeekOffPolicySerializer, WeekOffPolicyUpdateSerializer
+from AuthN.permissions import HasTenantAccess
 from utils.site_filter_utils import filter_queryset_by_site
 
 
-def get_admin_and_site_optimized(request, site_id):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Returns: (admin, site, None) tuple or (None, None, Response with error)
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    else:
-        return None, None, Response({
-            "status": status.HTTP_403_FORBIDDEN,
-            "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-            "data": None
-        }, status=status.HTTP_403_FORBIDDEN)
-
-
 class WeekOffPolicyAPIView(APIView):
     """Week Off Policy CRUD Operations - Optimized"""
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     
     def get(self, request, site_id, pk=None):
         """Get week off policies - O(1) queries with index optimization"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             admin_id = admin.id
             
@@ -175,9 +89,7 @@ class WeekOffPolicyAPIView(APIView):
     def post(self, request, site_id, pk=None):
         """Create week off policy - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin, site = request.tenant.admin, request.tenant.site
             
             data = request.data.copy()
             data['admin'] = str(admin.id)
@@ -209,9 +121,7 @@ class WeekOffPolicyAPIView(APIView):
     def put(self, request, site_id, pk=None):
         """Update week off policy - Optimized O(1) query"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index weekoff_id_adm_idx
             obj = WeekOffPolicy.objects.filter(
@@ -257,9 +167,7 @@ class WeekOffPolicyAPIView(APIView):
     def delete(self, request, site_id, pk=None):
         """Delete week off policy (soft delete) - Optimized O(1) update"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # Single O(1) query using index weekoff_id_adm_idx
             obj = WeekOffPolicy.objects.filter(
@@ -315,13 +223,12 @@ class WeekOffPolicyAPIView(APIView):
 
 class AssignWeekOffToUserAPIView(APIView):
     """Assign/Get/Delete week off policies for a user"""
+    permission_classes = [IsAuthenticated, HasTenantAccess]
     
     def post(self, request, site_id, user_id=None):
         """Assign week off policies to user - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # O(1) query - Validate user
             user = BaseUserModel.objects.filter(id=user_id, role='user').only('id', 'role').first()
@@ -405,10 +312,6 @@ class AssignWeekOffToUserAPIView(APIView):
     def get(self, request, site_id, user_id=None):
         """Get user's assigned week offs - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
-            
             # O(1) query - Validate user
             user = BaseUserModel.objects.filter(id=user_id, role='user').only('id', 'role').first()
             if not user:
@@ -455,9 +358,7 @@ class AssignWeekOffToUserAPIView(APIView):
     def delete(self, request, site_id, user_id=None, week_off_id=None):
         """Remove specific week off or all week offs from user - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
-            if error_response:
-                return error_response
+            admin = request.tenant.admin
             
             # O(1) query - Validate user
             user = BaseUserModel.objects.filter(id=user_id, role='user').only('id', 'role').first()
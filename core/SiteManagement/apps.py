@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SiteManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'SiteManagement'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import SiteManagement.signals
@@ -0,0 +1,28 @@
+"""
+Site Management Signals
+Keeps cached assignment indexes and tenant maps in sync with Site /
+EmployeeAdminSiteAssignment writes
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Site, EmployeeAdminSiteAssignment
+from utils.Employee.assignment_resolver import invalidate_assignment_cache
+from utils.tenant_utils import invalidate_tenant_cache
+
+
+@receiver(post_save, sender=EmployeeAdminSiteAssignment)
+@receiver(post_delete, sender=EmployeeAdminSiteAssignment)
+def invalidate_assignment_index(sender, instance, **kwargs):
+    """Bump the admin's assignment index version and drop the employee's cached admin once the write commits"""
+    admin_ids, employee_ids = [instance.admin_id], [instance.employee_id]
+    transaction.on_commit(lambda: invalidate_assignment_cache(admin_ids=admin_ids, employee_ids=employee_ids))
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_site_tenant(sender, instance, **kwargs):
+    """Drop the owning admin's cached tenant map (site list changed) once the write commits"""
+    admin_id = instance.created_by_admin_id
+    transaction.on_commit(lambda: invalidate_tenant_cache([admin_id]))
@@ -0,0 +1,226 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from utils.Employee.assignment_resolver import get_assignment_version, get_site_assignment_index
+from utils.fixture_utils import create_employees, create_tenant, create_tenant_rows
+from utils.tenant_utils import resolve_tenant
+from .models import EmployeeAdminSiteAssignment, Site
+
+# Site-scoped endpoints of the main apps - tenant checks must not touch these tables on a warm cache
+TENANT_ENDPOINTS = (
+    '/api/holidays/{site_id}/',
+    '/api/service-shifts/{site_id}/',
+    '/api/leave-types/{site_id}/',
+    '/api/leave-applications/{site_id}/?year={year}',
+    '/api/expenses/{site_id}/',
+    '/api/locations/{site_id}/',
+    '/api/task/task-list-create/{site_id}/',
+    '/api/payroll/employee-payroll-config/{site_id}/',
+    '/api/contact/contact-list-create/{site_id}/',
+)
+TENANT_TABLES = ('"SiteManagement_site"', '"AuthN_adminprofile"')
+
+
+class TenantResolutionTests(TestCase):
+    """utils.tenant_utils.resolve_tenant - cached tenant map and its signal invalidation"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        cls.employee = create_tenant_rows(cls.tenant, 1)[0]
+        cls.other = create_tenant()
+
+    def setUp(self):
+        cache.clear()
+
+    def request(self, user, **params):
+        request = Request(APIRequestFactory().get('/', params))
+        request.user = user
+        return request
+
+    def resolve(self, user, site_id=None, **params):
+        return resolve_tenant(self.request(user, **params), site_id, allow_user_role=True)
+
+    def test_admin_profile_write_invalidates_tenant_map_on_commit(self):
+        admin = self.tenant['admin']
+        self.resolve(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            admin.own_admin_profile.save()
+        with self.assertNumQueries(2):
+            self.resolve(admin)
+
+    def test_admin_warm_cache_costs_no_queries(self):
+        site = self.tenant['site']
+        with self.assertNumQueries(2):
+            tenant, error = self.resolve(self.tenant['admin'], site.id)
+        self.assertIsNone(error)
+        self.assertEqual((tenant.admin, tenant.site), (self.tenant['admin'], site))
+        with self.assertNumQueries(0):
+            tenant, error = self.resolve(self.tenant['admin'], site.id)
+        self.assertEqual(tenant.site_id, site.id)
+
+    def test_organization_warm_cache_costs_no_queries(self):
+        organization, admin_id = self.tenant['organization'], str(self.tenant['admin'].id)
+        self.resolve(organization, self.tenant['site'].id, admin_id=admin_id)
+        with self.assertNumQueries(0):
+            tenant, error = self.resolve(organization, self.tenant['site'].id, admin_id=admin_id)
+        self.assertEqual(tenant.organization_id, str(organization.id))
+
+    def test_employee_warm_cache_costs_no_queries(self):
+        self.resolve(self.employee, self.tenant['site'].id)
+        with self.assertNumQueries(0):
+            tenant, error = self.resolve(self.employee, self.tenant['site'].id)
+        self.assertEqual(tenant.admin, self.tenant['admin'])
+
+    def test_resolution_is_memoized_on_the_request(self):
+        request = self.request(self.tenant['admin'])
+        resolve_tenant(request, self.tenant['site'].id)
+        cache.clear()
+        with self.assertNumQueries(0):
+            tenant, error = resolve_tenant(request, self.tenant['site'].id)
+        self.assertIs(request.tenant, tenant)
+
+    def test_foreign_admin_and_site_are_rejected(self):
+        tenant, error = self.resolve(self.tenant['organization'], admin_id=str(self.other['admin'].id))
+        self.assertEqual(error.status_code, 403)
+        tenant, error = self.resolve(self.tenant['admin'], self.other['site'].id)
+        self.assertEqual(error.status_code, 403)
+
+    def test_site_write_invalidates_tenant_map_on_commit(self):
+        site = self.tenant['site']
+        self.resolve(self.tenant['admin'], site.id)
+        with self.captureOnCommitCallbacks() as callbacks:
+            site.is_active = False
+            site.save()
+        tenant, error = self.resolve(self.tenant['admin'], site.id)
+        self.assertIsNone(error)  # Not committed yet - the cached map still stands
+        for callback in callbacks:
+            callback()
+        with self.assertNumQueries(2):
+            tenant, error = self.resolve(self.tenant['admin'], site.id)
+        self.assertEqual(error.status_code, 403)
+
+    def test_new_site_is_resolvable_after_commit(self):
+        self.resolve(self.tenant['admin'])
+        with self.captureOnCommitCallbacks(execute=True):
+            site = Site.objects.create(
+                organization=self.tenant['organization'], created_by_admin=self.tenant['admin'], site_name='Branch',
+                address='2 MG Road', city='Bengaluru', state='Karnataka',
+            )
+        tenant, error = self.resolve(self.tenant['admin'], site.id)
+        self.assertIsNone(error)
+        self.assertEqual(tenant.site, site)
+
+    def test_assignment_write_invalidates_employee_sites(self):
+        self.resolve(self.employee, self.tenant['site'].id)
+        assignment = EmployeeAdminSiteAssignment.objects.get(employee=self.employee)
+        with self.captureOnCommitCallbacks() as callbacks:
+            assignment.is_active = False
+            assignment.save()
+        tenant, error = self.resolve(self.employee, self.tenant['site'].id)
+        self.assertIsNone(error)  # Not committed yet - the cached index still stands
+        for callback in callbacks:
+            callback()
+        tenant, error = self.resolve(self.employee, self.tenant['site'].id)
+        self.assertEqual(error.status_code, 403)
+        self.assertEqual(error.message, "You are not assigned to this site")
+
+
+class AssignmentIndexInvalidationTests(TestCase):
+    """SiteManagement.signals.invalidate_assignment_index - version bump deferred to commit"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        cls.employee = create_employees(cls.tenant, 1)[0]
+
+    def setUp(self):
+        cache.clear()
+
+    def test_assignment_write_bumps_version_on_commit(self):
+        admin, site = self.tenant['admin'], self.tenant['site']
+        get_site_assignment_index(admin.id, site.id)
+        version = get_assignment_version(admin.id)
+        assignment = EmployeeAdminSiteAssignment.objects.get(employee=self.employee)
+        with self.captureOnCommitCallbacks() as callbacks:
+            assignment.delete()
+        self.assertEqual(get_assignment_version(admin.id), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_assignment_version(admin.id), version)
+        with self.assertNumQueries(1):
+            index = get_site_assignment_index(admin.id, site.id)
+        self.assertEqual(index.employees_on(), [])
+
+
+class TenantEndpointQueryTests(TestCase):
+    """Main site-scoped endpoints - no Site / AdminProfile queries once the tenant map is warm"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        create_tenant_rows(cls.tenant, 3)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_warm_tenant_map_skips_tenant_tables(self):
+        params = {'site_id': self.tenant['site'].id, 'year': 2026}
+        for role in ('admin', 'organization'):
+            client = APIClient()
+            client.force_authenticate(self.tenant[role])
+            admin_id = f"admin_id={self.tenant['admin'].id}"
+            for endpoint in TENANT_ENDPOINTS:
+                url = endpoint.format(**params)
+                url += ('&' if '?' in url else '?') + admin_id
+                with self.subTest(role=role, url=url):
+                    client.get(url)  # Warms the tenant map
+                    with CaptureQueriesContext(connection) as queries:
+                        response = client.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    tenant_queries = [
+                        query['sql'] for query in queries.captured_queries
+                        if any(table in query['sql'] for table in TENANT_TABLES)
+                    ]
+                    self.assertEqual(tenant_queries, [])
+
+
+class HasTenantAccessTests(TestCase):
+    """AuthN.permissions.HasTenantAccess - resolves request.tenant before the handler runs"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+        cls.other = create_tenant()
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, user, site, **params):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.get(f'/api/service-shifts/{site.id}/', params)
+
+    def test_admin_is_resolved(self):
+        response = self.get(self.tenant['admin'], self.tenant['site'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([shift['id'] for shift in response.data['data']], [self.tenant['shift'].id])
+
+    def test_organization_is_resolved_through_admin_id(self):
+        response = self.get(self.tenant['organization'], self.tenant['site'], admin_id=self.tenant['admin'].id)
+        self.assertEqual(response.status_code, 200)
+        response = self.get(self.tenant['organization'], self.tenant['site'])
+        self.assertEqual(response.status_code, 400)
+
+    def test_foreign_site_renders_standard_error(self):
+        response = self.get(self.tenant['admin'], self.other['site'])
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data, {
+            'status': 403,
+            'message': "Site not found or you don't have permission to access this site",
+            'data': None,
+        })
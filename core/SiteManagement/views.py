@@ -22,6 +22,7 @@ from .serializers import (
 )
 from AuthN.models import BaseUserModel, AdminProfile, UserProfile
 from utils.Employee.assignment_utils import get_employees_assigned_to_site
+from utils.tenant_utils import invalidate_tenant_cache
 
 
 class SiteAPIView(APIView):
@@ -250,6 +251,8 @@ class SiteAPIView(APIView):
             
             # O(1) optimized update - only update is_active field using index
             Site.objects.filter(id=site_id, created_by_admin=admin).update(is_active=False)
+            # update() skips post_save - drop the admin's cached tenant map
+            invalidate_tenant_cache([admin.id])
             
             return Response({
                 "status": status.HTTP_200_OK,
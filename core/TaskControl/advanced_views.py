@@ -8,7 +8,7 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.db import transaction
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import Count, Sum, Avg
 from django.utils import timezone
 from datetime import datetime, date, timedelta
 from decimal import Decimal
@@ -22,10 +22,22 @@ from .models import Task, TaskComment
 from .serializers import (
     TaskSerializer, TaskCommentSerializer
 )
-from AuthN.models import BaseUserModel, UserProfile, AdminProfile
+from AuthN.models import BaseUserModel, UserProfile
 from SiteManagement.models import Site
+from utils.tenant_utils import get_admin_and_site_or_response
 from utils.pagination_utils import CustomPagination
 from utils.site_filter_utils import filter_queryset_by_site
+from SearchIndex.search_service import apply_search
+from Outbox import outbox_service
+from utils.notification_service import notify
+
+
+def notify_task_assigned(task):
+    """Push 'New task assigned' to the task's assignee once the transaction commits"""
+    notify(
+        [task.assigned_to_id], 'task_assigned', 'New task assigned', task.title,
+        data={'task_id': task.id, 'due_date': task.due_date.isoformat() if task.due_date else ''}
+    )
 
 
 class TaskAPIView(APIView):
@@ -38,60 +50,22 @@ class TaskAPIView(APIView):
     """
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('-created_at', '-id')  # ?cursor= keyset pagination
     
     def get(self, request, site_id, user_id=None, pk=None):
         """Get tasks - filtered by role - Single optimized query"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": status.HTTP_400_BAD_REQUEST,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": status.HTTP_403_FORBIDDEN,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": status.HTTP_404_NOT_FOUND,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
+            # Admin / organization roles - resolved from the cached tenant map (0 queries on warm cache)
+            if request.user.role in ('admin', 'organization'):
+                admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+                if error_response:
+                    return error_response
+                admin_id = admin.id
             else:
                 # For user role, admin_id is not required
                 admin_id = None
                 admin = None
             
-            # Validate site belongs to admin (if admin_id exists)
-            if admin_id:
-                try:
-                    site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-                except Site.DoesNotExist:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Site not found or you don't have permission to access this site",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            
             user = request.user
             
             if pk:
@@ -179,34 +153,16 @@ class TaskAPIView(APIView):
                         except ValueError:
                             pass
                 
-                # Search functionality
+                # Search functionality - SearchDocument trigram index
                 search_query = request.query_params.get('search', '').strip()
-                if search_query:
-                    queryset = queryset.filter(
-                        Q(title__icontains=search_query) |
-                        Q(description__icontains=search_query) |
-                        Q(assigned_to__email__icontains=search_query) |
-                        Q(assigned_to__own_user_profile__user_name__icontains=search_query) |
-                        Q(assigned_to__own_user_profile__custom_employee_id__icontains=search_query) |
-                        Q(assigned_by__email__icontains=search_query) |
-                        Q(assigned_by__own_user_profile__user_name__icontains=search_query) |
-                        Q(assigned_by__own_user_profile__custom_employee_id__icontains=search_query) |
-                        Q(task_type__name__icontains=search_query)
-                    )
+                queryset = apply_search(queryset, 'task', search_query)
                 
                 # Optimize queryset with select_related
                 queryset = queryset.select_related(
                     'assigned_to', 'assigned_by', 'task_type',
                     'assigned_to__own_user_profile', 'assigned_by__own_user_profile'
-                ).order_by('-created_at')
-                
-                # Fetch only required fields
-                queryset = queryset.only(
-                    'id', 'admin_id', 'task_type_id', 'title', 'description', 'priority', 'status',
-                    'assigned_to_id', 'assigned_by_id', 'start_date', 'due_date', 'start_time',
-                    'end_time', 'actual_hours', 'completed_at', 'progress_percentage',
-                    'created_at', 'updated_at'
-                )
+                ).prefetch_related('dependencies').order_by('-created_at')
+                # No .only() - TaskSerializer renders every column, deferred ones would reload per row
                 
                 # Check if Excel export is requested
                 export_excel = request.query_params.get('export', '').lower() == 'true'
@@ -219,7 +175,7 @@ class TaskAPIView(APIView):
                 
                 # Pagination
                 paginator = self.pagination_class()
-                paginated_qs = paginator.paginate_queryset(queryset, request)
+                paginated_qs = paginator.paginate_queryset(queryset, request, view=self)
                 serializer = TaskSerializer(paginated_qs, many=True)
                 pagination_data = paginator.get_paginated_response(serializer.data)
                 pagination_data["results"] = serializer.data
@@ -237,57 +193,16 @@ class TaskAPIView(APIView):
     def post(self, request, site_id, user_id=None):
         """Create task - Admin can create and assign to employee"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": status.HTTP_400_BAD_REQUEST,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": status.HTTP_403_FORBIDDEN,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": status.HTTP_404_NOT_FOUND,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
+            # Admin / organization roles - resolved from the cached tenant map (0 queries on warm cache)
+            if request.user.role in ('admin', 'organization'):
+                admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+                if error_response:
+                    return error_response
+                admin_id = admin.id
             else:
-                # For user role, admin_id is not required
+                # For user role, admin_id is not required - just validate site exists
                 admin_id = None
                 admin = None
-            
-            # Validate site belongs to admin (if admin_id exists)
-            if admin_id:
-                try:
-                    site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-                except Site.DoesNotExist:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Site not found or you don't have permission to access this site",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            else:
-                # For user role, just validate site exists
                 try:
                     site = Site.objects.get(id=site_id, is_active=True)
                 except Site.DoesNotExist:
@@ -328,10 +243,13 @@ class TaskAPIView(APIView):
                 
                 # Schedule task if frequency is not onetime
                 if task.schedule_frequency != 'onetime':
-                    from .tasks import create_scheduled_task
                     # Schedule first instance immediately if start_date is today or past
                     if task.start_date and task.start_date <= date.today():
-                        create_scheduled_task.delay(task.id)
+                        outbox_service.enqueue_task('TaskControl.tasks.create_scheduled_task', args=[task.id])
+                
+                # Tell the assignee - pushed after commit
+                if task.assigned_to_id and task.assigned_to_id != user.id:
+                    notify_task_assigned(task)
                 
                 return Response({
                     "status": status.HTTP_201_CREATED,
@@ -354,40 +272,12 @@ class TaskAPIView(APIView):
     def put(self, request, site_id, user_id=None, pk=None):
         """Update task"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": status.HTTP_400_BAD_REQUEST,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": status.HTTP_403_FORBIDDEN,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": status.HTTP_404_NOT_FOUND,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
+            # Admin / organization roles - resolved from the cached tenant map (0 queries on warm cache)
+            if request.user.role in ('admin', 'organization'):
+                admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+                if error_response:
+                    return error_response
+                admin_id = admin.id
             else:
                 # For user role, admin_id is not required
                 admin_id = None
@@ -400,17 +290,6 @@ class TaskAPIView(APIView):
                     "data": None
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Validate site belongs to admin (if admin_id exists)
-            if admin_id:
-                try:
-                    site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-                except Site.DoesNotExist:
-                    return Response({
-                        "status": status.HTTP_403_FORBIDDEN,
-                        "message": "Site not found or you don't have permission to access this site",
-                        "data": None
-                    }, status=status.HTTP_403_FORBIDDEN)
-            
             # Get task - filter by admin_id if provided
             if admin_id:
                 task = get_object_or_404(Task, id=pk, admin_id=admin_id)
@@ -441,8 +320,13 @@ class TaskAPIView(APIView):
             serializer = TaskSerializer(task, data=request.data, partial=True)
             if serializer.is_valid():
                 old_frequency = task.schedule_frequency
+                old_assignee_id = task.assigned_to_id
                 task = serializer.save()
                 
+                # Reassigned - tell the new assignee
+                if task.assigned_to_id and task.assigned_to_id not in (old_assignee_id, user.id):
+                    notify_task_assigned(task)
+                
                 # Update dependencies if provided
                 if 'dependency_ids' in request.data and admin_id:
                     dependency_ids = request.data.get('dependency_ids', [])
@@ -452,9 +336,8 @@ class TaskAPIView(APIView):
                 # Reschedule if frequency changed
                 if 'schedule_frequency' in request.data and old_frequency != task.schedule_frequency:
                     if task.schedule_frequency != 'onetime':
-                        from .tasks import create_scheduled_task
                         if task.start_date and task.start_date <= date.today():
-                            create_scheduled_task.delay(task.id)
+                            outbox_service.enqueue_task('TaskControl.tasks.create_scheduled_task', args=[task.id])
                 
                 return Response({
                     "status": status.HTTP_200_OK,
@@ -476,56 +359,18 @@ class TaskAPIView(APIView):
     def delete(self, request, site_id, user_id=None, pk=None):
         """Delete task - Only admin can delete"""
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": status.HTTP_400_BAD_REQUEST,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": None
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": status.HTTP_403_FORBIDDEN,
-                            "message": "Admin does not belong to your organization",
-                            "data": None
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": status.HTTP_404_NOT_FOUND,
-                        "message": "Admin not found",
-                        "data": None
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
+            if request.user.role not in ('admin', 'organization'):
                 return Response({
                     "status": status.HTTP_403_FORBIDDEN,
                     "message": "Unauthorized access. Only admin and organization roles can delete tasks",
                     "data": None
                 }, status=status.HTTP_403_FORBIDDEN)
             
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
-                return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": None
-                }, status=status.HTTP_403_FORBIDDEN)
+            # Resolved from the cached tenant map (0 queries on warm cache)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
+            if error_response:
+                return error_response
+            admin_id = admin.id
             
             if not pk:
                 return Response({
@@ -668,7 +513,8 @@ class TaskCommentAPIView(APIView):
         """Get task comments"""
         try:
             task = get_object_or_404(Task, id=task_id)
-            comments = TaskComment.objects.filter(task=task)
+            # admin_email / admin_name come from the joined rows - no per-comment queries
+            comments = TaskComment.objects.filter(task=task).select_related('admin', 'admin__own_user_profile')
             serializer = TaskCommentSerializer(comments, many=True)
             return Response({
                 "status": status.HTTP_200_OK,
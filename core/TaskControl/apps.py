@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TaskcontrolConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'TaskControl'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import TaskControl.signals
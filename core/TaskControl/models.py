@@ -193,6 +193,16 @@ class Task(models.Model):
             models.Index(fields=['month_date'], name='task_monthdate_idx'),
             # Detail view optimization
             models.Index(fields=['id', 'admin'], name='task_id_adm_idx'),
+            # Keyset pagination (?cursor=) - WHERE admin = x AND (created_at, id) < (...)
+            models.Index(fields=['admin', 'created_at', 'id'], name='task_adm_created_id_idx'),
+        ]
+        constraints = [
+            # One scheduled instance per parent per due date - makes the scheduler idempotent
+            models.UniqueConstraint(
+                fields=['parent_task', 'due_date'],
+                condition=models.Q(parent_task__isnull=False),
+                name='task_parent_due_uniq',
+            ),
         ]
     
     def __str__(self):
@@ -0,0 +1,35 @@
+"""
+TaskControl Signals
+Invalidates cached dashboard statistics and moves live status counters
+when tasks are written
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Task
+from utils.dashboard_stats_service import invalidate_dashboard_stats
+from utils.status_counter_service import count_deleted, count_saved, remember_counted_state
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_task_dashboard_stats(sender, instance, **kwargs):
+    """Bump the admin's tasks dashboard version once the write commits"""
+    invalidate_dashboard_stats('tasks', [instance.admin_id])
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_status(sender, instance, update_fields=None, **kwargs):
+    """Load the stored status so post_save can detect a transition"""
+    remember_counted_state(instance, update_fields)
+
+
+@receiver(post_save, sender=Task)
+def count_task_status_on_save(sender, instance, created, **kwargs):
+    """Move the live status counters on commit"""
+    count_saved('task', instance, created)
+
+
+@receiver(post_delete, sender=Task)
+def count_task_status_on_delete(sender, instance, **kwargs):
+    count_deleted('task', instance)
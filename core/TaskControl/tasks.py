@@ -1,24 +1,62 @@
 """
 Celery Tasks for Task Scheduling
-Optimized O(1) complexity scheduling
+Set-based scheduling - one anti-join query finds every due parent without an
+instance for the period, instances are written with bulk_create in batches.
+Idempotent via parent row locks and the unique (parent_task, due_date)
+constraint on Task.
 """
 
+from calendar import monthrange
 from celery import shared_task
 from django.utils import timezone
 from datetime import datetime, timedelta, date
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from .models import Task
 from AuthN.models import BaseUserModel
+from SearchIndex.search_service import index_queryset
+from utils.dashboard_stats_service import invalidate_dashboard_stats
+from utils.status_counter_service import record_bulk_created
+from utils.notification_service import notify
 import logging
 
 logger = logging.getLogger(__name__)
 
+SCHEDULE_BATCH_SIZE = 1000
+
+# Parent fields copied onto every scheduled instance
+INSTANCE_COPY_FIELDS = (
+    'admin_id', 'site_id', 'task_type_id', 'title', 'description', 'priority',
+    'assigned_to_id', 'assigned_by_id', 'tags', 'checklist',
+)
+
+
+def build_scheduled_instance(parent_id, values, due_date):
+    """
+    Unsaved scheduled instance of a parent task.
+
+    Args:
+        parent_id: parent task id
+        values: dict of INSTANCE_COPY_FIELDS from the parent
+        due_date: date the instance is due
+    """
+    return Task(
+        **{field: values[field] for field in INSTANCE_COPY_FIELDS},
+        status='pending',
+        start_date=due_date,
+        due_date=due_date,
+        schedule_frequency='onetime',  # Instance is always onetime
+        parent_task_id=parent_id,
+        is_scheduled_instance=True,
+    )
+
 
 @shared_task
 def create_scheduled_task(task_id):
     """
-    Create a scheduled task instance from parent task
-    O(1) complexity - direct task creation
+    Create the next scheduled instance of one parent task (used right after a
+    recurring task is created or rescheduled).
+    Idempotent - an instance already due on that date is not duplicated.
     """
     try:
         with transaction.atomic():
@@ -35,24 +73,14 @@ def create_scheduled_task(task_id):
                 logger.warning(f"Could not calculate next due date for task {task_id}")
                 return {"status": "error", "task_id": task_id}
             
+            if Task.objects.filter(parent_task=parent_task, due_date=next_due_date).exists():
+                return {"status": "exists", "task_id": task_id, "due_date": str(next_due_date)}
+            
             # Create new task instance
-            new_task = Task.objects.create(
-                admin=parent_task.admin,
-                task_type=parent_task.task_type,
-                title=parent_task.title,
-                description=parent_task.description,
-                priority=parent_task.priority,
-                status='pending',
-                assigned_to=parent_task.assigned_to,
-                assigned_by=parent_task.assigned_by,
-                start_date=next_due_date,
-                due_date=next_due_date,
-                schedule_frequency='onetime',  # Instance is always onetime
-                parent_task=parent_task,
-                is_scheduled_instance=True,
-                tags=parent_task.tags,
-                checklist=parent_task.checklist,
-            )
+            values = {field: getattr(parent_task, field) for field in INSTANCE_COPY_FIELDS}
+            new_task = build_scheduled_instance(parent_task.id, values, next_due_date)
+            new_task.save()
+            notify_assignees([new_task])
             
             logger.info(f"Created scheduled task instance {new_task.id} from parent {task_id}")
             return {"status": "success", "task_id": new_task.id, "parent_id": task_id}
@@ -108,40 +136,106 @@ def calculate_next_due_date(task):
             return date(next_year, next_month, min(task.month_date, 28))  # Safe date
         except ValueError:
             # If date doesn't exist (e.g., Feb 30), use last day of month
-            from calendar import monthrange
             last_day = monthrange(next_year, next_month)[1]
             return date(next_year, next_month, min(task.month_date, last_day))
     
     return None
 
 
+def due_parent_tasks(frequency, today):
+    """Active recurring parents of a frequency (open-ended schedules included)"""
+    return Task.objects.filter(
+        schedule_frequency=frequency,
+        is_scheduled_instance=False,
+    ).filter(
+        Q(schedule_end_date__isnull=True) | Q(schedule_end_date__gte=today),
+        Q(start_date__isnull=True) | Q(start_date__lte=today),
+    )
+
+
+def notify_assignees(instances):
+    """
+    Push 'New task assigned' for scheduled instances - one outbox event per
+    title; an employee getting several tasks receives one coalesced notification
+    """
+    by_title = {}
+    for task in instances:
+        if task.assigned_to_id:
+            by_title.setdefault(task.title, []).append(task.assigned_to_id)
+    for title, user_ids in by_title.items():
+        notify(user_ids, 'task_assigned', 'New task assigned', title)
+
+
+def instantiate_scheduled_tasks(parents, due_date, batch_size=SCHEDULE_BATCH_SIZE):
+    """
+    Create the instance due on `due_date` for every parent that lacks one.
+
+    One anti-join SELECT per batch, then - with the batch's parents locked
+    (select_for_update, like create_scheduled_task) - one SELECT of instances
+    created meanwhile by a concurrent worker or create_scheduled_task, one
+    INSERT, and one SELECT of the rows actually inserted. The unique
+    (parent_task, due_date) constraint stays the last line of defence.
+
+    bulk_create bypasses post_save, so the search index, live status counters,
+    dashboard stats and notifications are updated here per batch - for the
+    inserted rows only, never for skipped duplicates.
+
+    Returns:
+        int: number of instances inserted
+    """
+    missing = parents.filter(
+        ~Exists(Task.objects.filter(parent_task=OuterRef('pk'), due_date=due_date))
+    ).order_by('pk').values('pk', *INSTANCE_COPY_FIELDS)
+
+    created = 0
+    last_pk = 0
+    while True:
+        batch = list(missing.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        last_pk = batch[-1]['pk']
+        parent_ids = [values['pk'] for values in batch]
+
+        with transaction.atomic():
+            # Serializes with other schedulers on the same parents (pk order avoids deadlocks)
+            list(Task.objects.select_for_update().filter(pk__in=parent_ids).order_by('pk').values_list('pk', flat=True))
+            existing = set(
+                Task.objects.filter(parent_task_id__in=parent_ids, due_date=due_date)
+                .values_list('parent_task_id', flat=True)
+            )
+            instances = [
+                build_scheduled_instance(values['pk'], values, due_date)
+                for values in batch if values['pk'] not in existing
+            ]
+            if not instances:
+                continue
+            Task.objects.bulk_create(instances, batch_size=batch_size, ignore_conflicts=True)
+            # ignore_conflicts leaves pks unset and still returns skipped rows - re-select what was inserted
+            inserted = list(
+                Task.objects.filter(
+                    parent_task_id__in=[instance.parent_task_id for instance in instances], due_date=due_date
+                ).only('id', 'admin_id', 'site_id', 'status', 'assigned_to_id', 'title')
+            )
+            inserted_ids = [task.pk for task in inserted]
+            transaction.on_commit(lambda ids=inserted_ids: index_queryset(
+                'task', Task.objects.filter(pk__in=ids)
+            ))
+            record_bulk_created('task', [(t.admin_id, t.site_id, t.status) for t in inserted])
+            invalidate_dashboard_stats('tasks', {t.admin_id for t in inserted})
+            notify_assignees(inserted)
+        created += len(inserted)
+
+    return created
+
+
 @shared_task
 def process_daily_schedules():
     """
-    Process all daily scheduled tasks
-    O(n) where n = number of daily tasks (optimized with index)
+    Create today's instance of every daily scheduled task
+    Set based - one anti-join + one bulk INSERT per SCHEDULE_BATCH_SIZE parents
     """
     today = date.today()
-    
-    # Get all active daily scheduled tasks
-    daily_tasks = Task.objects.filter(
-        schedule_frequency='daily',
-        is_scheduled_instance=False,
-        schedule_end_date__gte=today
-    ).select_related('admin', 'task_type', 'assigned_to', 'assigned_by')
-    
-    created_count = 0
-    for task in daily_tasks:
-        # Check if task already created for today
-        existing = Task.objects.filter(
-            parent_task=task,
-            is_scheduled_instance=True,
-            due_date=today
-        ).exists()
-        
-        if not existing:
-            create_scheduled_task.delay(task.id)
-            created_count += 1
+    created_count = instantiate_scheduled_tasks(due_parent_tasks('daily', today), today)
     
     logger.info(f"Processed {created_count} daily scheduled tasks")
     return {"status": "success", "created": created_count}
@@ -150,32 +244,14 @@ def process_daily_schedules():
 @shared_task
 def process_weekly_schedules():
     """
-    Process all weekly scheduled tasks
-    O(n) where n = number of weekly tasks (optimized with index)
+    Create today's instance of every weekly scheduled task due on today's weekday
+    Set based - one anti-join + one bulk INSERT per SCHEDULE_BATCH_SIZE parents
     """
     today = date.today()
     current_weekday = today.weekday()  # 0=Monday, 6=Sunday
     
-    # Get all active weekly scheduled tasks for today's weekday
-    weekly_tasks = Task.objects.filter(
-        schedule_frequency='weekly',
-        week_day=str(current_weekday),
-        is_scheduled_instance=False,
-        schedule_end_date__gte=today
-    ).select_related('admin', 'task_type', 'assigned_to', 'assigned_by')
-    
-    created_count = 0
-    for task in weekly_tasks:
-        # Check if task already created for today
-        existing = Task.objects.filter(
-            parent_task=task,
-            is_scheduled_instance=True,
-            due_date=today
-        ).exists()
-        
-        if not existing:
-            create_scheduled_task.delay(task.id)
-            created_count += 1
+    weekly_tasks = due_parent_tasks('weekly', today).filter(week_day=str(current_weekday))
+    created_count = instantiate_scheduled_tasks(weekly_tasks, today)
     
     logger.info(f"Processed {created_count} weekly scheduled tasks for weekday {current_weekday}")
     return {"status": "success", "created": created_count}
@@ -184,34 +260,19 @@ def process_weekly_schedules():
 @shared_task
 def process_monthly_schedules():
     """
-    Process all monthly scheduled tasks
-    O(n) where n = number of monthly tasks (optimized with index)
+    Create today's instance of every monthly scheduled task due on today's date
+    Set based - one anti-join + one bulk INSERT per SCHEDULE_BATCH_SIZE parents
     """
     today = date.today()
     current_date = today.day
     
-    # Get all active monthly scheduled tasks for today's date
-    monthly_tasks = Task.objects.filter(
-        schedule_frequency='monthly',
-        month_date=current_date,
-        is_scheduled_instance=False,
-        schedule_end_date__gte=today
-    ).select_related('admin', 'task_type', 'assigned_to', 'assigned_by')
+    # On the last day of a month, dates that don't exist in it (e.g. 30/31 in February) fall due too
+    day_filter = Q(month_date=current_date)
+    if current_date == monthrange(today.year, today.month)[1]:
+        day_filter |= Q(month_date__gt=current_date)
     
-    created_count = 0
-    for task in monthly_tasks:
-        # Check if task already created for this month
-        existing = Task.objects.filter(
-            parent_task=task,
-            is_scheduled_instance=True,
-            due_date__year=today.year,
-            due_date__month=today.month
-        ).exists()
-        
-        if not existing:
-            create_scheduled_task.delay(task.id)
-            created_count += 1
+    monthly_tasks = due_parent_tasks('monthly', today).filter(day_filter)
+    created_count = instantiate_scheduled_tasks(monthly_tasks, today)
     
     logger.info(f"Processed {created_count} monthly scheduled tasks for date {current_date}")
     return {"status": "success", "created": created_count}
-
@@ -1,3 +1,70 @@
+from datetime import date
+from unittest import mock
+
 from django.test import TestCase
 
-# Create your tests here.
+from AuthN.models import BaseUserModel
+from . import tasks as scheduler
+from .models import Task, TaskType
+
+
+class InstantiateScheduledTasksTests(TestCase):
+    """tasks.instantiate_scheduled_tasks - counters and notifications only for inserted rows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = BaseUserModel.objects.create_user(
+            email='admin@example.com', password='x', username='admin1', role='admin', phone_number=9000000001,
+        )
+        cls.employee = BaseUserModel.objects.create_user(
+            email='emp@example.com', password='x', username='emp1', role='user', phone_number=9000000002,
+        )
+        task_type = TaskType.objects.create(admin=cls.admin)
+        cls.parents = [
+            Task.objects.create(
+                admin=cls.admin, task_type=task_type, title=f'Daily {n}', schedule_frequency='daily',
+                assigned_to=cls.employee, assigned_by=cls.admin,
+            )
+            for n in range(3)
+        ]
+        cls.due_date = date(2026, 1, 5)
+
+    def instantiate(self):
+        with mock.patch.object(scheduler, 'record_bulk_created') as record, \
+                mock.patch.object(scheduler, 'notify') as notify, \
+                self.captureOnCommitCallbacks(execute=False):
+            parents = Task.objects.filter(pk__in=[parent.pk for parent in self.parents])
+            created = scheduler.instantiate_scheduled_tasks(parents, self.due_date)
+        counted = [state for call in record.call_args_list for state in call.args[1]]
+        notified = [user_id for call in notify.call_args_list for user_id in call.args[0]]
+        return created, counted, notified
+
+    def test_creates_one_instance_per_parent(self):
+        created, counted, notified = self.instantiate()
+        self.assertEqual(created, 3)
+        self.assertEqual(len(counted), 3)
+        self.assertEqual(len(notified), 3)
+        self.assertEqual(Task.objects.filter(parent_task__in=self.parents, due_date=self.due_date).count(), 3)
+
+    def test_second_run_creates_nothing(self):
+        self.instantiate()
+        self.assertEqual(self.instantiate(), (0, [], []))
+
+    def test_raced_duplicate_is_not_counted(self):
+        raced_parent = self.parents[0]
+        select_for_update = Task.objects.select_for_update
+
+        def lock_after_race(*args, **kwargs):
+            # Another scheduler inserts the instance after the anti-join, before this batch takes its locks
+            if not Task.objects.filter(parent_task=raced_parent, due_date=self.due_date).exists():
+                values = {field: getattr(raced_parent, field) for field in scheduler.INSTANCE_COPY_FIELDS}
+                scheduler.build_scheduled_instance(raced_parent.pk, values, self.due_date).save()
+            return select_for_update(*args, **kwargs)
+
+        with mock.patch.object(Task.objects, 'select_for_update', side_effect=lock_after_race):
+            created, counted, notified = self.instantiate()
+
+        self.assertEqual(created, 2)
+        self.assertEqual(len(counted), 2)
+        self.assertEqual(len(notified), 2)
+        self.assertEqual(Task.objects.filter(parent_task=raced_parent, due_date=self.due_date).count(), 1)
@@ -10,95 +10,8 @@ from rest_framework import status
 from django.shortcuts import get_object_or_404
 from .models import TaskType
 from .serializers import TaskTypeSerializer, TaskTypeUpdateSerializer
-from AuthN.models import BaseUserModel, AdminProfile
-from SiteManagement.models import Site
 from utils.site_filter_utils import filter_queryset_by_site
-
-
-def get_admin_and_site_optimized(request, site_id):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Returns: (admin, site, None) tuple or (None, None, Response with error)
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    else:
-        return None, None, Response({
-            "status": status.HTTP_403_FORBIDDEN,
-            "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-            "data": None
-        }, status=status.HTTP_403_FORBIDDEN)
+from utils.tenant_utils import get_admin_and_site_or_response
 
 
 class TaskTypeAPIView(APIView):
@@ -107,7 +20,7 @@ class TaskTypeAPIView(APIView):
     def get(self, request, site_id, pk=None):
         """Get task types - O(1) queries with index optimization"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -173,7 +86,7 @@ class TaskTypeAPIView(APIView):
     def post(self, request, site_id):
         """Create task type - Optimized"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -206,7 +119,7 @@ class TaskTypeAPIView(APIView):
     def put(self, request, site_id, pk=None):
         """Update task type - Optimized O(1) query"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -254,7 +167,7 @@ class TaskTypeAPIView(APIView):
     def delete(self, request, site_id, pk=None):
         """Delete task type (soft delete) - Optimized O(1) update"""
         try:
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id)
             if error_response:
                 return error_response
             
@@ -8,7 +8,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from AuthN.models import UserProfile, BaseUserModel, AdminProfile
-from AuthN.serializers import UserProfileSerializer, UserProfileReadSerializer
+from AuthN.serializers import UserProfileSerializer, UserProfileListSerializer
 from utils.pagination_utils import CustomPagination
 from django.db.models import Q, Count
 from django.shortcuts import get_object_or_404
@@ -16,99 +16,9 @@ from django.db import transaction
 from utils.common_utils import *
 from utils.Employee.employee_excel_export_service import EmployeeExcelExportService
 from utils.Employee.assignment_utils import get_employee_ids_for_site_on_date, get_user_profiles_under_admin, get_employee_ids_under_admin
-from SiteManagement.models import Site
 from datetime import date
-
-
-def get_admin_and_site_optimized(request, site_id):
-    """
-    Optimized admin and site validation - O(1) queries with select_related
-    Returns: (admin, site, None) tuple or (None, None, Response with error)
-    """
-    user = request.user
-    
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        if site_id:
-            try:
-                site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                    id=site_id, 
-                    created_by_admin_id=admin_id, 
-                    is_active=True
-                )
-                return admin, site, None
-            except Site.DoesNotExist:
-                return None, None, Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "Site not found or you don't have permission to access this site",
-                    "data": []
-                }, status=status.HTTP_403_FORBIDDEN)
-        return admin, None, None
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id') or request.data.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role",
-                "data": []
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query to avoid N+1 - uses index on (id, role)
-        # Don't use select_related with only() when not accessing the related field
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": []
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": []
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        if site_id:
-            try:
-                site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                    id=site_id, 
-                    created_by_admin_id=admin_id, 
-                    is_active=True
-                )
-                return admin, site, None
-            except Site.DoesNotExist:
-                return None, None, Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "Site not found or does not belong to this admin",
-                    "data": []
-                }, status=status.HTTP_403_FORBIDDEN)
-        return admin, None, None
-    
-    else:
-        return None, None, Response({
-            "status": status.HTTP_403_FORBIDDEN,
-            "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-            "data": []
-        }, status=status.HTTP_403_FORBIDDEN)
+from utils.tenant_utils import get_admin_and_site_or_response
+from SearchIndex.search_service import apply_search
 
 
 class StaffListByAdmin(APIView):
@@ -118,6 +28,7 @@ class StaffListByAdmin(APIView):
     If role is admin, admin_id is fetched from request.user
     """
     pagination_class = CustomPagination
+    query_budget = {'GET': 15}  # Constant - must not grow with employee count
 
     def get(self, request, site_id):
         """Get staff list - O(1) queries with aggregation"""
@@ -127,7 +38,7 @@ class StaffListByAdmin(APIView):
             status_filter = request.query_params.get("status", None)  # active, inactive, all
 
             # Get admin and site - O(1) queries
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            admin, site, error_response = get_admin_and_site_or_response(request, site_id, empty_data=[])
             if error_response:
                 return error_response
             
@@ -166,12 +77,7 @@ class StaffListByAdmin(APIView):
             # Optional search - enhanced to include email - uses indexes
             if search:
                 search = search.strip()
-                queryset = queryset.filter(
-                    Q(user_name__icontains=search) |
-                    Q(custom_employee_id__icontains=search) |
-                    Q(designation__icontains=search) |
-                    Q(user__email__icontains=search)
-                )
+                queryset = apply_search(queryset, 'employee', search)
 
             # Single optimized query for counts using aggregation - O(1) query
             counts = queryset_all.aggregate(
@@ -186,39 +92,31 @@ class StaffListByAdmin(APIView):
             # Excel export - optimized with .only() to fetch only required fields
             if export:
                 # Get all active employees - fetch only required fields
-                active_employees_qs = queryset_all.filter(user__is_active=True).only(
-                    'id', 'user_id', 'organization_id', 'user_name',
-                    'custom_employee_id', 'designation', 'job_title', 'gender',
-                    'date_of_joining', 'state', 'city', 'user__email', 'user__is_active'
+                active_employees_qs = UserProfileListSerializer.setup_queryset(
+                    queryset_all.filter(user__is_active=True)
                 )
-                active_serializer = UserProfileReadSerializer(active_employees_qs, many=True, context={'request': request})
+                active_serializer = UserProfileListSerializer(active_employees_qs, context={'request': request})
                 active_data = active_serializer.data
                 
                 # Get all deactivated employees - fetch only required fields
-                deactivated_employees_qs = queryset_all.filter(user__is_active=False).only(
-                    'id', 'user_id', 'organization_id', 'user_name',
-                    'custom_employee_id', 'designation', 'job_title', 'gender',
-                    'date_of_joining', 'state', 'city', 'user__email', 'user__is_active'
+                deactivated_employees_qs = UserProfileListSerializer.setup_queryset(
+                    queryset_all.filter(user__is_active=False)
                 )
-                deactivated_serializer = UserProfileReadSerializer(deactivated_employees_qs, many=True, context={'request': request})
+                deactivated_serializer = UserProfileListSerializer(deactivated_employees_qs, context={'request': request})
                 deactivated_data = deactivated_serializer.data
                 
                 return EmployeeExcelExportService.generate(active_data, deactivated_data, admin_id)
 
-            # Fetch only required fields before pagination
-            queryset = queryset.only(
-                'id', 'user_id', 'organization_id', 'user_name',
-                'custom_employee_id', 'designation', 'job_title', 'gender',
-                'date_of_joining', 'state', 'city', 'user__email', 'user__is_active'
-            )
+            # Flat values() rows - 1 query for the page + 1 per M2M relation
+            queryset = UserProfileListSerializer.setup_queryset(queryset)
             
             # Pagination (use filtered queryset for display)
             paginator = self.pagination_class()
             paginated_qs = paginator.paginate_queryset(queryset, request)
 
             # Serialize with request context for image URLs
-            # Use UserProfileReadSerializer for consistency with deactivated list
-            serializer = UserProfileReadSerializer(paginated_qs, many=True, context={'request': request})
+            # Same output as UserProfileReadSerializer, without per-row queries
+            serializer = UserProfileListSerializer(paginated_qs, context={'request': request})
 
             # ✅ since your CustomPagination returns a dict
             pagination_data = paginator.get_paginated_response(serializer.data)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class VisitcontrolConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'VisitControl'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import VisitControl.signals
@@ -100,6 +100,8 @@ class Visit(models.Model):
             models.Index(fields=['assigned_employee', 'schedule_date'], name='visit_emp_date_idx'),
             # Detail view optimization
             models.Index(fields=['id', 'admin'], name='visit_id_adm_idx'),
+            # Keyset pagination (?cursor=) - WHERE admin = x AND (created_at, id) < (...)
+            models.Index(fields=['admin', 'created_at', 'id'], name='visit_adm_created_id_idx'),
             # Site filtering optimization - O(1) queries
             models.Index(fields=['site', 'admin', 'status', 'schedule_date'], name='visit_site_adm_status_date_idx'),
         ]
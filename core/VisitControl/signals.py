@@ -0,0 +1,35 @@
+"""
+VisitControl Signals
+Invalidates cached dashboard statistics and moves live status counters
+when visits are written
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Visit
+from utils.dashboard_stats_service import invalidate_dashboard_stats
+from utils.status_counter_service import count_deleted, count_saved, remember_counted_state
+
+
+@receiver(post_save, sender=Visit)
+@receiver(post_delete, sender=Visit)
+def invalidate_visit_dashboard_stats(sender, instance, **kwargs):
+    """Bump the admin's visits dashboard version once the write commits"""
+    invalidate_dashboard_stats('visits', [instance.admin_id])
+
+
+@receiver(pre_save, sender=Visit)
+def remember_visit_status(sender, instance, update_fields=None, **kwargs):
+    """Load the stored status so post_save can detect a transition"""
+    remember_counted_state(instance, update_fields)
+
+
+@receiver(post_save, sender=Visit)
+def count_visit_status_on_save(sender, instance, created, **kwargs):
+    """Move the live status counters on commit"""
+    count_saved('visit', instance, created)
+
+
+@receiver(post_delete, sender=Visit)
+def count_visit_status_on_delete(sender, instance, **kwargs):
+    count_deleted('visit', instance)
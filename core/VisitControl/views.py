@@ -24,11 +24,17 @@ from .serializers import (
     VisitSerializer, VisitCreateSerializer,
     VisitCheckInSerializer, VisitCheckOutSerializer
 )
-from AuthN.models import BaseUserModel, AdminProfile
+from AuthN.models import UserProfile
 from SiteManagement.models import Site
 from utils.pagination_utils import CustomPagination
 from utils.site_filter_utils import filter_queryset_by_site
 from utils.Employee.assignment_utils import get_current_admin_for_employee
+from utils.tenant_utils import get_admin_and_site_or_response
+from utils.dashboard_stats_service import get_dashboard_stats, invalidate_dashboard_stats
+from utils.status_counter_service import record_status_change
+from utils.geofence_service import validate_punch
+from utils.location_lookup_service import locate, serialize_match
+from SearchIndex.search_service import apply_search
 
 
 def get_admin_and_site_optimized(request, site_id, allow_user_role=False):
@@ -38,82 +44,15 @@ def get_admin_and_site_optimized(request, site_id, allow_user_role=False):
     """
     user = request.user
     
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": None
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": None
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": None
-            }, status=status.HTTP_403_FORBIDDEN)
+    # Admin / organization roles - resolved from the cached tenant map (0 queries on warm cache)
+    if user.role in ('admin', 'organization'):
+        return get_admin_and_site_or_response(request, site_id)
     
     # User role - only if allowed
     elif allow_user_role and user.role == 'user':
         # For user role, just validate site exists
         try:
-            site = Site.objects.only('id', 'site_name', 'is_active').get(id=site_id, is_active=True)
+            site = Site.objects.only('id', 'site_name', 'is_active', 'organization_id').get(id=site_id, is_active=True)
             return None, site, None
         except Site.DoesNotExist:
             return None, None, Response({
@@ -140,6 +79,7 @@ class VisitAPIView(APIView):
     """
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('-created_at', '-id')  # ?cursor= keyset pagination
     
     def generate_excel_export(self, visit_data):
         """Generate Excel export for visits - Optimized with .values()"""
@@ -399,22 +339,9 @@ class VisitAPIView(APIView):
                         except ValueError:
                             pass  # Invalid date format, ignore
                 
-                # Search functionality - uses indexes
+                # Search functionality - SearchDocument trigram index
                 search_query = request.query_params.get('search', '').strip()
-                if search_query:
-                    queryset = queryset.filter(
-                        Q(assigned_employee__own_user_profile__user_name__icontains=search_query) |
-                        Q(assigned_employee__email__icontains=search_query) |
-                        Q(assigned_employee__own_user_profile__custom_employee_id__icontains=search_query) |
-                        Q(client_name__icontains=search_query) |
-                        Q(location_name__icontains=search_query) |
-                        Q(address__icontains=search_query) |
-                        Q(contact_person__icontains=search_query) |
-                        Q(contact_phone__icontains=search_query) |
-                        Q(contact_email__icontains=search_query) |
-                        Q(title__icontains=search_query) |
-                        Q(description__icontains=search_query)
-                    )
+                queryset = apply_search(queryset, 'visit', search_query)
                 
                 # Check for Excel export
                 export = request.query_params.get('export') == 'true'
@@ -450,7 +377,7 @@ class VisitAPIView(APIView):
                 
                 # Pagination for admin view (all visits)
                 paginator = self.pagination_class()
-                paginated_qs = paginator.paginate_queryset(queryset, request)
+                paginated_qs = paginator.paginate_queryset(queryset, request, view=self)
                 serializer = VisitSerializer(paginated_qs, many=True)
                 pagination_data = paginator.get_paginated_response(serializer.data)
                 
@@ -561,9 +488,6 @@ class VisitAPIView(APIView):
                     "data": None
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            # Get admin from visit
-            admin = visit.admin
-            
             # Validate site belongs to admin
             admin, site, error_response = get_admin_and_site_optimized(request, site_id)
             if error_response:
@@ -693,11 +617,8 @@ class VisitCheckInAPIView(APIView):
                     "data": None
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            # Get admin from visit
-            admin = visit.admin
-            
-            # Validate site belongs to admin
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            # Validate site - employees check in/out of their own visits (permission checked below)
+            admin, site, error_response = get_admin_and_site_optimized(request, site_id, allow_user_role=True)
             if error_response:
                 return error_response
             
@@ -748,6 +669,23 @@ class VisitCheckInAPIView(APIView):
             longitude = validated_data['longitude']
             note = validated_data.get('note', '')
             
+            # Geofence - only employees' own check-ins are fenced (admins may check in on their behalf)
+            organization_id = site.organization_id
+            if user.role == 'user':
+                organization_id = UserProfile.objects.filter(user_id=user.id).values_list(
+                    'organization_id', flat=True
+                ).first()
+                allowed, fence_result, fence_error = validate_punch(user.id, organization_id, latitude, longitude)
+                if not allowed:
+                    return Response({
+                        "status": status.HTTP_400_BAD_REQUEST,
+                        "message": fence_error,
+                        "data": {
+                            "nearest_location_id": fence_result.location_id if fence_result else None,
+                            "distance_m": fence_result.distance_m if fence_result else None
+                        }
+                    }, status=status.HTTP_400_BAD_REQUEST)
+            
             # Update visit - O(1) optimized update
             check_in_time = timezone.now()
             Visit.objects.filter(id=visit_id).update(
@@ -757,14 +695,20 @@ class VisitCheckInAPIView(APIView):
                 check_in_longitude=Decimal(str(longitude)),
                 check_in_note=note
             )
+            # queryset.update() skips post_save - refresh the visit dashboard and live counters explicitly
+            invalidate_dashboard_stats('visits', [visit.admin_id])
+            record_status_change('visit', (visit.admin_id, visit.site_id, visit.status), (visit.admin_id, visit.site_id, 'in_progress'))
             
             # Refresh visit for response
             visit.refresh_from_db()
-            response_serializer = VisitSerializer(visit)
+            response_data = VisitSerializer(visit).data
+            # Known location the check-in falls in (geohash lookup - one indexed query)
+            matches = locate(organization_id, latitude, longitude, admin_id=visit.admin_id) if organization_id else []
+            response_data['matched_location'] = serialize_match(matches[0]) if matches else None
             return Response({
                 "status": status.HTTP_200_OK,
                 "message": "Check-in successful",
-                "data": response_serializer.data
+                "data": response_data
             })
         except Exception as e:
             return Response({
@@ -800,11 +744,8 @@ class VisitCheckOutAPIView(APIView):
                     "data": None
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            # Get admin from visit
-            admin = visit.admin
-            
-            # Validate site belongs to admin
-            admin, site, error_response = get_admin_and_site_optimized(request, site_id)
+            # Validate site - employees check in/out of their own visits (permission checked below)
+            admin, site, error_response = get_admin_and_site_optimized(request, site_id, allow_user_role=True)
             if error_response:
                 return error_response
             
@@ -857,6 +798,9 @@ class VisitCheckOutAPIView(APIView):
                 check_out_longitude=Decimal(str(longitude)),
                 check_out_note=note
             )
+            # queryset.update() skips post_save - refresh the visit dashboard and live counters explicitly
+            invalidate_dashboard_stats('visits', [visit.admin_id])
+            record_status_change('visit', (visit.admin_id, visit.site_id, visit.status), (visit.admin_id, visit.site_id, 'completed'))
             
             # Refresh visit for response
             visit.refresh_from_db()
@@ -910,14 +854,9 @@ class VisitStatsAPIView(APIView):
             # Filter by site - O(1) with index visit_site_adm_status_date_idx
             visits = filter_queryset_by_site(visits, site_id, 'site')
             
-            # Single optimized query for all statistics - O(1) aggregation
-            stats = {
-                'total_visits': visits.count(),
-                'pending': visits.filter(status='pending').count(),
-                'in_progress': visits.filter(status='in_progress').count(),
-                'completed': visits.filter(status='completed').count(),
-                'cancelled': visits.filter(status='cancelled').count(),
-            }
+            # Single conditional aggregate, cached per (admin, site, employee, day) - invalidated on visit writes
+            scope = user.id if user.role == 'user' else user_id
+            stats = get_dashboard_stats('visits', visits, tenant_id=admin_id, site_id=site_id, scope=scope)
             
             return Response({
                 "status": status.HTTP_200_OK,
@@ -8,17 +8,18 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from django.shortcuts import get_object_or_404
 from django.db import transaction
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import Q, Count, Sum
 from django.utils import timezone
 from datetime import datetime, date, timedelta
 
 from .models import Attendance
-from AuthN.models import BaseUserModel, UserProfile, AdminProfile
-from SiteManagement.models import Site
+from AuthN.models import BaseUserModel, UserProfile
 from .serializers import AttendanceSerializer
 from AuthN.serializers import UserProfileReadSerializer
 from utils.pagination_utils import CustomPagination
+from utils.tenant_utils import resolve_admin_and_site
 from utils.site_filter_utils import filter_queryset_by_site
+from utils.dashboard_stats_service import get_dashboard_stats
 
 
 class AttendanceDashboardAPIView(APIView):
@@ -29,53 +30,19 @@ class AttendanceDashboardAPIView(APIView):
         try:
             organization = get_object_or_404(BaseUserModel, id=org_id, role='organization')
             
-            today = date.today()
-            
-            # Today's Statistics
-            today_attendance = Attendance.objects.filter(
-                user__own_user_profile__organization=organization,
-                attendance_date=today
-            )
-            
-            present = today_attendance.filter(check_in_time__isnull=False).count()
-            absent = UserProfile.objects.filter(
+            # Current month of attendance in one conditional aggregate, cached per
+            # (organization, day) - invalidated on attendance writes
+            attendance = Attendance.objects.filter(user__own_user_profile__organization=organization)
+            employees = UserProfile.objects.filter(
                 organization=organization,
                 user__is_active=True
-            ).count() - present
-            
-            # This Month Statistics
-            month_start = date(today.year, today.month, 1)
-            month_attendance = Attendance.objects.filter(
-                user__own_user_profile__organization=organization,
-                attendance_date__gte=month_start,
-                attendance_date__lte=today
             )
-            
-            total_working_hours = month_attendance.aggregate(
-                total=Sum('total_working_minutes')
-            )['total'] or 0
-            total_working_hours = total_working_hours / 60  # Convert to hours
-            
-            avg_working_hours = month_attendance.aggregate(
-                avg=Avg('total_working_minutes')
-            )['avg'] or 0
-            avg_working_hours = avg_working_hours / 60
+            stats = get_dashboard_stats('attendance', attendance, tenant_id=organization.id, employees=employees)
             
             return Response({
                 "status": status.HTTP_200_OK,
                 "message": "Attendance dashboard data fetched successfully",
-                "data": {
-                    "today": {
-                        "present": present,
-                        "absent": absent,
-                        "attendance_rate": round((present / (present + absent) * 100) if (present + absent) > 0 else 0, 2)
-                    },
-                    "this_month": {
-                        "total_working_hours": round(total_working_hours, 2),
-                        "average_working_hours": round(avg_working_hours, 2),
-                        "total_records": month_attendance.count()
-                    }
-                }
+                "data": stats
             })
         except Exception as e:
             return Response({
@@ -89,6 +56,7 @@ class EmployeeAttendanceHistoryAPIView(APIView):
     """Get employee attendance history"""
     permission_classes = [IsAuthenticated]
     pagination_class = CustomPagination
+    cursor_ordering = ('-attendance_date', '-id')  # ?cursor= keyset pagination
     
     def get(self, request, org_id, employee_id):
         try:
@@ -114,7 +82,7 @@ class EmployeeAttendanceHistoryAPIView(APIView):
                 attendances = attendances.filter(check_in_time__isnull=True)
             
             paginator = self.pagination_class()
-            paginated_qs = paginator.paginate_queryset(attendances, request)
+            paginated_qs = paginator.paginate_queryset(attendances, request, view=self)
             
             # Serialize manually
             data = []
@@ -129,11 +97,17 @@ class EmployeeAttendanceHistoryAPIView(APIView):
                 })
             
             pagination_data = paginator.get_paginated_response(data)
+            pagination_data["results"] = data
             
-            # Summary
-            total_days = attendances.count()
-            present_days = attendances.filter(check_in_time__isnull=False).count()
-            total_hours = sum([a.total_working_minutes or 0 for a in attendances]) / 60
+            # Summary - single aggregate query instead of loading every row
+            totals = attendances.aggregate(
+                total_days=Count('id'),
+                present_days=Count('id', filter=Q(check_in_time__isnull=False)),
+                total_minutes=Sum('total_working_minutes'),
+            )
+            total_days = totals['total_days']
+            present_days = totals['present_days']
+            total_hours = (totals['total_minutes'] or 0) / 60
             
             pagination_data["summary"] = {
                 "total_days": total_days,
@@ -177,56 +151,14 @@ class EmployeeDailyInfoAPIView(APIView):
             List of employees with their daily attendance info
         """
         try:
-            # Get admin_id based on role
-            if request.user.role == 'admin':
-                admin_id = request.user.id
-                admin = request.user
-            elif request.user.role == 'organization':
-                # Organization role: get admin_id from query params
-                admin_id = request.query_params.get('admin_id')
-                if not admin_id:
-                    return Response({
-                        "status": status.HTTP_400_BAD_REQUEST,
-                        "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                        "data": []
-                    }, status=status.HTTP_400_BAD_REQUEST)
-                
-                # Validate admin exists and belongs to organization
-                try:
-                    admin = BaseUserModel.objects.get(id=admin_id, role='admin')
-                    # Verify admin belongs to organization
-                    admin_profile = AdminProfile.objects.filter(
-                        user=admin,
-                        organization=request.user
-                    ).first()
-                    if not admin_profile:
-                        return Response({
-                            "status": status.HTTP_403_FORBIDDEN,
-                            "message": "Admin does not belong to your organization",
-                            "data": []
-                        }, status=status.HTTP_403_FORBIDDEN)
-                except BaseUserModel.DoesNotExist:
-                    return Response({
-                        "status": status.HTTP_404_NOT_FOUND,
-                        "message": "Admin not found",
-                        "data": []
-                    }, status=status.HTTP_404_NOT_FOUND)
-            else:
-                return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "Unauthorized access. Only admin and organization roles can access this endpoint",
-                    "data": []
-                }, status=status.HTTP_403_FORBIDDEN)
-            
-            # Validate site belongs to admin
-            try:
-                site = Site.objects.get(id=site_id, created_by_admin=admin, is_active=True)
-            except Site.DoesNotExist:
+            # Resolve admin and site from the cached tenant map (0 queries on warm cache)
+            admin, site, tenant_error = resolve_admin_and_site(request, site_id)
+            if tenant_error:
                 return Response({
-                    "status": status.HTTP_403_FORBIDDEN,
-                    "message": "Site not found or you don't have permission to access this site",
+                    "status": tenant_error.status_code,
+                    "message": tenant_error.message,
                     "data": []
-                }, status=status.HTTP_403_FORBIDDEN)
+                }, status=tenant_error.status_code)
             
             # Get date from query params (default: today)
             date_str = request.query_params.get('date')
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class WorklogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'WorkLog'
+
+    def ready(self):
+        """Import signals when app is ready"""
+        import WorkLog.signals
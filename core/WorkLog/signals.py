@@ -0,0 +1,39 @@
+"""
+WorkLog Signals
+Invalidates cached attendance dashboard statistics and moves the live
+present-today counters when attendance is written
+"""
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Attendance
+from AuthN.models import UserProfile
+from utils.dashboard_stats_service import invalidate_dashboard_stats
+from utils.status_counter_service import (
+    count_attendance_deleted, count_attendance_saved, remember_attendance_state
+)
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_attendance_dashboard_stats(sender, instance, **kwargs):
+    """Bump the employee's organization attendance dashboard version once the write commits"""
+    organization_ids = UserProfile.objects.filter(user_id=instance.user_id).values_list('organization_id', flat=True)
+    invalidate_dashboard_stats('attendance', list(organization_ids))
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_attendance_check_in(sender, instance, update_fields=None, **kwargs):
+    """Load whether the stored row was already checked in"""
+    remember_attendance_state(instance, update_fields)
+
+
+@receiver(post_save, sender=Attendance)
+def count_attendance_on_save(sender, instance, **kwargs):
+    """Move the employee's present-today counter on their first check-in of the day"""
+    count_attendance_saved(instance)
+
+
+@receiver(post_delete, sender=Attendance)
+def count_attendance_on_delete(sender, instance, **kwargs):
+    count_attendance_deleted(instance)
@@ -28,7 +28,7 @@ urlpatterns = [
     
     # GET: Fetch attendance for a specific employee under an admin and site
     # URL params: site_id (UUID, required), user_id (UUID)
-    # Query params: date (required), status (optional), export (optional), page, page_size, admin_id (for organization role)
+    # Query params: date (required), status (optional), export (optional), page, page_size (or cursor for keyset pages), admin_id (for organization role)
     path(
         'employee-attendance/<uuid:site_id>/<uuid:user_id>/',
         FetchEmployeeAttendanceAPIView.as_view(),
@@ -37,7 +37,7 @@ urlpatterns = [
     
     # GET: Fetch attendance for all employees under an admin and site
     # URL params: site_id (UUID, required)
-    # Query params: date (required), status (optional), export (optional), page, page_size, admin_id (for organization role)
+    # Query params: date (required), status (optional), export (optional), page, page_size (or cursor for keyset pages), admin_id (for organization role)
     path(
         'employee-attendance/<uuid:site_id>/',
         FetchEmployeeAttendanceAPIView.as_view(),
@@ -53,6 +53,15 @@ urlpatterns = [
     ),
     
     
+    # GET: Re-validate a month of attendance punches for a site against employees' geofences
+    # Query params: violations_only (default true), admin_id (for organization role)
+    path(
+        'geofence-audit/<uuid:site_id>/<int:month>/<int:year>/',
+        GeofenceAuditAPIView.as_view(),
+        name='geofence-audit'
+    ),
+    
+    
     # ==================== Attendance Editing ====================
     
     # PUT: Edit attendance check-in & check-out details
@@ -12,8 +12,8 @@ from datetime import datetime, date, timedelta
 from django.utils import timezone
 from calendar import monthrange
 from .models import Attendance
-from AuthN.models import BaseUserModel, UserProfile, AdminProfile
-from SiteManagement.models import Site, EmployeeAdminSiteAssignment
+from AuthN.models import BaseUserModel, UserProfile
+from SiteManagement.models import EmployeeAdminSiteAssignment
 from .serializers import *
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Count, Case, When, IntegerField
@@ -21,13 +21,15 @@ from django.http import HttpResponse
 from django.core.cache import cache
 from django.db import transaction
 from utils.Attendance.attendance_utils import *
-from utils.pagination_utils import CustomPagination
-from utils.helpers.image_utils import save_multiple_base64_images, save_base64_image
+from utils.pagination_utils import CustomPagination, KeysetPagination, decode_cursor, encode_cursor, keyset_filter
+from utils.helpers.image_utils import save_multiple_base64_images, stash_base64_image
 from utils.site_filter_utils import validate_admin_and_site, filter_queryset_by_site
 from utils.Employee.assignment_utils import (
     get_employees_assigned_to_site,
     is_employee_assigned_to_site,
-    get_employee_ids_for_site_on_date
+    is_employee_assigned_to_site_during,
+    get_employee_ids_for_site_on_date,
+    get_site_daily_assignments
 )
 import openpyxl
 from openpyxl.styles import Font, Alignment, PatternFill
@@ -35,6 +37,10 @@ from io import BytesIO
 from utils.Attendance.attendance_excel_export_service import ExcelExportService
 from utils.Attendance.attendance_edit_service import AttendanceEditService
 import traceback
+from utils.tenant_utils import get_admin_and_site_or_response
+from utils.geofence_service import load_geofences, validate_punch
+from utils.location_lookup_service import location_name_at
+from Outbox import outbox_service
 
 
 def get_admin_and_site_for_attendance(request, site_id, attendance_date=None):
@@ -44,76 +50,9 @@ def get_admin_and_site_for_attendance(request, site_id, attendance_date=None):
     """
     user = request.user
     
-    # Fast path for admin role - O(1) query
-    if user.role == 'admin':
-        admin_id = user.id
-        admin = user
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": []
-            }, status=status.HTTP_403_FORBIDDEN)
-    
-    # Organization role - O(1) queries with select_related
-    elif user.role == 'organization':
-        admin_id = request.query_params.get('admin_id')
-        if not admin_id:
-            return None, None, Response({
-                "status": status.HTTP_400_BAD_REQUEST,
-                "message": "admin_id is required for organization role. Please provide admin_id as query parameter.",
-                "data": []
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Single O(1) query with select_related to avoid N+1 - uses index on (id, role)
-        try:
-            admin = BaseUserModel.objects.only(
-                'id', 'role', 'email'
-            ).get(id=admin_id, role='admin')
-        except BaseUserModel.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_404_NOT_FOUND,
-                "message": "Admin not found",
-                "data": []
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        # O(1) query - verify admin belongs to organization using select_related
-        admin_profile = AdminProfile.objects.select_related('user', 'organization').only(
-            'id', 'user_id', 'organization_id'
-        ).filter(
-            user_id=admin_id,
-            organization_id=user.id
-        ).first()
-        
-        if not admin_profile:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Admin does not belong to your organization",
-                "data": []
-            }, status=status.HTTP_403_FORBIDDEN)
-        
-        # Single O(1) query with index on (id, created_by_admin, is_active)
-        try:
-            site = Site.objects.only('id', 'site_name', 'created_by_admin_id', 'is_active').get(
-                id=site_id, 
-                created_by_admin_id=admin_id, 
-                is_active=True
-            )
-            return admin, site, None
-        except Site.DoesNotExist:
-            return None, None, Response({
-                "status": status.HTTP_403_FORBIDDEN,
-                "message": "Site not found or you don't have permission to access this site",
-                "data": []
-            }, status=status.HTTP_403_FORBIDDEN)
+    # Admin / organization roles - resolved from the cached tenant map (0 queries on warm cache)
+    if user.role in ('admin', 'organization'):
+        return get_admin_and_site_or_response(request, site_id, empty_data=[])
     
     # User role - validate assignment
     elif user.role == 'user':
@@ -151,6 +90,18 @@ def get_admin_and_site_for_attendance(request, site_id, attendance_date=None):
         }, status=status.HTTP_403_FORBIDDEN)
 
 
+def geofence_error_response(result, message):
+    """400 response for a punch rejected by the employee's geofence"""
+    return Response({
+        "status": status.HTTP_400_BAD_REQUEST,
+        "message": message,
+        "data": {
+            "nearest_location_id": result.location_id if result else None,
+            "distance_m": result.distance_m if result else None
+        }
+    }, status=status.HTTP_400_BAD_REQUEST)
+
+
 
 class AttendanceCheckInOutAPIView(APIView):
     """
@@ -238,6 +189,14 @@ class AttendanceCheckInOutAPIView(APIView):
                     expected_hours = open_attendance.assign_shift.duration_minutes / 60
                 overtime = calculate_overtime_minutes(total_minutes, expected_hours=expected_hours)
 
+                # Geofence - cached per employee, one cache hit on the warm path
+                allowed, fence_result, fence_error = validate_punch(
+                    user.id, user_profile.organization_id,
+                    request.data.get("check_out_latitude"), request.data.get("check_out_longitude")
+                )
+                if not allowed:
+                    return geofence_error_response(fence_result, fence_error)
+
                 # Prepare update data
                 update_data = {
                     'check_out_time': check_time,
@@ -252,9 +211,13 @@ class AttendanceCheckInOutAPIView(APIView):
                     update_data['check_out_latitude'] = request.data.get("check_out_latitude")
                     update_data['check_out_longitude'] = request.data.get("check_out_longitude")
                 
-                # Add check_out_location if provided
-                if request.data.get("check_out_location"):
-                    update_data['check_out_location'] = request.data.get("check_out_location")
+                # Add check_out_location if provided - otherwise the location the punch falls in
+                check_out_location = request.data.get("check_out_location") or location_name_at(
+                    user_profile.organization_id,
+                    request.data.get("check_out_latitude"), request.data.get("check_out_longitude")
+                )
+                if check_out_location:
+                    update_data['check_out_location'] = check_out_location
                 
                 # Update profile photo from selfie if provided (update on every checkout)
                 base64_images = request.data.get("base64_images")
@@ -263,18 +226,15 @@ class AttendanceCheckInOutAPIView(APIView):
                     if isinstance(base64_images, str):
                         base64_images = [base64_images]
                     
-                    # Update profile photo on every checkout
+                    # Update profile photo on every checkout - the selfie is stored as
+                    # received and compressed by a media worker after commit (outbox)
                     if base64_images and len(base64_images) > 0:
                         try:
-                            saved_image = save_base64_image(
-                                base64_images[0],
-                                folder_name='profile_photos',
-                                attendance_type='profile',
-                                captured_at=check_time
+                            upload_name = stash_base64_image(base64_images[0])
+                            outbox_service.enqueue_task(
+                                'media.update_profile_photo',
+                                args=[str(user.id), upload_name, check_time.isoformat()]
                             )
-                            # Update user profile photo
-                            user_profile.profile_photo = saved_image.get('file_path', '')
-                            user_profile.save(update_fields=['profile_photo'])
                         except Exception as e:
                             # Log error but don't fail checkout
                             print(f"Error updating profile photo: {str(e)}")
@@ -289,6 +249,14 @@ class AttendanceCheckInOutAPIView(APIView):
                 }, status=status.HTTP_200_OK)
 
             # 🟩 CHECK-IN FLOW
+            # Geofence - cached per employee, one cache hit on the warm path
+            allowed, fence_result, fence_error = validate_punch(
+                user.id, user_profile.organization_id,
+                request.data.get("check_in_latitude"), request.data.get("check_in_longitude")
+            )
+            if not allowed:
+                return geofence_error_response(fence_result, fence_error)
+            
             # Optimized: Cache shifts lookup per user (5 min cache)
             cache_key = f"user_shifts_{userid}"
             shifts = cache.get(cache_key)
@@ -321,16 +289,20 @@ class AttendanceCheckInOutAPIView(APIView):
                 payload["check_in_latitude"] = request.data.get("check_in_latitude")
                 payload["check_in_longitude"] = request.data.get("check_in_longitude")
             
-            # Add check_in_location if provided
-            if request.data.get("check_in_location"):
-                payload["check_in_location"] = request.data.get("check_in_location")
+            # Add check_in_location if provided - otherwise the location the punch falls in
+            check_in_location = request.data.get("check_in_location") or location_name_at(
+                user_profile.organization_id,
+                request.data.get("check_in_latitude"), request.data.get("check_in_longitude")
+            )
+            if check_in_location:
+                payload["check_in_location"] = check_in_location
             
             serializer = AttendanceSerializer(data=payload)
             if serializer.is_valid():
                 serializer.save()
                 
-                # Invalidate cache after check-in
-                cache.delete(cache_key)
+                # Invalidate cache once the check-in is committed
+                outbox_service.invalidate_cache(cache_key)
                 return Response({
                     "status": status.HTTP_201_CREATED,
                     "message": "Checked in successfully.",
@@ -357,6 +329,40 @@ class AttendanceCheckInOutAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def build_attendance_rows(employees, attendance_date, status_param=None):
+    """
+    Daily attendance rows for a set of employees - 1 query for their records.
+
+    Returns:
+        list of dicts (AttendanceOutputSerializer input), filtered by
+        status_param (late / present / absent) when given
+    """
+    data = AttendanceService.build_employee_structure(employees, attendance_date)
+
+    records = Attendance.objects.filter(
+        user_id__in=list(data.keys()),
+        attendance_date=attendance_date
+    ).select_related("user", "assign_shift").only(
+        'id', 'user_id', 'attendance_date', 'attendance_status', 'is_late', 'late_minutes',
+        'check_in_time', 'check_out_time', 'total_working_minutes', 'break_duration_minutes',
+        'remarks', 'assign_shift_id', 'user__email', 'user__is_active'
+    ).order_by('-id')
+
+    data = AttendanceService.aggregate_records(records, data)
+    final_data = AttendanceService.finalize_status(data)
+
+    # Filter by status_param if provided
+    if status_param:
+        status_param = status_param.lower()
+        if status_param == "late":
+            final_data = [x for x in final_data if x.get("is_late")]
+        elif status_param == "present":
+            final_data = [x for x in final_data if x.get("attendance_status") == "present"]
+        elif status_param == "absent":
+            final_data = [x for x in final_data if x.get("attendance_status") == "absent"]
+    return final_data
+
+
 class FetchEmployeeAttendanceAPIView(APIView):
     pagination_class = CustomPagination
 
@@ -473,30 +479,19 @@ class FetchEmployeeAttendanceAPIView(APIView):
             else:
                 employees = all_employees
 
-            data = AttendanceService.build_employee_structure(employees, attendance_date)
-
-            records = Attendance.objects.filter(
-                user_id__in=list(data.keys()),
-                attendance_date=attendance_date
-            ).select_related("user", "assign_shift").only(
-                'id', 'user_id', 'attendance_date', 'attendance_status', 'is_late',
-                'check_in_time', 'check_out_time', 'total_working_minutes',
-                'assign_shift_id', 'user__email', 'user__is_active'
-            ).order_by('-id')
-
-            
-            data = AttendanceService.aggregate_records(records, data)
-            final_data = AttendanceService.finalize_status(data)
+            # ------------------- Keyset mode (?cursor=) -------------------
+            # Pages employees by user_id in the DB and builds attendance only for
+            # them, instead of materializing every employee's day and slicing
+            if KeysetPagination.cursor_query_param in request.query_params and not export:
+                return self.get_keyset_page(request, employees, attendance_date, status_param, {
+                    "total_employees": total_emp,
+                    "present": present,
+                    "late_login": late,
+                    "absent": absent,
+                    "attendance_date": attendance_date.strftime("%Y-%m-%d")
+                })
 
-            # Filter by status_param if provided
-            if status_param:
-                status_param = status_param.lower()
-                if status_param == "late":
-                    final_data = [x for x in final_data if x.get("is_late")]
-                elif status_param == "present":
-                    final_data = [x for x in final_data if x.get("attendance_status") == "present"]
-                elif status_param == "absent":
-                    final_data = [x for x in final_data if x.get("attendance_status") == "absent"]
+            final_data = build_attendance_rows(employees, attendance_date, status_param)
 
             if export:
                 return ExcelExportService.generate(final_data, attendance_date)
@@ -547,6 +542,56 @@ class FetchEmployeeAttendanceAPIView(APIView):
                 "data": []
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    def get_keyset_page(self, request, employees, attendance_date, status_param, summary):
+        """
+        ?cursor= page of employees ordered by user_id (forward only).
+
+        Status filters are computed per employee, so employees are read in
+        batches after the cursor until the page is full or none are left.
+        """
+        keyset = KeysetPagination(('user_id',))
+        page_size = keyset.get_page_size(request)
+        cursor = request.query_params.get(keyset.cursor_query_param)
+        employees = employees.order_by('user_id')
+        if cursor:
+            values, _ = decode_cursor(cursor)
+            employees = employees.filter(keyset_filter(('user_id',), keyset._to_python(UserProfile, values)))
+
+        rows = []
+        last_user_id = None
+        exhausted = False
+        while len(rows) <= page_size:
+            batch_employees = employees
+            if last_user_id is not None:
+                batch_employees = batch_employees.filter(user_id__gt=last_user_id)
+            batch = list(batch_employees[:page_size + 1])
+            if not batch:
+                exhausted = True
+                break
+            last_user_id = batch[-1].user_id
+            rows.extend(build_attendance_rows(batch, attendance_date, status_param))
+            if len(batch) <= page_size:
+                exhausted = True
+                break
+
+        has_next = len(rows) > page_size or not exhausted
+        rows = rows[:page_size]
+        next_cursor = encode_cursor([rows[-1]["user_id"]]) if has_next and rows else None
+
+        serializer = AttendanceOutputSerializer(rows, many=True)
+        return Response({
+            "status": status.HTTP_200_OK,
+            "message": "Attendance fetched successfully",
+            "data": serializer.data,
+            "summary": summary,
+            "pagination": {
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+                "has_previous": bool(cursor)
+            }
+        }, status=status.HTTP_200_OK)
+
 
 class FetchEmployeeMonthlyAttendanceAPIView(APIView):
     """
@@ -607,10 +652,9 @@ class FetchEmployeeMonthlyAttendanceAPIView(APIView):
             # For admin/org roles, validate employee belongs to admin via assignment
             if request.user.role != 'user':
                 # Check if employee is assigned to this admin and site using common function
-                # Check if assignment exists for any date in the month (check first and last day)
-                assignment_exists = (
-                    is_employee_assigned_to_site(user_id, admin_id, site_id, check_date=first_day) or
-                    is_employee_assigned_to_site(user_id, admin_id, site_id, check_date=last_day)
+                # Check if assignment exists for any date in the month (single in-memory interval check)
+                assignment_exists = is_employee_assigned_to_site_during(
+                    user_id, admin_id, site_id, first_day, last_day
                 )
                 
                 if not assignment_exists:
@@ -694,6 +738,121 @@ class FetchEmployeeMonthlyAttendanceAPIView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class GeofenceAuditAPIView(APIView):
+    """
+    Re-validate a month of attendance punches for a site against employees'
+    geofences (audit report).
+
+    Set based: one attendance query for the month, fences for every employee
+    built in two queries, each punch checked in memory. Punches are checked
+    against the employee's CURRENT assigned locations.
+
+    Query params: violations_only (default true), admin_id (for organization role)
+    """
+    
+    def get(self, request, site_id, month, year):
+        try:
+            if month < 1 or month > 12:
+                return Response({
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Invalid month. Month must be between 1 and 12",
+                    "data": []
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            if year < 2000 or year > 2100:
+                return Response({
+                    "status": status.HTTP_400_BAD_REQUEST,
+                    "message": "Invalid year",
+                    "data": []
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
+            if request.user.role not in ('admin', 'organization'):
+                return Response({
+                    "status": status.HTTP_403_FORBIDDEN,
+                    "message": "Only admin and organization roles can run geofence audits",
+                    "data": []
+                }, status=status.HTTP_403_FORBIDDEN)
+            
+            admin, site, error_response = get_admin_and_site_for_attendance(request, site_id)
+            if error_response:
+                return error_response
+            
+            first_day = date(year, month, 1)
+            last_day = date(year, month, monthrange(year, month)[1])
+            violations_only = request.query_params.get('violations_only', 'true').lower() != 'false'
+            
+            # Who was assigned to the site on each day - cached assignment index, 0 queries warm
+            daily_assignments = get_site_daily_assignments(admin.id, site_id, first_day, last_day)
+            employee_ids = set().union(*daily_assignments.values()) if daily_assignments else set()
+            
+            punches = Attendance.objects.filter(
+                user_id__in=employee_ids,
+                attendance_date__gte=first_day,
+                attendance_date__lte=last_day
+            ).order_by('attendance_date', 'user_id').values_list(
+                'id', 'user_id', 'attendance_date',
+                'check_in_latitude', 'check_in_longitude',
+                'check_out_latitude', 'check_out_longitude'
+            )
+            geofences = load_geofences(employee_ids)
+            names = dict(UserProfile.objects.filter(user_id__in=employee_ids).values_list('user_id', 'user_name'))
+            
+            summary = {"punches": 0, "inside": 0, "outside": 0, "missing_coordinates": 0, "not_fenced": 0}
+            results = []
+            for attendance_id, user_id, attendance_date, in_lat, in_lon, out_lat, out_lon in punches:
+                if user_id not in daily_assignments.get(attendance_date, ()):
+                    continue  # Punch belongs to another site assignment
+                geofence = geofences.get(str(user_id))
+                for punch, lat, lon in (('check_in', in_lat, in_lon), ('check_out', out_lat, out_lon)):
+                    if punch == 'check_out' and lat is None and lon is None:
+                        continue  # No check-out yet
+                    summary["punches"] += 1
+                    if geofence is None or not geofence.enforced:
+                        summary["not_fenced"] += 1
+                        continue
+                    if lat is None or lon is None:
+                        summary["missing_coordinates"] += 1
+                        result = None
+                        outcome = "missing_coordinates"
+                    else:
+                        result = geofence.fences.check(lat, lon)
+                        outcome = "inside" if result.inside else "outside"
+                        summary[outcome] += 1
+                    if violations_only and outcome == "inside":
+                        continue
+                    results.append({
+                        "attendance_id": attendance_id,
+                        "employee_id": str(user_id),
+                        "employee_name": names.get(user_id),
+                        "attendance_date": attendance_date,
+                        "punch": punch,
+                        "latitude": lat,
+                        "longitude": lon,
+                        "result": outcome,
+                        "location_id": result.location_id if result else None,
+                        "distance_m": result.distance_m if result else None
+                    })
+            
+            return Response({
+                "status": status.HTTP_200_OK,
+                "message": "Geofence audit completed",
+                "data": {
+                    "site_id": str(site_id),
+                    "month": month,
+                    "year": year,
+                    "summary": summary,
+                    "results": results
+                }
+            }, status=status.HTTP_200_OK)
+        
+        except Exception as e:
+            return Response({
+                "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                "message": str(e),
+                "data": []
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class EditAttendanceAPIView(APIView):
     """Clean API to edit attendance check-in & check-out"""
 
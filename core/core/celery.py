@@ -19,10 +19,13 @@ app = Celery('core')
 #   should have a `CELERY_` prefix.
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
-# Load task modules from all registered Django apps.
+# Load task modules (tasks.py) from every app in INSTALLED_APPS.
 # Explicitly include 'core.tasks' since 'core' is the project directory, not an app
+app.autodiscover_tasks()
 app.autodiscover_tasks(packages=['core'])
 
+# Queues, routes and per-queue worker options: settings.BACKGROUND_QUEUES / CELERY_TASK_ROUTES
+
 
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
@@ -0,0 +1,90 @@
+"""
+Query Budget Middleware
+
+Counts the SQL queries of each request, flags repeated query shapes (N+1) and
+enforces per-view query budgets (`query_budget` attribute on the view class).
+
+Settings:
+    QUERY_BUDGET_ENABLED: instrument every request (default: False - independent
+        of DEBUG, so development servers are not slowed down unless asked)
+    QUERY_BUDGET_SAMPLE_RATE: fraction of requests instrumented when not
+        enabled - cheap production sampling (default: 0.0)
+    QUERY_BUDGET_N_PLUS_ONE_THRESHOLD: executions of one shape that count as N+1 (default: 5)
+    QUERY_BUDGET_DEFAULT: budget for views without their own (default: None = no limit)
+    QUERY_BUDGET_RAISE: raise QueryBudgetExceeded instead of logging (tests/CI)
+
+Instrumented responses carry X-Query-Count and X-Query-Time-Ms headers.
+"""
+import logging
+import random
+
+from django.conf import settings
+
+from utils.exceptions import QueryBudgetExceeded
+from utils.query_inspector import QueryRecorder, get_view_query_budget
+
+logger = logging.getLogger('query_budget')
+
+
+class QueryBudgetMiddleware:
+    """Per-request query recorder with budget and N+1 checks"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    # Settings are read per request so override_settings() works in tests
+    @property
+    def enabled(self):
+        return getattr(settings, 'QUERY_BUDGET_ENABLED', False)
+
+    def _should_record(self):
+        if self.enabled:
+            return True
+        sample_rate = getattr(settings, 'QUERY_BUDGET_SAMPLE_RATE', 0.0)
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def __call__(self, request):
+        if not self._should_record():
+            return self.get_response(request)
+
+        # Callsites are only captured when fully enabled - sampling stays cheap
+        with QueryRecorder(capture_callsites=self.enabled) as recorder:
+            request.query_recorder = recorder
+            response = self.get_response(request)
+
+        response['X-Query-Count'] = str(recorder.count)
+        response['X-Query-Time-Ms'] = f"{recorder.duration * 1000:.1f}"
+        self._check(request, recorder)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_view_query_budget(view_func, request.method)
+        return None
+
+    def _check(self, request, recorder):
+        budget = getattr(request, 'query_budget', None)
+        if budget is None:
+            budget = getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
+        repeated = recorder.repeated_shapes(getattr(settings, 'QUERY_BUDGET_N_PLUS_ONE_THRESHOLD', 5))
+        over_budget = budget is not None and recorder.count > budget
+        if not over_budget and not repeated:
+            return
+
+        endpoint = f"{request.method} {request.path}"
+        problems = []
+        if over_budget:
+            problems.append(f"{recorder.count} queries (budget {budget})")
+        for item in repeated[:5]:
+            location = f" at {item['callsite']}" if item['callsite'] else ""
+            problems.append(f"N+1: {item['count']}x {item['shape'][:200]}{location}")
+        message = f"{endpoint}: " + "; ".join(problems)
+
+        report = {
+            'endpoint': endpoint,
+            'count': recorder.count,
+            'budget': budget,
+            'repeated': repeated,
+        }
+        if getattr(settings, 'QUERY_BUDGET_RAISE', False):
+            raise QueryBudgetExceeded(message, report)
+        logger.warning(message)
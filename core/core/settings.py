@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 from decouple import config, Csv
+from kombu import Exchange, Queue
 import os
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -65,6 +66,8 @@ LOCAL_APPS = [
     'ContactManagement',
     'InvoiceManagement',
     'SiteManagement',
+    'SearchIndex',
+    'Outbox',
     ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -89,8 +92,16 @@ MIDDLEWARE = [
     'core.timezone_middleware.TimezoneMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.query_budget.QueryBudgetMiddleware',
 ]
 
+# Query budget / N+1 detection (core.middleware.query_budget)
+QUERY_BUDGET_ENABLED = config('QUERY_BUDGET_ENABLED', default=False, cast=bool)  # Record every request (not tied to DEBUG)
+QUERY_BUDGET_SAMPLE_RATE = config('QUERY_BUDGET_SAMPLE_RATE', default=0.0, cast=float)  # Production sampling (0.0 - 1.0)
+QUERY_BUDGET_N_PLUS_ONE_THRESHOLD = 5  # Same query shape this many times in one request = N+1
+QUERY_BUDGET_DEFAULT = None  # Budget for views without query_budget (None = no limit)
+QUERY_BUDGET_RAISE = config('QUERY_BUDGET_RAISE', default=False, cast=bool)  # Raise instead of log (tests/CI)
+
 ROOT_URLCONF = 'core.urls'
 CORS_ALLOW_ALL_ORIGINS = True  # OR use CORS_ALLOWED_ORIGINS = ['http://localhost:3000']
 
@@ -183,6 +194,11 @@ ATTENDANCE_IMAGE_QUALITY = 85  # JPEG quality (1-100, lower = smaller file)
 ATTENDANCE_IMAGE_MAX_WIDTH = 1920  # Maximum image width in pixels (will be resized if larger)
 ATTENDANCE_IMAGE_MAX_HEIGHT = 1080  # Maximum image height in pixels (will be resized if larger)
 
+# Content-addressed media store (utils/helpers/media_store.py)
+MEDIA_STORE_DIR = 'blobs'  # Images saved as blobs/ab/cd/<sha256>.<ext> - identical uploads share one file
+MEDIA_THUMBNAIL_DIR = 'thumbs'  # List-view thumbnails: thumbs/<size>/ab/cd/<sha256>.jpg
+MEDIA_THUMBNAIL_SIZE = 160  # Square thumbnail side in pixels
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
@@ -204,6 +220,68 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_ENABLE_UTC = False
 
+# Background queues - run one worker per queue: python manage.py run_worker <queue>
+# Celery applies concurrency / prefetch / time limits per worker, so they live here per queue
+#   realtime - default queue: minute-level beats (auto checkout, counters) and short jobs
+#   bulk     - imports and set-based schedule generation (long, resumable)
+#   media    - image processing (tasks named media.*)
+#   ocr      - business card OCR (workers preload the EasyOCR model)
+BACKGROUND_QUEUES = {
+    'realtime': {'concurrency': 4, 'prefetch_multiplier': 4, 'soft_time_limit': 240, 'time_limit': 300},
+    'bulk': {'concurrency': 2, 'prefetch_multiplier': 1, 'soft_time_limit': 55 * 60, 'time_limit': 60 * 60},
+    'media': {'concurrency': 2, 'prefetch_multiplier': 1, 'soft_time_limit': 240, 'time_limit': 300},
+    'ocr': {'concurrency': 2, 'prefetch_multiplier': 1, 'soft_time_limit': 120, 'time_limit': 180},
+}
+CELERY_TASK_QUEUES = tuple(Queue(name, Exchange(name), routing_key=name) for name in BACKGROUND_QUEUES)
+CELERY_TASK_DEFAULT_QUEUE = 'realtime'  # Unrouted tasks - keep them short
+CELERY_TASK_ROUTES = {
+    'run_bulk_import_job': {'queue': 'bulk'},
+    'run_contact_import_job': {'queue': 'bulk'},
+    'snapshot_asset_depreciation': {'queue': 'bulk'},
+    'TaskControl.tasks.process_*_schedules': {'queue': 'bulk'},
+    'media.*': {'queue': 'media'},
+    # Business card OCR - only workers started with -Q ocr load the model
+    'extract_business_card': {'queue': 'ocr'},
+}
+# Limits for workers started without run_worker (the longest queue's)
+CELERY_TASK_SOFT_TIME_LIMIT = BACKGROUND_QUEUES['bulk']['soft_time_limit']
+CELERY_TASK_TIME_LIMIT = BACKGROUND_QUEUES['bulk']['time_limit']
+
+# Bulk registration password hashing (AuthN.password_hashing)
+BULK_PASSWORD_HASH_WORKERS = config('BULK_PASSWORD_HASH_WORKERS', default=os.cpu_count() or 1, cast=int)  # 1 = serial
+BULK_PASSWORD_HASH_MIN_PARALLEL = 16  # Smaller batches are hashed in-process
+BULK_IMPORT_CHUNK_SIZE = 500  # Rows validated/committed per chunk by the bulk employee / asset importers
+
+# List search (SearchIndex app) - False falls back to icontains across joins
+SEARCH_INDEX_ENABLED = config('SEARCH_INDEX_ENABLED', default=True, cast=bool)
+KEYSET_COUNT_CACHE_TIMEOUT = 60  # Seconds a ?cursor= list's ?count=cached total is reused
+DASHBOARD_STATS_CACHE_TIMEOUT = config('DASHBOARD_STATS_CACHE_TIMEOUT', default=60, cast=int)  # Dashboard stats TTL (0 = no caching)
+# Business card OCR (ContactManagement.ocr_job_service)
+OCR_WORKER_ENABLED = config('OCR_WORKER_ENABLED', default=True, cast=bool)  # False = extract inline in the request
+OCR_WORKER_PRELOAD = config('OCR_WORKER_PRELOAD', default=False, cast=bool)  # Set on OCR workers to load the model at process start
+OCR_MAX_IMAGE_SIDE = config('OCR_MAX_IMAGE_SIDE', default=1600, cast=int)  # Longest side (px) fed to OCR (0 = full size)
+OCR_RESULT_CACHE_TIMEOUT = 7 * 24 * 60 * 60  # Extraction results cached by image hash
+CONTACT_IMPORT_MAX_CARDS = config('CONTACT_IMPORT_MAX_CARDS', default=500, cast=int)  # Cards per batch business card import
+STATUS_COUNTER_RECONCILE_INTERVAL = config('STATUS_COUNTER_RECONCILE_INTERVAL', default=900, cast=int)  # Seconds between live counter recounts
+# Post-commit side effects (Outbox app)
+OUTBOX_BATCH_SIZE = 500  # Events claimed per dispatcher batch
+OUTBOX_LEASE_SECONDS = 300  # A claimed event is retried after this if its worker died
+OUTBOX_MAX_ATTEMPTS = 10  # Then the event is marked failed (manage.py drain_outbox --retry-failed)
+OUTBOX_DRAIN_SECONDS = 30  # Longest single dispatch_outbox run
+OUTBOX_SWEEP_INTERVAL = config('OUTBOX_SWEEP_INTERVAL', default=10, cast=int)  # Seconds between beat sweeps (lost wake-ups, retries)
+OUTBOX_WAKE_ON_COMMIT = config('OUTBOX_WAKE_ON_COMMIT', default=True, cast=bool)  # Wake the dispatcher right after a commit
+OUTBOX_HANDLER_MODULES = ['utils.notification_service']  # Modules registering @outbox_handler topics
+# Push notifications (utils.notification_service) - sent by the outbox dispatcher
+PUSH_TRANSPORT = config('PUSH_TRANSPORT', default='file')  # fcm / file / memory, or a dotted PushTransport path - 'file' logs a warning at startup when DEBUG is off
+PUSH_FILE_PATH = config('PUSH_FILE_PATH', default=os.path.join(BASE_DIR, 'push_notifications.log'))  # FileTransport output
+FIREBASE_CREDENTIALS_FILE = config('FIREBASE_CREDENTIALS_FILE', default='')  # Service account JSON for the fcm transport
+PUSH_RATE_LIMIT_PER_MINUTE = config('PUSH_RATE_LIMIT_PER_MINUTE', default=1000, cast=int)  # Per organization (0 = unlimited)
+SHIFT_REMINDER_LEAD_MINUTES = config('SHIFT_REMINDER_LEAD_MINUTES', default=15, cast=int)  # Remind this long before a shift starts
+SHIFT_REMINDER_INTERVAL = 300  # Seconds between shift reminder runs (window size)
+# Asset depreciation snapshot (AssetManagement.asset_register_service) - written-down value, monthly
+ASSET_DEPRECIATION_RATE = config('ASSET_DEPRECIATION_RATE', default=15, cast=float)  # % per year for categories without depreciation_rate
+ASSET_RESIDUAL_VALUE_PERCENT = config('ASSET_RESIDUAL_VALUE_PERCENT', default=5, cast=float)  # current_value never drops below this % of purchase_price
+
 # Cache Configuration (for high-traffic APIs)
 CACHES = {
     'default': {
@@ -240,6 +318,36 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'shiftwise_auto_checkout_task',
         'schedule': 60.0,  # Run every 60 seconds (1 minute)
     },
+    'reconcile-status-counters': {
+        'task': 'reconcile_status_counters_task',
+        'schedule': STATUS_COUNTER_RECONCILE_INTERVAL,
+    },
+    'dispatch-outbox': {
+        'task': 'dispatch_outbox',
+        'schedule': OUTBOX_SWEEP_INTERVAL,
+    },
+    'shift-reminders': {
+        'task': 'send_shift_reminders',
+        'schedule': SHIFT_REMINDER_INTERVAL,
+    },
+    # Recurring task instances - set-based, idempotent (safe to re-run)
+    'task-daily-schedules': {
+        'task': 'TaskControl.tasks.process_daily_schedules',
+        'schedule': crontab(hour=0, minute=5),
+    },
+    'task-weekly-schedules': {
+        'task': 'TaskControl.tasks.process_weekly_schedules',
+        'schedule': crontab(hour=0, minute=10),
+    },
+    'task-monthly-schedules': {
+        'task': 'TaskControl.tasks.process_monthly_schedules',
+        'schedule': crontab(hour=0, minute=15),
+    },
+    # Asset current_value for the new month - one set-based UPDATE
+    'asset-depreciation-snapshot': {
+        'task': 'snapshot_asset_depreciation',
+        'schedule': crontab(day_of_month=1, hour=1, minute=0),
+    },
 }
 
 
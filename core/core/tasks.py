@@ -179,3 +179,19 @@ def shiftwise_auto_checkout_task():
         logger.error(f"Error in shiftwise_auto_checkout_task: {str(e)}\nTraceback:\n{error_traceback}")
         return {"status": "error", "message": str(e)}
 
+
+
+@shared_task(name='reconcile_status_counters_task')
+def reconcile_status_counters_task():
+    """
+    Recount live status counters (tasks, visits, expenses, leaves, attendance)
+    from the DB and correct drift from writes that bypass signals.
+    """
+    from utils.status_counter_service import reconcile_status_counters
+
+    try:
+        drifted = reconcile_status_counters()
+        return {"status": "success", "drifted": drifted}
+    except Exception as e:
+        logger.error(f"Error in reconcile_status_counters_task: {str(e)}\nTraceback:\n{traceback.format_exc()}")
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,440 @@
+import os
+import re
+import threading
+import uuid
+from contextlib import ExitStack
+from datetime import timedelta
+from unittest import mock
+from urllib.parse import urlencode
+
+from celery.contrib.testing.worker import start_worker
+from celery.schedules import schedule
+from celery.signals import task_revoked
+from celery.worker import state as worker_state
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from AuthN.models import BulkImportJob
+from ContactManagement.models import ContactImportJob
+from ContactManagement.ocr_job_service import JOB_PENDING, _job_key
+from PayrollSystem.models import OrganizationPayrollSettings
+from SiteManagement.models import EmployeeAdminSiteAssignment
+from TaskControl.models import Task
+from core.celery import app
+from utils.cache_version_utils import bump_version, get_version
+from utils.fixture_utils import create_tenant, create_tenant_rows
+
+REALTIME_MAX_INTERVAL = timedelta(minutes=5)  # Beats at least this frequent must stay on 'realtime'
+
+# Intended queue of every registered task - a new task must be added here
+TASK_QUEUES = {
+    # realtime - minute-level beats and short jobs
+    'general_auto_checkout_task': 'realtime',
+    'shiftwise_auto_checkout_task': 'realtime',
+    'reconcile_status_counters_task': 'realtime',
+    'send_shift_reminders': 'realtime',
+    'dispatch_outbox': 'realtime',
+    'TaskControl.tasks.create_scheduled_task': 'realtime',
+    'core.celery.debug_task': 'realtime',
+    # bulk - imports and set-based schedule generation
+    'run_bulk_import_job': 'bulk',
+    'run_contact_import_job': 'bulk',
+    'snapshot_asset_depreciation': 'bulk',
+    'TaskControl.tasks.process_daily_schedules': 'bulk',
+    'TaskControl.tasks.process_weekly_schedules': 'bulk',
+    'TaskControl.tasks.process_monthly_schedules': 'bulk',
+    # media - image processing
+    'media.update_profile_photo': 'media',
+    # ocr - business card OCR
+    'extract_business_card': 'ocr',
+}
+
+
+class TaskRoutingTests(SimpleTestCase):
+    """CELERY_TASK_ROUTES / CELERY_TASK_QUEUES - each task lands on its intended queue"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        app.loader.import_default_modules()
+        cls.registered = sorted(
+            name for name in app.tasks if not name.startswith('celery.')
+        )
+
+    def route(self, name):
+        return app.amqp.router.route({}, name)['queue'].name
+
+    def test_every_task_has_an_intended_queue(self):
+        self.assertEqual(self.registered, sorted(TASK_QUEUES))
+
+    def test_each_task_resolves_to_its_queue(self):
+        for name, queue in TASK_QUEUES.items():
+            with self.subTest(task=name):
+                self.assertEqual(self.route(name), queue)
+
+    def test_queues_are_declared(self):
+        declared = {queue.name for queue in app.conf.task_queues}
+        self.assertEqual(declared, set(settings.BACKGROUND_QUEUES))
+        self.assertEqual(app.conf.task_default_queue, 'realtime')
+
+    def test_beat_tasks_are_registered(self):
+        for entry, beat in settings.CELERY_BEAT_SCHEDULE.items():
+            with self.subTest(entry=entry):
+                self.assertIn(beat['task'], TASK_QUEUES)
+
+    def test_frequent_beat_tasks_stay_on_realtime(self):
+        for entry, beat in settings.CELERY_BEAT_SCHEDULE.items():
+            every = beat['schedule']
+            if isinstance(every, (int, float)):
+                every = timedelta(seconds=every)
+            elif isinstance(every, schedule) and not hasattr(every, 'minute'):
+                every = every.run_every
+            if isinstance(every, timedelta) and every <= REALTIME_MAX_INTERVAL:
+                with self.subTest(entry=entry):
+                    self.assertEqual(self.route(beat['task']), 'realtime')
+
+
+class TaskWorkerRoutingTests(SimpleTestCase):
+    """
+    One embedded worker per queue on an in-memory broker - every task is
+    consumed only by the worker of its routed queue.
+
+    The published task ids are marked revoked up front, so workers receive
+    and discard the messages without running any task code.
+    """
+
+    WAIT_SECONDS = 20
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        app.loader.import_default_modules()
+        # Celery reads these environment variables ahead of settings
+        cls.enterClassContext(mock.patch.dict(os.environ, {
+            'CELERY_BROKER_URL': 'memory://localhost//',
+            'CELERY_RESULT_BACKEND': 'cache+memory://',
+        }))
+        app.close()  # Drop pooled connections to the configured broker
+        cls.addClassCleanup(app.close)
+
+    def test_each_task_is_consumed_from_its_routed_queue(self):
+        task_ids = {str(uuid.uuid4()): name for name in TASK_QUEUES}
+        consumed = {}
+        all_consumed = threading.Event()
+
+        def on_revoked(sender, request, **kwargs):
+            if request.id in task_ids:
+                consumed[task_ids[request.id]] = (request.hostname.split('@')[0], request.delivery_info['routing_key'])
+                if len(consumed) == len(task_ids):
+                    all_consumed.set()
+
+        task_revoked.connect(on_revoked, weak=False)
+        self.addCleanup(task_revoked.disconnect, on_revoked)
+        for task_id in task_ids:
+            worker_state.revoked.add(task_id)
+            self.addCleanup(worker_state.revoked.discard, task_id)
+
+        with ExitStack() as stack:
+            for queue in settings.BACKGROUND_QUEUES:
+                worker = stack.enter_context(start_worker(
+                    app, pool='solo', concurrency=1, queues=[queue], hostname=f'{queue}@routing-test',
+                    perform_ping_check=False, loglevel='WARNING', shutdown_timeout=self.WAIT_SECONDS,
+                ))
+                with self.subTest(worker=queue):
+                    self.assertEqual(sorted(q.name for q in worker.consumer.task_consumer.queues), [queue])
+            for task_id, name in task_ids.items():
+                app.send_task(name, task_id=task_id)
+            all_consumed.wait(self.WAIT_SECONDS)
+
+        # (worker, queue the message was delivered from) per task
+        self.assertEqual(consumed, {name: (queue, queue) for name, queue in TASK_QUEUES.items()})
+
+
+# Detail routes: first path segment -> model whose first row fills <pk>
+DETAIL_MODELS = {
+    'holidays': 'Holiday.Holiday',
+    'service-shifts': 'ServiceShift.ServiceShift',
+    'week-off-policies': 'ServiceWeekOff.WeekOffPolicy',
+    'expense-categories': 'Expenditure.ExpenseCategory',
+    'expense-projects': 'Expenditure.ExpenseProject',
+    'task-types': 'TaskControl.TaskType',
+    'task-detail-update-delete': 'TaskControl.Task',
+    'locations': 'LocationControl.Location',
+    'leave-types': 'LeaveControl.LeaveType',
+    'leave-balances': 'LeaveControl.EmployeeLeaveBalance',
+    'leave-applications': 'LeaveControl.LeaveApplication',
+    'payslip-generator': 'PayrollSystem.PayslipGenerator',
+    'employee-payroll-config': 'PayrollSystem.EmployeePayrollConfig',
+    'employee-bank-info': 'PayrollSystem.EmployeeBankInfo',
+    'employee-advance': 'PayrollSystem.EmployeeAdvance',
+    'visit-detail-update-delete': 'VisitControl.Visit',
+    'categories': 'AssetManagement.AssetCategory',
+    'assets': 'AssetManagement.Asset',
+    'contact-detail-update-delete': 'ContactManagement.Contact',
+    'invoices': 'InvoiceManagement.Invoice',
+}
+
+CONVERTER_RE = re.compile(r'<(?:(?P<converter>[^>:]+):)?(?P<name>[^>]+)>')
+
+
+def iter_routes(patterns, prefix=''):
+    """Yield (route, URLPattern) for every path() in the URLconf"""
+    for entry in patterns:
+        if isinstance(entry, URLResolver):
+            yield from iter_routes(entry.url_patterns, prefix + str(entry.pattern))
+        elif isinstance(entry, URLPattern):
+            yield prefix + str(entry.pattern), entry
+
+
+def get_routes():
+    """(route, view name) of every API route with a GET handler"""
+    routes = []
+    for route, pattern in iter_routes(get_resolver().url_patterns):
+        view_class = getattr(pattern.callback, 'view_class', None) or getattr(pattern.callback, 'cls', None)
+        if route.startswith('api/') and (view_class is None or hasattr(view_class, 'get')):
+            routes.append((route, getattr(view_class, '__name__', pattern.callback.__name__)))
+    return routes
+
+
+# Routes only some roles may call - everything else runs for admin and organization
+DEFAULT_ROLES = ('admin', 'organization')
+ROUTE_ROLES = {
+    'api/organizations': ('system_owner',),
+    'api/organizations/<uuid:org_id>': ('system_owner',),
+    'api/organization_all_admin/<str:orgID>': ('organization',),
+    'api/organization/admins': ('organization',),
+    'api/organization/admins/<uuid:admin_id>': ('organization',),
+    'api/admin/site-employees/': ('admin',),
+    'api/task/employee/my-tasks/<uuid:site_id>/<uuid:user_id>/': ('employee',),
+}
+
+# Query parameters a role or route requires - values are formatted with the tenant's url params
+ROLE_QUERY = {
+    'organization': {'admin_id': '{admin_id}'},
+}
+ROUTE_QUERY = {
+    'api/locations/<uuid:site_id>/nearby/': {'lat': '12.9716', 'lng': '77.5946'},
+    'api/employee-attendance/<uuid:site_id>/': {'date': '{date}'},
+    'api/employee-attendance/<uuid:site_id>/<uuid:user_id>/': {'date': '{date}'},
+    'api/leave-applications/<uuid:site_id>/': {'year': '{year}'},
+    'api/leave-applications/<uuid:site_id>/<uuid:user_id>/': {'year': '{year}'},
+    'api/payroll/employee-earnings-excel/<uuid:site_id>/': {'month': '{month}', 'year': '{year}'},
+    'api/payroll/employee-deductions-excel/<uuid:site_id>/': {'month': '{month}', 'year': '{year}'},
+    'api/payroll/generate-payroll-from-attendance/<uuid:site_id>/': {'month': '{month}', 'year': '{year}'},
+    'api/payroll/generate-payslip-from-payroll/<uuid:site_id>/': {'month': '{month}', 'year': '{year}'},
+    'api/admin/site-employees/': {'site_id': '{site_id}'},
+}
+
+# URL kwargs that take a different url param on a route
+ROUTE_PARAMS = {
+    'api/organizations/<uuid:org_id>': {'org_id': 'organization_profile_id'},
+}
+
+# GET routes that generate a row per employee - status is checked, query count is not
+PER_ROW_WRITES = {
+    'api/payroll/generate-payslip-from-payroll/<uuid:site_id>/':
+        'creates one PayslipGenerator per payroll record, each numbering itself in save()',
+}
+
+# Routes that fail for every tenant - skipped with the reason until the view is fixed
+KNOWN_BROKEN = {
+    'api/assign-shifts/<uuid:site_id>/<uuid:user_id>/<int:shift_id>/':
+        'DELETE route - the shared view\'s get() does not accept shift_id',
+    'api/assign-week-offs/<uuid:site_id>/<uuid:user_id>/<int:week_off_id>/':
+        'DELETE route - the shared view\'s get() does not accept week_off_id',
+    'api/assign-locations/<uuid:site_id>/<uuid:user_id>/<int:location_id>/':
+        'DELETE route - the shared view\'s get() does not accept location_id',
+    'api/organization_all_admin/<str:orgID>': 'URL kwarg orgID does not match get(org_id)',
+    'api/organization/admins/<uuid:admin_id>': 'get() does not accept admin_id',
+    'api/employee-daily-info/<uuid:site_id>/': 'filters UserProfile on a site field it does not have',
+    'api/payroll/employee-bank-info/<uuid:site_id>/': 'filters EmployeeBankInfo on a site field it does not have',
+    'api/payroll/employee-bank-info/<uuid:site_id>/<int:pk>/': 'filters UserProfile on a site_id field it does not have',
+    'api/payroll/demo-attendance-sheet/<uuid:site_id>/': 'filters UserProfile on a site_id field it does not have',
+}
+
+
+class QueryCountScalingTests(TestCase):
+    """
+    Every GET API route answers successfully and runs the same number of
+    queries for a tenant with 1 row per list as for one with 200 - list and
+    detail views must not issue per-row (N+1) queries.
+    """
+
+    SMALL, LARGE = 1, 200
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenants = {}
+        for count in (cls.SMALL, cls.LARGE):
+            tenant = create_tenant()
+            tenant['employees'] = create_tenant_rows(tenant, count)
+            tenant['employee'] = tenant['employees'][0]
+            tenant['job_id'] = cls.create_jobs(tenant)
+            tenant['params'] = cls.url_params(tenant)
+            cls.tenants[count] = tenant
+
+    @staticmethod
+    def create_jobs(tenant):
+        """Bulk and contact import job plus payroll settings, sharing one job id"""
+        job_id = uuid.uuid4()
+        admin, organization, site = tenant['admin'], tenant['organization'], tenant['site']
+        BulkImportJob.objects.create(
+            id=job_id, admin=admin, organization=organization, site=site, created_by=admin,
+            file='bulk_imports/employees.csv', file_format='csv',
+        )
+        ContactImportJob.objects.create(id=job_id, admin=admin, site=site, created_by=admin)
+        OrganizationPayrollSettings.objects.create(organization=organization)
+        return str(job_id)
+
+    @staticmethod
+    def url_params(tenant):
+        employee = tenant['employee']
+        today = timezone.localdate()
+        return {
+            'admin_id': str(tenant['admin'].id),
+            'org_id': str(tenant['organization'].id),
+            'orgID': str(tenant['organization'].id),
+            'organization_profile_id': str(tenant['organization'].own_organization_profile.id),
+            'site_id': str(tenant['site'].id),
+            'user_id': str(employee.id),
+            'userid': str(employee.id),
+            'employee_id': str(employee.id),
+            'date': today.isoformat(),
+            'month': str(today.month),
+            'year': str(today.year),
+            'shift_id': str(tenant['shift'].id),
+            'week_off_id': str(tenant['week_off'].id),
+            'location_id': str(tenant['location'].id),
+            'task_id': str(Task.objects.filter(admin=tenant['admin']).order_by('pk').first().pk),
+            'assignment_id': str(EmployeeAdminSiteAssignment.objects.filter(employee=employee).first().pk),
+            'job_id': tenant['job_id'],
+        }
+
+    @staticmethod
+    def first_pk(route, tenant):
+        segments = [segment for segment in route.split('/') if segment and not segment.startswith('<')]
+        model = apps.get_model(DETAIL_MODELS[segments[-1] if segments[-1] in DETAIL_MODELS else segments[1]])
+        field_names = {field.name for field in model._meta.fields}
+        if 'admin' in field_names:
+            scope = {'admin': tenant['admin']}
+        else:
+            scope = {'user__in' if 'user' in field_names else 'employee__in': tenant['employees']}
+        return str(model.objects.filter(**scope).order_by('pk').values_list('pk', flat=True).first())
+
+    def build_url(self, route, tenant, role):
+        params = tenant['params']
+        if '<' in route and 'pk>' in route:
+            params = {**params, 'pk': self.first_pk(route, tenant)}
+        names = ROUTE_PARAMS.get(route, {})
+        url = '/' + CONVERTER_RE.sub(lambda match: params[names.get(match.group('name'), match.group('name'))], route)
+        query = {**ROLE_QUERY.get(role, {}), **ROUTE_QUERY.get(route, {})}
+        if query:
+            url += '?' + urlencode({key: value.format(**params) for key, value in query.items()})
+        return url
+
+    def count_queries(self, user, url, job_id):
+        client = APIClient(raise_request_exception=False)  # Broken views answer 500 instead of raising
+        client.force_authenticate(user)
+        cache.clear()  # Every request starts cold - the tenants must not share cached lookups
+        cache.set(_job_key(job_id), {'status': JOB_PENDING}, 60)  # Card extraction jobs live only in the cache
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        return len(queries), response.status_code
+
+    def assert_constant_queries(self, role):
+        routes = [
+            (route, view_name) for route, view_name in get_routes()
+            if role in ROUTE_ROLES.get(route, DEFAULT_ROLES)
+        ]
+        self.assertTrue(routes)
+        for route, view_name in routes:
+            with self.subTest(route=route, view=view_name):
+                if route in KNOWN_BROKEN:
+                    self.skipTest(KNOWN_BROKEN[route])
+                counts = {}
+                for size, tenant in self.tenants.items():
+                    url = self.build_url(route, tenant, role)
+                    counts[size], status_code = self.count_queries(tenant[role], url, tenant['job_id'])
+                    self.assertLess(status_code, 400, f'{url} answered HTTP {status_code} for {size} row(s)')
+                if route in PER_ROW_WRITES:
+                    continue
+                self.assertEqual(
+                    counts[self.SMALL], counts[self.LARGE],
+                    f'{counts[self.SMALL]} queries for {self.SMALL} row(s), {counts[self.LARGE]} for {self.LARGE}',
+                )
+
+    def test_route_tables_name_real_routes(self):
+        routes = {route for route, view_name in get_routes()}
+        for table in (ROUTE_ROLES, ROUTE_QUERY, ROUTE_PARAMS, PER_ROW_WRITES, KNOWN_BROKEN):
+            self.assertEqual(set(table) - routes, set())
+
+    def test_admin_routes(self):
+        self.assert_constant_queries('admin')
+
+    def test_organization_routes(self):
+        self.assert_constant_queries('organization')
+
+    def test_system_owner_routes(self):
+        self.assert_constant_queries('system_owner')
+
+    def test_employee_routes(self):
+        self.assert_constant_queries('employee')
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+    """QueryBudgetMiddleware records on QUERY_BUDGET_ENABLED, not DEBUG"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tenant = create_tenant()
+
+    def get(self):
+        client = APIClient()
+        client.force_authenticate(self.tenant['admin'])
+        return client.get(f"/api/task/task-list-create/{self.tenant['site'].id}/")
+
+    @override_settings(DEBUG=True, QUERY_BUDGET_ENABLED=False, QUERY_BUDGET_SAMPLE_RATE=0.0)
+    def test_debug_alone_does_not_record(self):
+        self.assertNotIn('X-Query-Count', self.get())
+
+    @override_settings(DEBUG=False, QUERY_BUDGET_ENABLED=True)
+    def test_enabled_records_without_debug(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response['X-Query-Count']), 0)
+
+
+class CacheVersionTests(SimpleTestCase):
+    """utils.cache_version_utils - version counters never restart below an earlier version"""
+
+    key = 'test_cache_version'
+
+    def setUp(self):
+        cache.delete(self.key)
+
+    def test_get_seeds_once(self):
+        version = get_version(self.key)
+        self.assertEqual(get_version(self.key), version)
+
+    def test_bump_increments(self):
+        version = get_version(self.key)
+        self.assertEqual(bump_version(self.key), version + 1)
+        self.assertEqual(get_version(self.key), version + 1)
+
+    def test_evicted_counter_reseeds_above_earlier_versions(self):
+        version = get_version(self.key)
+        for _ in range(3):
+            version = bump_version(self.key)
+        cache.delete(self.key)  # Evicted while entries cached under `version` are still alive
+        self.assertGreater(get_version(self.key), version)
+        cache.delete(self.key)
+        self.assertGreater(bump_version(self.key), version)
+
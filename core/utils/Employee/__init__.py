@@ -9,10 +9,23 @@ from .assignment_utils import (
     verify_and_get_employee_profile,
     get_employees_assigned_to_site,
     is_employee_assigned_to_site,
+    is_employee_assigned_to_site_during,
+    get_site_daily_assignments,
     get_active_assignments_for_employee,
     get_assignments_by_date_range,
     get_employee_ids_for_site_on_date
 )
+from .assignment_resolver import (
+    AssignmentIndex,
+    get_site_assignment_index,
+    get_admin_assignment_index,
+    invalidate_assignment_cache
+)
+from .bulk_operations import (
+    partition_employees_under_admin,
+    bulk_set_employees_active,
+    bulk_transfer_employees
+)
 
 __all__ = [
     'get_current_admin_for_employee',
@@ -24,7 +37,16 @@ __all__ = [
     'verify_and_get_employee_profile',
     'get_employees_assigned_to_site',
     'is_employee_assigned_to_site',
+    'is_employee_assigned_to_site_during',
+    'get_site_daily_assignments',
     'get_active_assignments_for_employee',
     'get_assignments_by_date_range',
     'get_employee_ids_for_site_on_date',
+    'AssignmentIndex',
+    'get_site_assignment_index',
+    'get_admin_assignment_index',
+    'invalidate_assignment_cache',
+    'partition_employees_under_admin',
+    'bulk_set_employees_active',
+    'bulk_transfer_employees',
 ]
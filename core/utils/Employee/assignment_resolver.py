@@ -0,0 +1,309 @@
+"""
+Employee Assignment Resolver
+Interval-indexed, cached view of EmployeeAdminSiteAssignment rows.
+
+A site's (or admin's) assignments are loaded with ONE query into sorted
+start/end arrays and cached. All date questions ("who is assigned on D",
+"is X assigned during [A, B]", "day-by-day assignment for a month") are then
+answered in memory.
+
+Cache invalidation is version based: every write to an assignment bumps the
+admin's version number, so stale indexes are simply never read again and
+expire on their own TTL.
+"""
+from bisect import bisect_right
+from datetime import date, timedelta
+
+from django.core.cache import cache
+
+from SiteManagement.models import EmployeeAdminSiteAssignment
+from utils.cache_version_utils import bump_version, get_version
+
+
+ASSIGNMENT_INDEX_TIMEOUT = 60 * 60  # 1 hour - versioning makes stale entries unreachable
+ASSIGNMENT_VERSION_TIMEOUT = None  # Version counters never expire
+OPEN_END_ORDINAL = date.max.toordinal()
+
+
+def _to_date(value):
+    """Accept date, datetime or 'YYYY-MM-DD' string and return a date."""
+    if value is None:
+        return date.today()
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if hasattr(value, 'date') and callable(value.date):
+        return value.date()
+    return value
+
+
+class AssignmentIndex:
+    """
+    Immutable interval index over a set of assignments.
+
+    Intervals are kept in arrays sorted by start date (as ordinals), so every
+    lookup is a bisect plus a scan of the candidates that started on or before
+    the requested date. Per-employee intervals are grouped for O(k) membership
+    checks where k is the number of assignments of that employee.
+    """
+
+    __slots__ = ('_starts', '_ends', '_employees', '_active', '_by_employee')
+
+    def __init__(self, rows):
+        """
+        Args:
+            rows: iterable of (employee_id, start_date, end_date, is_active)
+        """
+        intervals = sorted(
+            (
+                start.toordinal(),
+                end.toordinal() if end else OPEN_END_ORDINAL,
+                employee_id,
+                bool(is_active),
+            )
+            for employee_id, start, end, is_active in rows
+        )
+        self._starts = [item[0] for item in intervals]
+        self._ends = [item[1] for item in intervals]
+        self._employees = [item[2] for item in intervals]
+        self._active = [item[3] for item in intervals]
+
+        by_employee = {}
+        for start, end, employee_id, is_active in intervals:
+            by_employee.setdefault(str(employee_id), []).append((start, end, is_active))
+        self._by_employee = by_employee
+
+    def __len__(self):
+        return len(self._starts)
+
+    def employees_on(self, check_date=None, active_only=True):
+        """
+        Employee IDs assigned on a given date (default: today).
+
+        Returns:
+            list of employee IDs (UUIDs), de-duplicated, in start-date order
+        """
+        day = _to_date(check_date).toordinal()
+        seen = set()
+        result = []
+        # Only intervals starting on/before `day` can contain it
+        for idx in range(bisect_right(self._starts, day)):
+            if self._ends[idx] < day:
+                continue
+            if active_only and not self._active[idx]:
+                continue
+            employee_id = self._employees[idx]
+            if employee_id not in seen:
+                seen.add(employee_id)
+                result.append(employee_id)
+        return result
+
+    def employees_during(self, start_date, end_date, active_only=True):
+        """
+        Employee IDs with an assignment overlapping [start_date, end_date].
+
+        Returns:
+            list of employee IDs (UUIDs), de-duplicated
+        """
+        first = _to_date(start_date).toordinal()
+        last = _to_date(end_date).toordinal()
+        seen = set()
+        result = []
+        for idx in range(bisect_right(self._starts, last)):
+            if self._ends[idx] < first:
+                continue
+            if active_only and not self._active[idx]:
+                continue
+            employee_id = self._employees[idx]
+            if employee_id not in seen:
+                seen.add(employee_id)
+                result.append(employee_id)
+        return result
+
+    def is_assigned(self, employee_id, check_date=None, active_only=True):
+        """Check if employee is assigned on a given date (default: today)."""
+        day = _to_date(check_date).toordinal()
+        for start, end, is_active in self._by_employee.get(str(employee_id), ()):
+            if start > day:
+                break
+            if end >= day and (is_active or not active_only):
+                return True
+        return False
+
+    def is_assigned_during(self, employee_id, start_date, end_date, active_only=True):
+        """Check if employee has an assignment overlapping [start_date, end_date]."""
+        first = _to_date(start_date).toordinal()
+        last = _to_date(end_date).toordinal()
+        for start, end, is_active in self._by_employee.get(str(employee_id), ()):
+            if start > last:
+                break
+            if end >= first and (is_active or not active_only):
+                return True
+        return False
+
+    def assigned_days(self, employee_id, start_date, end_date, active_only=True):
+        """
+        Dates within [start_date, end_date] on which the employee is assigned.
+
+        Returns:
+            sorted list of date objects
+        """
+        first = _to_date(start_date).toordinal()
+        last = _to_date(end_date).toordinal()
+        days = set()
+        for start, end, is_active in self._by_employee.get(str(employee_id), ()):
+            if start > last:
+                break
+            if end < first or (active_only and not is_active):
+                continue
+            days.update(range(max(start, first), min(end, last) + 1))
+        return [date.fromordinal(day) for day in sorted(days)]
+
+    def daily_assignments(self, start_date, end_date, active_only=True):
+        """
+        Day-by-day assignment map for a date range (e.g. a month).
+
+        Returns:
+            dict: {date: set of employee IDs assigned that day}
+        """
+        first = _to_date(start_date)
+        last = _to_date(end_date)
+        first_ord = first.toordinal()
+        last_ord = last.toordinal()
+        span = last_ord - first_ord + 1
+        buckets = [set() for _ in range(max(span, 0))]
+
+        for idx in range(bisect_right(self._starts, last_ord)):
+            if self._ends[idx] < first_ord:
+                continue
+            if active_only and not self._active[idx]:
+                continue
+            lo = max(self._starts[idx], first_ord) - first_ord
+            hi = min(self._ends[idx], last_ord) - first_ord
+            employee_id = self._employees[idx]
+            for offset in range(lo, hi + 1):
+                buckets[offset].add(employee_id)
+
+        return {first + timedelta(days=offset): bucket for offset, bucket in enumerate(buckets)}
+
+
+# ==================== CACHE / VERSIONING ====================
+
+def _version_key(admin_id):
+    return f"assignment_index_version_{admin_id}"
+
+
+def _index_key(admin_id, site_id, version):
+    return f"assignment_index_{admin_id}_{site_id or 'all'}_v{version}"
+
+
+def _current_admin_key(employee_id):
+    return f"employee_current_admin_{employee_id}"
+
+
+def _employee_sites_key(employee_id):
+    return f"employee_active_sites_{employee_id}"
+
+
+def get_assignment_version(admin_id):
+    """Current cache version for an admin's assignments - O(1) cache hit."""
+    return get_version(_version_key(admin_id), ASSIGNMENT_VERSION_TIMEOUT)
+
+
+def invalidate_assignment_cache(admin_ids=(), employee_ids=()):
+    """
+    Invalidate cached assignment data after writes.
+
+    Call this after bulk_create / queryset.update() on EmployeeAdminSiteAssignment,
+    which bypass model signals. Regular save()/delete() are handled by signals.
+
+    Args:
+        admin_ids: admins whose site/admin indexes must be rebuilt
+        employee_ids: employees whose cached current admin must be dropped
+    """
+    for admin_id in {str(a) for a in admin_ids if a}:
+        bump_version(_version_key(admin_id), ASSIGNMENT_VERSION_TIMEOUT)
+
+    employee_keys = []
+    for employee_id in {str(e) for e in employee_ids if e}:
+        employee_keys.append(_current_admin_key(employee_id))
+        employee_keys.append(_employee_sites_key(employee_id))
+    if employee_keys:
+        cache.delete_many(employee_keys)
+
+
+def _load_index(admin_id, site_id=None):
+    """Load assignments for admin (optionally one site) with a single query."""
+    queryset = EmployeeAdminSiteAssignment.objects.filter(admin_id=admin_id)
+    if site_id:
+        queryset = queryset.filter(site_id=site_id)
+    rows = queryset.values_list('employee_id', 'start_date', 'end_date', 'is_active')
+    return AssignmentIndex(rows)
+
+
+def get_site_assignment_index(admin_id, site_id):
+    """
+    Cached AssignmentIndex for one admin-site combination.
+    With site_id=None the index covers every site of the admin.
+
+    Cold: 1 DB query (index assignment_site_dates_idx). Warm: 2 cache hits.
+    """
+    version = get_assignment_version(admin_id)
+    key = _index_key(admin_id, site_id, version)
+    index = cache.get(key)
+    if index is None:
+        index = _load_index(admin_id, site_id)
+        cache.set(key, index, ASSIGNMENT_INDEX_TIMEOUT)
+    return index
+
+
+def get_admin_assignment_index(admin_id):
+    """
+    Cached AssignmentIndex for all sites of an admin.
+
+    Cold: 1 DB query (index assignment_admin_active_idx). Warm: 2 cache hits.
+    """
+    return get_site_assignment_index(admin_id, None)
+
+
+def get_cached_current_admin(employee_id, loader):
+    """
+    Cache wrapper for an employee's current admin.
+
+    Args:
+        employee_id: UUID of the employee
+        loader: callable returning the admin (or None) on cache miss
+
+    Returns:
+        BaseUserModel (admin) or None
+    """
+    key = _current_admin_key(employee_id)
+    cached = cache.get(key)
+    if cached is not None:
+        # False marks "no active assignment" so misses are cached too
+        return cached or None
+    admin = loader()
+    cache.set(key, admin if admin is not None else False, ASSIGNMENT_INDEX_TIMEOUT)
+    return admin
+
+
+def get_employee_active_sites(employee_id):
+    """
+    Cached map of an employee's active site assignments.
+
+    Cold: 1 DB query (index assignment_emp_active_idx). Warm: 1 cache hit.
+
+    Returns:
+        dict: {site_id (str): admin_id (str)}
+    """
+    key = _employee_sites_key(employee_id)
+    sites = cache.get(key)
+    if sites is None:
+        rows = EmployeeAdminSiteAssignment.objects.filter(
+            employee_id=employee_id,
+            is_active=True,
+            site_id__isnull=False
+        ).order_by('start_date').values_list('site_id', 'admin_id')
+        # Later assignments win when the same site appears twice
+        sites = {str(site_id): str(admin_id) for site_id, admin_id in rows}
+        cache.set(key, sites, ASSIGNMENT_INDEX_TIMEOUT)
+    return sites
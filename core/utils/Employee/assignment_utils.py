@@ -12,6 +12,7 @@ from datetime import date
 
 from AuthN.models import BaseUserModel, UserProfile
 from SiteManagement.models import EmployeeAdminSiteAssignment
+from .assignment_resolver import get_site_assignment_index, get_cached_current_admin
 
 
 def get_current_admin_for_employee(employee):
@@ -27,15 +28,18 @@ def get_current_admin_for_employee(employee):
     if not employee or employee.role != 'user':
         return None
     
-    # O(1) query using index assignment_emp_active_idx
-    assignment = EmployeeAdminSiteAssignment.objects.filter(
-        employee=employee,
-        is_active=True
-    ).select_related('admin', 'admin__own_admin_profile').only(
-        'id', 'admin_id', 'admin__id', 'admin__role', 'admin__email'
-    ).order_by('-start_date').first()
-    
-    return assignment.admin if assignment else None
+    def load_admin():
+        # O(1) query using index assignment_emp_active_idx
+        assignment = EmployeeAdminSiteAssignment.objects.filter(
+            employee=employee,
+            is_active=True
+        ).select_related('admin').only(
+            'id', 'admin_id', 'admin__id', 'admin__role', 'admin__email'
+        ).order_by('-start_date').first()
+        return assignment.admin if assignment else None
+    
+    # Cached per employee, invalidated on assignment writes
+    return get_cached_current_admin(employee.id, load_admin)
 
 
 def get_current_assignment_for_employee(employee):
@@ -55,7 +59,7 @@ def get_current_assignment_for_employee(employee):
     return EmployeeAdminSiteAssignment.objects.filter(
         employee=employee,
         is_active=True
-    ).select_related('admin', 'admin__own_admin_profile', 'site').only(
+    ).select_related('admin', 'site').only(
         'id', 'employee_id', 'admin_id', 'site_id', 'start_date', 
         'end_date', 'is_active'
     ).order_by('-start_date').first()
@@ -146,7 +150,7 @@ def get_employee_ids_under_admin(admin_id, active_only=True, site_id=None):
         if site_id:
             # Use common function to get employees assigned to site
             site_employee_ids = get_employees_assigned_to_site(admin_id, site_id, check_date=None, active_only=active_only)
-            employee_ids = employee_ids.filter(id__in=site_employee_ids)
+            employee_ids = employee_ids.filter(employee_id__in=site_employee_ids)
         
         return employee_ids
     except BaseUserModel.DoesNotExist:
@@ -239,8 +243,9 @@ def verify_and_get_employee_profile(employee_id, admin_id, raise_response=True):
 
 def get_employees_assigned_to_site(admin_id, site_id, check_date=None, active_only=True):
     """
-    Get all employee IDs assigned to a site on a specific date (or today) - O(1) query.
+    Get all employee IDs assigned to a site on a specific date (or today).
     This is a common pattern used across multiple APIs.
+    Resolved in memory from the cached site assignment index (0 queries on warm cache).
     
     Args:
         admin_id: UUID string or UUID object of admin
@@ -249,32 +254,19 @@ def get_employees_assigned_to_site(admin_id, site_id, check_date=None, active_on
         active_only: If True, only return employees with active assignments
     
     Returns:
-        QuerySet of employee IDs (UUIDs)
+        list of employee IDs (UUIDs)
     """
     if check_date is None:
         check_date = date.today()
     
-    filter_kwargs = {
-        'site_id': site_id,
-        'admin_id': admin_id,
-        'start_date__lte': check_date
-    }
-    
-    if active_only:
-        filter_kwargs['is_active'] = True
-    
-    # O(1) query using index assignment_site_dates_idx
-    assignments = EmployeeAdminSiteAssignment.objects.filter(**filter_kwargs).filter(
-        Q(end_date__gte=check_date) | Q(end_date__isnull=True)
-    ).only('employee_id')
-    
-    return assignments.values_list('employee_id', flat=True).distinct()
+    return get_site_assignment_index(admin_id, site_id).employees_on(check_date, active_only=active_only)
 
 
 def is_employee_assigned_to_site(employee_id, admin_id, site_id, check_date=None):
     """
-    Check if employee is assigned to site on specific date - O(1) query.
+    Check if employee is assigned to site on specific date.
     Common validation used across multiple APIs.
+    Resolved in memory from the cached site assignment index (0 queries on warm cache).
     
     Args:
         employee_id: UUID string or UUID object of employee
@@ -288,16 +280,44 @@ def is_employee_assigned_to_site(employee_id, admin_id, site_id, check_date=None
     if check_date is None:
         check_date = date.today()
     
-    # O(1) query using index assignment_site_dates_idx
-    return EmployeeAdminSiteAssignment.objects.filter(
-        employee_id=employee_id,
-        site_id=site_id,
-        admin_id=admin_id,
-        is_active=True,
-        start_date__lte=check_date
-    ).filter(
-        Q(end_date__gte=check_date) | Q(end_date__isnull=True)
-    ).only('id').exists()
+    return get_site_assignment_index(admin_id, site_id).is_assigned(employee_id, check_date)
+
+
+def is_employee_assigned_to_site_during(employee_id, admin_id, site_id, start_date, end_date):
+    """
+    Check if employee has an active assignment to site on any day in [start_date, end_date].
+    Resolved in memory from the cached site assignment index (0 queries on warm cache).
+    
+    Args:
+        employee_id: UUID string or UUID object of employee
+        admin_id: UUID string or UUID object of admin
+        site_id: UUID string or UUID object of site
+        start_date: First day of the range (inclusive)
+        end_date: Last day of the range (inclusive)
+    
+    Returns:
+        bool: True if assigned during the range, False otherwise
+    """
+    return get_site_assignment_index(admin_id, site_id).is_assigned_during(
+        employee_id, start_date, end_date
+    )
+
+
+def get_site_daily_assignments(admin_id, site_id, start_date, end_date):
+    """
+    Day-by-day assignment map for a site (e.g. a month of attendance).
+    Resolved in memory from the cached site assignment index (0 queries on warm cache).
+    
+    Args:
+        admin_id: UUID string or UUID object of admin
+        site_id: UUID string or UUID object of site
+        start_date: First day of the range (inclusive)
+        end_date: Last day of the range (inclusive)
+    
+    Returns:
+        dict: {date: set of employee IDs assigned that day}
+    """
+    return get_site_assignment_index(admin_id, site_id).daily_assignments(start_date, end_date)
 
 
 def get_active_assignments_for_employee(employee_id, admin_id=None, site_id=None):
@@ -392,8 +412,8 @@ def get_assignments_by_date_range(admin_id, site_id=None, start_date=None, end_d
 
 def get_employee_ids_for_site_on_date(admin_id, site_id, check_date=None):
     """
-    Get list of employee IDs assigned to a site on a specific date - O(1) query.
-    Optimized version that returns a list instead of QuerySet.
+    Get list of employee IDs assigned to a site on a specific date.
+    Resolved from the cached site assignment index.
     
     Args:
         admin_id: UUID string or UUID object of admin
@@ -403,5 +423,4 @@ def get_employee_ids_for_site_on_date(admin_id, site_id, check_date=None):
     Returns:
         list: List of employee IDs (UUIDs)
     """
-    employee_ids = get_employees_assigned_to_site(admin_id, site_id, check_date, active_only=True)
-    return list(employee_ids)
+    return get_employees_assigned_to_site(admin_id, site_id, check_date, active_only=True)
@@ -0,0 +1,173 @@
+"""
+Bulk Employee Operations
+Set-based activate/deactivate and admin transfer for many employees at once.
+
+Every operation validates the whole id set with one query, writes with a
+single UPDATE / bulk_update / bulk_create, and invalidates caches once -
+bulk writes bypass model signals, so the invalidation the signals would
+have done per row is done here for the affected admins/employees.
+
+Each function returns (succeeded, errors) where errors is a list of
+{"employee_id", "error"} - one entry per id that was not applied.
+"""
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from AuthN.models import BaseUserModel, UserProfile
+from SiteManagement.models import EmployeeAdminSiteAssignment
+from utils.dashboard_stats_service import invalidate_dashboard_stats
+from .assignment_resolver import invalidate_assignment_cache
+
+
+BULK_WRITE_BATCH_SIZE = 1000
+
+EMPLOYEE_NOT_FOUND = "Employee not found"
+EMPLOYEE_NOT_UNDER_ADMIN = "Employee is not under this admin"
+EMPLOYEE_NOT_IN_ORGANIZATION = "Employee does not belong to this organization"
+
+
+def _unique_ids(employee_ids):
+    """Request order preserved, duplicates dropped"""
+    return list(dict.fromkeys(str(emp_id) for emp_id in employee_ids))
+
+
+def partition_employees_under_admin(admin_id, employee_ids):
+    """
+    Split ids into employees actively assigned under the admin and errors - one query.
+
+    Returns:
+        tuple: (list of employee id strings, list of error dicts)
+    """
+    employee_ids = _unique_ids(employee_ids)
+    under_admin = EmployeeAdminSiteAssignment.objects.filter(
+        employee_id=OuterRef('pk'), admin_id=admin_id, is_active=True
+    )
+    found = dict(
+        BaseUserModel.objects.filter(id__in=employee_ids, role='user')
+        .annotate(under_admin=Exists(under_admin))
+        .values_list('id', 'under_admin')
+    )
+    found = {str(emp_id): is_member for emp_id, is_member in found.items()}
+
+    members = []
+    errors = []
+    for emp_id in employee_ids:
+        if emp_id not in found:
+            errors.append({"employee_id": emp_id, "error": EMPLOYEE_NOT_FOUND})
+        elif not found[emp_id]:
+            errors.append({"employee_id": emp_id, "error": EMPLOYEE_NOT_UNDER_ADMIN})
+        else:
+            members.append(emp_id)
+    return members, errors
+
+
+def bulk_set_employees_active(admin_id, employee_ids, is_active):
+    """
+    Activate / deactivate the admin's employees with one UPDATE.
+
+    Args:
+        admin_id: admin the employees must be actively assigned to
+        employee_ids: employee UUIDs
+        is_active: new BaseUserModel.is_active
+
+    Returns:
+        tuple: (list of updated employee ids, list of error dicts)
+    """
+    members, errors = partition_employees_under_admin(admin_id, employee_ids)
+    if not members:
+        return members, errors
+
+    with transaction.atomic():
+        BaseUserModel.objects.filter(id__in=members).update(is_active=is_active)
+        # Attendance dashboards count active employees per organization
+        organization_ids = UserProfile.objects.filter(user_id__in=members).values_list(
+            'organization_id', flat=True
+        ).distinct()
+        invalidate_dashboard_stats('attendance', list(organization_ids))
+
+    return members, errors
+
+
+def _closing_date(assignment, today):
+    """End date for an assignment closed today (never before its start or an earlier end)"""
+    if assignment.end_date and assignment.end_date < today:
+        return assignment.end_date
+    return max(today, assignment.start_date)
+
+
+def bulk_transfer_employees(organization_id, new_admin_id, employee_ids, assigned_by=None):
+    """
+    Move employees of an organization under another admin.
+
+    Closes every active assignment of the employees (bulk_update) and opens
+    one site-less assignment under the new admin per employee (bulk_create).
+
+    Returns:
+        tuple: (list of {"employee_id", "employee_name", "old_admin_id",
+                "new_admin_id"}, list of error dicts)
+    """
+    employee_ids = _unique_ids(employee_ids)
+    profiles = {
+        str(user_id): user_name
+        for user_id, user_name in UserProfile.objects.filter(
+            user_id__in=employee_ids, organization_id=organization_id, user__role='user'
+        ).values_list('user_id', 'user_name')
+    }
+    errors = [
+        {"employee_id": emp_id, "error": EMPLOYEE_NOT_IN_ORGANIZATION}
+        for emp_id in employee_ids if emp_id not in profiles
+    ]
+    valid_ids = [emp_id for emp_id in employee_ids if emp_id in profiles]
+    if not valid_ids:
+        return [], errors
+
+    today = timezone.now().date()
+    now = timezone.now()
+    with transaction.atomic():
+        current = list(
+            EmployeeAdminSiteAssignment.objects.select_for_update()
+            .filter(employee_id__in=valid_ids, is_active=True)
+            .order_by('employee_id', '-start_date')
+            .only('id', 'employee_id', 'admin_id', 'start_date', 'end_date')
+        )
+        old_admins = {}
+        for assignment in current:
+            # Latest active assignment is the employee's current admin
+            old_admins.setdefault(str(assignment.employee_id), str(assignment.admin_id))
+            assignment.end_date = _closing_date(assignment, today)
+            assignment.is_active = False
+            assignment.assignment_reason = 'Transferred to another admin'
+            assignment.updated_at = now
+        EmployeeAdminSiteAssignment.objects.bulk_update(
+            current, ['end_date', 'is_active', 'assignment_reason', 'updated_at'],
+            batch_size=BULK_WRITE_BATCH_SIZE
+        )
+
+        EmployeeAdminSiteAssignment.objects.bulk_create([
+            EmployeeAdminSiteAssignment(
+                employee_id=emp_id,
+                admin_id=new_admin_id,
+                site=None,  # Site can be assigned later
+                start_date=today,
+                end_date=None,
+                is_active=True,
+                assigned_by=assigned_by,
+                assignment_reason=f'Transferred from admin {old_admins.get(emp_id)}'
+            )
+            for emp_id in valid_ids
+        ], batch_size=BULK_WRITE_BATCH_SIZE)
+
+        admin_ids = {str(new_admin_id), *old_admins.values()}
+        transaction.on_commit(lambda: invalidate_assignment_cache(admin_ids=admin_ids, employee_ids=valid_ids))
+
+    transferred = [
+        {
+            "employee_id": emp_id,
+            "employee_name": profiles[emp_id],
+            "old_admin_id": old_admins.get(emp_id),
+            "new_admin_id": str(new_admin_id)
+        }
+        for emp_id in valid_ids
+    ]
+    return transferred, errors
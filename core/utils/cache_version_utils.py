@@ -0,0 +1,42 @@
+"""
+Cache Version Utilities
+Version counters for namespaced cache invalidation.
+
+A cached entry embeds the current version of its namespace in its key; a
+write bumps the version, so stale entries are simply never read again and
+expire on their own TTL.
+
+A missing counter (never read, evicted, or cache restarted) is seeded from
+the clock rather than 1/2: entries cached under earlier versions may still be
+alive, and a counter restarting at a small number could make them readable
+again. Clock seeds (microseconds) stay ahead of any count reached by
+increments in between.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _seed():
+    return time.time_ns() // 1000
+
+
+def get_version(key, timeout=None):
+    """Current version stored under key, seeding it when missing - O(1) cache hit"""
+    version = cache.get(key)
+    if version is None:
+        version = _seed()
+        if not cache.add(key, version, timeout):
+            version = cache.get(key, version)  # Lost the race - use the winner's seed
+    return version
+
+
+def bump_version(key, timeout=None):
+    """Move key to a new version, making entries cached under the old one unreachable"""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Key missing (never read or evicted) - start a fresh version space
+        version = _seed()
+        cache.set(key, version, timeout)
+        return version
@@ -0,0 +1,169 @@
+"""
+Dashboard Stats Service
+Cached, single-aggregate statistics for the dashboard endpoints (tasks,
+visits, contacts, attendance).
+
+Every dashboard is ONE conditional aggregate (COUNT ... FILTER (WHERE ...))
+over an already tenant/site scoped queryset instead of one COUNT per status.
+Results are cached per (dashboard, tenant, site, scope, day):
+- short TTL (DASHBOARD_STATS_CACHE_TIMEOUT) bounds staleness for writes that
+  bypass signals (queryset.update(), bulk_create)
+- event invalidation: model signals call invalidate_dashboard_stats() on
+  commit, which bumps the tenant's version so cached entries are never read again
+
+Usage:
+    stats = get_dashboard_stats('tasks', tasks_queryset, tenant_id=admin.id, site_id=site_id)
+"""
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Q, Sum
+
+from utils.cache_version_utils import bump_version, get_version
+
+
+STATS_VERSION_TIMEOUT = None  # Version counters never expire
+
+
+# ==================== AGGREGATES ====================
+
+def _rate(part, total):
+    return round((part / total * 100) if total > 0 else 0, 2)
+
+
+def task_stats(tasks, today):
+    stats = tasks.aggregate(
+        total_tasks=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        completed=Count('id', filter=Q(status='completed')),
+        overdue=Count('id', filter=Q(due_date__lt=today, status__in=['pending', 'in_progress'])),
+    )
+    stats['completion_rate'] = _rate(stats['completed'], stats['total_tasks'])
+    return stats
+
+
+def visit_stats(visits, today):
+    return visits.aggregate(
+        total_visits=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        in_progress=Count('id', filter=Q(status='in_progress')),
+        completed=Count('id', filter=Q(status='completed')),
+        cancelled=Count('id', filter=Q(status='cancelled')),
+    )
+
+
+def contact_stats(contacts, today):
+    # COUNT(DISTINCT col) ignores NULLs, so only empty strings need filtering
+    return contacts.aggregate(
+        total_contacts=Count('id'),
+        scanned_contacts=Count('id', filter=Q(source_type='scanned')),
+        manual_contacts=Count('id', filter=Q(source_type='manual')),
+        contacts_with_email=Count('id', filter=~Q(email_address__isnull=True) & ~Q(email_address='')),
+        contacts_with_phone=Count('id', filter=~Q(mobile_number__isnull=True) & ~Q(mobile_number='')),
+        contacts_with_company=Count('id', filter=~Q(company_name__isnull=True) & ~Q(company_name='')),
+        unique_companies=Count('company_name', distinct=True, filter=~Q(company_name='')),
+        unique_states=Count('state', distinct=True, filter=~Q(state='')),
+        unique_cities=Count('city', distinct=True, filter=~Q(city='')),
+    )
+
+
+def attendance_stats(attendance, today, employees=None):
+    """
+    Args:
+        attendance: Attendance queryset for the tenant (any date range -
+            narrowed to the current month here)
+        employees: active employees queryset - today's absentees are
+            employees without a check-in (one extra COUNT)
+    """
+    month_start = date(today.year, today.month, 1)
+    totals = attendance.filter(attendance_date__gte=month_start, attendance_date__lte=today).aggregate(
+        present=Count('id', filter=Q(attendance_date=today, check_in_time__isnull=False)),
+        total_minutes=Sum('total_working_minutes'),
+        average_minutes=Avg('total_working_minutes'),
+        total_records=Count('id'),
+    )
+    present = totals['present']
+    absent = (employees.count() if employees is not None else 0) - present
+    return {
+        "today": {
+            "present": present,
+            "absent": absent,
+            "attendance_rate": _rate(present, present + absent),
+        },
+        "this_month": {
+            "total_working_hours": round((totals['total_minutes'] or 0) / 60, 2),
+            "average_working_hours": round((totals['average_minutes'] or 0) / 60, 2),
+            "total_records": totals['total_records'],
+        },
+    }
+
+
+DASHBOARDS = {
+    'tasks': task_stats,
+    'visits': visit_stats,
+    'contacts': contact_stats,
+    'attendance': attendance_stats,
+}
+
+
+# ==================== CACHE ====================
+
+def _version_key(dashboard, tenant_id):
+    return f"dashboard_stats_version_{dashboard}_{tenant_id}"
+
+
+def _stats_key(dashboard, tenant_id, site_id, scope, day, version):
+    return f"dashboard_stats_{dashboard}_{tenant_id}_{site_id or 'all'}_{scope or 'all'}_{day.isoformat()}_v{version}"
+
+
+def get_stats_version(dashboard, tenant_id):
+    """Current cache version for a tenant's dashboard - O(1) cache hit"""
+    return get_version(_version_key(dashboard, tenant_id), STATS_VERSION_TIMEOUT)
+
+
+def get_dashboard_stats(dashboard, queryset, tenant_id, site_id=None, scope=None, **params):
+    """
+    Dashboard statistics for a scoped queryset, cached.
+
+    Args:
+        dashboard: 'tasks' / 'visits' / 'contacts' / 'attendance'
+        queryset: rows the dashboard covers (already filtered by tenant/site/role)
+        tenant_id: admin (organization for attendance) - invalidation unit
+        site_id: Optional site the queryset is filtered to
+        scope: Optional extra cache discriminator (e.g. employee id for "my stats")
+        **params: extra arguments for the aggregate (e.g. employees)
+
+    Returns:
+        dict: statistics (same keys the endpoint always returned)
+    """
+    today = date.today()
+    timeout = getattr(settings, 'DASHBOARD_STATS_CACHE_TIMEOUT', 60)
+    if not timeout:
+        return DASHBOARDS[dashboard](queryset, today, **params)
+
+    key = _stats_key(dashboard, tenant_id, site_id, scope, today, get_stats_version(dashboard, tenant_id))
+    stats = cache.get(key)
+    if stats is None:
+        stats = DASHBOARDS[dashboard](queryset, today, **params)
+        cache.set(key, stats, timeout)
+    return stats
+
+
+def invalidate_dashboard_stats(dashboard, tenant_ids):
+    """
+    Make cached stats of the given tenants unreachable.
+
+    Deferred to transaction commit so readers never cache pre-commit counts.
+    """
+    tenant_ids = {str(t) for t in tenant_ids if t}
+    if not tenant_ids:
+        return
+
+    def bump():
+        for tenant_id in tenant_ids:
+            bump_version(_version_key(dashboard, tenant_id), STATS_VERSION_TIMEOUT)
+
+    transaction.on_commit(bump)
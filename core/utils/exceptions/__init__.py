@@ -3,3 +3,39 @@ Exceptions Package
 Custom exception classes
 """
 
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class TenantAccessError(APIException):
+    """
+    Raised when tenant (admin/organization/site) resolution fails inside a
+    permission class. Renders in the standard {"status", "message", "data"}
+    response shape used across the API.
+    """
+    status_code = status.HTTP_403_FORBIDDEN
+    default_detail = "Unauthorized access"
+    default_code = 'tenant_access_denied'
+
+    def __init__(self, message=None, status_code=None):
+        if status_code is not None:
+            self.status_code = status_code
+        super().__init__(detail=message or self.default_detail)
+        # Keep native types in the payload (APIException would coerce them to strings)
+        self.detail = {
+            "status": self.status_code,
+            "message": str(message or self.default_detail),
+            "data": None
+        }
+
+
+class QueryBudgetExceeded(Exception):
+    """
+    Raised by QueryBudgetMiddleware when QUERY_BUDGET_RAISE is on (tests/CI)
+    and a request exceeds its query budget or repeats a query shape (N+1).
+    """
+
+    def __init__(self, message, report=None):
+        super().__init__(message)
+        self.report = report or {}
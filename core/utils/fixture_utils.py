@@ -0,0 +1,256 @@
+"""
+Test Fixture Utilities
+======================
+
+Builds tenants (organization -> admin -> site), employees and the rows of
+every tenant-scoped list for the apps' tests with bulk_create, so fixtures of
+1,000+ employees stay fast. bulk_create skips post_save, so signal-maintained
+data (search documents, live status counters) is not written.
+
+Passwords are unusable (no hashing) - tests authenticate with
+APIClient.force_authenticate().
+
+Usage:
+    tenant = create_tenant()
+    employees = create_employees(tenant, 200)  # + shift, week off and location links
+    create_tenant_rows(tenant, 200)  # employees + 200 rows of every list
+"""
+
+import itertools
+import uuid
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from AssetManagement.models import Asset, AssetCategory
+from AuthN.models import (
+    AdminProfile, BaseUserModel, OrganizationProfile, OrganizationSettings, UserProfile,
+)
+from ContactManagement.models import Contact
+from Expenditure.models import Expense, ExpenseCategory, ExpenseProject
+from Holiday.models import Holiday
+from InvoiceManagement.invoice_analytics_service import sync_line_items
+from InvoiceManagement.models import Invoice
+from LeaveControl.models import EmployeeLeaveBalance, LeaveApplication, LeaveType
+from LocationControl.models import Location
+from PayrollSystem.models import (
+    EmployeeAdvance, EmployeeBankInfo, EmployeePayrollConfig, GeneratedPayrollRecord, PayslipGenerator,
+    SalaryStructure,
+)
+from ServiceShift.models import ServiceShift
+from ServiceWeekOff.models import WeekOffPolicy
+from SiteManagement.models import EmployeeAdminSiteAssignment, Site
+from TaskControl.models import Task, TaskComment, TaskType
+from VisitControl.models import Visit
+from WorkLog.models import Attendance
+
+_phone_numbers = itertools.count(7000000000)
+
+
+def build_user(role, tag):
+    """Unsaved BaseUserModel with unique email / username / phone"""
+    return BaseUserModel(
+        email=f'{tag}@example.com', username=tag, role=role,
+        phone_number=next(_phone_numbers), password=make_password(None),
+    )
+
+
+def create_tenant(tag=None):
+    """
+    System owner, organization (+ settings), admin and one site.
+
+    Returns:
+        dict: system_owner, organization, admin, site, shift, week_off, location
+    """
+    tag = tag or uuid.uuid4().hex[:8]
+    system_owner, organization, admin = BaseUserModel.objects.bulk_create([
+        build_user('system_owner', f'so-{tag}'),
+        build_user('organization', f'org-{tag}'),
+        build_user('admin', f'admin-{tag}'),
+    ])
+    OrganizationProfile.objects.create(
+        user=organization, organization_name=f'Org {tag}', system_owner=system_owner, state='Karnataka', city='Bengaluru',
+    )
+    OrganizationSettings.objects.create(organization=organization)
+    AdminProfile.objects.create(
+        user=admin, admin_name=f'Admin {tag}', organization=organization, state='Karnataka', city='Bengaluru',
+    )
+    site = Site.objects.create(
+        organization=organization, created_by_admin=admin, site_name=f'Site {tag}',
+        address='1 MG Road', city='Bengaluru', state='Karnataka',
+    )
+    return {
+        'system_owner': system_owner,
+        'organization': organization,
+        'admin': admin,
+        'site': site,
+        'shift': ServiceShift.objects.create(admin=admin, site=site, shift_name='General'),
+        'week_off': WeekOffPolicy.objects.create(admin=admin, site=site),
+        'location': Location.objects.create(
+            admin=admin, site=site, organization=organization, name='Office',
+            latitude=Decimal('12.971599'), longitude=Decimal('77.594566'),
+        ),
+    }
+
+
+def create_employees(tenant, count, tag=None, with_policies=True):
+    """
+    `count` employees of the tenant's admin, assigned to its site.
+
+    Args:
+        with_policies: link each employee to the tenant's shift, week off and location
+
+    Returns:
+        list of BaseUserModel (role 'user')
+    """
+    tag = tag or uuid.uuid4().hex[:8]
+    admin, site = tenant['admin'], tenant['site']
+    users = BaseUserModel.objects.bulk_create([build_user('user', f'emp{n}-{tag}') for n in range(count)])
+    profiles = UserProfile.objects.bulk_create([
+        UserProfile(
+            user=user, user_name=f'Employee {n}', organization=tenant['organization'], admin=admin,
+            gender='Female' if n % 2 else 'Male', date_of_joining=date(2024, 1, 1),
+            custom_employee_id=f'EMP{n}-{tag}', state='Karnataka', city='Bengaluru',
+        )
+        for n, user in enumerate(users)
+    ])
+    EmployeeAdminSiteAssignment.objects.bulk_create([
+        EmployeeAdminSiteAssignment(employee=user, admin=admin, site=site, start_date=date(2024, 1, 1), assigned_by=admin)
+        for user in users
+    ])
+    if with_policies:
+        for name, related in (('shifts', tenant['shift']), ('week_offs', tenant['week_off']), ('locations', tenant['location'])):
+            field = UserProfile._meta.get_field(name)
+            through = field.remote_field.through
+            through.objects.bulk_create([
+                through(**{field.m2m_field_name(): profile, field.m2m_reverse_field_name(): related})
+                for profile in profiles
+            ])
+    return users
+
+
+def create_tenant_rows(tenant, count):
+    """
+    `count` employees plus `count` rows of every tenant-scoped list - shifts,
+    week offs, locations, holidays, attendance, expenses, tasks, leave, payroll,
+    visits, assets, contacts and invoices - for the tenant's admin and site.
+
+    Returns:
+        list of BaseUserModel: the employees
+    """
+    admin, site, organization = tenant['admin'], tenant['site'], tenant['organization']
+    owned = {'admin': admin, 'site': site}
+    employees = create_employees(tenant, count)
+    today = timezone.localdate()
+    numbers = range(count)
+
+    ServiceShift.objects.bulk_create([ServiceShift(**owned, shift_name=f'Shift {n}') for n in range(1, count)])
+    WeekOffPolicy.objects.bulk_create([WeekOffPolicy(**owned, name=f'Week off {n}') for n in range(1, count)])
+    Location.objects.bulk_create([
+        Location(**owned, organization=organization, name=f'Location {n}', address='MG Road',
+                 latitude=Decimal('12.97') + Decimal(n) / 1000, longitude=Decimal('77.59'))
+        for n in range(1, count)
+    ])
+    Holiday.objects.bulk_create([
+        Holiday(**owned, organization=organization, name=f'Holiday {n}', holiday_date=today + timedelta(days=n))
+        for n in numbers
+    ])
+    check_in = timezone.make_aware(datetime.combine(today, time(9, 0)))
+    Attendance.objects.bulk_create([
+        Attendance(user=employee, assign_shift=tenant['shift'], attendance_date=today, check_in_time=check_in,
+                   attendance_status='present', marked_by='employee')
+        for employee in employees
+    ])
+
+    expense_categories = ExpenseCategory.objects.bulk_create([
+        ExpenseCategory(**owned, name=f'Category {n}', code=f'CAT{n}') for n in numbers
+    ])
+    expense_projects = ExpenseProject.objects.bulk_create([
+        ExpenseProject(**owned, name=f'Project {n}', code=f'PRJ{n}') for n in numbers
+    ])
+    Expense.objects.bulk_create([
+        Expense(**owned, employee=employee, category=category, project=project, title=f'Expense {n}',
+                expense_date=today, amount=Decimal('100.00'), created_by=admin)
+        for n, (employee, category, project) in enumerate(zip(employees, expense_categories, expense_projects))
+    ])
+
+    task_types = TaskType.objects.bulk_create([TaskType(**owned, name=f'Type {n}') for n in numbers])
+    tasks = Task.objects.bulk_create([
+        Task(**owned, task_type=task_type, title=f'Task {n}', assigned_to=employee, assigned_by=admin,
+             start_date=today, due_date=today)
+        for n, (employee, task_type) in enumerate(zip(employees, task_types))
+    ])
+    TaskComment.objects.bulk_create([
+        TaskComment(**owned, task=tasks[0], comment=f'Comment {n}') for n in numbers
+    ])
+
+    leave_types = LeaveType.objects.bulk_create([
+        LeaveType(**owned, name=f'Leave {n}', code=f'L{n}') for n in numbers
+    ])
+    EmployeeLeaveBalance.objects.bulk_create([
+        EmployeeLeaveBalance(user=employee, leave_type=leave_types[0], year=today.year, assigned=12)
+        for employee in employees
+    ])
+    LeaveApplication.objects.bulk_create([
+        LeaveApplication(**owned, organization=organization, user=employee, leave_type=leave_types[0],
+                         from_date=today, to_date=today, total_days=1, leave_day_type='full_day', reason='Personal')
+        for employee in employees
+    ])
+
+    structure = SalaryStructure.objects.create(organization=organization, name='Standard')
+    configs = EmployeePayrollConfig.objects.bulk_create([
+        EmployeePayrollConfig(**owned, employee=employee, salary_structure=structure, gross_salary=Decimal('30000'),
+                              effective_month=1, effective_year=today.year)
+        for employee in employees
+    ])
+    EmployeeBankInfo.objects.bulk_create([
+        EmployeeBankInfo(employee=employee, pan_card_number=f'P{employee.phone_number}',
+                         aadhar_card_number=f'{employee.phone_number}00',
+                         bank_name='Bank', account_number=f'{n:012d}', account_holder_name=f'Employee {n}',
+                         ifsc_code='BANK0000001', bank_address='MG Road', city='Bengaluru', state='Karnataka',
+                         pincode='560001')
+        for n, employee in enumerate(employees)
+    ])
+    EmployeeAdvance.objects.bulk_create([
+        EmployeeAdvance(**owned, employee=employee, advance_amount=Decimal('1000'), request_date=today,
+                        remaining_amount=Decimal('1000'))
+        for employee in employees
+    ])
+    GeneratedPayrollRecord.objects.bulk_create([
+        GeneratedPayrollRecord(**owned, employee=employee, month=today.month, year=today.year, payroll_config=config)
+        for employee, config in zip(employees, configs)
+    ])
+    PayslipGenerator.objects.bulk_create([
+        PayslipGenerator(**owned, employee=employee, month=today.month, year=today.year, pay_date=today,
+                         employee_name=f'Employee {n}', payslip_number=f'PS-{uuid.uuid4().hex[:12]}')
+        for n, employee in enumerate(employees)
+    ])
+
+    Visit.objects.bulk_create([
+        Visit(**owned, assigned_employee=employee, title=f'Visit {n}', schedule_date=today, address='MG Road',
+              created_by=admin)
+        for n, employee in enumerate(employees)
+    ])
+    asset_categories = AssetCategory.objects.bulk_create([
+        AssetCategory(**owned, name=f'Asset category {n}', code=f'AC{n}') for n in numbers
+    ])
+    Asset.objects.bulk_create([
+        Asset(**owned, category=category, asset_code=f'AST{n}', name=f'Asset {n}', purchase_date=today,
+              purchase_price=Decimal('50000'), current_value=Decimal('50000'))
+        for n, category in enumerate(asset_categories)
+    ])
+    Contact.objects.bulk_create([
+        Contact(**owned, user=employee, full_name=f'Contact {n}', company_name='Acme', created_by=admin)
+        for n, employee in enumerate(employees)
+    ])
+    invoices = Invoice.objects.bulk_create([
+        Invoice(**owned, invoice_number=f'INV-{uuid.uuid4().hex[:10]}', invoice_date=today, due_date=today,
+                status='sent', business_name='Business', client_name=f'Client {n}', client_state='Karnataka',
+                items=[{'description': 'Service', 'hsn_sac': '998314', 'quantity': 1, 'rate': 1000,
+                        'sgst_percent': 9, 'cgst_percent': 9}])
+        for n in numbers
+    ])
+    sync_line_items([invoice.pk for invoice in invoices])
+    return employees
@@ -0,0 +1,227 @@
+"""
+Geofence Service
+Validates punch coordinates (attendance check-in/out, visit check-in) against
+the employee's assigned LocationControl locations.
+
+An employee's fences are compiled once into a GeofenceSet - parallel tuples
+of lat/lon/radius plus a precomputed bounding box per fence - and cached, so a
+warm validation is one cache get and a few float comparisons:
+- bounding-box prefilter rejects fences that cannot contain the point without
+  any trigonometry
+- haversine distance only for the fences whose box contains the point
+
+Enforcement: geofencing applies when the organization has
+OrganizationSettings.geofencing_enabled, the employee has
+UserProfile.allow_geo_fencing, and the employee has at least one active
+assigned location. Radius precedence per fence: UserProfile.radius (employee
+override) > Location.radius > OrganizationSettings.geofence_radius_in_meters.
+
+Cache invalidation: UserProfile saves / location assignment changes drop the
+employee's entry; Location and OrganizationSettings writes bump the
+organization's version (signals in AuthN and LocationControl, run on commit).
+
+load_geofences() builds fences for many employees in two queries - used by
+the batch audit that re-validates a month of historical punches.
+"""
+import math
+from collections import namedtuple
+
+from django.core.cache import cache
+
+from AuthN.models import UserProfile
+from utils.cache_version_utils import bump_version, get_version
+
+
+EARTH_RADIUS_M = 6371008.8
+METERS_PER_DEGREE_LAT = 111320.0
+DEFAULT_RADIUS_M = 100
+GEOFENCE_CACHE_TIMEOUT = 60 * 60  # 1 hour - versioning makes stale entries unreachable
+GEOFENCE_VERSION_TIMEOUT = None  # Version counters never expire
+
+GeofenceResult = namedtuple('GeofenceResult', ['inside', 'location_id', 'distance_m'])
+
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in meters between two points given in degrees"""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GeofenceSet:
+    """
+    Compiled circular fences of one employee.
+
+    Stored as parallel tuples (location ids, centers, radii, bounding boxes)
+    so the structure is compact, picklable and scanned without attribute lookups.
+    """
+
+    def __init__(self, fences):
+        """
+        Args:
+            fences: iterable of (location_id, latitude, longitude, radius_m)
+        """
+        fences = [(loc_id, float(lat), float(lon), float(radius)) for loc_id, lat, lon, radius in fences]
+        self.location_ids = tuple(fence[0] for fence in fences)
+        self.lats = tuple(fence[1] for fence in fences)
+        self.lons = tuple(fence[2] for fence in fences)
+        self.radii = tuple(fence[3] for fence in fences)
+
+        boxes = []
+        for _, lat, lon, radius in fences:
+            d_lat = radius / METERS_PER_DEGREE_LAT
+            cos_lat = math.cos(math.radians(lat))
+            # Near the poles a box in longitude degrees is meaningless - span everything
+            d_lon = radius / (METERS_PER_DEGREE_LAT * cos_lat) if cos_lat > 1e-6 else 360.0
+            boxes.append((lat - d_lat, lat + d_lat, lon - d_lon, lon + d_lon))
+        self.boxes = tuple(boxes)
+
+    def __len__(self):
+        return len(self.location_ids)
+
+    def check(self, latitude, longitude):
+        """
+        Locate a point.
+
+        Returns:
+            GeofenceResult: inside, matching (or nearest) location id, distance
+            in meters to that location's center - None values when there are no fences
+        """
+        lat = float(latitude)
+        lon = float(longitude)
+        for i, (min_lat, max_lat, min_lon, max_lon) in enumerate(self.boxes):
+            if lat < min_lat or lat > max_lat or lon < min_lon or lon > max_lon:
+                continue
+            distance = haversine_m(lat, lon, self.lats[i], self.lons[i])
+            if distance <= self.radii[i]:
+                return GeofenceResult(True, self.location_ids[i], round(distance, 1))
+
+        # Outside every fence - report the nearest one (full scan, rare path)
+        nearest = None
+        for i in range(len(self.location_ids)):
+            distance = haversine_m(lat, lon, self.lats[i], self.lons[i])
+            if nearest is None or distance < nearest[1]:
+                nearest = (self.location_ids[i], distance)
+        if nearest is None:
+            return GeofenceResult(False, None, None)
+        return GeofenceResult(False, nearest[0], round(nearest[1], 1))
+
+
+EmployeeGeofence = namedtuple('EmployeeGeofence', ['enforced', 'fences'])
+
+
+# ==================== LOADING ====================
+
+def load_geofences(user_ids):
+    """
+    Build geofences for many employees - two queries regardless of count.
+
+    Returns:
+        dict: {user_id (str): EmployeeGeofence}
+    """
+    profiles = UserProfile.objects.filter(user_id__in=user_ids).values_list(
+        'id', 'user_id', 'allow_geo_fencing', 'radius',
+        'organization__own_organization_profile_setting__geofencing_enabled',
+        'organization__own_organization_profile_setting__geofence_radius_in_meters',
+    )
+    profile_info = {}
+    for profile_id, user_id, allow, radius, org_enabled, org_radius in profiles:
+        profile_info[profile_id] = (str(user_id), bool(allow and org_enabled), radius, org_radius)
+
+    fences = {profile_id: [] for profile_id in profile_info}
+    assigned = UserProfile.locations.through.objects.filter(
+        userprofile_id__in=list(profile_info), location__is_active=True
+    ).values_list('userprofile_id', 'location_id', 'location__latitude', 'location__longitude', 'location__radius')
+    for profile_id, location_id, lat, lon, location_radius in assigned:
+        _, _, radius, org_radius = profile_info[profile_id]
+        fences[profile_id].append(
+            (location_id, lat, lon, radius or location_radius or org_radius or DEFAULT_RADIUS_M)
+        )
+
+    geofences = {}
+    for profile_id, (user_id, enabled, _, _) in profile_info.items():
+        fence_set = GeofenceSet(fences[profile_id])
+        geofences[user_id] = EmployeeGeofence(enabled and len(fence_set) > 0, fence_set)
+    return geofences
+
+
+# ==================== CACHE / VERSIONING ====================
+
+def _version_key(organization_id):
+    return f"geofence_version_{organization_id}"
+
+
+def _employee_key(user_id):
+    return f"geofence_employee_{user_id}"
+
+
+def get_geofence_version(organization_id):
+    """Current geofence cache version for an organization - O(1) cache hit"""
+    return get_version(_version_key(organization_id), GEOFENCE_VERSION_TIMEOUT)
+
+
+def invalidate_geofences(organization_ids=(), user_ids=()):
+    """
+    Make cached geofences stale.
+
+    Args:
+        organization_ids: organizations whose locations/settings changed (all employees)
+        user_ids: employees whose profile or location assignment changed
+    """
+    for organization_id in {str(o) for o in organization_ids if o}:
+        bump_version(_version_key(organization_id), GEOFENCE_VERSION_TIMEOUT)
+
+    employee_keys = [_employee_key(user_id) for user_id in {str(u) for u in user_ids if u}]
+    if employee_keys:
+        cache.delete_many(employee_keys)
+
+
+def get_employee_geofence(user_id, organization_id):
+    """
+    Cached geofence of one employee.
+
+    Cold: 2 queries. Warm: 2 cache gets (entry + organization version).
+
+    Returns:
+        EmployeeGeofence
+    """
+    version = get_geofence_version(organization_id)
+    entry = cache.get(_employee_key(user_id))
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    geofence = load_geofences([user_id]).get(str(user_id), EmployeeGeofence(False, GeofenceSet(())))
+    cache.set(_employee_key(user_id), (version, geofence), GEOFENCE_CACHE_TIMEOUT)
+    return geofence
+
+
+# ==================== VALIDATION ====================
+
+def validate_punch(user_id, organization_id, latitude, longitude):
+    """
+    Check punch coordinates against the employee's geofence.
+
+    Returns:
+        tuple: (allowed, GeofenceResult or None, error message or None)
+    """
+    geofence = get_employee_geofence(user_id, organization_id)
+    if not geofence.enforced:
+        return True, None, None
+
+    if latitude in (None, '') or longitude in (None, ''):
+        return False, None, "Location coordinates are required - geofencing is enabled for this employee."
+
+    try:
+        result = geofence.fences.check(latitude, longitude)
+    except (TypeError, ValueError):
+        return False, None, "Invalid location coordinates."
+
+    if not result.inside:
+        return False, result, (
+            f"You are outside your assigned location(s) - "
+            f"{result.distance_m:.0f} m from the nearest location."
+        )
+    return True, result, None
@@ -0,0 +1,91 @@
+"""
+Geohash helpers
+Pure functions (no Django imports) so models can use them in save().
+
+A geohash interleaves longitude/latitude bits into a base32 string; points
+sharing a prefix lie in the same grid cell, so a B-tree prefix scan
+(LIKE 'abc%') is a spatial bucket lookup.
+"""
+import math
+
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+METERS_PER_DEGREE = 111320.0
+STORED_PRECISION = 9  # ~4.8 m x 4.8 m cells
+
+
+def encode(latitude, longitude, precision=STORED_PRECISION):
+    """Geohash of a point (degrees) at the given precision"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    lat = float(latitude)
+    lon = float(longitude)
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # Geohash starts with a longitude bit
+    while len(chars) < precision:
+        value_range, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (value_range[0] + value_range[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            value_range[0] = mid
+        else:
+            value_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size_degrees(precision):
+    """(lat height, lon width) of a cell in degrees"""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def covering_cells(latitude, longitude, precision):
+    """
+    The point's cell and its 8 neighbours - every point within
+    guaranteed_radius_m() of the point lies in one of them.
+
+    Returns:
+        set of geohash prefixes
+    """
+    lat = float(latitude)
+    lon = float(longitude)
+    lat_step, lon_step = cell_size_degrees(precision)
+    cells = set()
+    for d_lat in (-lat_step, 0.0, lat_step):
+        neighbour_lat = lat + d_lat
+        if neighbour_lat > 90.0 or neighbour_lat < -90.0:
+            continue
+        for d_lon in (-lon_step, 0.0, lon_step):
+            # Wrap across the antimeridian
+            neighbour_lon = (lon + d_lon + 180.0) % 360.0 - 180.0
+            cells.add(encode(neighbour_lat, neighbour_lon, precision))
+    return cells
+
+
+def guaranteed_radius_m(latitude, precision):
+    """
+    Distance (m) from the point within which every location is inside
+    covering_cells() - one full cell on each side.
+    """
+    lat_step, lon_step = cell_size_degrees(precision)
+    cos_lat = max(math.cos(math.radians(abs(float(latitude)) + lat_step)), 0.0)
+    return min(lat_step * METERS_PER_DEGREE, lon_step * METERS_PER_DEGREE * cos_lat)
+
+
+def precision_for_radius(latitude, radius_m, max_precision=STORED_PRECISION):
+    """Finest precision whose covering cells contain everything within radius_m"""
+    for precision in range(max_precision, 0, -1):
+        if guaranteed_radius_m(latitude, precision) >= radius_m:
+            return precision
+    return 1
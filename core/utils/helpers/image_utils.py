@@ -1,15 +1,20 @@
 """
 Image utility functions for handling base64 images
+Images are saved to the content-addressed media store (media_store.py):
+identical uploads share one file and get a list-view thumbnail once.
 """
 import base64
 import os
-import uuid
 from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils import timezone
 from datetime import datetime
 from io import BytesIO
 
+from . import media_store
+
 try:
-    from PIL import Image
+    from PIL import Image, ImageOps
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
@@ -20,143 +25,158 @@ def save_base64_image(base64_string, folder_name='attendance_images', attendance
     """
     Convert base64 string to image file and save it.
     
+    The image is stored by content hash (blobs/ab/cd/<sha256>.<ext>): saving
+    the same image again returns the existing file instead of writing a new one.
+    
     Args:
         base64_string: Base64 encoded image string (with or without data URL prefix)
-        folder_name: Folder name inside MEDIA_ROOT to save the image
+        folder_name: Kind of image (profile_photos, attendance_images...). Blobs
+            are shared across kinds, so it no longer changes the path.
         attendance_type: Type of attendance - 'check_in' or 'check_out' (default: 'check_in')
         captured_at: Datetime when image was captured (default: current time)
     
     Returns:
         dict: {
-            'file_path': relative path from MEDIA_ROOT,
-            'file_name': original file name,
+            'file_path': relative path from MEDIA_ROOT (the blob name),
+            'file_name': stored file name,
             'file_size': file size in bytes,
             'file_type': image file extension (jpg, png, etc.),
             'image_type': 'check_in' or 'check_out',
-            'captured_at': ISO format datetime string
+            'captured_at': ISO format datetime string,
+            'deduplicated': True if identical content was already stored
         }
     
     Raises:
         ValueError: If base64 string is invalid or image format is not supported
     """
     try:
-        # Store attendance_type before it gets overwritten
-        attendance_image_type = attendance_type
-        
-        # Remove data URL prefix if present (e.g., "data:image/jpeg;base64,")
-        if ',' in base64_string:
-            header, base64_string = base64_string.split(',', 1)
-            # Extract image file extension from header
-            if 'image/' in header:
-                file_extension = header.split('image/')[1].split(';')[0]
-            else:
-                file_extension = 'jpg'  # default
+        image_data, file_extension = decode_base64_image(base64_string)
+    except Exception as e:
+        raise ValueError(f"Error processing base64 image: {str(e)}")
+    return save_image_bytes(image_data, file_extension, attendance_type, captured_at)
+
+
+def decode_base64_image(base64_string):
+    """
+    Decode a base64 image (with or without data URL prefix).
+
+    Returns:
+        tuple: (bytes, file extension from the data URL - 'jpg' if none)
+    """
+    # Remove data URL prefix if present (e.g., "data:image/jpeg;base64,")
+    if ',' in base64_string:
+        header, base64_string = base64_string.split(',', 1)
+        # Extract image file extension from header
+        if 'image/' in header:
+            file_extension = header.split('image/')[1].split(';')[0]
         else:
             file_extension = 'jpg'  # default
+    else:
+        file_extension = 'jpg'  # default
+    
+    return base64.b64decode(base64_string), file_extension
+
+
+def stash_base64_image(base64_string):
+    """
+    Store an upload as received - no decoding or compression - for a background
+    task to process with save_image_bytes(). Nothing references the raw blob,
+    so gc_media_store removes it once it is past its minimum age.
+
+    Returns:
+        str: stored name of the raw upload
+    """
+    image_data, file_extension = decode_base64_image(base64_string)
+    if not file_extension.isalnum():  # e.g. svg+xml - keep the name collectable
+        file_extension = 'bin'
+    name, _ = media_store.store_blob(image_data, file_extension, thumbnail=False)
+    return name
+
+
+def save_image_bytes(image_data, file_extension, attendance_type='check_in', captured_at=None):
+    """
+    Compress and store decoded image bytes - save_base64_image() after decoding.
+    Also used by background tasks processing an upload stashed by a request.
+
+    Returns:
+        dict: same as save_base64_image()
+
+    Raises:
+        ValueError: If the image format is not supported
+    """
+    try:
+        # Store attendance_type before it gets overwritten
+        attendance_image_type = attendance_type
         
-        # Decode base64 string
-        image_data = base64.b64decode(base64_string)
-        
-        # Validate file format
-        allowed_formats = getattr(settings, 'ATTENDANCE_IMAGE_ALLOWED_FORMATS', ['jpg', 'jpeg', 'png', 'webp'])
-        if file_extension.lower() not in allowed_formats:
-            # Convert to JPEG if format not allowed
-            if PIL_AVAILABLE:
-                try:
-                    img = Image.open(BytesIO(image_data))
-                    output = BytesIO()
-                    if img.mode in ('RGBA', 'LA', 'P'):
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'P':
-                            img = img.convert('RGBA')
-                        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                        img = background
-                    elif img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    img.save(output, format='JPEG', quality=85, optimize=True)
-                    image_data = output.getvalue()
-                    output.close()
-                    file_extension = 'jpg'
-                except Exception as e:
-                    print(f"Warning: Could not convert image format: {str(e)}")
-            else:
-                raise ValueError(f"Image format '{file_extension}' not allowed. Allowed formats: {', '.join(allowed_formats)}")
+        # Same upload seen before - reuse its blob without re-encoding it
+        source_digest, stored_name = media_store.find_stored_source(image_data)
+        if stored_name:
+            return _saved_image_info(stored_name, attendance_image_type, captured_at, deduplicated=True)
         
         # Get max size limit
         max_size_mb = getattr(settings, 'ATTENDANCE_IMAGE_MAX_SIZE_MB', 3)
         max_size = max_size_mb * 1024 * 1024
         
-        # Compress and optimize image if PIL is available (always try to compress)
+        # Decode once: orient, downscale (JPEG draft mode), encode to fit max_size
+        decoded = None
         if PIL_AVAILABLE:
             try:
-                # First attempt: Normal compression
-                compressed_data = compress_image(image_data, file_extension)
-                
-                # If still too large, try aggressive compression
-                if len(compressed_data) > max_size:
-                    compressed_data = compress_image_aggressive(image_data, file_extension, max_size)
-                
-                image_data = compressed_data
+                image_data, file_extension, decoded = ingest_image(image_data, file_extension, max_size)
             except Exception as e:
-                print(f"Warning: Image compression failed: {str(e)}. Using original image.")
-                # If compression fails and image is still too large, try one more time with aggressive settings
-                if len(image_data) > max_size and PIL_AVAILABLE:
-                    try:
-                        image_data = compress_image_aggressive(image_data, file_extension, max_size)
-                    except Exception as e2:
-                        print(f"Warning: Aggressive compression also failed: {str(e2)}")
+                print(f"Warning: Image processing failed: {str(e)}. Using original image.")
+        else:
+            allowed_formats = getattr(settings, 'ATTENDANCE_IMAGE_ALLOWED_FORMATS', ['jpg', 'jpeg', 'png', 'webp'])
+            if file_extension.lower() not in allowed_formats:
+                raise ValueError(f"Image format '{file_extension}' not allowed. Allowed formats: {', '.join(allowed_formats)}")
         
         # Final check: If still too large after compression, log warning but don't fail
         if len(image_data) > max_size:
             print(f"Warning: Image size ({len(image_data) / (1024*1024):.2f}MB) still exceeds limit ({max_size_mb}MB) after compression. Saving anyway.")
         
-        # Create folder if it doesn't exist
-        media_folder = os.path.join(settings.MEDIA_ROOT, folder_name)
-        os.makedirs(media_folder, exist_ok=True)
-        
-        # Generate unique file name
-        timestamp = timezone.now().strftime('%Y%m%d_%H%M%S')
-        unique_id = str(uuid.uuid4())[:8]
-        file_name = f"{timestamp}_{unique_id}.{file_extension}"
-        file_path = os.path.join(media_folder, file_name)
-        
-        # Save image file
-        with open(file_path, 'wb') as f:
-            f.write(image_data)
-        
-        # Return relative path from MEDIA_ROOT
-        relative_path = os.path.join(folder_name, file_name)
-        
-        # Set captured_at timestamp
-        if captured_at is None:
-            captured_at = timezone.now()
-        elif isinstance(captured_at, str):
-            captured_at = datetime.fromisoformat(captured_at.replace('Z', '+00:00'))
+        # Store by content hash - identical images (e.g. a profile photo
+        # refreshed on every checkout) are written and thumbnailed only once
+        relative_path, created = media_store.store_blob(image_data, file_extension, thumbnail_source=decoded)
+        media_store.remember_source(source_digest, relative_path)
         
-        # Validate attendance_type
-        if attendance_image_type not in ['check_in', 'check_out']:
-            attendance_image_type = 'check_in'  # default
-        
-        return {
-            'file_path': relative_path,
-            'file_name': file_name,
-            'file_size': len(image_data),
-            'file_type': file_extension,  # jpg, png, etc.
-            'image_type': attendance_image_type,  # check_in or check_out
-            'captured_at': captured_at.isoformat() if isinstance(captured_at, datetime) else captured_at
-        }
+        return _saved_image_info(
+            relative_path, attendance_image_type, captured_at, deduplicated=not created, file_size=len(image_data)
+        )
     
     except Exception as e:
         raise ValueError(f"Error processing base64 image: {str(e)}")
 
 
+def _saved_image_info(relative_path, attendance_image_type, captured_at, deduplicated, file_size=None):
+    """Return dict of save_base64_image"""
+    # Set captured_at timestamp
+    if captured_at is None:
+        captured_at = timezone.now()
+    elif isinstance(captured_at, str):
+        captured_at = datetime.fromisoformat(captured_at.replace('Z', '+00:00'))
+    
+    # Validate attendance_type
+    if attendance_image_type not in ['check_in', 'check_out']:
+        attendance_image_type = 'check_in'  # default
+    
+    file_name = os.path.basename(relative_path)
+    return {
+        'file_path': relative_path,
+        'file_name': file_name,
+        'file_size': file_size if file_size is not None else default_storage.size(relative_path),
+        'file_type': os.path.splitext(file_name)[1].lstrip('.'),  # jpg, png, etc.
+        'image_type': attendance_image_type,  # check_in or check_out
+        'captured_at': captured_at.isoformat() if isinstance(captured_at, datetime) else captured_at,
+        'deduplicated': deduplicated
+    }
+
+
 def save_multiple_base64_images(base64_images, folder_name='attendance_images', attendance_type='check_in', captured_at=None):
     """
     Save multiple base64 images with limits.
     
     Args:
         base64_images: List of base64 encoded image strings
-        folder_name: Folder name inside MEDIA_ROOT to save images
+        folder_name: Kind of image - see save_base64_image
         attendance_type: Type of attendance - 'check_in' or 'check_out' (default: 'check_in')
         captured_at: Datetime when images were captured (default: current time)
     
@@ -185,9 +205,132 @@ def save_multiple_base64_images(base64_images, folder_name='attendance_images',
     return saved_images
 
 
+# Output format per allowed extension - anything else is stored as JPEG
+OUTPUT_FORMATS = {'jpg': 'JPEG', 'jpeg': 'JPEG', 'png': 'PNG', 'webp': 'WEBP'}
+FORMAT_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+MIN_QUALITY = 20
+MIN_SIDE = 200
+EXIF_ORIENTATION = 0x0112
+
+
+def _encode(img, image_format, quality):
+    output = BytesIO()
+    if image_format == 'JPEG':
+        img.save(output, format='JPEG', quality=quality, optimize=True)
+    elif image_format == 'WEBP':
+        img.save(output, format='WEBP', quality=quality, method=6)
+    else:
+        img.save(output, format='PNG', optimize=True)
+    return output.getvalue()
+
+
+def _flatten(img, image_format):
+    """Mode the output format can store - JPEG gets transparency composited on white"""
+    if image_format == 'JPEG' and img.mode in ('RGBA', 'LA', 'P'):
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if image_format != 'JPEG' and img.mode in ('LA', 'P'):
+        return img.convert('RGBA')
+    if img.mode not in ('RGB', 'L', 'RGBA'):
+        return img.convert('RGB')
+    return img
+
+
+def _fit_to_size(img, quality, target_size_bytes):
+    """
+    JPEG bytes of an already-downscaled image under target_size_bytes.
+    Binary search on quality (about 6 encodes); only if even MIN_QUALITY is
+    too big is the image shrunk further, by the square root of the overshoot.
+    """
+    img = _flatten(img, 'JPEG')
+    while True:
+        low, high = MIN_QUALITY, quality
+        best = None
+        while low <= high:
+            middle = (low + high) // 2
+            data = _encode(img, 'JPEG', middle)
+            if len(data) <= target_size_bytes:
+                best, low = data, middle + 1
+            else:
+                high = middle - 1
+                smallest = data
+        if best is not None:
+            return best, img
+        factor = min((target_size_bytes / len(smallest)) ** 0.5 * 0.9, 0.9)
+        size = (int(img.width * factor), int(img.height * factor))
+        if min(size) < MIN_SIDE:
+            return smallest, img
+        img = img.resize(size, Image.Resampling.LANCZOS)
+
+
+def ingest_image(image_data, file_extension, max_size=None, max_width=None, max_height=None, quality=None):
+    """
+    Decode an uploaded image once and produce the bytes to store.
+    
+    - EXIF orientation is applied (phones store portrait photos rotated)
+    - JPEGs larger than the target are decoded at reduced scale (draft mode:
+      1/2, 1/4 or 1/8 in the decoder itself) before the final LANCZOS resize
+    - Formats outside ATTENDANCE_IMAGE_ALLOWED_FORMATS are stored as JPEG
+    - If the result exceeds max_size, JPEG quality is binary-searched on the
+      downscaled image instead of re-decoding the original per attempt
+    - The original bytes are kept when they are already small enough and
+      re-encoding would not shrink them
+    
+    Args:
+        image_data: Raw image bytes
+        file_extension: Extension from the upload (jpg, png, ...)
+        max_size: Maximum bytes (default: ATTENDANCE_IMAGE_MAX_SIZE_MB)
+        max_width / max_height / quality: default from settings
+    
+    Returns:
+        tuple: (bytes, extension, decoded PIL image - reusable for thumbnails)
+    """
+    max_width = max_width or getattr(settings, 'ATTENDANCE_IMAGE_MAX_WIDTH', 1920)
+    max_height = max_height or getattr(settings, 'ATTENDANCE_IMAGE_MAX_HEIGHT', 1080)
+    quality = quality or getattr(settings, 'ATTENDANCE_IMAGE_QUALITY', 85)
+    if max_size is None:
+        max_size = getattr(settings, 'ATTENDANCE_IMAGE_MAX_SIZE_MB', 3) * 1024 * 1024
+    allowed_formats = getattr(settings, 'ATTENDANCE_IMAGE_ALLOWED_FORMATS', ['jpg', 'jpeg', 'png', 'webp'])
+    
+    extension = file_extension.lower()
+    image_format = OUTPUT_FORMATS.get(extension, 'JPEG') if extension in allowed_formats else 'JPEG'
+    
+    img = Image.open(BytesIO(image_data))
+    source_format = img.format
+    orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+    
+    # Bounding box in stored (unrotated) pixels
+    box_width, box_height = (max_height, max_width) if orientation in (5, 6, 7, 8) else (max_width, max_height)
+    scale = min(1.0, box_width / img.width, box_height / img.height)
+    if scale < 1 and source_format == 'JPEG':
+        img.draft(None, (int(img.width * scale) + 1, int(img.height * scale) + 1))
+    
+    img = ImageOps.exif_transpose(img)
+    img = _flatten(img, image_format)
+    resized = img.width > max_width or img.height > max_height
+    if resized:
+        img.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+    
+    data = _encode(img, image_format, quality)
+    if len(data) > max_size:
+        data, img = _fit_to_size(img, quality, max_size)
+        image_format = 'JPEG'
+    elif (
+        not resized and orientation == 1 and source_format == image_format
+        and len(image_data) <= min(len(data), max_size)
+    ):
+        data = image_data  # Already small - re-encoding would only cost quality
+    
+    return data, FORMAT_EXTENSIONS[image_format], img
+
+
 def compress_image(image_data, file_extension, max_width=None, max_height=None, quality=None):
     """
     Compress and optimize image to reduce file size.
+    Superseded by ingest_image() - kept as the baseline of benchmark_image_ingest.
     
     Args:
         image_data: Raw image bytes
@@ -256,6 +399,7 @@ def compress_image_aggressive(image_data, file_extension, target_size_bytes):
     """
     Aggressively compress image to meet target size limit.
     Progressively reduces quality and dimensions until target size is met.
+    Superseded by ingest_image() - kept as the baseline of benchmark_image_ingest.
     
     Args:
         image_data: Raw image bytes
@@ -0,0 +1,293 @@
+"""
+Content-addressed media store
+
+Images are stored once per distinct content, named by the SHA-256 of the
+stored bytes and sharded two levels deep so no directory grows unbounded:
+
+    blobs/ab/cd/abcd1234....jpg        (MEDIA_STORE_DIR)
+    thumbs/160/ab/cd/abcd1234....jpg   (MEDIA_THUMBNAIL_DIR / MEDIA_THUMBNAIL_SIZE)
+
+- The same selfie uploaded again (e.g. the profile photo refreshed on every
+  checkout) resolves to the same name - nothing is written twice
+- A fixed-size square thumbnail is generated once, when a blob is first
+  stored; list views link to it via thumbnail_url() without touching storage
+- Blobs are never deleted in the request path (several rows may share one);
+  collect_garbage() / "manage.py gc_media_store" removes blobs no model
+  FileField/ImageField references any more
+
+Files saved before the store existed keep their old paths and still work.
+"""
+import hashlib
+import logging
+import os
+import re
+from datetime import timedelta
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = 'blobs'
+DEFAULT_THUMBNAIL_DIR = 'thumbs'
+DEFAULT_THUMBNAIL_SIZE = 160
+THUMBNAIL_QUALITY = 80
+SOURCE_CACHE_TIMEOUT = 7 * 24 * 60 * 60  # Upload hash -> blob name, 7 days
+GC_CHUNK_SIZE = 5000
+
+BLOB_FILE = re.compile(r'^([0-9a-f]{64})\.(\w+)$')
+
+
+def store_dir():
+    return getattr(settings, 'MEDIA_STORE_DIR', DEFAULT_STORE_DIR)
+
+
+def thumbnail_dir():
+    return getattr(settings, 'MEDIA_THUMBNAIL_DIR', DEFAULT_THUMBNAIL_DIR)
+
+
+def thumbnail_size():
+    return getattr(settings, 'MEDIA_THUMBNAIL_SIZE', DEFAULT_THUMBNAIL_SIZE)
+
+
+def content_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _sharded(root, digest, extension):
+    return f"{root}/{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
+
+
+def blob_name(digest, extension):
+    """Storage name of a blob: blobs/ab/cd/<digest>.<ext>"""
+    extension = extension.lower()
+    return _sharded(store_dir(), digest, 'jpg' if extension == 'jpeg' else extension)
+
+
+def blob_digest(name):
+    """Digest of a blob name, or None for files outside the store (legacy paths)"""
+    name = str(name or '')
+    if not name.startswith(f"{store_dir()}/"):
+        return None
+    match = BLOB_FILE.match(os.path.basename(name))
+    return match.group(1) if match else None
+
+
+def thumbnail_name(name, size=None):
+    """Storage name of a blob's thumbnail (always JPEG)"""
+    digest = blob_digest(name)
+    if digest is None:
+        return None
+    return _sharded(f"{thumbnail_dir()}/{size or thumbnail_size()}", digest, 'jpg')
+
+
+def _write_once(name, data):
+    """Write data under name unless it is already there. Returns True if written."""
+    if default_storage.exists(name):
+        return False
+    saved = default_storage.save(name, ContentFile(data))
+    if saved != name:
+        # Lost a race with an identical upload - same bytes already stored under name
+        default_storage.delete(saved)
+        return False
+    return True
+
+
+def make_thumbnail(image_data=None, size=None, image=None):
+    """
+    Square, centre-cropped JPEG thumbnail bytes - from an already decoded
+    image when the caller has one, else from bytes (JPEGs decoded at reduced scale)
+    """
+    from PIL import Image, ImageOps
+
+    size = size or thumbnail_size()
+    if image is not None:
+        img = image
+    else:
+        img = Image.open(BytesIO(image_data))
+        img.draft(None, (size, size))  # JPEG only - no-op for other formats
+        img = ImageOps.exif_transpose(img)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    img = ImageOps.fit(img, (size, size), Image.Resampling.LANCZOS)
+    output = BytesIO()
+    img.save(output, format='JPEG', quality=THUMBNAIL_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+def ensure_thumbnail(name, image_data=None, size=None, image=None):
+    """
+    Generate the thumbnail of a blob if it does not exist yet.
+
+    Returns:
+        str: thumbnail name, or None if name is not a blob / the image can't be decoded
+    """
+    thumb = thumbnail_name(name, size)
+    if thumb is None:
+        return None
+    if default_storage.exists(thumb):
+        return thumb
+    try:
+        if image is None and image_data is None:
+            with default_storage.open(name, 'rb') as f:
+                image_data = f.read()
+        _write_once(thumb, make_thumbnail(image_data, size, image=image))
+    except Exception as e:
+        logger.warning(f"Could not create thumbnail for {name}: {str(e)}")
+        return None
+    return thumb
+
+
+def store_blob(data, extension, thumbnail=True, thumbnail_source=None):
+    """
+    Store bytes by content hash.
+    thumbnail_source: the decoded image, if the caller has it - saves decoding data again
+
+    Returns:
+        tuple: (name, created) - created is False when identical content was already stored
+    """
+    name = blob_name(content_digest(data), extension)
+    created = _write_once(name, data)
+    if created and thumbnail:
+        ensure_thumbnail(name, image_data=data, image=thumbnail_source)
+    return name, created
+
+
+def _source_key(source_digest):
+    return f"media_src_{source_digest}"
+
+
+def find_stored_source(source_bytes):
+    """
+    Blob previously stored for these exact upload bytes (before compression),
+    so a repeated upload skips decoding and re-encoding entirely.
+
+    Returns:
+        tuple: (source digest, blob name or None)
+    """
+    source_digest = content_digest(source_bytes)
+    name = cache.get(_source_key(source_digest))
+    if name and not default_storage.exists(name):  # Collected since
+        name = None
+    return source_digest, name
+
+
+def remember_source(source_digest, name):
+    cache.set(_source_key(source_digest), name, SOURCE_CACHE_TIMEOUT)
+
+
+def thumbnail_url(name):
+    """
+    URL for list views - the thumbnail for blobs, the file itself for legacy
+    paths. No storage access.
+    """
+    if not name:
+        return None
+    thumb = thumbnail_name(name)
+    return default_storage.url(thumb or str(name))
+
+
+# Garbage collection
+
+def file_fields():
+    """(model, field) for every FileField / ImageField in the project"""
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field
+
+
+def referenced_digests():
+    """
+    Digests of every blob referenced by a model row.
+    One streamed values_list() query per file field - no model instances.
+    """
+    prefix = f"{store_dir()}/"
+    digests = set()
+    for model, field in file_fields():
+        names = (
+            model._base_manager
+            .filter(**{f'{field.attname}__startswith': prefix})
+            .values_list(field.attname, flat=True)
+            .iterator(chunk_size=GC_CHUNK_SIZE)
+        )
+        for name in names:
+            digest = blob_digest(name)
+            if digest:
+                digests.add(digest)
+    return digests
+
+
+def _walk_shards(root):
+    """Yield storage names of files in root/ab/cd/"""
+    if not default_storage.exists(root):
+        return
+    for first in default_storage.listdir(root)[0]:
+        for second in default_storage.listdir(f"{root}/{first}")[0]:
+            directory = f"{root}/{first}/{second}"
+            for file_name in default_storage.listdir(directory)[1]:
+                yield f"{directory}/{file_name}"
+
+
+def iter_blobs():
+    return _walk_shards(store_dir())
+
+
+def iter_thumbnails():
+    root = thumbnail_dir()
+    if not default_storage.exists(root):
+        return
+    for size in default_storage.listdir(root)[0]:
+        yield from _walk_shards(f"{root}/{size}")
+
+
+def _size(name):
+    try:
+        return default_storage.size(name)
+    except Exception:
+        return 0
+
+
+def collect_garbage(min_age_hours=24, dry_run=False):
+    """
+    Delete blobs no row references, and thumbnails whose blob is gone.
+
+    Blobs younger than min_age_hours are kept - an upload is stored before the
+    row pointing at it is saved.
+
+    Returns:
+        dict: {'blobs', 'kept', 'deleted', 'thumbnails_deleted', 'bytes_freed'}
+    """
+    referenced = referenced_digests()
+    cutoff = timezone.now() - timedelta(hours=min_age_hours)
+    stats = {'blobs': 0, 'kept': 0, 'deleted': 0, 'thumbnails_deleted': 0, 'bytes_freed': 0}
+    live = set()
+
+    for name in iter_blobs():
+        digest = blob_digest(name)
+        if digest is None:
+            continue
+        stats['blobs'] += 1
+        if digest in referenced or default_storage.get_modified_time(name) > cutoff:
+            live.add(digest)
+            stats['kept'] += 1
+            continue
+        stats['deleted'] += 1
+        stats['bytes_freed'] += _size(name)
+        if not dry_run:
+            default_storage.delete(name)
+
+    for name in iter_thumbnails():
+        if os.path.basename(name).split('.')[0] in live:
+            continue
+        stats['thumbnails_deleted'] += 1
+        stats['bytes_freed'] += _size(name)
+        if not dry_run:
+            default_storage.delete(name)
+    return stats
@@ -0,0 +1,158 @@
+"""
+Location Lookup Service
+"Which location is this punch at" and "nearest N locations to this point"
+for organizations with thousands of LocationControl locations.
+
+Location.geohash (kept in sync by Location.save()) buckets every location
+into a grid cell; a lookup scans the 3x3 block of cells around the point
+with indexed prefix queries (geohash LIKE 'abc%') and ranks only those
+candidates by haversine distance - cost depends on local density, not on
+how many locations the organization has:
+- locate(): one query at the precision that covers the organization's
+  largest location radius
+- nearest(): starts at a fine precision and widens one level at a time
+  until the N-th candidate is provably closer than anything outside the block -
+  one query per level, so up to NEAREST_START_PRECISION queries when locations
+  are sparse around the point
+
+Run rebuild_location_geohash after bulk_create / queryset.update() on
+Location, which bypass save().
+"""
+from collections import namedtuple
+
+from django.core.cache import cache
+from django.db.models import Max, Q
+
+from LocationControl.models import Location
+from utils import geohash
+from utils.geofence_service import get_geofence_version, haversine_m
+
+
+NEAREST_START_PRECISION = 6  # ~1.2 km x 0.6 km cells
+MAX_RADIUS_CACHE_TIMEOUT = 60 * 60  # Versioned by Location writes (geofence version)
+LOCATION_FIELDS = ('id', 'name', 'address', 'site_id', 'latitude', 'longitude', 'radius')
+
+LocationMatch = namedtuple('LocationMatch', ['location', 'distance_m', 'inside'])
+
+
+def locations_for(organization_id, site_id=None, admin_id=None):
+    """Active locations of an organization (optionally one admin / one site)"""
+    queryset = Location.objects.filter(organization_id=organization_id, is_active=True)
+    if admin_id:
+        queryset = queryset.filter(admin_id=admin_id)
+    if site_id:
+        queryset = queryset.filter(site_id=site_id)
+    return queryset
+
+
+def _in_cells(cells):
+    condition = Q()
+    for cell in cells:
+        condition |= Q(geohash__startswith=cell)
+    return condition
+
+
+def _ranked(rows, latitude, longitude):
+    """[LocationMatch] for candidate rows, nearest first"""
+    lat = float(latitude)
+    lon = float(longitude)
+    matches = []
+    for row in rows:
+        distance = haversine_m(lat, lon, float(row['latitude']), float(row['longitude']))
+        matches.append(LocationMatch(row, round(distance, 1), distance <= row['radius']))
+    matches.sort(key=lambda match: match.distance_m)
+    return matches
+
+
+def get_max_location_radius(organization_id):
+    """Largest geofence radius among the organization's locations - cached per Location version"""
+    key = f"location_max_radius_{organization_id}_v{get_geofence_version(organization_id)}"
+    radius = cache.get(key)
+    if radius is None:
+        radius = locations_for(organization_id).aggregate(max_radius=Max('radius'))['max_radius'] or 0
+        cache.set(key, radius, MAX_RADIUS_CACHE_TIMEOUT)
+    return radius
+
+
+def locate(organization_id, latitude, longitude, site_id=None, admin_id=None):
+    """
+    Locations whose geofence contains the point, nearest first.
+
+    One indexed query, plus the organization's max radius aggregate when it
+    is not cached yet.
+
+    Returns:
+        list of LocationMatch (inside=True)
+    """
+    max_radius = get_max_location_radius(organization_id)
+    if not max_radius:
+        return []
+    precision = geohash.precision_for_radius(latitude, max_radius)
+    cells = geohash.covering_cells(latitude, longitude, precision)
+    rows = locations_for(organization_id, site_id, admin_id).filter(_in_cells(cells)).values(*LOCATION_FIELDS)
+    return [match for match in _ranked(rows, latitude, longitude) if match.inside]
+
+
+def location_name_at(organization_id, latitude, longitude):
+    """
+    Name of the location containing a punch - None when there is none or
+    the coordinates are missing/invalid (punch flows must never fail here).
+    """
+    if not organization_id or latitude in (None, '') or longitude in (None, ''):
+        return None
+    try:
+        matches = locate(organization_id, latitude, longitude)
+    except (TypeError, ValueError):
+        return None
+    return matches[0].location['name'] if matches else None
+
+
+def nearest(organization_id, latitude, longitude, limit=5, max_distance_m=None, site_id=None, admin_id=None):
+    """
+    The `limit` nearest locations to a point.
+
+    One indexed query per precision level tried - a single query where
+    locations are dense, up to NEAREST_START_PRECISION (6) where the search
+    has to widen to coarse cells.
+
+    Args:
+        max_distance_m: Optional cut-off - also bounds how far the search widens
+
+    Returns:
+        list of LocationMatch, nearest first
+    """
+    queryset = locations_for(organization_id, site_id, admin_id)
+    start = NEAREST_START_PRECISION
+    if max_distance_m is not None:
+        start = min(start, geohash.precision_for_radius(latitude, max_distance_m))
+
+    matches = []
+    for precision in range(start, 0, -1):
+        cells = geohash.covering_cells(latitude, longitude, precision)
+        rows = queryset.filter(_in_cells(cells)).values(*LOCATION_FIELDS)
+        matches = _ranked(rows, latitude, longitude)
+        if max_distance_m is not None:
+            matches = [match for match in matches if match.distance_m <= max_distance_m]
+
+        guaranteed = geohash.guaranteed_radius_m(latitude, precision)
+        if len(matches) >= limit and matches[limit - 1].distance_m <= guaranteed:
+            break  # Nothing outside the block can beat the N-th candidate
+        if max_distance_m is not None and max_distance_m <= guaranteed:
+            break  # Everything within the cut-off has been seen
+    return matches[:limit]
+
+
+def serialize_match(match):
+    """JSON-friendly dict for API responses"""
+    location = match.location
+    return {
+        "id": location['id'],
+        "name": location['name'],
+        "address": location['address'],
+        "site_id": str(location['site_id']) if location['site_id'] else None,
+        "latitude": location['latitude'],
+        "longitude": location['longitude'],
+        "radius": location['radius'],
+        "distance_m": match.distance_m,
+        "inside": match.inside,
+    }
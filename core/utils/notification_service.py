@@ -0,0 +1,212 @@
+"""
+Push Notification Service
+Shift reminders, leave decisions and task assignments sent to employees'
+devices (UserProfile.fcm_token) - never on the request path.
+
+notify() records a 'push.notify' outbox event in the caller's transaction.
+The outbox dispatcher hands the handler a whole batch of events, which:
+
+1. Coalesces per recipient and kind - five tasks assigned to one employee
+   in the batch become one "5 new tasks assigned" notification
+2. Resolves tokens in one query, skipping organizations without
+   push_notifications_enabled and employees without a token
+3. Rate-limits per organization (PUSH_RATE_LIMIT_PER_MINUTE): the excess is
+   re-published to the outbox for the next window instead of being dropped
+4. Sends in provider-sized batches through the configured transport
+   (utils.push_transports)
+5. Clears every token the provider rejected in one UPDATE
+
+An organization whose sends fail is re-published on its own with a delay,
+so the organizations already sent to are not notified twice.
+"""
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from Outbox.outbox_service import outbox_handler, publish
+from utils.push_transports import PushMessage, get_transport
+
+logger = logging.getLogger(__name__)
+
+TOPIC = 'push.notify'
+RECIPIENT_CHUNK_SIZE = 1000  # User ids per outbox event
+RATE_WINDOW_SECONDS = 60
+RETRY_DELAY_SECONDS = 60
+MAX_SEND_ATTEMPTS = 5
+
+# Title of a coalesced notification, by kind - {count} notifications of that kind
+COALESCED_TITLES = {
+    'task_assigned': '{count} new tasks assigned',
+    'leave_status': '{count} leave requests updated',
+    'shift_reminder': 'Shift reminder',
+}
+DEFAULT_COALESCED_TITLE = '{count} new notifications'
+
+
+def notify(user_ids, kind, title, body, data=None):
+    """
+    Queue a push notification to employees (BaseUserModel ids).
+    Sent after the current transaction commits; unknown ids, employees without
+    a token and organizations with push disabled are skipped when sending.
+    """
+    user_ids = [str(user_id) for user_id in user_ids if user_id]
+    for start in range(0, len(user_ids), RECIPIENT_CHUNK_SIZE):
+        publish(TOPIC, {
+            'user_ids': user_ids[start:start + RECIPIENT_CHUNK_SIZE],
+            'kind': kind, 'title': title, 'body': body, 'data': data or {},
+        })
+
+
+def coalesce(payloads):
+    """
+    One notification per (recipient, kind).
+
+    Returns:
+        dict: {(user_id, kind): {'title', 'body', 'data', 'count', 'attempts'}}
+    """
+    pending = {}
+    for payload in payloads:
+        for user_id in payload['user_ids']:
+            key = (user_id, payload['kind'])
+            entry = pending.get(key)
+            if entry is None:
+                pending[key] = {
+                    'title': payload['title'], 'body': payload['body'], 'data': dict(payload.get('data') or {}),
+                    'count': payload.get('count', 1), 'attempts': payload.get('attempts', 0),
+                }
+                continue
+            # Latest body wins; the title becomes a count
+            entry['count'] += payload.get('count', 1)
+            entry['title'] = COALESCED_TITLES.get(payload['kind'], DEFAULT_COALESCED_TITLE).format(count=entry['count'])
+            entry['body'] = payload['body']
+            entry['data'] = dict(payload.get('data') or {})
+            entry['attempts'] = min(entry['attempts'], payload.get('attempts', 0))
+    return pending
+
+
+def _recipients(user_ids):
+    """{user_id: (organization_id, token)} for employees who can receive a push - one query"""
+    from AuthN.models import UserProfile
+
+    rows = (
+        UserProfile.objects
+        .filter(
+            user_id__in=user_ids,
+            user__is_active=True,
+            organization__own_organization_profile_setting__push_notifications_enabled=True,
+        )
+        .exclude(fcm_token='')
+        .values_list('user_id', 'organization_id', 'fcm_token')
+    )
+    return {str(user_id): (str(organization_id), token) for user_id, organization_id, token in rows}
+
+
+def _rate_allowance(organization_id, wanted):
+    """
+    Reserve up to `wanted` sends in the organization's current one-minute window.
+
+    Returns:
+        tuple: (allowed now, seconds until the next window)
+    """
+    limit = getattr(settings, 'PUSH_RATE_LIMIT_PER_MINUTE', 0)
+    now = time.time()
+    retry_in = int(RATE_WINDOW_SECONDS - now % RATE_WINDOW_SECONDS) + 1
+    if not limit:
+        return wanted, retry_in
+    key = f"push_rate_{organization_id}_{int(now // RATE_WINDOW_SECONDS)}"
+    cache.add(key, 0, RATE_WINDOW_SECONDS * 2)
+    try:
+        used = cache.incr(key, wanted)
+    except ValueError:  # Evicted between add() and incr()
+        cache.set(key, wanted, RATE_WINDOW_SECONDS * 2)
+        used = wanted
+    return max(0, min(wanted, limit - (used - wanted))), retry_in
+
+
+def _republish(entries, delay_seconds, attempt_increment=0):
+    """
+    Put (user_id, kind, entry) notifications back in the outbox - one event per
+    identical notification (e.g. a deferred shift reminder broadcast), not per recipient
+    """
+    groups = {}
+    for user_id, kind, entry in entries:
+        attempts = entry['attempts'] + attempt_increment
+        if attempts >= MAX_SEND_ATTEMPTS:
+            logger.warning(f"Push {kind} to {user_id} dropped after {attempts} attempts")
+            continue
+        payload = {
+            'kind': kind, 'title': entry['title'], 'body': entry['body'],
+            'data': entry['data'], 'count': entry['count'], 'attempts': attempts,
+        }
+        groups.setdefault(json.dumps(payload, sort_keys=True, default=str), (payload, []))[1].append(user_id)
+    for payload, user_ids in groups.values():
+        for start in range(0, len(user_ids), RECIPIENT_CHUNK_SIZE):
+            publish(TOPIC, {**payload, 'user_ids': user_ids[start:start + RECIPIENT_CHUNK_SIZE]}, delay_seconds=delay_seconds)
+
+
+def send_pending(pending):
+    """
+    Send coalesced notifications (see coalesce()).
+
+    Returns:
+        dict: {'sent', 'skipped', 'deferred', 'failed', 'invalid_tokens'}
+    """
+    stats = {'sent': 0, 'skipped': 0, 'deferred': 0, 'failed': 0, 'invalid_tokens': 0}
+    recipients = _recipients({user_id for user_id, _ in pending})
+
+    by_organization = {}
+    for (user_id, kind), entry in pending.items():
+        if user_id not in recipients:
+            stats['skipped'] += 1
+            continue
+        organization_id, token = recipients[user_id]
+        by_organization.setdefault(organization_id, []).append((user_id, kind, entry, token))
+
+    transport = get_transport()
+    invalid_tokens = set()
+    for organization_id, items in by_organization.items():
+        allowed, retry_in = _rate_allowance(organization_id, len(items))
+        if allowed < len(items):
+            _republish([(user_id, kind, entry) for user_id, kind, entry, _ in items[allowed:]], retry_in)
+            stats['deferred'] += len(items) - allowed
+            items = items[:allowed]
+
+        for start in range(0, len(items), transport.max_batch_size):
+            batch = items[start:start + transport.max_batch_size]
+            messages = [
+                PushMessage(token, entry['title'], entry['body'], {**entry['data'], 'kind': kind})
+                for _, kind, entry, token in batch
+            ]
+            try:
+                invalid_tokens.update(transport.send(messages))
+            except Exception as e:
+                unsent = items[start:]
+                logger.warning(f"Push to organization {organization_id} failed, {len(unsent)} re-queued: {str(e)}")
+                _republish(
+                    [(user_id, kind, entry) for user_id, kind, entry, _ in unsent],
+                    RETRY_DELAY_SECONDS, attempt_increment=1
+                )
+                stats['failed'] += len(unsent)
+                break
+            stats['sent'] += len(batch)
+
+    if invalid_tokens:
+        from AuthN.models import UserProfile
+
+        UserProfile.objects.filter(fcm_token__in=invalid_tokens).update(fcm_token='')
+        stats['invalid_tokens'] = len(invalid_tokens)
+    return stats
+
+
+@outbox_handler(TOPIC)
+def _send_push_notifications(payloads):
+    stats = send_pending(coalesce(payloads))
+    logger.info(
+        f"Push: {stats['sent']} sent, {stats['deferred']} deferred (rate limit), {stats['failed']} re-queued, "
+        f"{stats['skipped']} skipped, {stats['invalid_tokens']} invalid token(s) cleared"
+    )
+    return stats
+
@@ -1,5 +1,13 @@
 
 # =================================PAGINATION=================================
+import base64
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Q
 from rest_framework import pagination
 from rest_framework.exceptions import NotFound
 
@@ -10,6 +18,13 @@ class CustomPagination(pagination.PageNumberPagination):
     page_query_param = 'page'
 
     def paginate_queryset(self, queryset, request, view=None):
+        # Opt-in keyset mode: ?cursor= on views that declare cursor_ordering
+        self.keyset = None
+        cursor_ordering = getattr(view, 'cursor_ordering', None)
+        if cursor_ordering and KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination(cursor_ordering)
+            return self.keyset.paginate_queryset(queryset, request, view)
+
         page_number = request.query_params.get(self.page_query_param)
         
         # Store request for use in get_paginated_response
@@ -26,6 +41,9 @@ class CustomPagination(pagination.PageNumberPagination):
         return page
 
     def get_paginated_response(self, data):
+        if getattr(self, 'keyset', None) is not None:
+            return self.keyset.get_paginated_response(data)
+
         next_page_number = self.page.next_page_number() if self.page.has_next() else None
         previous_page_number = self.page.previous_page_number() if self.page.has_previous() else None
         
@@ -70,4 +88,190 @@ class CustomPagination(pagination.PageNumberPagination):
             'previous': previous_url,
             'has_next': self.page.has_next(),
             'has_previous': self.page.has_previous(),
-        }
\ No newline at end of file
+        }
+
+# ==============================KEYSET PAGINATION==============================
+
+def encode_cursor(values, reverse=False):
+    """Opaque cursor: urlsafe base64 of the boundary row's ordering values"""
+    payload = json.dumps({'v': values, 'r': 1 if reverse else 0}, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Returns:
+        tuple: (values, reverse)
+
+    Raises:
+        NotFound: malformed cursor (same as an invalid page number)
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return list(payload['v']), bool(payload.get('r'))
+    except (ValueError, TypeError, KeyError):
+        raise NotFound(detail="Invalid cursor")
+
+
+def keyset_filter(ordering, values):
+    """
+    Rows strictly after `values` in `ordering` (row-value comparison expanded
+    to ORed prefixes, which PostgreSQL serves from a composite btree index):
+    (a < x) OR (a = x AND b < y) OR ...
+    """
+    condition = Q()
+    for position, field in enumerate(ordering):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        prefix = {ordering[i].lstrip('-'): values[i] for i in range(position)}
+        condition |= Q(**prefix, **{f'{name}__{lookup}': values[position]})
+    return condition
+
+
+def reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+
+def _count_cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.md5(f'{sql}|{params}'.encode()).hexdigest()
+    return f'keyset_count:{queryset.model._meta.label_lower}:{digest}'
+
+
+def cached_count(queryset):
+    """Exact COUNT(*) cached for KEYSET_COUNT_CACHE_TIMEOUT seconds per distinct filter"""
+    key = _count_cache_key(queryset)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, getattr(settings, 'KEYSET_COUNT_CACHE_TIMEOUT', 60))
+    return count
+
+
+def approximate_count(queryset):
+    """
+    Planner row estimate (PostgreSQL EXPLAIN) - O(1) regardless of table size.
+    Falls back to cached_count() on other databases or when the plan can't be read.
+
+    Returns:
+        tuple: (count, is_approximate)
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        try:
+            sql, params = queryset.order_by().query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]['Plan']['Plan Rows']), True
+        except Exception:
+            pass
+    return cached_count(queryset), False
+
+
+class KeysetPagination:
+    """
+    Keyset (cursor) pagination - WHERE (ordering) < (last row) ... LIMIT n.
+
+    Every page costs the same as the first one (no OFFSET scan) and no
+    COUNT(*) runs unless asked for with ?count=cached|approx|exact.
+    The ordering must end in a unique column (id) and use non-null columns,
+    ideally matching a composite index, e.g. ('-created_at', '-id').
+
+    Views opt in with a `cursor_ordering` attribute; CustomPagination
+    delegates here when the request carries ?cursor= (empty = first page).
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    page_size = CustomPagination.page_size
+    page_size_query_param = CustomPagination.page_size_query_param
+    max_page_size = CustomPagination.max_page_size
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+        self.field_names = [field.lstrip('-') for field in self.ordering]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def _row_values(self, row):
+        return [getattr(row, name) for name in self.field_names]
+
+    def _to_python(self, model, values):
+        """Convert decoded JSON cursor values back to field types"""
+        if len(values) != len(self.field_names):
+            raise NotFound(detail="Invalid cursor")
+        try:
+            return [model._meta.get_field(name).to_python(value) for name, value in zip(self.field_names, values)]
+        except Exception:
+            raise NotFound(detail="Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.base_queryset = queryset
+
+        cursor = request.query_params.get(self.cursor_query_param)
+        reverse = False
+        if cursor:
+            values, reverse = decode_cursor(cursor)
+            values = self._to_python(queryset.model, values)
+            ordering = reverse_ordering(self.ordering) if reverse else self.ordering
+            queryset = queryset.filter(keyset_filter(ordering, values))
+        else:
+            ordering = self.ordering
+
+        # One extra row tells whether another page exists - no COUNT(*)
+        rows = list(queryset.order_by(*ordering)[:self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, bool(cursor)
+
+        self.page = rows
+        return rows
+
+    def get_count(self):
+        mode = self.request.query_params.get(self.count_query_param, '').lower()
+        if mode == 'exact':
+            return self.base_queryset.count(), False
+        if mode == 'cached':
+            return cached_count(self.base_queryset), False
+        if mode == 'approx':
+            return approximate_count(self.base_queryset)
+        return None, False
+
+    def _page_url(self, cursor):
+        params = self.request.query_params.copy()
+        params.pop('page', None)
+        params[self.cursor_query_param] = cursor
+        return f"{self.request.build_absolute_uri(self.request.path)}?{params.urlencode()}"
+
+    def get_paginated_response(self, data):
+        next_cursor = encode_cursor(self._row_values(self.page[-1])) if self.has_next and self.page else None
+        previous_cursor = (
+            encode_cursor(self._row_values(self.page[0]), reverse=True)
+            if self.has_previous and self.page else None
+        )
+        count, is_approximate = self.get_count()
+        return {
+            'count': count,
+            'count_is_approximate': is_approximate,
+            'page_size': self.page_size_value,
+            'next_cursor': next_cursor,
+            'previous_cursor': previous_cursor,
+            'next': self._page_url(next_cursor) if next_cursor else None,
+            'previous': self._page_url(previous_cursor) if previous_cursor else None,
+            'has_next': self.has_next,
+            'has_previous': self.has_previous,
+        }
@@ -0,0 +1,151 @@
+"""
+Push notification transports
+
+A transport sends one provider-sized batch of PushMessage and reports which
+device tokens the provider rejected as invalid (uninstalled app, expired
+token), so notification_service can prune them in bulk.
+
+- FcmTransport: Firebase Cloud Messaging via firebase_admin (optional
+  dependency, credentials from FIREBASE_CREDENTIALS_FILE)
+- FileTransport: appends JSON lines to PUSH_FILE_PATH - local development
+- MemoryTransport: keeps messages in memory - tests / management commands
+
+PUSH_TRANSPORT selects one by short name (fcm / file / memory) or dotted path.
+"""
+import json
+import logging
+import os
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+PushMessage = namedtuple('PushMessage', ['token', 'title', 'body', 'data'])
+
+
+class PushTransport:
+    """Base transport - subclasses implement send()"""
+    max_batch_size = 500
+
+    def send(self, messages):
+        """
+        Send up to max_batch_size messages.
+
+        Returns:
+            list: tokens the provider reported as invalid
+
+        Raises:
+            Exception: if the batch could not be sent at all (it is retried)
+        """
+        raise NotImplementedError
+
+
+class FcmTransport(PushTransport):
+    """Firebase Cloud Messaging - messaging.send_each() takes up to 500 messages"""
+    max_batch_size = 500
+    _lock = threading.Lock()
+
+    def __init__(self):
+        try:
+            import firebase_admin
+            from firebase_admin import credentials, messaging
+        except ImportError:
+            raise ImproperlyConfigured('PUSH_TRANSPORT = "fcm" requires the firebase-admin package')
+        self.messaging = messaging
+        with self._lock:
+            if not firebase_admin._apps:
+                credentials_file = getattr(settings, 'FIREBASE_CREDENTIALS_FILE', None)
+                if not credentials_file:
+                    raise ImproperlyConfigured('PUSH_TRANSPORT = "fcm" requires FIREBASE_CREDENTIALS_FILE')
+                firebase_admin.initialize_app(credentials.Certificate(credentials_file))
+
+    def send(self, messages):
+        messaging = self.messaging
+        response = messaging.send_each([
+            messaging.Message(
+                token=message.token,
+                notification=messaging.Notification(title=message.title, body=message.body),
+                data={key: str(value) for key, value in (message.data or {}).items()},
+            )
+            for message in messages
+        ])
+        invalid_errors = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+        invalid = []
+        for message, result in zip(messages, response.responses):
+            if result.success:
+                continue
+            error = result.exception
+            if isinstance(error, invalid_errors) or getattr(error, 'code', None) == 'INVALID_ARGUMENT':
+                invalid.append(message.token)
+        return invalid
+
+
+class FileTransport(PushTransport):
+    """One JSON line per message in PUSH_FILE_PATH"""
+    max_batch_size = 500
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.path = getattr(settings, 'PUSH_FILE_PATH', None) or os.path.join(settings.BASE_DIR, 'push_notifications.log')
+
+    def send(self, messages):
+        sent_at = timezone.now().isoformat()
+        lines = [
+            json.dumps({'sent_at': sent_at, **message._asdict()}, default=str) + '\n'
+            for message in messages
+        ]
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+        return []
+
+
+class MemoryTransport(PushTransport):
+    """
+    Keeps every sent batch in MemoryTransport.batches.
+    Tokens in MemoryTransport.invalid_tokens are reported invalid.
+    """
+    max_batch_size = 500
+    batches = []
+    invalid_tokens = set()
+
+    def send(self, messages):
+        MemoryTransport.batches.append(list(messages))
+        return [message.token for message in messages if message.token in MemoryTransport.invalid_tokens]
+
+    @classmethod
+    def reset(cls):
+        cls.batches = []
+        cls.invalid_tokens = set()
+
+
+TRANSPORTS = {
+    'fcm': FcmTransport,
+    'file': FileTransport,
+    'memory': MemoryTransport,
+}
+
+_transport = None
+
+
+def warn_if_development_transport():
+    """Log at startup when a non-DEBUG process would write pushes to a local file instead of sending them"""
+    if getattr(settings, 'PUSH_TRANSPORT', 'file') == 'file' and not settings.DEBUG:
+        logger.warning(
+            "PUSH_TRANSPORT is 'file' with DEBUG off - push notifications are written to "
+            f"{FileTransport().path} and never reach devices. Set PUSH_TRANSPORT=fcm in production."
+        )
+
+
+def get_transport():
+    """Configured transport - one instance per process"""
+    global _transport
+    name = getattr(settings, 'PUSH_TRANSPORT', 'file')
+    transport_class = TRANSPORTS.get(name) or import_string(name)
+    if type(_transport) is not transport_class:
+        _transport = transport_class()
+    return _transport
@@ -0,0 +1,136 @@
+"""
+Query Inspector
+Records the SQL executed while a block of code runs (a request, a test, a task)
+and detects N+1 patterns.
+
+N+1 detection works on query *shapes*: the SQL text with parameters already
+separated by the DB driver, and IN (...) lists collapsed. A shape executed many
+times in one request almost always means a per-row query inside a loop or a
+serializer method field.
+
+Usage:
+    with QueryRecorder() as recorder:
+        response = client.get(url)
+    recorder.count, recorder.repeated_shapes(threshold=5)
+
+    # Budgets for views (read by QueryBudgetMiddleware)
+    class StaffListByAdmin(APIView):
+        query_budget = 12                  # every method
+        query_budget = {'GET': 12}         # per HTTP method
+"""
+import re
+import time
+import traceback
+from contextlib import ExitStack
+
+from django.db import connections
+
+
+IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*%s\s*,?)+\)', re.IGNORECASE)
+NUMBER_RE = re.compile(r'(?<![\w"])\d+(?:\.\d+)?\b')
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+WHITESPACE_RE = re.compile(r'\s+')
+
+# Frames from these packages are skipped when locating where a query came from
+LIBRARY_PATHS = ('/django/', '/rest_framework/', '/site-packages/', '/query_inspector.py', '/contextlib.py')
+
+
+def normalize_sql(sql):
+    """
+    Reduce SQL to its shape - literals and IN-list lengths removed.
+
+    Returns:
+        str: normalized SQL
+    """
+    shape = IN_LIST_RE.sub('IN (...)', sql)
+    shape = STRING_RE.sub('?', shape)
+    shape = NUMBER_RE.sub('?', shape)
+    return WHITESPACE_RE.sub(' ', shape).strip()
+
+
+def _app_callsite():
+    """First stack frame that belongs to project code (file:line function)"""
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        if not any(path in frame.filename for path in LIBRARY_PATHS):
+            return f"{frame.filename}:{frame.lineno} in {frame.name}"
+    return None
+
+
+class QueryRecorder:
+    """
+    Context manager that records every query on every DB connection.
+
+    Uses connection.execute_wrapper(), so it works with DEBUG=False and costs
+    one dict update per query.
+    """
+
+    def __init__(self, using=None, capture_callsites=True):
+        self.using = using
+        self.capture_callsites = capture_callsites
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = {}  # shape -> {'count', 'duration', 'sql', 'callsite'}
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = normalize_sql(sql)
+        entry = self.shapes.get(shape)
+        if entry is None:
+            entry = {'count': 0, 'duration': 0.0, 'sql': sql, 'callsite': None}
+            self.shapes[shape] = entry
+        elif entry['count'] == 1 and self.capture_callsites:
+            # Locate the caller only once a shape repeats - keeps the common path cheap
+            entry['callsite'] = _app_callsite()
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            entry['count'] += 1
+            entry['duration'] += elapsed
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        aliases = [self.using] if self.using else list(connections)
+        for alias in aliases:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+        return False
+
+    def repeated_shapes(self, threshold=5):
+        """
+        Shapes executed at least `threshold` times (likely N+1), most frequent first.
+
+        Returns:
+            list of dicts: {'shape', 'count', 'duration', 'sql', 'callsite'}
+        """
+        repeated = [
+            {'shape': shape, **entry}
+            for shape, entry in self.shapes.items()
+            if entry['count'] >= threshold
+        ]
+        repeated.sort(key=lambda item: item['count'], reverse=True)
+        return repeated
+
+
+def get_view_query_budget(view_func, method):
+    """
+    Query budget declared by a view (class attribute or @query_budget).
+
+    Returns:
+        int or None
+    """
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+        budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        budget = budget.get(method)
+    return budget
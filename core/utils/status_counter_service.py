@@ -0,0 +1,375 @@
+"""
+Status Counter Service
+Live per-tenant status counts (pending leaves, pending expenses, open tasks,
+visits by status, employees present today) kept as counters in the cache
+(Redis in production) so status widgets never re-count rows.
+
+Keys: status_counter_{entity}_{admin}_{site|all}_{status}
+- every change is applied to the site key AND the admin-wide 'all' key, so
+  both reads are O(1) get_many calls
+- model signals record status transitions and apply +1/-1 deltas with
+  cache.incr() inside transaction.on_commit(), so rolled-back writes never count
+- counters are seeded lazily: a read that finds a key missing recounts that
+  (entity, admin, site) with one GROUP BY query; incr() on a missing key is
+  skipped so an unseeded counter never starts from a wrong value
+- reconcile_status_counters() (Celery beat + management command) recounts
+  from the DB and overwrites drift caused by queryset.update(), bulk_create,
+  evictions or lost on_commit callbacks
+
+Attendance counts distinct employees with a check-in per (admin, site, day) -
+admin and site come from the employee's active site assignment.
+"""
+import logging
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+
+logger = logging.getLogger(__name__)
+
+COUNTER_TIMEOUT = None  # Status counters never expire - reconciliation corrects drift
+ATTENDANCE_COUNTER_TIMEOUT = 60 * 60 * 48  # Daily attendance counters live two days
+ALL_SITES = 'all'
+PRESENT = 'present'
+
+# entity -> model label; every model has admin, site and status fields
+COUNTED_ENTITIES = {
+    'task': 'TaskControl.Task',
+    'visit': 'VisitControl.Visit',
+    'expense': 'Expenditure.Expense',
+    'leave': 'LeaveControl.LeaveApplication',
+}
+TRACKED_FIELDS = {'status', 'admin', 'admin_id', 'site', 'site_id'}
+
+
+def _counter_key(entity, admin_id, site_id, status):
+    return f"status_counter_{entity}_{admin_id}_{site_id or ALL_SITES}_{status}"
+
+
+def _attendance_status(day):
+    return f"{PRESENT}_{day.isoformat()}"
+
+
+def get_statuses(entity):
+    """All status values of an entity (from the model field choices)"""
+    model = apps.get_model(COUNTED_ENTITIES[entity])
+    return [value for value, _ in model._meta.get_field('status').choices]
+
+
+# ==================== WRITES ====================
+
+def _apply_deltas(entity, deltas):
+    """
+    Add deltas to counters - skips keys that were never seeded.
+
+    Args:
+        deltas: {(admin_id, site_id, status): delta}
+    """
+    for (admin_id, site_id, status), delta in deltas.items():
+        if not delta or not admin_id:
+            continue
+        for site_key in {site_id or ALL_SITES, ALL_SITES}:
+            try:
+                cache.incr(_counter_key(entity, admin_id, site_key, status), delta)
+            except ValueError:
+                pass  # Not seeded yet - the next read recounts from the DB
+
+
+def record_status_change(entity, old, new):
+    """
+    Queue counter deltas for a status transition, applied on commit.
+
+    Args:
+        old: (admin_id, site_id, status) before the write, or None when created
+        new: (admin_id, site_id, status) after the write, or None when deleted
+    """
+    if old == new:
+        return
+    deltas = defaultdict(int)
+    if old:
+        deltas[old] -= 1
+    if new:
+        deltas[new] += 1
+    transaction.on_commit(lambda: _apply_deltas(entity, deltas))
+
+
+def record_bulk_created(entity, states):
+    """
+    Queue +1 deltas for rows written with bulk_create (no post_save), applied on commit.
+
+    Args:
+        states: iterable of (admin_id, site_id, status), one per created row
+    """
+    deltas = defaultdict(int)
+    for state in states:
+        deltas[state] += 1
+    if deltas:
+        transaction.on_commit(lambda: _apply_deltas(entity, deltas))
+
+
+def _counted_state(instance):
+    return (instance.admin_id, instance.site_id, instance.status)
+
+
+def remember_counted_state(instance, update_fields=None):
+    """
+    pre_save hook - load the row's current (admin, site, status) so post_save
+    can tell whether the status moved. One PK lookup, skipped for inserts and
+    for saves whose update_fields don't touch status/admin/site.
+    """
+    instance._counted_state = None
+    instance._counted_state_skipped = False
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not TRACKED_FIELDS.intersection(update_fields):
+        instance._counted_state_skipped = True
+        return
+    instance._counted_state = type(instance).objects.filter(pk=instance.pk).values_list(
+        'admin_id', 'site_id', 'status'
+    ).first()
+
+
+def count_saved(entity, instance, created):
+    """post_save hook - apply the transition recorded by remember_counted_state()"""
+    if getattr(instance, '_counted_state_skipped', False):
+        return
+    old = None if created else getattr(instance, '_counted_state', None)
+    if not created and old is None:
+        return  # Row vanished or pre_save didn't run - leave it to reconciliation
+    record_status_change(entity, old, _counted_state(instance))
+
+
+def count_deleted(entity, instance):
+    """post_delete hook"""
+    record_status_change(entity, _counted_state(instance), None)
+
+
+# ==================== ATTENDANCE ====================
+
+def _employee_tenants(employee_ids):
+    """
+    Active (admin_id, site_id) of employees - one query.
+
+    Returns:
+        dict: employee_id -> (admin_id, site_id)
+    """
+    from SiteManagement.models import EmployeeAdminSiteAssignment
+
+    tenants = {}
+    rows = EmployeeAdminSiteAssignment.objects.filter(
+        employee_id__in=employee_ids, is_active=True
+    ).order_by('employee_id', '-start_date').values_list('employee_id', 'admin_id', 'site_id')
+    for employee_id, admin_id, site_id in rows:
+        tenants.setdefault(employee_id, (admin_id, site_id))
+    return tenants
+
+
+def count_attendance_change(user_id, attendance_date, had_check_in, has_check_in):
+    """
+    Attendance save/delete hook - an employee counts once per day no matter
+    how many check-in rows they have, so the counter only moves when their
+    first check-in appears or their last one disappears.
+    """
+    if had_check_in == has_check_in:
+        return
+
+    def apply():
+        from WorkLog.models import Attendance
+
+        checked_in = Attendance.objects.filter(
+            user_id=user_id, attendance_date=attendance_date, check_in_time__isnull=False
+        )
+        remaining = checked_in.count()
+        if has_check_in and remaining != 1:
+            return  # Already counted by an earlier check-in row
+        if not has_check_in and remaining != 0:
+            return  # Still present through another row
+        tenant = _employee_tenants([user_id]).get(user_id)
+        if tenant:
+            admin_id, site_id = tenant
+            _apply_deltas('attendance', {
+                (admin_id, site_id, _attendance_status(attendance_date)): 1 if has_check_in else -1
+            })
+
+    transaction.on_commit(apply)
+
+
+def remember_attendance_state(instance, update_fields=None):
+    """pre_save hook - whether the stored row already had a check-in"""
+    instance._had_check_in = False
+    if instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and 'check_in_time' not in update_fields:
+        instance._had_check_in = instance.check_in_time is not None
+        return
+    instance._had_check_in = type(instance).objects.filter(
+        pk=instance.pk, check_in_time__isnull=False
+    ).exists()
+
+
+def count_attendance_saved(instance):
+    """post_save hook"""
+    count_attendance_change(
+        instance.user_id, instance.attendance_date,
+        getattr(instance, '_had_check_in', False), instance.check_in_time is not None,
+    )
+
+
+def count_attendance_deleted(instance):
+    """post_delete hook"""
+    count_attendance_change(instance.user_id, instance.attendance_date, instance.check_in_time is not None, False)
+
+
+def _attendance_groups(day, admin_ids=None):
+    """
+    Employees present on a day per (admin, site) of their active assignment.
+
+    Returns:
+        dict: {(admin_id, site_id, 'present_<day>'): count}, including 0 for
+        assigned (admin, site) pairs nobody checked in to
+    """
+    from SiteManagement.models import EmployeeAdminSiteAssignment
+    from WorkLog.models import Attendance
+
+    assignments = EmployeeAdminSiteAssignment.objects.filter(is_active=True)
+    if admin_ids:
+        assignments = assignments.filter(admin_id__in=admin_ids)
+    status = _attendance_status(day)
+    groups = {
+        (admin_id, site_id, status): 0
+        for admin_id, site_id in assignments.order_by().values_list('admin_id', 'site_id').distinct()
+    }
+    present = Attendance.objects.filter(
+        user_id__in=assignments.values('employee_id'), attendance_date=day, check_in_time__isnull=False
+    ).values_list('user_id', flat=True).distinct()
+    wanted_admins = {str(admin_id) for admin_id in admin_ids} if admin_ids else None
+    for admin_id, site_id in _employee_tenants(list(present)).values():
+        if wanted_admins and str(admin_id) not in wanted_admins:
+            continue  # Primary assignment is with another admin
+        groups[(admin_id, site_id, status)] = groups.get((admin_id, site_id, status), 0) + 1
+    return groups
+
+
+# ==================== READS ====================
+
+def _recount(entity, admin_id, site_id=None, day=None):
+    """Counts straight from the DB for one (entity, admin, site)"""
+    if entity == 'attendance':
+        groups = _attendance_groups(day, admin_ids=[admin_id])
+        present = sum(
+            total for (group_admin, group_site, _), total in groups.items()
+            if str(group_admin) == str(admin_id) and (not site_id or str(group_site) == str(site_id))
+        )
+        return {_attendance_status(day): present}
+
+    model = apps.get_model(COUNTED_ENTITIES[entity])
+    queryset = model.objects.filter(admin_id=admin_id)
+    if site_id:
+        queryset = queryset.filter(site_id=site_id)
+    counts = {status: 0 for status in get_statuses(entity)}
+    for row in queryset.order_by().values('status').annotate(total=Count('id')):
+        counts[row['status']] = row['total']
+    return counts
+
+
+def get_status_counts(entity, admin_id, site_id=None, day=None):
+    """
+    Live status counts - one cache get_many on a warm cache.
+
+    Args:
+        entity: 'task' / 'visit' / 'expense' / 'leave' / 'attendance'
+        admin_id: tenant admin
+        site_id: Optional site (None = all of the admin's sites)
+        day: attendance day (default today)
+
+    Returns:
+        dict: status -> count ({'present': n} for attendance)
+    """
+    if entity == 'attendance':
+        day = day or date.today()
+        statuses = [_attendance_status(day)]
+        timeout = ATTENDANCE_COUNTER_TIMEOUT
+    else:
+        statuses = get_statuses(entity)
+        timeout = COUNTER_TIMEOUT
+
+    keys = {_counter_key(entity, admin_id, site_id, status): status for status in statuses}
+    cached = cache.get_many(list(keys))
+    if len(cached) == len(keys):
+        counts = {keys[key]: value for key, value in cached.items()}
+    else:
+        counts = _recount(entity, admin_id, site_id, day)
+        cache.set_many({_counter_key(entity, admin_id, site_id, status): value for status, value in counts.items()}, timeout)
+
+    if entity == 'attendance':
+        return {PRESENT: counts[_attendance_status(day)]}
+    return counts
+
+
+# ==================== RECONCILIATION ====================
+
+def _reconcile(entity, grouped, timeout):
+    """
+    Overwrite counters with DB counts.
+
+    Args:
+        grouped: {(admin_id, site_id, status): count} for every row group
+
+    Returns:
+        int: number of counters that had drifted (seeded and wrong)
+    """
+    expected = defaultdict(int)
+    for (admin_id, site_id, status), total in grouped.items():
+        if site_id:
+            expected[_counter_key(entity, admin_id, site_id, status)] += total
+        expected[_counter_key(entity, admin_id, None, status)] += total
+
+    current = cache.get_many(list(expected))
+    drifted = sum(1 for key, value in current.items() if value != expected[key])
+    cache.set_many(dict(expected), timeout)
+    return drifted
+
+
+def reconcile_status_counters(entities=None, admin_ids=None, days=None):
+    """
+    Recount every counter from the DB (one GROUP BY per entity) and fix drift.
+
+    Every status of each (admin, site) that still has rows is written, so
+    statuses that emptied out reset to 0.
+
+    Returns:
+        dict: entity -> number of drifted counters corrected
+    """
+    results = {}
+    for entity in entities or [*COUNTED_ENTITIES, 'attendance']:
+        if entity == 'attendance':
+            continue
+        model = apps.get_model(COUNTED_ENTITIES[entity])
+        queryset = model.objects.all()
+        if admin_ids:
+            queryset = queryset.filter(admin_id__in=admin_ids)
+        rows = queryset.order_by().values_list('admin_id', 'site_id', 'status').annotate(total=Count('id'))
+
+        grouped = {}
+        tenants = set()
+        for admin_id, site_id, status, total in rows:
+            grouped[(admin_id, site_id, status)] = total
+            tenants.add((admin_id, site_id))
+        # Zero every status of each known (admin, site) so emptied statuses reset
+        for admin_id, site_id in tenants:
+            for status in get_statuses(entity):
+                grouped.setdefault((admin_id, site_id, status), 0)
+        results[entity] = _reconcile(entity, grouped, COUNTER_TIMEOUT)
+
+    if entities is None or 'attendance' in entities:
+        drifted = 0
+        for day in days or [date.today(), date.today() - timedelta(days=1)]:
+            drifted += _reconcile('attendance', _attendance_groups(day, admin_ids), ATTENDANCE_COUNTER_TIMEOUT)
+        results['attendance'] = drifted
+
+    logger.info(f"Status counters reconciled: {results}")
+    return results
@@ -0,0 +1,243 @@
+"""
+Tenant Resolution Utilities
+Resolves (role, admin, organization, site) once per request from a cached tenant map.
+
+Most site-scoped APIs need the same checks before doing any real work:
+- resolve admin by role (admin -> self, organization -> ?admin_id=, user -> assignment)
+- verify the admin belongs to the requesting organization
+- verify the site belongs to the admin and is active
+
+The tenant map for an admin (admin user, organization id, active sites) is
+cached and invalidated by signals once BaseUserModel / AdminProfile / Site
+writes commit, so these checks cost zero queries on a warm cache. Results are also
+memoized on the request, so repeated calls in the same request are free.
+"""
+import uuid
+from collections import namedtuple
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from AuthN.models import BaseUserModel
+from SiteManagement.models import Site
+
+
+TENANT_CACHE_TIMEOUT = 60 * 10  # 10 minutes - signals invalidate on writes
+
+# Error returned instead of raising, so each app can keep its own response shape
+TenantError = namedtuple('TenantError', ['status_code', 'message'])
+
+
+class Tenant:
+    """Resolved tenant context for a request (exposed as request.tenant)"""
+
+    __slots__ = ('role', 'user', 'admin', 'organization_id', 'site')
+
+    def __init__(self, role, user, admin, organization_id, site=None):
+        self.role = role
+        self.user = user
+        self.admin = admin
+        self.organization_id = organization_id
+        self.site = site
+
+    @property
+    def admin_id(self):
+        return self.admin.id if self.admin else None
+
+    @property
+    def site_id(self):
+        return self.site.id if self.site else None
+
+    def __repr__(self):
+        return f"<Tenant role={self.role} admin={self.admin_id} site={self.site_id}>"
+
+
+# ==================== TENANT MAP CACHE ====================
+
+def _tenant_key(admin_id):
+    return f"tenant_admin_{admin_id}"
+
+
+def invalidate_tenant_cache(admin_ids):
+    """Drop cached tenant maps for the given admins"""
+    keys = [_tenant_key(a) for a in {str(a) for a in admin_ids if a}]
+    if keys:
+        cache.delete_many(keys)
+
+
+def get_admin_tenant_map(admin_id):
+    """
+    Cached tenant map for an admin.
+
+    Cold: 2 queries (admin with profile, active sites). Warm: 1 cache hit.
+
+    Returns:
+        dict: {'admin': BaseUserModel or None, 'organization_id': str or None,
+               'sites': {site_id (str): Site}}
+    """
+    key = _tenant_key(admin_id)
+    tenant_map = cache.get(key)
+    if tenant_map is not None:
+        return tenant_map
+
+    # O(1) query using primary key + OneToOne join
+    admin = BaseUserModel.objects.select_related('own_admin_profile').only(
+        'id', 'role', 'email', 'username', 'is_active',
+        'own_admin_profile__id', 'own_admin_profile__organization_id'
+    ).filter(id=admin_id, role='admin').first()
+
+    tenant_map = {'admin': None, 'organization_id': None, 'sites': {}}
+    if admin:
+        profile = getattr(admin, 'own_admin_profile', None)
+        # O(1) query using index site_admin_active_idx
+        sites = Site.objects.filter(created_by_admin_id=admin.id, is_active=True)
+        tenant_map = {
+            'admin': admin,
+            'organization_id': str(profile.organization_id) if profile else None,
+            'sites': {str(site.id): site for site in sites},
+        }
+
+    cache.set(key, tenant_map, TENANT_CACHE_TIMEOUT)
+    return tenant_map
+
+
+# ==================== RESOLUTION ====================
+
+def _is_valid_uuid(value):
+    try:
+        uuid.UUID(str(value))
+        return True
+    except (ValueError, AttributeError, TypeError):
+        return False
+
+
+def _resolve_for_admin_id(user, role, admin_id, site_id, organization_id=None):
+    """Shared admin/organization resolution against the tenant map"""
+    tenant_map = get_admin_tenant_map(admin_id)
+    admin = tenant_map['admin']
+    if admin is None:
+        return None, TenantError(404, "Admin not found")
+
+    if organization_id is not None and tenant_map['organization_id'] != str(organization_id):
+        return None, TenantError(403, "Admin does not belong to your organization")
+
+    site = None
+    if site_id is not None:
+        site = tenant_map['sites'].get(str(site_id))
+        if site is None:
+            return None, TenantError(403, "Site not found or you don't have permission to access this site")
+
+    return Tenant(role, user, admin, tenant_map['organization_id'], site), None
+
+
+def _resolve_for_employee(user, site_id):
+    """Employee resolution via cached active assignments"""
+    from utils.Employee.assignment_resolver import get_employee_active_sites
+    from utils.Employee.assignment_utils import get_current_admin_for_employee
+
+    if site_id is None:
+        admin = get_current_admin_for_employee(user)
+        if admin is None:
+            return None, TenantError(403, "You are not assigned to any admin. Please contact your administrator.")
+        tenant_map = get_admin_tenant_map(admin.id)
+        return Tenant('user', user, tenant_map['admin'] or admin, tenant_map['organization_id']), None
+
+    admin_id = get_employee_active_sites(user.id).get(str(site_id))
+    if admin_id is None:
+        return None, TenantError(403, "You are not assigned to this site")
+
+    tenant_map = get_admin_tenant_map(admin_id)
+    site = tenant_map['sites'].get(str(site_id))
+    if tenant_map['admin'] is None or site is None:
+        return None, TenantError(404, "Site not found")
+
+    return Tenant('user', user, tenant_map['admin'], tenant_map['organization_id'], site), None
+
+
+def resolve_tenant(request, site_id=None, allow_user_role=False, admin_id=None):
+    """
+    Resolve the tenant for a request - 0 queries on warm cache.
+
+    Sets request.tenant on success. Memoized per request.
+
+    Args:
+        request: DRF request (organization role must pass ?admin_id=)
+        site_id: Optional UUID of site the request is scoped to
+        allow_user_role: If True, employees are resolved via their active assignment
+        admin_id: Optional admin UUID for organization role (default: ?admin_id=)
+
+    Returns:
+        tuple: (Tenant, None) or (None, TenantError)
+    """
+    user = request.user
+    memo = getattr(request, '_tenant_memo', None)
+    if memo is None:
+        memo = {}
+        request._tenant_memo = memo
+
+    memo_key = (str(site_id) if site_id else None, allow_user_role, str(admin_id) if admin_id else None)
+    if memo_key in memo:
+        return memo[memo_key]
+
+    role = getattr(user, 'role', None)
+    if role == 'admin':
+        result = _resolve_for_admin_id(user, role, user.id, site_id)
+    elif role == 'organization':
+        admin_id = admin_id or request.query_params.get('admin_id')
+        if not admin_id:
+            result = (None, TenantError(
+                400, "admin_id is required for organization role. Please provide admin_id as query parameter."
+            ))
+        elif not _is_valid_uuid(admin_id):
+            result = (None, TenantError(400, f"Invalid admin_id format: {admin_id}. Must be a valid UUID."))
+        else:
+            result = _resolve_for_admin_id(user, role, admin_id, site_id, organization_id=user.id)
+    elif role == 'user' and allow_user_role:
+        result = _resolve_for_employee(user, site_id)
+    elif allow_user_role:
+        result = (None, TenantError(
+            403, "Unauthorized access. Only admin, organization, and user roles can access this endpoint"
+        ))
+    else:
+        result = (None, TenantError(
+            403, "Unauthorized access. Only admin and organization roles can access this endpoint"
+        ))
+
+    memo[memo_key] = result
+    if result[0] is not None:
+        request.tenant = result[0]
+    return result
+
+
+def resolve_admin_and_site(request, site_id, allow_user_role=False, admin_id=None):
+    """
+    Drop-in helper for the (admin, site, error) pattern used across views.
+
+    Returns:
+        tuple: (admin, site, None) or (None, None, TenantError)
+    """
+    tenant, error = resolve_tenant(request, site_id, allow_user_role=allow_user_role, admin_id=admin_id)
+    if error:
+        return None, None, error
+    return tenant.admin, tenant.site, None
+
+
+def get_admin_and_site_or_response(request, site_id, allow_user_role=False, empty_data=None):
+    """
+    resolve_admin_and_site() with the error rendered in the standard
+    {"status", "message", "data"} response shape.
+
+    Args:
+        empty_data: "data" of the error response (None or [] depending on the app)
+
+    Returns:
+        tuple: (admin, site, None) or (None, None, Response)
+    """
+    admin, site, tenant_error = resolve_admin_and_site(request, site_id, allow_user_role=allow_user_role)
+    if tenant_error:
+        return None, None, Response({
+            "status": tenant_error.status_code,
+            "message": tenant_error.message,
+            "data": empty_data
+        }, status=tenant_error.status_code)
+    return admin, site, None